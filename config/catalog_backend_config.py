@@ -5,7 +5,9 @@ Provides flexible switching between JSON and PostgreSQL backends with backward c
 
 import os
 import json
+import atexit
 import logging
+import threading
 from typing import Dict, Any, Optional, Union
 from pathlib import Path
 from datetime import datetime
@@ -22,8 +24,7 @@ DEFAULT_CONFIGS = {
     "json_file": {
         "backend": "json_file",
         "json_file": {
-            "file_path": DEFAULT_CATALOG_JSON,
-            "backup_path": DEFAULT_CATALOG_JSON + ".backup"
+            "file_path": DEFAULT_CATALOG_JSON
         },
         "cache": {
             "enabled": False
@@ -38,7 +39,14 @@ DEFAULT_CONFIGS = {
             "user": os.getenv("POSTGRES_USER", "openasp"),
             "password": os.getenv("POSTGRES_PASSWORD", ""),
             "pool_size": 20,
-            "max_overflow": 10
+            "max_overflow": 10,
+            "min_connections": 2,
+            "pool_timeout": 30.0,
+            "max_connection_age": 1800,
+            "health_check_interval": 30,
+            "statement_timeout_ms": int(os.getenv("POSTGRES_STATEMENT_TIMEOUT_MS", "0")) or None,
+            # Read-only replica DSNs, ';' separated
+            "replicas": [dsn for dsn in os.getenv("POSTGRES_REPLICA_DSNS", "").split(";") if dsn.strip()]
         },
         "cache": {
             "enabled": True,
@@ -266,13 +274,24 @@ def get_active_dbio_manager():
         return DBIOManager(DEFAULT_CONFIGS["json_file"])
 
 
+# Hybrid manager of this process (one write queue worker per secondary backend)
+_hybrid_manager = None
+_hybrid_manager_key = None
+_hybrid_manager_lock = threading.Lock()
+
+
 def create_hybrid_manager():
     """
-    Create a hybrid manager for migration periods.
+    Get the hybrid manager for migration periods.
+    
+    The HybridBackend is created once per process and migration
+    configuration and shared by all callers; its queued secondary writes
+    are drained (and the queues closed) at interpreter exit.
     
     Returns:
         HybridBackend instance for dual-write operations
     """
+    global _hybrid_manager, _hybrid_manager_key
     try:
         from dbio.migration import HybridBackend
         from dbio.core import DBIOManager
@@ -283,25 +302,52 @@ def create_hybrid_manager():
         if not migration_config:
             raise ValueError("Migration mode not enabled")
         
-        # Create read backend
         read_backend_name = migration_config["read_backend"]
-        read_config = config.get_backend_config(read_backend_name)
-        read_manager = DBIOManager(read_config)
+        backend_names = [read_backend_name] + list(migration_config["write_backends"])
+        key = (os.getpid(), json.dumps([config.get_backend_config(name) for name in backend_names],
+                                       sort_keys=True, default=str))
         
-        # Create write backends
-        write_managers = []
-        for backend_name in migration_config["write_backends"]:
-            write_config = config.get_backend_config(backend_name)
-            write_manager = DBIOManager(write_config)
-            write_managers.append(write_manager)
-        
-        return HybridBackend(read_manager, write_managers)
+        with _hybrid_manager_lock:
+            if _hybrid_manager is not None and _hybrid_manager_key == key:
+                return _hybrid_manager
+            if _hybrid_manager is not None and _hybrid_manager_key[0] == os.getpid():
+                # Migration configuration changed
+                _hybrid_manager.close()
+            
+            # Create read backend
+            read_config = config.get_backend_config(read_backend_name)
+            read_manager = DBIOManager(read_config)
+            
+            # Create write backends
+            write_managers = []
+            for backend_name in migration_config["write_backends"]:
+                write_config = config.get_backend_config(backend_name)
+                write_manager = DBIOManager(write_config)
+                write_managers.append(write_manager)
+            
+            if _hybrid_manager_key is None:
+                atexit.register(_close_hybrid_manager)
+            _hybrid_manager = HybridBackend(read_manager, write_managers)
+            _hybrid_manager_key = key
+            return _hybrid_manager
         
     except Exception as e:
         logger.error(f"Error creating hybrid manager: {e}")
         raise
 
 
+def _close_hybrid_manager():
+    """Drain the queued secondary writes of this process's hybrid manager."""
+    global _hybrid_manager
+    with _hybrid_manager_lock:
+        if _hybrid_manager is not None and _hybrid_manager_key[0] == os.getpid():
+            try:
+                _hybrid_manager.close()
+            except Exception as e:
+                logger.warning(f"Error closing hybrid manager: {e}")
+        _hybrid_manager = None
+
+
 # Convenience functions for common operations
 def switch_to_postgresql() -> bool:
     """Switch to PostgreSQL backend."""
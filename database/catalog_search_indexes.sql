@@ -0,0 +1,15 @@
+-- Catalog search indexes for DBIO search_objects()
+-- Run this script once as a privileged user (psql, autocommit). The
+-- PostgreSQLBackend only creates them itself, at startup, when the config
+-- key 'create_search_indexes' is set (default false).
+-- CONCURRENTLY keeps aspuser.objects writable while the indexes build.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Contains / wildcard search: lower(object_name) LIKE '%...%'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_objects_name_trgm
+    ON aspuser.objects USING gin (lower(object_name) gin_trgm_ops);
+
+-- Prefix search: lower(object_name) LIKE 'abc%'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_objects_name_prefix
+    ON aspuser.objects (lower(object_name) text_pattern_ops);
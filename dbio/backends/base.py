@@ -2,13 +2,103 @@
 Base Backend Class - Abstract interface for all database backends
 """
 
+import re
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+
+
+def matches_filters(key: Tuple[str, str, str], attributes: Dict[str, Any],
+                    filters: Dict[str, Any]) -> bool:
+    """Check an object against query filters (object_type, volume, library, updated_since or attribute equality)."""
+    for filter_key, value in filters.items():
+        if filter_key == 'updated_since':
+            if str(attributes.get('UPDATED') or '') <= str(value):
+                return False
+        elif filter_key == 'object_type':
+            if attributes.get('TYPE') != value:
+                return False
+        elif filter_key == 'volume':
+            if key[0] != value:
+                return False
+        elif filter_key == 'library':
+            if key[1] != value:
+                return False
+        elif str(attributes.get(filter_key, '')) != str(value):
+            return False
+    return True
+
+
+class SearchQuery:
+    """
+    Parsed catalog search query shared by the backends.
+    
+    Syntax (case-insensitive, matched against object names):
+        ABC      contains 'ABC' (descriptions are searched too)
+        ABC*     starts with 'ABC'
+        A?C*D    wildcard: '*' any run of characters, '?' one character
+    """
+    
+    def __init__(self, query: str):
+        self.raw = query or ''
+        text = self.raw.strip().lower()
+        if '*' not in text and '?' not in text:
+            self.mode = 'contains'
+        elif text.endswith('*') and '*' not in text[:-1] and '?' not in text:
+            self.mode = 'prefix'
+            text = text[:-1]
+        else:
+            self.mode = 'wildcard'
+        self.text = text
+        
+        # Literal runs between wildcards, used to pick index entries
+        self.segments = [segment for segment in re.split(r'[*?]+', text) if segment]
+        
+        if self.mode == 'contains':
+            pattern = re.escape(text)
+        elif self.mode == 'prefix':
+            pattern = '^' + re.escape(text)
+        else:
+            pattern = '^' + ''.join('.*' if ch == '*' else '.' if ch == '?' else re.escape(ch)
+                                    for ch in text) + '$'
+        self.regex = re.compile(pattern, re.DOTALL)
+    
+    def matches_name(self, name: str) -> bool:
+        return bool(self.regex.search(name.lower()))
+    
+    def matches_description(self, description: str) -> bool:
+        return self.mode == 'contains' and bool(self.text) and self.text in description.lower()
+    
+    def like_pattern(self) -> str:
+        """Equivalent ILIKE pattern (backslash escapes)"""
+        escaped = ''.join('\\' + ch if ch in '%_\\' else ch for ch in self.text)
+        if self.mode == 'contains':
+            return f'%{escaped}%'
+        if self.mode == 'prefix':
+            return f'{escaped}%'
+        return escaped.replace('*', '%').replace('?', '_')
+    
+    def rank(self, name: str, description: str = '') -> float:
+        """Relevance: exact name > name prefix > name substring > description"""
+        name = name.lower()
+        rank = 1.0
+        if self.text and name == self.text:
+            rank += 1.0
+        elif self.segments and name.startswith(self.segments[0]) and not self.text.startswith(('*', '?')):
+            rank += 0.7
+        elif self.matches_name(name):
+            rank += 0.5
+        if description and self.matches_description(description):
+            rank += 0.3
+        return rank
 
 
 class BaseBackend(ABC):
     """Abstract base class for all DBIO backends."""
     
+    # True when the backend stamps created/updated times itself, so callers
+    # need not look up the existing object to decide on CREATED
+    MANAGES_TIMESTAMPS = False
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize backend with configuration.
@@ -93,13 +183,15 @@ class BaseBackend(ABC):
         pass
     
     @abstractmethod
-    def search_objects(self, query: str, object_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    def search_objects(self, query: str, object_type: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Full-text search across objects.
         
         Args:
-            query: Search query
+            query: Search query (see SearchQuery for prefix/wildcard syntax)
             object_type: Optional filter by object type
+            limit: Maximum number of results (best ranked first)
             
         Returns:
             List of matching objects
@@ -153,6 +245,47 @@ class BaseBackend(ABC):
         """
         pass
     
+    def iter_objects(self, filters: Optional[Dict[str, Any]] = None,
+                     order: str = 'ASC', page_size: int = 500,
+                     after: Optional[Tuple[str, str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream objects in (volume, library, object) key order.
+        
+        Keyset pagination: 'after' is the key of the last object already seen
+        and the generator resumes right behind it. Backends override this
+        with a streaming implementation; the default pages over
+        get_all_objects().
+        
+        Args:
+            filters: object_type, volume, library, updated_since (ISO timestamp)
+                or attribute equality filters
+            order: 'ASC' or 'DESC' on the object key
+            page_size: Objects fetched per round trip
+            after: Key of the last object of the previous page
+            
+        Yields:
+            {'volume_name', 'library_name', 'object_name', 'attributes'}
+        """
+        descending = order.upper() == 'DESC'
+        filters = filters or {}
+        catalog = self.get_all_objects()
+        keys = sorted(((volume, library, object_name)
+                       for volume, volume_data in catalog.items()
+                       for library, library_data in volume_data.items()
+                       for object_name in library_data), reverse=descending)
+        
+        for key in keys:
+            if after is not None and (key <= tuple(after) if not descending else key >= tuple(after)):
+                continue
+            attributes = catalog[key[0]][key[1]][key[2]]
+            if matches_filters(key, attributes, filters):
+                yield {
+                    'volume_name': key[0],
+                    'library_name': key[1],
+                    'object_name': key[2],
+                    'attributes': attributes
+                }
+    
     def close(self):
         """Close connections and cleanup resources."""
         pass
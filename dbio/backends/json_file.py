@@ -1,44 +1,89 @@
 """
 JSON File Backend for DBIO - Backward compatibility implementation
+
+The catalog is held in memory as a dict keyed by (volume, library, object)
+with secondary indexes by TYPE and by library, and trigram inverted indexes
+over object names and descriptions for search_objects(). It is reloaded only when
+catalog.json or its journal changes on disk (inode, mtime or size). Writes are
+appended to '<catalog>.journal' and compacted into catalog.json in the
+background, on close() and at interpreter exit.
 """
 
 import json
 import logging
 import os
+import atexit
 import threading
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set, Tuple, Iterator
 from datetime import datetime
 import copy
 import fcntl
+from bisect import bisect_left, bisect_right
 
-from .base import BaseBackend
+from .base import BaseBackend, SearchQuery, matches_filters
 from ..exceptions import ValidationError, DBIOException
 
 logger = logging.getLogger(__name__)
 
+ObjectKey = Tuple[str, str, str]
+
+JSON_COMPACT_INTERVAL = float(os.environ.get('DBIO_JSON_COMPACT_INTERVAL', '2.0'))
+JSON_COMPACT_THRESHOLD = int(os.environ.get('DBIO_JSON_COMPACT_THRESHOLD', '500'))
+
+NGRAM = 3
+NAME_START = '\x02'  # marks the start of a name so prefix queries use anchored grams
+
+
+def _ngrams(text: str) -> Set[str]:
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
 
 class JSONFileBackend(BaseBackend):
     """JSON file implementation - maintains compatibility with existing catalog.json."""
-    
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize JSON file backend.
-        
+
         Args:
-            config: Configuration containing file_path
+            config: Configuration containing file_path and optional
+                    journal_path, compact_interval, compact_threshold, fsync
         """
         super().__init__(config)
         self.file_path = config.get('file_path', '/home/aspuser/app/config/catalog.json')
-        self.backup_path = config.get('backup_path', self.file_path + '.backup')
+        self.journal_path = config.get('journal_path', self.file_path + '.journal')
+        self.compact_interval = config.get('compact_interval', JSON_COMPACT_INTERVAL)
+        self.compact_threshold = config.get('compact_threshold', JSON_COMPACT_THRESHOLD)
+        self.fsync = config.get('fsync', True)
         self.lock = threading.RLock()
-        
+
+        # In-memory catalog and indexes
+        self._objects: Dict[ObjectKey, Dict[str, Any]] = {}
+        self._by_type: Dict[str, Set[ObjectKey]] = {}
+        self._by_library: Dict[Tuple[str, str], Set[ObjectKey]] = {}
+        self._sorted_keys: Optional[List[ObjectKey]] = None  # rebuilt lazily after inserts/deletes
+        self._name_grams: Dict[str, Set[ObjectKey]] = {}
+        self._desc_grams: Dict[str, Set[ObjectKey]] = {}
+        self._signature = None  # (catalog stat, journal stat) the memory state reflects
+        self._pending = 0  # journal entries not yet compacted
+        self._journal_locked = False  # this backend holds LOCK_EX on the journal
+
+        self._journal = None
+        self._compactor = None
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self.stats = {'reloads': 0, 'journal_appends': 0, 'compactions': 0, 'compaction_errors': 0}
+
         # Ensure directory exists
         os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        
+
         # Initialize empty catalog if file doesn't exist
         if not os.path.exists(self.file_path):
             self._save_catalog({})
-    
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
     def _load_catalog(self) -> Dict[str, Any]:
         """Load catalog from JSON file with file locking."""
         with self.lock:
@@ -51,21 +96,281 @@ class JSONFileBackend(BaseBackend):
                         return data if isinstance(data, dict) else {}
                     finally:
                         fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                        
+
             except (FileNotFoundError, json.JSONDecodeError) as e:
                 logger.warning(f"Error loading catalog, returning empty: {e}")
                 return {}
-    
+
+    @staticmethod
+    def _stat_signature(path: str):
+        try:
+            st = os.stat(path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _current_signature(self):
+        return (self._stat_signature(self.file_path), self._stat_signature(self.journal_path))
+
+    def _refresh(self):
+        """Reload the in-memory catalog if catalog.json or the journal changed on disk."""
+        with self.lock:
+            if self._current_signature() != self._signature:
+                self._reload()
+
+    def _reload(self):
+        """Rebuild memory state from catalog.json plus the journal (caller holds self.lock)."""
+        self._objects.clear()
+        self._by_type.clear()
+        self._by_library.clear()
+        self._name_grams.clear()
+        self._desc_grams.clear()
+        self._sorted_keys = None
+        self._pending = 0
+
+        with open(self.journal_path, 'a+', encoding='utf-8') as journal:
+            # A shared journal lock keeps compaction in other processes from
+            # truncating the journal between reading the catalog and the journal
+            if not self._journal_locked:
+                fcntl.flock(journal.fileno(), fcntl.LOCK_SH)
+            try:
+                signature = self._current_signature()
+                for volume, volume_data in self._load_catalog().items():
+                    if not isinstance(volume_data, dict):
+                        continue
+                    for library, library_data in volume_data.items():
+                        if not isinstance(library_data, dict):
+                            continue
+                        for object_name, object_data in library_data.items():
+                            self._put((volume, library, object_name), object_data)
+
+                journal.seek(0)
+                for line in journal:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn last line from a crash during append
+                        continue
+                    self._apply_entry(entry)
+                    self._pending += 1
+            finally:
+                if not self._journal_locked:
+                    fcntl.flock(journal.fileno(), fcntl.LOCK_UN)
+
+        self._signature = signature
+        self.stats['reloads'] += 1
+        if self._pending:
+            logger.info(f"Replayed {self._pending} catalog journal entries from {self.journal_path}")
+
+    # ------------------------------------------------------------------
+    # Index maintenance (caller holds self.lock)
+    # ------------------------------------------------------------------
+    def _put(self, key: ObjectKey, object_data: Dict[str, Any]):
+        old = self._objects.get(key)
+        if old is not None:
+            self._unindex(key, old)
+        else:
+            self._sorted_keys = None
+            self._add_grams(self._name_grams, _ngrams(NAME_START + key[2].lower()), key)
+        self._objects[key] = object_data
+        self._by_type.setdefault(object_data.get('TYPE', 'UNKNOWN'), set()).add(key)
+        self._by_library.setdefault(key[:2], set()).add(key)
+
+        old_description = self._description(old) if old is not None else ''
+        description = self._description(object_data)
+        if description != old_description:
+            self._drop_grams(self._desc_grams, _ngrams(old_description), key)
+            self._add_grams(self._desc_grams, _ngrams(description), key)
+
+    def _remove(self, key: ObjectKey) -> bool:
+        old = self._objects.pop(key, None)
+        if old is None:
+            return False
+        self._unindex(key, old)
+        self._drop_grams(self._name_grams, _ngrams(NAME_START + key[2].lower()), key)
+        self._drop_grams(self._desc_grams, _ngrams(self._description(old)), key)
+        self._sorted_keys = None
+        return True
+
+    def _unindex(self, key: ObjectKey, object_data: Dict[str, Any]):
+        for index, index_key in ((self._by_type, object_data.get('TYPE', 'UNKNOWN')),
+                                 (self._by_library, key[:2])):
+            keys = index.get(index_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[index_key]
+
+    @staticmethod
+    def _description(object_data: Dict[str, Any]) -> str:
+        return str(object_data.get('DESCRIPTION') or '').lower()
+
+    @staticmethod
+    def _add_grams(index: Dict[str, Set[ObjectKey]], grams: Set[str], key: ObjectKey):
+        for gram in grams:
+            index.setdefault(gram, set()).add(key)
+
+    @staticmethod
+    def _drop_grams(index: Dict[str, Set[ObjectKey]], grams: Set[str], key: ObjectKey):
+        for gram in grams:
+            keys = index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[gram]
+
+    @staticmethod
+    def _lookup_grams(index: Dict[str, Set[ObjectKey]], grams: Set[str]) -> Set[ObjectKey]:
+        """Keys containing every gram (smallest posting list first)"""
+        postings = sorted((index.get(gram, set()) for gram in grams), key=len)
+        if not postings:
+            return set()
+        result = set(postings[0])
+        for keys in postings[1:]:
+            result &= keys
+            if not result:
+                break
+        return result
+
+    def _search_candidates(self, search: SearchQuery) -> Optional[Set[ObjectKey]]:
+        """Keys that may match according to the trigram indexes, None when the query is too short"""
+        name_grams: Set[str] = set()
+        for i, segment in enumerate(search.segments):
+            anchored = i == 0 and search.mode != 'contains' and not search.text.startswith(('*', '?'))
+            name_grams |= _ngrams(NAME_START + segment if anchored else segment)
+        if not name_grams:
+            return None
+        candidates = self._lookup_grams(self._name_grams, name_grams)
+
+        if search.mode == 'contains':
+            candidates |= self._lookup_grams(self._desc_grams, _ngrams(search.text))
+        return candidates
+
+    def _apply_entry(self, entry: Dict[str, Any]):
+        key = (entry['volume'], entry['library'], entry['object'])
+        if entry.get('op') == 'delete':
+            self._remove(key)
+        else:
+            self._put(key, entry['data'])
+
+    def _sorted_index(self) -> List[ObjectKey]:
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._objects)
+        return self._sorted_keys
+
+    def _merge_object(self, key: ObjectKey, attributes: Dict[str, Any]) -> Dict[str, Any]:
+        """Existing attributes updated with new ones, preserving CREATED."""
+        existing = self._objects.get(key, {})
+
+        # Preserve CREATED timestamp if it exists
+        if 'CREATED' in existing and 'CREATED' not in attributes:
+            attributes['CREATED'] = existing['CREATED']
+
+        merged = copy.deepcopy(existing)
+        merged.update(copy.deepcopy(attributes))
+        return merged
+
+    def _as_catalog(self) -> Dict[str, Any]:
+        """Nested catalog.json structure sharing the in-memory object dicts."""
+        catalog: Dict[str, Any] = {}
+        for (volume, library, object_name), object_data in self._objects.items():
+            catalog.setdefault(volume, {}).setdefault(library, {})[object_name] = object_data
+        return catalog
+
+    # ------------------------------------------------------------------
+    # Journal and compaction
+    # ------------------------------------------------------------------
+    def _write(self, entries: List[Dict[str, Any]]):
+        """
+        Apply journal entries to memory and append them to the journal.
+
+        The journal is locked for the whole refresh/apply/append cycle so that
+        entries appended by other processes are never overwritten in memory.
+        """
+        if not entries:
+            return
+        with self.lock:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'ab')
+            fd = self._journal.fileno()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            self._journal_locked = True
+            try:
+                self._refresh()
+                for entry in entries:
+                    self._apply_entry(entry)
+                self._journal.write(''.join(
+                    json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n' for entry in entries
+                ).encode('utf-8'))
+                self._journal.flush()
+                if self.fsync:
+                    os.fsync(fd)
+            except Exception as e:
+                # Memory may be ahead of disk, force a reload on next access
+                self._signature = None
+                raise DBIOException(f"Failed to write catalog journal: {str(e)}")
+            finally:
+                self._journal_locked = False
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+            self._signature = self._current_signature()
+            self._pending += len(entries)
+            self.stats['journal_appends'] += len(entries)
+
+        self._start_compactor()
+        if self._pending >= self.compact_threshold:
+            self._wakeup.set()
+
+    def _start_compactor(self):
+        """Start the background compactor on first write."""
+        with self.lock:
+            if self._compactor is not None or self._stopped.is_set():
+                return
+            self._compactor = threading.Thread(target=self._compact_loop,
+                                               name='dbio-json-compactor', daemon=True)
+            self._compactor.start()
+            atexit.register(self.close)
+
+    def _compact_loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.compact_interval)
+            self._wakeup.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                logger.warning(f"Catalog compaction failed: {e}")
+
+    def compact(self) -> bool:
+        """Fold the journal into catalog.json and truncate it."""
+        with self.lock:
+            if not os.path.exists(self.journal_path):
+                return True
+            with open(self.journal_path, 'ab') as journal:
+                fcntl.flock(journal.fileno(), fcntl.LOCK_EX)
+                self._journal_locked = True
+                try:
+                    self._refresh()
+                    if not self._pending:
+                        return True
+                    try:
+                        self._save_catalog(self._as_catalog())
+                    except DBIOException:
+                        self.stats['compaction_errors'] += 1
+                        raise
+                    journal.truncate(0)
+                    self._pending = 0
+                    self._signature = self._current_signature()
+                    self.stats['compactions'] += 1
+                    return True
+                finally:
+                    self._journal_locked = False
+                    fcntl.flock(journal.fileno(), fcntl.LOCK_UN)
+
     def _save_catalog(self, catalog: Dict[str, Any]) -> bool:
-        """Save catalog to JSON file with atomic write and backup."""
+        """Save catalog to JSON file with atomic write."""
         with self.lock:
+            temp_path = self.file_path + '.tmp'
             try:
-                # Create backup first
-                if os.path.exists(self.file_path):
-                    os.rename(self.file_path, self.backup_path)
-                
-                # Atomic write using temporary file
-                temp_path = self.file_path + '.tmp'
                 with open(temp_path, 'w', encoding='utf-8') as f:
                     fcntl.flock(f.fileno(), fcntl.LOCK_EX)
                     try:
@@ -74,345 +379,369 @@ class JSONFileBackend(BaseBackend):
                         os.fsync(f.fileno())
                     finally:
                         fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-                
-                # Atomic move
-                os.rename(temp_path, self.file_path)
-                
-                # Remove old backup after successful write
-                if os.path.exists(self.backup_path):
-                    os.remove(self.backup_path)
-                
+
+                # Atomic move, readers see either the old or the new catalog
+                os.replace(temp_path, self.file_path)
                 return True
-                
+
             except Exception as e:
                 logger.error(f"Error saving catalog: {e}")
-                # Restore from backup if possible
-                if os.path.exists(self.backup_path):
-                    os.rename(self.backup_path, self.file_path)
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
                 raise DBIOException(f"Failed to save catalog: {str(e)}")
-    
+
+    def close(self):
+        """Stop the compactor and fold outstanding journal entries into catalog.json."""
+        self._stopped.set()
+        self._wakeup.set()
+        try:
+            self.compact()
+        except Exception as e:
+            logger.warning(f"Final catalog compaction failed, journal kept: {e}")
+        with self.lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            if self._compactor is not None:
+                atexit.unregister(self.close)
+
+    # ------------------------------------------------------------------
+    # Backend interface
+    # ------------------------------------------------------------------
     def get_all_objects(self) -> Dict[str, Any]:
         """Get all objects in catalog.json format."""
-        return self._load_catalog()
-    
+        with self.lock:
+            self._refresh()
+            return copy.deepcopy(self._as_catalog())
+
     def get_object(self, volume: str, library: str, object_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific object."""
-        catalog = self._load_catalog()
-        
-        if volume in catalog and library in catalog[volume] and object_name in catalog[volume][library]:
-            return copy.deepcopy(catalog[volume][library][object_name])
-        
-        return None
-    
-    def update_object(self, volume: str, library: str, object_name: str, 
+        with self.lock:
+            self._refresh()
+            object_data = self._objects.get((volume, library, object_name))
+            return copy.deepcopy(object_data) if object_data is not None else None
+
+    def update_object(self, volume: str, library: str, object_name: str,
                      attributes: Dict[str, Any]) -> bool:
         """Update or create an object."""
-        catalog = self._load_catalog()
-        
-        # Ensure volume exists
-        if volume not in catalog:
-            catalog[volume] = {}
-        
-        # Ensure library exists
-        if library not in catalog[volume]:
-            catalog[volume][library] = {}
-        
-        # Get existing object or create new
-        if object_name not in catalog[volume][library]:
-            catalog[volume][library][object_name] = {}
-        
-        # Update attributes
-        existing = catalog[volume][library][object_name]
-        
-        # Preserve CREATED timestamp if it exists
-        if 'CREATED' in existing and 'CREATED' not in attributes:
-            attributes['CREATED'] = existing['CREATED']
-        
-        # Update object
-        catalog[volume][library][object_name].update(attributes)
-        
-        # Save catalog
-        return self._save_catalog(catalog)
-    
+        with self.lock:
+            self._refresh()
+            key = (volume, library, object_name)
+            self._write([{
+                'op': 'put', 'volume': volume, 'library': library, 'object': object_name,
+                'data': self._merge_object(key, attributes)
+            }])
+        return True
+
     def delete_object(self, volume: str, library: str, object_name: str) -> bool:
         """Delete an object."""
-        catalog = self._load_catalog()
-        
-        if (volume in catalog and 
-            library in catalog[volume] and 
-            object_name in catalog[volume][library]):
-            
-            del catalog[volume][library][object_name]
-            
-            # Clean up empty structures
-            if not catalog[volume][library]:
-                del catalog[volume][library]
-                if not catalog[volume]:
-                    del catalog[volume]
-            
-            return self._save_catalog(catalog)
-        
-        return False
-    
+        with self.lock:
+            self._refresh()
+            if (volume, library, object_name) not in self._objects:
+                return False
+            self._write([{'op': 'delete', 'volume': volume, 'library': library, 'object': object_name}])
+        return True
+
     def query_objects(self, filters: Optional[Dict[str, Any]] = None,
                      sort: Optional[List[tuple]] = None,
                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Query objects with filters and sorting."""
-        catalog = self._load_catalog()
-        results = []
-        
-        # Flatten catalog structure for querying
-        for volume_name, volume_data in catalog.items():
-            for library_name, library_data in volume_data.items():
-                for object_name, object_data in library_data.items():
-                    result = {
-                        'volume_name': volume_name,
-                        'library_name': library_name,
-                        'object_name': object_name,
-                        'attributes': copy.deepcopy(object_data)
-                    }
-                    results.append(result)
-        
-        # Apply filters
-        if filters:
-            filtered_results = []
-            for result in results:
-                match = True
-                for key, value in filters.items():
-                    if key == 'object_type':
-                        if result['attributes'].get('TYPE') != value:
-                            match = False
-                            break
-                    elif key == 'volume':
-                        if result['volume_name'] != value:
-                            match = False
-                            break
-                    elif key == 'library':
-                        if result['library_name'] != value:
-                            match = False
-                            break
+        filters = dict(filters or {})
+
+        with self.lock:
+            self._refresh()
+
+            # Narrow candidates with the indexes before scanning attributes
+            if 'volume' in filters and 'library' in filters:
+                candidates = self._by_library.get((filters.pop('volume'), filters.pop('library')), set())
+            else:
+                candidates = None
+            if 'object_type' in filters:
+                by_type = self._by_type.get(filters.pop('object_type'), set())
+                candidates = by_type if candidates is None else candidates & by_type
+            if candidates is None:
+                candidates = self._objects.keys()
+
+            matches = [(key, self._objects[key]) for key in candidates
+                       if matches_filters(key, self._objects[key], filters)]
+
+            # Deterministic (volume, library, object) order, then the requested sort
+            matches.sort(key=lambda item: item[0])
+            if sort:
+                positions = {'volume_name': 0, 'library_name': 1, 'object_name': 2}
+                for field, direction in reversed(sort):  # Apply in reverse order
+                    reverse = direction.upper() == 'DESC'
+
+                    if field in positions:
+                        index = positions[field]
+                        matches.sort(key=lambda item: item[0][index], reverse=reverse)
                     else:
-                        if str(result['attributes'].get(key, '')) != str(value):
-                            match = False
-                            break
-                
-                if match:
-                    filtered_results.append(result)
-            
-            results = filtered_results
-        
-        # Apply sorting
-        if sort:
-            for field, direction in reversed(sort):  # Apply in reverse order
-                reverse = direction.upper() == 'DESC'
-                
-                if field in ['volume_name', 'library_name', 'object_name']:
-                    results.sort(key=lambda x: x[field], reverse=reverse)
+                        matches.sort(key=lambda item: item[1].get(field, ''), reverse=reverse)
+
+            # Apply limit
+            if limit and limit > 0:
+                matches = matches[:limit]
+
+            return [{
+                'volume_name': volume_name,
+                'library_name': library_name,
+                'object_name': object_name,
+                'attributes': copy.deepcopy(object_data)
+            } for (volume_name, library_name, object_name), object_data in matches]
+
+    def iter_objects(self, filters: Optional[Dict[str, Any]] = None,
+                     order: str = 'ASC', page_size: int = 500,
+                     after: Optional[ObjectKey] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream objects in key order from the sorted key index.
+
+        The lock is held for one page at a time, so writers are not blocked
+        while the caller consumes the generator. Volume/library filters jump
+        straight to their key range.
+        """
+        descending = order.upper() == 'DESC'
+        filters = dict(filters or {})
+        prefix: ObjectKey = ()
+        if 'volume' in filters:
+            prefix = (filters['volume'],)
+            if 'library' in filters:
+                prefix = (filters['volume'], filters['library'])
+        position = tuple(after) if after is not None else None
+
+        while True:
+            page = []
+            exhausted = True
+            with self.lock:
+                self._refresh()
+                keys = self._sorted_index()
+                if descending:
+                    end = bisect_left(keys, position) if position is not None else len(keys)
+                    indices = range(end - 1, -1, -1)
                 else:
-                    results.sort(key=lambda x: x['attributes'].get(field, ''), reverse=reverse)
-        
-        # Apply limit
-        if limit and limit > 0:
-            results = results[:limit]
-        
-        return results
-    
-    def search_objects(self, query: str, object_type: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Full-text search across objects (simple implementation)."""
-        query_lower = query.lower()
-        filters = {}
-        
-        if object_type:
-            filters['object_type'] = object_type
-        
-        all_objects = self.query_objects(filters)
-        results = []
-        
-        for obj in all_objects:
-            # Search in object name and description
-            searchable_text = (
-                obj['object_name'].lower() + ' ' +
-                obj['attributes'].get('DESCRIPTION', '').lower()
-            )
-            
-            if query_lower in searchable_text:
-                # Simple ranking based on position of match
-                rank = 1.0
-                if query_lower in obj['object_name'].lower():
-                    rank += 0.5
-                if query_lower in obj['attributes'].get('DESCRIPTION', '').lower():
-                    rank += 0.3
-                
-                obj['rank'] = rank
-                results.append(obj)
-        
-        # Sort by rank (descending)
-        results.sort(key=lambda x: x.get('rank', 0), reverse=True)
-        
-        return results
-    
+                    start = bisect_right(keys, position) if position is not None else 0
+                    if prefix:
+                        start = max(start, bisect_left(keys, prefix))
+                    indices = range(start, len(keys))
+
+                for i in indices:
+                    key = keys[i]
+                    key_prefix = key[:len(prefix)]
+                    if key_prefix != prefix:
+                        # Past the prefix range in scan direction: done
+                        if (key_prefix < prefix) == descending:
+                            break
+                        continue
+                    position = key
+                    object_data = self._objects[key]
+                    if matches_filters(key, object_data, filters):
+                        page.append({
+                            'volume_name': key[0],
+                            'library_name': key[1],
+                            'object_name': key[2],
+                            'attributes': copy.deepcopy(object_data)
+                        })
+                        if len(page) >= page_size:
+                            exhausted = False
+                            break
+
+            yield from page
+            if exhausted:
+                return
+
+    def search_objects(self, query: str, object_type: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search object names and descriptions through the trigram indexes."""
+        search = SearchQuery(query)
+
+        with self.lock:
+            self._refresh()
+            candidates = self._search_candidates(search)
+            if object_type:
+                by_type = self._by_type.get(object_type, set())
+                candidates = by_type if candidates is None else candidates & by_type
+            elif candidates is None:
+                candidates = self._objects.keys()
+
+            matches = []
+            for key in candidates:
+                object_data = self._objects[key]
+                description = self._description(object_data)
+                # Index hits are candidates only, confirm against the query
+                if search.matches_name(key[2]) or search.matches_description(description):
+                    matches.append((search.rank(key[2], description), key, object_data))
+
+            # Sort by rank (descending)
+            matches.sort(key=lambda match: (-match[0], match[1]))
+            if limit and limit > 0:
+                matches = matches[:limit]
+
+            return [{
+                'volume_name': volume_name,
+                'library_name': library_name,
+                'object_name': object_name,
+                'attributes': copy.deepcopy(object_data),
+                'rank': rank
+            } for rank, (volume_name, library_name, object_name), object_data in matches]
+
     def bulk_operations(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Perform bulk operations."""
         stats = {'created': 0, 'updated': 0, 'deleted': 0, 'errors': 0}
-        catalog = self._load_catalog()
-        
-        for operation in operations:
-            try:
-                op_type = operation.get('type')
-                volume = operation.get('volume')
-                library = operation.get('library')
-                object_name = operation.get('object_name')
-                
-                if op_type == 'update':
-                    # Check if object exists
-                    exists = (volume in catalog and 
-                             library in catalog[volume] and 
-                             object_name in catalog[volume][library])
-                    
-                    # Ensure structure exists
-                    if volume not in catalog:
-                        catalog[volume] = {}
-                    if library not in catalog[volume]:
-                        catalog[volume][library] = {}
-                    if object_name not in catalog[volume][library]:
-                        catalog[volume][library][object_name] = {}
-                    
-                    # Update attributes
-                    attributes = operation.get('attributes', {})
-                    existing = catalog[volume][library][object_name]
-                    
-                    # Preserve CREATED timestamp
-                    if 'CREATED' in existing and 'CREATED' not in attributes:
-                        attributes['CREATED'] = existing['CREATED']
-                    
-                    catalog[volume][library][object_name].update(attributes)
-                    
-                    if exists:
-                        stats['updated'] += 1
-                    else:
-                        stats['created'] += 1
-                
-                elif op_type == 'delete':
-                    if (volume in catalog and 
-                        library in catalog[volume] and 
-                        object_name in catalog[volume][library]):
-                        
-                        del catalog[volume][library][object_name]
-                        
-                        # Clean up empty structures
-                        if not catalog[volume][library]:
-                            del catalog[volume][library]
-                            if not catalog[volume]:
-                                del catalog[volume]
-                        
-                        stats['deleted'] += 1
-                
-            except Exception as e:
-                logger.error(f"Error in bulk operation: {e}")
-                stats['errors'] += 1
-        
-        # Save once after all operations
-        if self._save_catalog(catalog):
-            return stats
-        else:
-            raise DBIOException("Failed to save catalog after bulk operations")
-    
+
+        with self.lock:
+            self._refresh()
+            entries = []
+            # Objects as they will be after the operations queued so far
+            staged: Dict[ObjectKey, Optional[Dict[str, Any]]] = {}
+
+            for operation in operations:
+                try:
+                    op_type = operation.get('type')
+                    key = (operation.get('volume'), operation.get('library'), operation.get('object_name'))
+                    current = staged[key] if key in staged else self._objects.get(key)
+
+                    if op_type == 'update':
+                        attributes = operation.get('attributes', {})
+
+                        # Preserve CREATED timestamp
+                        if current and 'CREATED' in current and 'CREATED' not in attributes:
+                            attributes['CREATED'] = current['CREATED']
+
+                        merged = copy.deepcopy(current) if current else {}
+                        merged.update(copy.deepcopy(attributes))
+                        staged[key] = merged
+                        entries.append({'op': 'put', 'volume': key[0], 'library': key[1],
+                                        'object': key[2], 'data': merged})
+
+                        if current is not None:
+                            stats['updated'] += 1
+                        else:
+                            stats['created'] += 1
+
+                    elif op_type == 'delete':
+                        if current is not None:
+                            staged[key] = None
+                            entries.append({'op': 'delete', 'volume': key[0], 'library': key[1],
+                                            'object': key[2]})
+                            stats['deleted'] += 1
+
+                except Exception as e:
+                    logger.error(f"Error in bulk operation: {e}")
+                    stats['errors'] += 1
+
+            # Append once after all operations
+            self._write(entries)
+
+        return stats
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get backend statistics."""
-        catalog = self._load_catalog()
-        
-        # Count objects by type
-        object_counts = {}
-        total_objects = 0
+        with self.lock:
+            self._refresh()
+            objects = list(self._objects.items())
+            object_counts = {obj_type: len(keys) for obj_type, keys in self._by_type.items()}
+            volumes = {key[0] for key in self._by_library}
+            libraries = len(self._by_library)
+            backend_stats = dict(self.stats, journal_pending=self._pending)
+
         recent_updates = 0
         cutoff_time = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        for volume_data in catalog.values():
-            for library_data in volume_data.values():
-                for object_data in library_data.values():
-                    total_objects += 1
-                    
-                    obj_type = object_data.get('TYPE', 'UNKNOWN')
-                    object_counts[obj_type] = object_counts.get(obj_type, 0) + 1
-                    
-                    # Check for recent updates
-                    updated_str = object_data.get('UPDATED', '')
-                    if updated_str:
-                        try:
-                            updated = datetime.fromisoformat(updated_str.replace('Z', '+00:00'))
-                            if updated >= cutoff_time:
-                                recent_updates += 1
-                        except:
-                            pass
-        
+
+        for _, object_data in objects:
+            # Check for recent updates
+            updated_str = object_data.get('UPDATED', '')
+            if updated_str:
+                try:
+                    updated = datetime.fromisoformat(updated_str.replace('Z', '+00:00'))
+                    if updated >= cutoff_time:
+                        recent_updates += 1
+                except:
+                    pass
+
         return {
             'backend': 'json_file',
-            'total_objects': total_objects,
-            'volumes': len(catalog),
-            'libraries': sum(len(vol_data) for vol_data in catalog.values()),
+            'total_objects': len(objects),
+            'volumes': len(volumes),
+            'libraries': libraries,
             'objects_by_type': object_counts,
             'recent_updates_24h': recent_updates,
             'file_size_bytes': os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0,
+            'journal': backend_stats,
             'timestamp': datetime.utcnow().isoformat()
         }
-    
+
     def import_catalog(self, catalog_data: Dict[str, Any], merge: bool = False) -> Dict[str, Any]:
         """Import catalog data from dictionary."""
-        if merge:
-            existing_catalog = self._load_catalog()
-            # Deep merge logic
-            for volume, volume_data in catalog_data.items():
-                if volume not in existing_catalog:
-                    existing_catalog[volume] = {}
-                for library, library_data in volume_data.items():
-                    if library not in existing_catalog[volume]:
-                        existing_catalog[volume][library] = {}
-                    existing_catalog[volume][library].update(library_data)
-            catalog_to_save = existing_catalog
-        else:
-            catalog_to_save = catalog_data
-        
-        # Count statistics
         stats = {'volumes': 0, 'libraries': 0, 'objects': 0, 'errors': 0}
-        
-        for volume_name, volume_data in catalog_to_save.items():
-            stats['volumes'] += 1
-            for library_name, library_data in volume_data.items():
-                stats['libraries'] += 1
-                stats['objects'] += len(library_data)
-        
-        # Save catalog
-        if self._save_catalog(catalog_to_save):
-            return stats
-        else:
-            stats['errors'] = 1
-            return stats
-    
+
+        with self.lock:
+            if merge:
+                # Objects in catalog_data replace existing ones, journaled like any write
+                entries = [
+                    {'op': 'put', 'volume': volume, 'library': library, 'object': object_name,
+                     'data': copy.deepcopy(object_data)}
+                    for volume, volume_data in catalog_data.items()
+                    for library, library_data in volume_data.items()
+                    for object_name, object_data in library_data.items()
+                ]
+                try:
+                    self._write(entries)
+                except DBIOException as e:
+                    logger.error(f"Error importing catalog: {e}")
+                    stats['errors'] = 1
+                    return stats
+                catalog_to_count = self._as_catalog()
+            else:
+                # Full replacement, write catalog.json directly and drop the journal
+                journal = open(self.journal_path, 'ab')
+                fcntl.flock(journal.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._save_catalog(catalog_data)
+                    journal.truncate(0)
+                except DBIOException as e:
+                    logger.error(f"Error importing catalog: {e}")
+                    stats['errors'] = 1
+                    return stats
+                finally:
+                    fcntl.flock(journal.fileno(), fcntl.LOCK_UN)
+                    journal.close()
+                self._signature = None
+                catalog_to_count = catalog_data
+
+            # Count statistics
+            for volume_name, volume_data in catalog_to_count.items():
+                stats['volumes'] += 1
+                for library_name, library_data in volume_data.items():
+                    stats['libraries'] += 1
+                    stats['objects'] += len(library_data)
+
+        return stats
+
     def health_check(self) -> Dict[str, Any]:
         """Check JSON file backend health."""
         try:
             # Test read
-            catalog = self._load_catalog()
-            
+            with self.lock:
+                self._refresh()
+                object_count = len(self._objects)
+                pending = self._pending
+
             # Test write (create temporary backup)
             backup_test = self.file_path + '.health_test'
             with open(backup_test, 'w', encoding='utf-8') as f:
                 json.dump({'test': True}, f)
             os.remove(backup_test)
-            
+
             return {
                 'status': 'healthy',
                 'backend': 'json_file',
                 'file_exists': os.path.exists(self.file_path),
                 'file_readable': True,
                 'file_writable': True,
-                'object_count': sum(
-                    sum(len(lib_data) for lib_data in vol_data.values())
-                    for vol_data in catalog.values()
-                ),
+                'object_count': object_count,
+                'journal_pending': pending,
                 'timestamp': datetime.utcnow().isoformat()
             }
-            
+
         except Exception as e:
             return {
                 'status': 'unhealthy',
@@ -420,4 +749,4 @@ class JSONFileBackend(BaseBackend):
                 'error': str(e),
                 'file_exists': os.path.exists(self.file_path),
                 'timestamp': datetime.utcnow().isoformat()
-            }
\ No newline at end of file
+            }
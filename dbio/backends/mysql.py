@@ -28,7 +28,7 @@ class MySQLBackend(BaseBackend):
     def query_objects(self, filters=None, sort=None, limit=None):
         raise NotImplementedError
     
-    def search_objects(self, query, object_type=None):
+    def search_objects(self, query, object_type=None, limit=None):
         raise NotImplementedError
     
     def bulk_operations(self, operations):
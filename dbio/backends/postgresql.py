@@ -3,23 +3,184 @@ Updated PostgreSQL Backend for DBIO - OpenASP Catalog System
 Designed for the new hierarchical schema: aspuser.volumes -> libraries -> objects
 """
 
+import itertools
 import logging
 import psycopg2
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor, Json
-from typing import Dict, Any, Optional, List
+from psycopg2.extras import RealDictCursor, Json, execute_values
+from typing import Dict, Any, Optional, List, Tuple, Iterator
 import json
+import uuid
 from datetime import datetime
 
-from .base import BaseBackend, TransactionMixin
+from .base import BaseBackend, TransactionMixin, SearchQuery, matches_filters
+from .postgresql_pool import ManagedConnectionPool
 from ..exceptions import ConnectionError, ValidationError, TransactionError
 
 logger = logging.getLogger(__name__)
 
+# Rows per execute_values page for set-based bulk writes
+BULK_PAGE_SIZE = 5000
+
+# Type-specific detail tables: object TYPE -> (table, ((column, attribute, default), ...))
+TYPE_DETAIL_TABLES = {
+    'PGM': ('aspuser.programs', (('pgm_type', 'PGMTYPE', 'UNKNOWN'),
+                                 ('encoding', 'ENCODING', 'UTF-8'))),
+    'DATASET': ('aspuser.datasets', (('rec_type', 'RECTYPE', 'FB'),
+                                     ('rec_len', 'RECLEN', 80),
+                                     ('encoding', 'ENCODING', 'UTF-8'))),
+    'MAP': ('aspuser.maps', (('map_type', 'MAPTYPE', 'SMED'),
+                             ('width', 'WIDTH', 0),
+                             ('height', 'HEIGHT', 0))),
+    'COPYBOOK': ('aspuser.copybooks', (('copybook_type', 'COPYBOOKTYPE', 'COBOL'),
+                                       ('encoding', 'ENCODING', 'UTF-8'))),
+    'JOB': ('aspuser.jobs', (('job_type', 'JOBTYPE', 'BATCH'),
+                             ('schedule_info', 'SCHEDULE', ''))),
+    'LAYOUT': ('aspuser.layouts', (('layout_type', 'LAYOUTTYPE', 'SCREEN'),
+                                   ('layout_data', 'LAYOUTDATA', {}))),
+}
+
+ObjectKey = Tuple[str, str, str]
+
+# SQLSTATEs handled by the prepared upsert path
+FOREIGN_KEY_VIOLATION = '23503'
+DUPLICATE_PREPARED_STATEMENT = '42P05'
+
+
+def object_upsert_statement(object_type: str, cached_ids: bool) -> Tuple[str, str]:
+    """
+    (prepared name, SQL) of the single-statement object upsert.
+    
+    Parameters: volume_name, volume_path, library_name, library_path (or
+    volume_id, library_id when cached_ids), then object_name, object_type,
+    object_path, file_size and the TYPE_DETAIL_TABLES columns of the type.
+    Returns one row: volume_id, library_id, object_id.
+    """
+    detail = TYPE_DETAIL_TABLES.get(object_type)
+    name = f"dbio_upsert_{object_type.lower() if detail else 'object'}{'_ids' if cached_ids else ''}"
+    
+    if cached_ids:
+        ctes = []
+        object_ids = "$1, $2"
+        next_param = 3
+    else:
+        ctes = ["""vol AS (
+            INSERT INTO aspuser.volumes (volume_name, volume_path)
+            VALUES ($1, $2)
+            ON CONFLICT (volume_name) DO UPDATE SET volume_name = EXCLUDED.volume_name
+            RETURNING volume_id
+        )""", """lib AS (
+            INSERT INTO aspuser.libraries (volume_id, library_name, library_path)
+            VALUES ((SELECT volume_id FROM vol), $3, $4)
+            ON CONFLICT (volume_id, library_name) DO UPDATE SET library_name = EXCLUDED.library_name
+            RETURNING volume_id, library_id
+        )"""]
+        object_ids = "(SELECT volume_id FROM lib), (SELECT library_id FROM lib)"
+        next_param = 5
+    
+    object_params = ', '.join(f'${next_param + i}' for i in range(4))
+    ctes.append(f"""obj AS (
+            INSERT INTO aspuser.objects (volume_id, library_id, object_name, object_type, object_path, file_size)
+            VALUES ({object_ids}, {object_params})
+            ON CONFLICT (volume_id, library_id, object_name)
+            DO UPDATE SET
+                object_type = EXCLUDED.object_type,
+                object_path = EXCLUDED.object_path,
+                file_size = EXCLUDED.file_size,
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING volume_id, library_id, object_id
+        )""")
+    next_param += 4
+    
+    if detail:
+        table, columns = detail
+        column_names = [column for column, _, _ in columns]
+        detail_params = ', '.join(f'${next_param + i}' for i in range(len(column_names)))
+        updates = ', '.join(f'{column} = EXCLUDED.{column}' for column in column_names)
+        ctes.append(f"""detail AS (
+            INSERT INTO {table} (object_id, {', '.join(column_names)})
+            VALUES ((SELECT object_id FROM obj), {detail_params})
+            ON CONFLICT (object_id)
+            DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+        )""")
+    
+    return name, f"WITH {', '.join(ctes)}\n        SELECT volume_id, library_id, object_id FROM obj"
+
+# Indexes behind search_objects (also in database/catalog_search_indexes.sql)
+SEARCH_INDEX_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_objects_name_trgm "
+    "ON aspuser.objects USING gin (lower(object_name) gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_objects_name_prefix "
+    "ON aspuser.objects (lower(object_name) text_pattern_ops)",
+)
+
+
+def object_data_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Build catalog.json style attributes from an objects row joined with its detail tables."""
+    object_data = {
+        'TYPE': row['object_type'],
+        'CREATED': row['created_at'].isoformat() + 'Z' if row['created_at'] else None,
+        'UPDATED': row['updated_at'].isoformat() + 'Z' if row['updated_at'] else None,
+    }
+    
+    # Add type-specific attributes
+    if row['object_type'] == 'PGM':
+        if row['pgm_type']:
+            object_data['PGMTYPE'] = row['pgm_type']
+        if row['pgm_encoding']:
+            object_data['ENCODING'] = row['pgm_encoding']
+        if row['compile_date']:
+            object_data['COMPILED'] = row['compile_date'].isoformat() + 'Z'
+    
+    elif row['object_type'] == 'DATASET':
+        if row['rec_type']:
+            object_data['RECTYPE'] = row['rec_type']
+        if row['rec_len']:
+            object_data['RECLEN'] = row['rec_len']
+        if row['dataset_encoding']:
+            object_data['ENCODING'] = row['dataset_encoding']
+    
+    elif row['object_type'] == 'MAP':
+        if row['map_type']:
+            object_data['MAPTYPE'] = row['map_type']
+        if row['width']:
+            object_data['WIDTH'] = row['width']
+        if row['height']:
+            object_data['HEIGHT'] = row['height']
+    
+    elif row['object_type'] == 'COPYBOOK':
+        if row['copybook_type']:
+            object_data['COPYBOOKTYPE'] = row['copybook_type']
+        if row['copybook_encoding']:
+            object_data['ENCODING'] = row['copybook_encoding']
+    
+    elif row['object_type'] == 'JOB':
+        if row['job_type']:
+            object_data['JOBTYPE'] = row['job_type']
+        if row['schedule_info']:
+            object_data['SCHEDULE'] = row['schedule_info']
+    
+    elif row['object_type'] == 'LAYOUT':
+        if row['layout_type']:
+            object_data['LAYOUTTYPE'] = row['layout_type']
+        if row['layout_data']:
+            try:
+                object_data['LAYOUTDATA'] = json.loads(row['layout_data']) if isinstance(row['layout_data'], str) else row['layout_data']
+            except:
+                object_data['LAYOUTDATA'] = row['layout_data']
+    
+    # Add file size if available
+    if row['file_size']:
+        object_data['SIZE'] = row['file_size']
+    
+    return object_data
+
 
 class PostgreSQLBackend(BaseBackend, TransactionMixin):
     """PostgreSQL implementation for OpenASP catalog storage with new schema."""
     
+    MANAGES_TIMESTAMPS = True
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize PostgreSQL backend.
@@ -30,10 +191,30 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
         super().__init__(config)
         self.connection_pool = None
         self.current_connection = None
+        self._trigram_available: Optional[bool] = None  # pg_trgm installed (None: not checked yet)
+        self._library_ids: Dict[Tuple[str, str], Tuple[int, int]] = {}  # (volume, library) -> ids
+        self._prepared: Dict[int, Tuple[int, set]] = {}  # connection id -> (backend pid, statement names)
+        self.read_pools: List[ManagedConnectionPool] = []
+        self._connection_pools: Dict[int, ManagedConnectionPool] = {}  # id(conn) -> owning replica pool
+        self._replica_cycle = itertools.count()
+        self.replica_fallbacks = 0
         self._init_connection_pool()
+        if self.config.get('create_search_indexes', False):
+            # DDL at startup, never inside a user request; the indexes are
+            # normally created by database/catalog_search_indexes.sql
+            self.ensure_search_indexes()
     
     def _init_connection_pool(self):
-        """Initialize connection pool."""
+        """
+        Initialize the primary pool and optional read replica pools.
+        
+        Pool settings (config keys): pool_size + max_overflow (maximum
+        connections), min_connections (kept warm), pool_timeout (seconds to
+        wait for a free connection), max_connection_age, health_check_interval
+        (idle seconds before a liveness probe) and statement_timeout_ms.
+        replicas is a list of DSN strings or dicts overriding the primary
+        connection parameters.
+        """
         try:
             conn_params = {
                 'host': self.config.get('host', 'localhost'),
@@ -45,10 +226,19 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
             
             pool_size = self.config.get('pool_size', 10)
             max_overflow = self.config.get('max_overflow', 5)
+            pool_options = {
+                'timeout': self.config.get('pool_timeout', 30.0),
+                'max_age': self.config.get('max_connection_age', 1800.0),
+                'health_check_interval': self.config.get('health_check_interval', 30.0),
+                'statement_timeout_ms': self.config.get('statement_timeout_ms'),
+                'on_discard': self._forget_prepared,
+            }
             
-            self.connection_pool = psycopg2.pool.ThreadedConnectionPool(
-                minconn=1,
+            self.connection_pool = ManagedConnectionPool(
+                minconn=self.config.get('min_connections', min(2, pool_size)),
                 maxconn=pool_size + max_overflow,
+                name='primary',
+                **pool_options,
                 **conn_params
             )
             
@@ -57,25 +247,71 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
         except Exception as e:
             logger.error(f"Failed to initialize PostgreSQL pool: {e}")
             raise ConnectionError(f"Cannot connect to PostgreSQL: {str(e)}")
+        
+        for index, replica in enumerate(self.config.get('replicas') or []):
+            replica_params = {'dsn': replica} if isinstance(replica, str) else {**conn_params, **replica}
+            try:
+                self.read_pools.append(ManagedConnectionPool(
+                    minconn=self.config.get('replica_min_connections', 1),
+                    maxconn=self.config.get('replica_pool_size', pool_size),
+                    name=f'replica{index}',
+                    read_only=True,
+                    **{**pool_options, 'timeout': self.config.get('replica_pool_timeout', 1.0)},
+                    **replica_params
+                ))
+            except Exception as e:
+                # Reads fall back to the primary
+                logger.warning(f"Read replica {index} unavailable: {e}")
+        
+        if self.read_pools:
+            logger.info(f"Routing catalog reads to {len(self.read_pools)} PostgreSQL replica(s)")
     
-    def _get_connection(self):
-        """Get connection from pool."""
+    def _get_connection(self, read_only: bool = False):
+        """
+        Get connection from pool.
+        
+        read_only connections come from the replica pools (round robin) when
+        configured, except inside a transaction so reads see its writes.
+        """
         if self.current_connection:
             return self.current_connection
+        if read_only and self.read_pools:
+            for _ in range(len(self.read_pools)):
+                pool = self.read_pools[next(self._replica_cycle) % len(self.read_pools)]
+                try:
+                    conn = pool.getconn()
+                except Exception as e:
+                    self.replica_fallbacks += 1
+                    logger.warning(f"Read replica {pool.name} unavailable, trying next: {e}")
+                    continue
+                self._connection_pools[id(conn)] = pool
+                return conn
         return self.connection_pool.getconn()
     
     def _put_connection(self, conn):
         """Return connection to pool."""
         if self.current_connection:
             return  # Don't return transaction connections
-        self.connection_pool.putconn(conn)
+        self._connection_pools.pop(id(conn), self.connection_pool).putconn(conn)
+    
+    def _forget_prepared(self, conn):
+        """Drop prepared statement names of a connection closed by its pool."""
+        self._prepared.pop(id(conn), None)
+    
+    def get_pool_statistics(self) -> Dict[str, Any]:
+        """Wait time and saturation of the primary and replica pools."""
+        return {
+            'primary': self.connection_pool.get_stats() if self.connection_pool else None,
+            'replicas': [pool.get_stats() for pool in self.read_pools],
+            'replica_fallbacks': self.replica_fallbacks
+        }
     
     def get_all_objects(self) -> Dict[str, Any]:
         """
         Get all objects in catalog.json format.
         Returns the hierarchical structure: {volume: {library: {object: {...}}}}
         """
-        conn = self._get_connection()
+        conn = self._get_connection(read_only=True)
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 # Get all objects with their hierarchical information
@@ -138,62 +374,7 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
                     if library_name not in catalog[volume_name]:
                         catalog[volume_name][library_name] = {}
                     
-                    # Build object data based on type
-                    object_data = {
-                        'TYPE': row['object_type'],
-                        'CREATED': row['created_at'].isoformat() + 'Z' if row['created_at'] else None,
-                        'UPDATED': row['updated_at'].isoformat() + 'Z' if row['updated_at'] else None,
-                    }
-                    
-                    # Add type-specific attributes
-                    if row['object_type'] == 'PGM':
-                        if row['pgm_type']:
-                            object_data['PGMTYPE'] = row['pgm_type']
-                        if row['pgm_encoding']:
-                            object_data['ENCODING'] = row['pgm_encoding']
-                        if row['compile_date']:
-                            object_data['COMPILED'] = row['compile_date'].isoformat() + 'Z'
-                    
-                    elif row['object_type'] == 'DATASET':
-                        if row['rec_type']:
-                            object_data['RECTYPE'] = row['rec_type']
-                        if row['rec_len']:
-                            object_data['RECLEN'] = row['rec_len']
-                        if row['dataset_encoding']:
-                            object_data['ENCODING'] = row['dataset_encoding']
-                    
-                    elif row['object_type'] == 'MAP':
-                        if row['map_type']:
-                            object_data['MAPTYPE'] = row['map_type']
-                        if row['width']:
-                            object_data['WIDTH'] = row['width']
-                        if row['height']:
-                            object_data['HEIGHT'] = row['height']
-                    
-                    elif row['object_type'] == 'COPYBOOK':
-                        if row['copybook_type']:
-                            object_data['COPYBOOKTYPE'] = row['copybook_type']
-                        if row['copybook_encoding']:
-                            object_data['ENCODING'] = row['copybook_encoding']
-                    
-                    elif row['object_type'] == 'JOB':
-                        if row['job_type']:
-                            object_data['JOBTYPE'] = row['job_type']
-                        if row['schedule_info']:
-                            object_data['SCHEDULE'] = row['schedule_info']
-                    
-                    elif row['object_type'] == 'LAYOUT':
-                        if row['layout_type']:
-                            object_data['LAYOUTTYPE'] = row['layout_type']
-                        if row['layout_data']:
-                            try:
-                                object_data['LAYOUTDATA'] = json.loads(row['layout_data']) if isinstance(row['layout_data'], str) else row['layout_data']
-                            except:
-                                object_data['LAYOUTDATA'] = row['layout_data']
-                    
-                    # Add file size if available
-                    if row['file_size']:
-                        object_data['SIZE'] = row['file_size']
+                    object_data = object_data_from_row(row)
                     
                     catalog[volume_name][library_name][object_name] = object_data
                 
@@ -207,7 +388,7 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
     
     def get_object(self, volume: str, library: str, object_name: str) -> Optional[Dict[str, Any]]:
         """Get a specific object with all its attributes."""
-        conn = self._get_connection()
+        conn = self._get_connection(read_only=True)
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute("""
@@ -253,64 +434,7 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
                 if not row:
                     return None
                 
-                # Build object data
-                object_data = {
-                    'TYPE': row['object_type'],
-                    'CREATED': row['created_at'].isoformat() + 'Z' if row['created_at'] else None,
-                    'UPDATED': row['updated_at'].isoformat() + 'Z' if row['updated_at'] else None,
-                }
-                
-                # Add type-specific attributes (same logic as get_all_objects)
-                if row['object_type'] == 'PGM':
-                    if row['pgm_type']:
-                        object_data['PGMTYPE'] = row['pgm_type']
-                    if row['pgm_encoding']:
-                        object_data['ENCODING'] = row['pgm_encoding']
-                    if row['compile_date']:
-                        object_data['COMPILED'] = row['compile_date'].isoformat() + 'Z'
-                
-                elif row['object_type'] == 'DATASET':
-                    if row['rec_type']:
-                        object_data['RECTYPE'] = row['rec_type']
-                    if row['rec_len']:
-                        object_data['RECLEN'] = row['rec_len']
-                    if row['dataset_encoding']:
-                        object_data['ENCODING'] = row['dataset_encoding']
-                
-                elif row['object_type'] == 'MAP':
-                    if row['map_type']:
-                        object_data['MAPTYPE'] = row['map_type']
-                    if row['width']:
-                        object_data['WIDTH'] = row['width']
-                    if row['height']:
-                        object_data['HEIGHT'] = row['height']
-                
-                elif row['object_type'] == 'COPYBOOK':
-                    if row['copybook_type']:
-                        object_data['COPYBOOKTYPE'] = row['copybook_type']
-                    if row['copybook_encoding']:
-                        object_data['ENCODING'] = row['copybook_encoding']
-                
-                elif row['object_type'] == 'JOB':
-                    if row['job_type']:
-                        object_data['JOBTYPE'] = row['job_type']
-                    if row['schedule_info']:
-                        object_data['SCHEDULE'] = row['schedule_info']
-                
-                elif row['object_type'] == 'LAYOUT':
-                    if row['layout_type']:
-                        object_data['LAYOUTTYPE'] = row['layout_type']
-                    if row['layout_data']:
-                        try:
-                            object_data['LAYOUTDATA'] = json.loads(row['layout_data']) if isinstance(row['layout_data'], str) else row['layout_data']
-                        except:
-                            object_data['LAYOUTDATA'] = row['layout_data']
-                
-                # Add file size if available
-                if row['file_size']:
-                    object_data['SIZE'] = row['file_size']
-                
-                return object_data
+                return object_data_from_row(row)
                 
         except Exception as e:
             logger.error(f"Error getting object {volume}.{library}.{object_name}: {e}")
@@ -318,166 +442,109 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
         finally:
             self._put_connection(conn)
     
+    def _execute_prepared(self, cursor, name: str, sql: str, params: Tuple[Any, ...]):
+        """
+        EXECUTE a server-side prepared statement, preparing it on first use.
+        
+        Prepared names are tracked per connection (object id + backend pid,
+        so a reconnected pool slot prepares again) and dropped when the pool
+        closes the connection. The PREPARE is sent in the same round trip as
+        the first EXECUTE; inside a transaction it runs under a savepoint so
+        a duplicate statement (42P05) does not abort the transaction.
+        """
+        conn = cursor.connection
+        pid = conn.get_backend_pid()
+        entry = self._prepared.get(id(conn))
+        if entry is None or entry[0] != pid:
+            entry = self._prepared[id(conn)] = (pid, set())
+        prepared = entry[1]
+        execute = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})"
+        
+        if name in prepared:
+            cursor.execute(execute, params)
+            return
+        savepoint = not conn.autocommit
+        try:
+            if savepoint:
+                cursor.execute(f"SAVEPOINT dbio_prepare;\nPREPARE {name} AS {sql};\n"
+                               f"RELEASE SAVEPOINT dbio_prepare;\n{execute}", params)
+            else:
+                cursor.execute(f"PREPARE {name} AS {sql};\n{execute}", params)
+        except psycopg2.Error as e:
+            if e.pgcode != DUPLICATE_PREPARED_STATEMENT:
+                raise
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT dbio_prepare;\nRELEASE SAVEPOINT dbio_prepare")
+            cursor.execute(execute, params)
+        prepared.add(name)
+    
+    def _upsert_object(self, cursor, volume: str, library: str, object_name: str,
+                       attributes: Dict[str, Any], ids: Optional[Tuple[int, int]]) -> Tuple[int, int, int]:
+        """Run the single-statement upsert; returns (volume_id, library_id, object_id)."""
+        object_type = attributes.get('TYPE', 'DATASET')
+        name, sql = object_upsert_statement(object_type, cached_ids=ids is not None)
+        
+        detail_values = []
+        if object_type in TYPE_DETAIL_TABLES:
+            _, columns = TYPE_DETAIL_TABLES[object_type]
+            detail_values = [attributes.get(attribute, default) for _, attribute, default in columns]
+            if object_type == 'LAYOUT':
+                detail_values[-1] = json.dumps(detail_values[-1])
+        
+        object_values = [object_name, object_type, f'/volume/{volume}/{library}/{object_name}',
+                         attributes.get('SIZE', 0)]
+        if ids is not None:
+            params = (*ids, *object_values, *detail_values)
+        else:
+            params = (volume, f'/volume/{volume}', library, f'/volume/{volume}/{library}',
+                      *object_values, *detail_values)
+        
+        self._execute_prepared(cursor, name, sql, params)
+        return cursor.fetchone()
+    
     def update_object(self, volume: str, library: str, object_name: str, 
                      attributes: Dict[str, Any]) -> bool:
-        """Update or create an object."""
+        """
+        Update or create an object.
+        
+        One prepared CTE statement upserts the volume, library, object and
+        type-specific row. volume_id/library_id are cached per library so
+        later writes skip the volume and library upserts.
+        """
         conn = self._get_connection()
+        owns_transaction = not self.current_connection
+        previous_autocommit = conn.autocommit
         try:
+            # A single statement is atomic on its own, so no BEGIN/COMMIT round trips
+            if owns_transaction:
+                conn.autocommit = True
+            
             with conn.cursor() as cursor:
-                object_type = attributes.get('TYPE', 'DATASET')
-                
-                # Begin transaction if not already in one
-                if not self.current_connection:
-                    cursor.execute("BEGIN")
-                
-                # Get or create volume
-                cursor.execute("""
-                    INSERT INTO aspuser.volumes (volume_name, volume_path)
-                    VALUES (%s, %s)
-                    ON CONFLICT (volume_name) DO NOTHING
-                    RETURNING volume_id
-                """, (volume, f'/volume/{volume}'))
-                
-                result = cursor.fetchone()
-                if not result:
-                    cursor.execute("SELECT volume_id FROM aspuser.volumes WHERE volume_name = %s", (volume,))
-                    result = cursor.fetchone()
-                volume_id = result[0]
-                
-                # Get or create library
-                cursor.execute("""
-                    INSERT INTO aspuser.libraries (volume_id, library_name, library_path)
-                    VALUES (%s, %s, %s)
-                    ON CONFLICT (volume_id, library_name) DO NOTHING
-                    RETURNING library_id
-                """, (volume_id, library, f'/volume/{volume}/{library}'))
-                
-                result = cursor.fetchone()
-                if not result:
-                    cursor.execute("SELECT library_id FROM aspuser.libraries WHERE volume_id = %s AND library_name = %s", (volume_id, library))
-                    result = cursor.fetchone()
-                library_id = result[0]
-                
-                # Update or insert object
-                object_path = f'/volume/{volume}/{library}/{object_name}'
-                file_size = attributes.get('SIZE', 0)
-                
-                cursor.execute("""
-                    INSERT INTO aspuser.objects (volume_id, library_id, object_name, object_type, object_path, file_size)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (volume_id, library_id, object_name) 
-                    DO UPDATE SET 
-                        object_type = EXCLUDED.object_type,
-                        object_path = EXCLUDED.object_path,
-                        file_size = EXCLUDED.file_size,
-                        updated_at = CURRENT_TIMESTAMP
-                    RETURNING object_id
-                """, (volume_id, library_id, object_name, object_type, object_path, file_size))
-                
-                object_id = cursor.fetchone()[0]
-                
-                # Handle type-specific attributes
-                if object_type == 'PGM':
-                    pgm_type = attributes.get('PGMTYPE', 'UNKNOWN')
-                    encoding = attributes.get('ENCODING', 'UTF-8')
-                    
-                    cursor.execute("""
-                        INSERT INTO aspuser.programs (object_id, pgm_type, encoding)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (object_id) 
-                        DO UPDATE SET 
-                            pgm_type = EXCLUDED.pgm_type,
-                            encoding = EXCLUDED.encoding,
-                            updated_at = CURRENT_TIMESTAMP
-                    """, (object_id, pgm_type, encoding))
-                
-                elif object_type == 'DATASET':
-                    rec_type = attributes.get('RECTYPE', 'FB')
-                    rec_len = attributes.get('RECLEN', 80)
-                    encoding = attributes.get('ENCODING', 'UTF-8')
-                    
-                    cursor.execute("""
-                        INSERT INTO aspuser.datasets (object_id, rec_type, rec_len, encoding)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT (object_id) 
-                        DO UPDATE SET 
-                            rec_type = EXCLUDED.rec_type,
-                            rec_len = EXCLUDED.rec_len,
-                            encoding = EXCLUDED.encoding,
-                            updated_at = CURRENT_TIMESTAMP
-                    """, (object_id, rec_type, rec_len, encoding))
-                
-                elif object_type == 'MAP':
-                    map_type = attributes.get('MAPTYPE', 'SMED')
-                    width = attributes.get('WIDTH', 0)
-                    height = attributes.get('HEIGHT', 0)
-                    
-                    cursor.execute("""
-                        INSERT INTO aspuser.maps (object_id, map_type, width, height)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT (object_id) 
-                        DO UPDATE SET 
-                            map_type = EXCLUDED.map_type,
-                            width = EXCLUDED.width,
-                            height = EXCLUDED.height,
-                            updated_at = CURRENT_TIMESTAMP
-                    """, (object_id, map_type, width, height))
-                
-                elif object_type == 'COPYBOOK':
-                    copybook_type = attributes.get('COPYBOOKTYPE', 'COBOL')
-                    encoding = attributes.get('ENCODING', 'UTF-8')
-                    
-                    cursor.execute("""
-                        INSERT INTO aspuser.copybooks (object_id, copybook_type, encoding)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (object_id) 
-                        DO UPDATE SET 
-                            copybook_type = EXCLUDED.copybook_type,
-                            encoding = EXCLUDED.encoding,
-                            updated_at = CURRENT_TIMESTAMP
-                    """, (object_id, copybook_type, encoding))
-                
-                elif object_type == 'JOB':
-                    job_type = attributes.get('JOBTYPE', 'BATCH')
-                    schedule_info = attributes.get('SCHEDULE', '')
-                    
-                    cursor.execute("""
-                        INSERT INTO aspuser.jobs (object_id, job_type, schedule_info)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (object_id) 
-                        DO UPDATE SET 
-                            job_type = EXCLUDED.job_type,
-                            schedule_info = EXCLUDED.schedule_info,
-                            updated_at = CURRENT_TIMESTAMP
-                    """, (object_id, job_type, schedule_info))
-                
-                elif object_type == 'LAYOUT':
-                    layout_type = attributes.get('LAYOUTTYPE', 'SCREEN')
-                    layout_data = json.dumps(attributes.get('LAYOUTDATA', {}))
-                    
-                    cursor.execute("""
-                        INSERT INTO aspuser.layouts (object_id, layout_type, layout_data)
-                        VALUES (%s, %s, %s)
-                        ON CONFLICT (object_id) 
-                        DO UPDATE SET 
-                            layout_type = EXCLUDED.layout_type,
-                            layout_data = EXCLUDED.layout_data,
-                            updated_at = CURRENT_TIMESTAMP
-                    """, (object_id, layout_type, layout_data))
-                
-                # Commit transaction if we started it
-                if not self.current_connection:
-                    cursor.execute("COMMIT")
-                
-                logger.debug(f"Updated object {volume}.{library}.{object_name}")
-                return True
-                
+                library_key = (volume, library)
+                ids = self._library_ids.get(library_key)
+                try:
+                    volume_id, library_id, _ = self._upsert_object(cursor, volume, library, object_name,
+                                                                   attributes, ids)
+                except psycopg2.Error as e:
+                    if ids is None or e.pgcode != FOREIGN_KEY_VIOLATION:
+                        raise
+                    # Library was removed since its ids were cached
+                    self._library_ids.pop(library_key, None)
+                    if not owns_transaction:
+                        raise
+                    volume_id, library_id, _ = self._upsert_object(cursor, volume, library, object_name,
+                                                                   attributes, None)
+                self._library_ids[library_key] = (volume_id, library_id)
+            
+            logger.debug(f"Updated object {volume}.{library}.{object_name}")
+            return True
+            
         except Exception as e:
-            if not self.current_connection:
-                cursor.execute("ROLLBACK")
             logger.error(f"Error updating object {volume}.{library}.{object_name}: {e}")
             raise
         finally:
+            if owns_transaction:
+                conn.autocommit = previous_autocommit
             self._put_connection(conn)
     
     def delete_object(self, volume: str, library: str, object_name: str) -> bool:
@@ -514,7 +581,7 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
                      sort: Optional[List[tuple]] = None,
                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Query objects with filters and sorting."""
-        conn = self._get_connection()
+        conn = self._get_connection(read_only=True)
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 query = """
@@ -568,28 +635,218 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
         finally:
             self._put_connection(conn)
     
-    def search_objects(self, query: str, object_type: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Full-text search across objects."""
-        conn = self._get_connection()
+    def iter_objects(self, filters: Optional[Dict[str, Any]] = None,
+                     order: str = 'ASC', page_size: int = 500,
+                     after: Optional[ObjectKey] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream objects through a server-side (named) cursor.
+        
+        Rows are fetched page_size at a time in (volume, library, object)
+        order, resuming behind the 'after' key with a row-value comparison
+        so no OFFSET scan is needed. The pooled connection is held until the
+        generator is exhausted or closed.
+        """
+        descending = order.upper() == 'DESC'
+        direction = 'DESC' if descending else 'ASC'
+        conditions = []
+        params: List[Any] = []
+        attribute_filters = {}
+        
+        for key, value in (filters or {}).items():
+            if key == 'object_type':
+                conditions.append("o.object_type = %s")
+                params.append(value)
+            elif key == 'volume':
+                conditions.append("v.volume_name = %s")
+                params.append(value)
+            elif key == 'library':
+                conditions.append("l.library_name = %s")
+                params.append(value)
+            elif key == 'updated_since':
+                conditions.append("o.updated_at > %s")
+                params.append(value)
+            else:
+                attribute_filters[key] = value
+        
+        if after is not None:
+            comparison = '<' if descending else '>'
+            conditions.append(f"(v.volume_name, l.library_name, o.object_name) {comparison} (%s, %s, %s)")
+            params.extend(after)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = f"""
+            SELECT 
+                v.volume_name,
+                l.library_name,
+                o.object_name,
+                o.object_type,
+                o.file_size,
+                o.created_at,
+                o.updated_at,
+                p.pgm_type,
+                p.encoding as pgm_encoding,
+                p.compile_date,
+                d.rec_type,
+                d.rec_len,
+                d.encoding as dataset_encoding,
+                m.map_type,
+                m.width,
+                m.height,
+                cb.copybook_type,
+                cb.encoding as copybook_encoding,
+                j.job_type,
+                j.schedule_info,
+                lay.layout_type,
+                lay.layout_data
+            FROM aspuser.objects o
+            JOIN aspuser.libraries l ON o.library_id = l.library_id
+            JOIN aspuser.volumes v ON o.volume_id = v.volume_id
+            LEFT JOIN aspuser.programs p ON o.object_id = p.object_id
+            LEFT JOIN aspuser.datasets d ON o.object_id = d.object_id
+            LEFT JOIN aspuser.maps m ON o.object_id = m.object_id
+            LEFT JOIN aspuser.copybooks cb ON o.object_id = cb.object_id
+            LEFT JOIN aspuser.jobs j ON o.object_id = j.object_id
+            LEFT JOIN aspuser.layouts lay ON o.object_id = lay.object_id
+            {where}
+            ORDER BY v.volume_name {direction}, l.library_name {direction}, o.object_name {direction}
+        """
+        
+        conn = self._get_connection(read_only=True)
+        owns_transaction = not self.current_connection
+        previous_autocommit = conn.autocommit
+        try:
+            # Named cursors only live inside a transaction
+            if owns_transaction:
+                conn.autocommit = False
+            
+            with conn.cursor(name=f'dbio_iter_{uuid.uuid4().hex}', cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = page_size
+                cursor.execute(query, params)
+                
+                for row in cursor:
+                    key = (row['volume_name'], row['library_name'], row['object_name'])
+                    object_data = object_data_from_row(row)
+                    if attribute_filters and not matches_filters(key, object_data, attribute_filters):
+                        continue
+                    yield {
+                        'volume_name': key[0],
+                        'library_name': key[1],
+                        'object_name': key[2],
+                        'attributes': object_data
+                    }
+                    
+        except Exception as e:
+            logger.error(f"Error iterating objects: {e}")
+            raise
+        finally:
+            if owns_transaction:
+                try:
+                    conn.rollback()  # read-only, just ends the cursor transaction
+                finally:
+                    conn.autocommit = previous_autocommit
+            self._put_connection(conn)
+    
+    def ensure_search_indexes(self) -> bool:
+        """
+        Create the pg_trgm extension and name indexes used by search_objects (idempotent).
+        
+        Runs at startup when create_search_indexes is set. The indexes are built
+        CONCURRENTLY so catalog writes are not blocked; the extension needs a
+        role allowed to create it.
+        """
+        conn = self.connection_pool.getconn()
+        previous_autocommit = conn.autocommit
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                for statement in SEARCH_INDEX_DDL:
+                    cursor.execute(statement)
+            self._trigram_available = True
+            logger.info("Catalog search indexes ready")
+            return True
+        except Exception as e:
+            logger.warning(f"Could not create catalog search indexes, search will scan: {e}")
+            return False
+        finally:
+            conn.autocommit = previous_autocommit
+            self.connection_pool.putconn(conn)
+    
+    def _check_trigram(self) -> bool:
+        """Whether pg_trgm is installed (ranks search results by similarity)."""
+        conn = self._get_connection(read_only=True)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                self._trigram_available = cursor.fetchone() is not None
+        except Exception as e:
+            logger.warning(f"Could not check for pg_trgm, ranking without similarity: {e}")
+            self._trigram_available = False
+        finally:
+            self._put_connection(conn)
+        if not self._trigram_available:
+            logger.warning("pg_trgm not installed, catalog search will scan; "
+                           "see database/catalog_search_indexes.sql")
+        return self._trigram_available
+    
+    def search_objects(self, query: str, object_type: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Indexed search on object names.
+        
+        The LIKE pattern is served by the trigram GIN index (contains and
+        wildcard queries) or the text_pattern_ops index (prefix queries);
+        results are ranked exact > prefix > substring, then by similarity.
+        """
+        if self._trigram_available is None:
+            self._check_trigram()
+        
+        search = SearchQuery(query)
+        prefix_pattern = None
+        if search.segments and not search.text.startswith(('*', '?')):
+            prefix_pattern = SearchQuery(search.segments[0] + '*').like_pattern()
+        similarity = ("similarity(lower(o.object_name), %(text)s)" if self._trigram_available
+                      else "0")
+        
+        conn = self._get_connection(read_only=True)
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                sql = """
-                    SELECT v.volume_name, l.library_name, o.object_name, o.object_type
+                sql = f"""
+                    SELECT v.volume_name, l.library_name, o.object_name, o.object_type,
+                           1.0 + CASE
+                               WHEN lower(o.object_name) = %(text)s THEN 1.0
+                               WHEN %(prefix)s IS NOT NULL AND lower(o.object_name) LIKE %(prefix)s THEN 0.7
+                               ELSE 0.5
+                           END AS rank,
+                           {similarity} AS similarity
                     FROM aspuser.objects o
                     JOIN aspuser.libraries l ON o.library_id = l.library_id
                     JOIN aspuser.volumes v ON o.volume_id = v.volume_id
-                    WHERE o.object_name ILIKE %s
+                    WHERE lower(o.object_name) LIKE %(pattern)s
                 """
-                params = [f'%{query}%']
+                params = {
+                    'text': search.text,
+                    'prefix': prefix_pattern,
+                    'pattern': search.like_pattern()
+                }
                 
                 if object_type:
-                    sql += " AND o.object_type = %s"
-                    params.append(object_type)
+                    sql += " AND o.object_type = %(object_type)s"
+                    params['object_type'] = object_type
                 
-                sql += " ORDER BY o.object_name"
+                sql += " ORDER BY rank DESC, similarity DESC, v.volume_name, l.library_name, o.object_name"
+                
+                if limit:
+                    sql += " LIMIT %(limit)s"
+                    params['limit'] = limit
                 
                 cursor.execute(sql, params)
-                return [dict(row) for row in cursor.fetchall()]
+                results = []
+                for row in cursor.fetchall():
+                    result = dict(row)
+                    result['rank'] = float(result['rank'])
+                    result.pop('similarity', None)
+                    results.append(result)
+                return results
                 
         except Exception as e:
             logger.error(f"Error searching objects: {e}")
@@ -599,7 +856,7 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get backend statistics."""
-        conn = self._get_connection()
+        conn = self._get_connection(read_only=True)
         try:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 # Object counts by type
@@ -628,6 +885,7 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
                     'libraries': library_count,
                     'objects_by_type': object_counts,
                     'connection_pool_size': self.connection_pool.maxconn if self.connection_pool else 0,
+                    'connection_pools': self.get_pool_statistics(),
                     'timestamp': datetime.utcnow().isoformat()
                 }
                 
@@ -637,42 +895,167 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
         finally:
             self._put_connection(conn)
     
+    def _upsert_objects_batch(self, cursor, objects: Dict[ObjectKey, Dict[str, Any]],
+                              stats: Optional[Dict[str, int]] = None) -> int:
+        """
+        Set-based upsert of many objects on one cursor.
+
+        Volumes, libraries, objects and each type-specific table are written
+        with one multi-row statement per BULK_PAGE_SIZE rows instead of
+        several round trips per object.
+
+        Args:
+            cursor: Cursor of the connection holding the transaction
+            objects: {(volume, library, object_name): attributes}, one entry per key
+            stats: Optional dict whose 'created' / 'updated' counts are increased
+                   by the objects inserted / updated
+
+        Returns:
+            Number of objects written
+        """
+        if not objects:
+            return 0
+
+        # Volumes
+        volume_names = sorted({volume for volume, _, _ in objects})
+        execute_values(cursor, """
+            INSERT INTO aspuser.volumes (volume_name, volume_path)
+            VALUES %s
+            ON CONFLICT (volume_name) DO NOTHING
+        """, [(volume, f'/volume/{volume}') for volume in volume_names], page_size=BULK_PAGE_SIZE)
+        cursor.execute("SELECT volume_name, volume_id FROM aspuser.volumes WHERE volume_name = ANY(%s)",
+                       (volume_names,))
+        volume_ids = dict(cursor.fetchall())
+
+        # Libraries
+        library_keys = sorted({(volume, library) for volume, library, _ in objects})
+        execute_values(cursor, """
+            INSERT INTO aspuser.libraries (volume_id, library_name, library_path)
+            VALUES %s
+            ON CONFLICT (volume_id, library_name) DO NOTHING
+        """, [(volume_ids[volume], library, f'/volume/{volume}/{library}') for volume, library in library_keys],
+            page_size=BULK_PAGE_SIZE)
+        library_rows = execute_values(cursor, """
+            SELECT l.volume_id, l.library_name, l.library_id
+            FROM aspuser.libraries l
+            JOIN (VALUES %s) AS wanted (volume_id, library_name)
+              ON l.volume_id = wanted.volume_id AND l.library_name = wanted.library_name
+        """, [(volume_ids[volume], library) for volume, library in library_keys],
+            page_size=BULK_PAGE_SIZE, fetch=True)
+        library_ids = {(volume_id, library_name): library_id for volume_id, library_name, library_id in library_rows}
+
+        # Objects
+        entries = list(objects.items())
+        object_rows = []
+        for (volume, library, object_name), attributes in entries:
+            volume_id = volume_ids[volume]
+            object_rows.append((
+                volume_id, library_ids[(volume_id, library)], object_name,
+                attributes.get('TYPE', 'DATASET'),
+                f'/volume/{volume}/{library}/{object_name}',
+                attributes.get('SIZE', 0)
+            ))
+        returned = execute_values(cursor, """
+            INSERT INTO aspuser.objects (volume_id, library_id, object_name, object_type, object_path, file_size)
+            VALUES %s
+            ON CONFLICT (volume_id, library_id, object_name)
+            DO UPDATE SET
+                object_type = EXCLUDED.object_type,
+                object_path = EXCLUDED.object_path,
+                file_size = EXCLUDED.file_size,
+                updated_at = CURRENT_TIMESTAMP
+            RETURNING library_id, object_name, object_id, (xmax = 0) AS inserted
+        """, object_rows, page_size=BULK_PAGE_SIZE, fetch=True)
+        object_ids = {(library_id, object_name): object_id for library_id, object_name, object_id, _ in returned}
+        if stats is not None:
+            created = sum(1 for row in returned if row[3])
+            stats['created'] += created
+            stats['updated'] += len(returned) - created
+
+        # Type-specific attributes, one statement per detail table
+        detail_rows: Dict[str, List[tuple]] = {}
+        for (_, attributes), row in zip(entries, object_rows):
+            object_type = row[3]
+            if object_type not in TYPE_DETAIL_TABLES:
+                continue
+            _, columns = TYPE_DETAIL_TABLES[object_type]
+            values = [attributes.get(attribute, default) for _, attribute, default in columns]
+            if object_type == 'LAYOUT':
+                values[-1] = json.dumps(values[-1])
+            detail_rows.setdefault(object_type, []).append((object_ids[(row[1], row[2])], *values))
+
+        for object_type, rows in detail_rows.items():
+            table, columns = TYPE_DETAIL_TABLES[object_type]
+            column_names = [column for column, _, _ in columns]
+            updates = ',\n                '.join(f'{column} = EXCLUDED.{column}' for column in column_names)
+            execute_values(cursor, f"""
+                INSERT INTO {table} (object_id, {', '.join(column_names)})
+                VALUES %s
+                ON CONFLICT (object_id)
+                DO UPDATE SET
+                    {updates},
+                    updated_at = CURRENT_TIMESTAMP
+            """, rows, page_size=BULK_PAGE_SIZE)
+
+        return len(object_rows)
+
+    def _delete_objects_batch(self, cursor, keys: List[ObjectKey]) -> int:
+        """Set-based delete of many objects; returns the number of rows deleted."""
+        if not keys:
+            return 0
+        deleted = execute_values(cursor, """
+            DELETE FROM aspuser.objects o
+            USING aspuser.volumes v, aspuser.libraries l, (VALUES %s) AS doomed (volume_name, library_name, object_name)
+            WHERE v.volume_name = doomed.volume_name
+              AND l.volume_id = v.volume_id
+              AND l.library_name = doomed.library_name
+              AND o.volume_id = v.volume_id
+              AND o.library_id = l.library_id
+              AND o.object_name = doomed.object_name
+            RETURNING o.object_id
+        """, keys, page_size=BULK_PAGE_SIZE, fetch=True)
+        return len(deleted)
+
     def bulk_operations(self, operations: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Perform bulk operations."""
-        conn = self._get_connection()
+        """
+        Perform bulk operations.
+
+        Operations are collapsed to the last one per object and applied with
+        set-based statements in a single transaction on one connection.
+        'created' / 'updated' count objects inserted / changed, not operations.
+        """
         stats = {'created': 0, 'updated': 0, 'deleted': 0, 'errors': 0}
-        
+
+        # Last operation wins per object, as when applying them one by one
+        final_ops: Dict[ObjectKey, Optional[Dict[str, Any]]] = {}
+        for operation in operations:
+            op_type = operation.get('type')
+            key = (operation.get('volume'), operation.get('library'), operation.get('object_name'))
+            if not all(key) or op_type not in ('update', 'delete'):
+                logger.error(f"Invalid bulk operation: {operation}")
+                stats['errors'] += 1
+                continue
+            if op_type == 'update':
+                final_ops[key] = operation.get('attributes', {})
+            else:
+                final_ops[key] = None
+
+        upserts = {key: attributes for key, attributes in final_ops.items() if attributes is not None}
+        deletes = [key for key, attributes in final_ops.items() if attributes is None]
+
+        conn = self._get_connection()
         try:
             with conn.cursor() as cursor:
                 # Begin transaction for bulk operations
                 if not self.current_connection:
                     conn.autocommit = False
-                
-                for operation in operations:
-                    try:
-                        op_type = operation.get('type')
-                        volume = operation.get('volume')
-                        library = operation.get('library')
-                        object_name = operation.get('object_name')
-                        
-                        if op_type == 'update':
-                            attributes = operation.get('attributes', {})
-                            success = self.update_object(volume, library, object_name, attributes)
-                            if success:
-                                stats['updated'] += 1
-                            
-                        elif op_type == 'delete':
-                            success = self.delete_object(volume, library, object_name)
-                            if success:
-                                stats['deleted'] += 1
-                            
-                    except Exception as e:
-                        logger.error(f"Error in bulk operation: {e}")
-                        stats['errors'] += 1
-                
+
+                stats['deleted'] = self._delete_objects_batch(cursor, deletes)
+                self._upsert_objects_batch(cursor, upserts, stats)
+
                 if not self.current_connection:
                     conn.commit()
-                    
+
         except Exception as e:
             if not self.current_connection:
                 conn.rollback()
@@ -682,29 +1065,52 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
             if not self.current_connection:
                 conn.autocommit = True
             self._put_connection(conn)
-        
+
         return stats
-    
+
     def import_catalog(self, catalog_data: Dict[str, Any], merge: bool = False) -> Dict[str, Any]:
         """
         Import catalog data from dictionary.
-        
+
         Args:
             catalog_data: Complete catalog structure
             merge: If True, merge with existing; if False, replace
-            
+
         Returns:
             Import statistics
         """
-        conn = self._get_connection()
         stats = {'volumes': 0, 'libraries': 0, 'objects': 0, 'errors': 0}
-        
+
+        # Validate and flatten before touching the database
+        objects: Dict[ObjectKey, Dict[str, Any]] = {}
+        for volume_name, volume_data in catalog_data.items():
+            if not isinstance(volume_data, dict):
+                logger.error(f"Error importing volume {volume_name}: not a mapping")
+                stats['errors'] += 1
+                continue
+            stats['volumes'] += 1
+
+            for library_name, library_data in volume_data.items():
+                if not isinstance(library_data, dict):
+                    logger.error(f"Error importing library {library_name}: not a mapping")
+                    stats['errors'] += 1
+                    continue
+                stats['libraries'] += 1
+
+                for object_name, object_data in library_data.items():
+                    if not isinstance(object_data, dict):
+                        logger.error(f"Error importing object {object_name}: not a mapping")
+                        stats['errors'] += 1
+                        continue
+                    objects[(volume_name, library_name, object_name)] = object_data
+
+        conn = self._get_connection()
         try:
             with conn.cursor() as cursor:
                 # Begin transaction
                 if not self.current_connection:
-                    cursor.execute("BEGIN")
-                
+                    conn.autocommit = False
+
                 # Clear existing data if not merging
                 if not merge:
                     cursor.execute("DELETE FROM aspuser.layouts")
@@ -716,50 +1122,26 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
                     cursor.execute("DELETE FROM aspuser.objects")
                     cursor.execute("DELETE FROM aspuser.libraries")
                     cursor.execute("DELETE FROM aspuser.volumes")
-                
-                # Import data
-                for volume_name, volume_data in catalog_data.items():
-                    try:
-                        stats['volumes'] += 1
-                        
-                        for library_name, library_data in volume_data.items():
-                            try:
-                                stats['libraries'] += 1
-                                
-                                for object_name, object_data in library_data.items():
-                                    try:
-                                        success = self.update_object(volume_name, library_name, 
-                                                                   object_name, object_data)
-                                        if success:
-                                            stats['objects'] += 1
-                                        else:
-                                            stats['errors'] += 1
-                                    except Exception as e:
-                                        logger.error(f"Error importing object {object_name}: {e}")
-                                        stats['errors'] += 1
-                                        
-                            except Exception as e:
-                                logger.error(f"Error importing library {library_name}: {e}")
-                                stats['errors'] += 1
-                                
-                    except Exception as e:
-                        logger.error(f"Error importing volume {volume_name}: {e}")
-                        stats['errors'] += 1
-                
+                    self._library_ids.clear()
+
+                stats['objects'] = self._upsert_objects_batch(cursor, objects)
+
                 # Commit transaction if we started it
                 if not self.current_connection:
-                    cursor.execute("COMMIT")
-                
+                    conn.commit()
+
         except Exception as e:
             if not self.current_connection:
-                cursor.execute("ROLLBACK")
+                conn.rollback()
             logger.error(f"Error importing catalog: {e}")
             raise
         finally:
+            if not self.current_connection:
+                conn.autocommit = True
             self._put_connection(conn)
-        
+
         return stats
-    
+
     def health_check(self) -> Dict[str, Any]:
         """Check PostgreSQL backend health."""
         try:
@@ -777,6 +1159,7 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
                 'schema': 'aspuser',
                 'connection': 'ok',
                 'query_test': 'ok' if result else 'failed',
+                'pools': self.get_pool_statistics(),
                 'timestamp': datetime.utcnow().isoformat()
             }
             
@@ -829,6 +1212,9 @@ class PostgreSQLBackend(BaseBackend, TransactionMixin):
         if self.current_connection:
             self.rollback_transaction()
         
+        for pool in self.read_pools:
+            pool.closeall()
+        
         if self.connection_pool:
             self.connection_pool.closeall()
             logger.info("PostgreSQL connection pool closed")
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Managed PostgreSQL connection pool for DBIO
+
+Drop-in replacement for psycopg2's ThreadedConnectionPool (getconn /
+putconn / closeall) with warm minimum sizing, bounded waiting when the pool
+is exhausted, connection max-age, liveness checks on checkout, a session
+statement_timeout and wait/saturation statistics.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import psycopg2
+from psycopg2 import extensions
+
+from ..exceptions import ConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(ConnectionError):
+    """Raised when no connection became available within the pool timeout"""
+    pass
+
+
+class ManagedConnectionPool:
+    """
+    Thread-safe PostgreSQL connection pool.
+
+    Idle connections are reused LIFO so the warm set stays small and the
+    rest age out. A connection is replaced on checkout when it is older than
+    max_age, or when it has been idle longer than health_check_interval and
+    fails a 'SELECT 1' probe.
+    """
+
+    def __init__(self, minconn: int, maxconn: int, name: str = 'primary',
+                 timeout: float = 30.0, max_age: float = 1800.0,
+                 health_check_interval: float = 30.0,
+                 statement_timeout_ms: Optional[int] = None,
+                 read_only: bool = False, on_discard=None, **conn_params):
+        self.name = name
+        self.on_discard = on_discard  # called with each connection the pool closes
+        self.minconn = max(0, min(minconn, maxconn))
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        self.conn_params = dict(conn_params)
+
+        options = []
+        if statement_timeout_ms:
+            options.append(f"-c statement_timeout={int(statement_timeout_ms)}")
+        if read_only:
+            options.append("-c default_transaction_read_only=on")
+        if options:
+            self.conn_params['options'] = ' '.join(filter(None, [self.conn_params.get('options'), *options]))
+
+        self.cond = threading.Condition()
+        self.idle: List[Any] = []  # connections ready for checkout (LIFO)
+        self.in_use: Dict[int, Any] = {}  # id(conn) -> conn
+        self.created_at: Dict[int, float] = {}  # id(conn) -> monotonic creation time
+        self.returned_at: Dict[int, float] = {}  # id(conn) -> monotonic time of last putconn
+        self.opening = 0  # connections being opened outside the lock
+        self.probing = 0  # idle connections checked out for the age/liveness check
+        self.closed = False
+
+        self.stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time_ms_total': 0.0,
+            'wait_time_ms_max': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'closed_max_age': 0,
+            'closed_unhealthy': 0,
+            'health_checks': 0,
+            'peak_in_use': 0
+        }
+
+        # Warm minimum: fail fast on bad credentials like ThreadedConnectionPool
+        for _ in range(self.minconn):
+            conn = self._connect()
+            self.idle.append(conn)
+
+    @property
+    def size(self) -> int:
+        return len(self.idle) + len(self.in_use) + self.opening + self.probing
+
+    def _connect(self):
+        conn = psycopg2.connect(**self.conn_params)
+        now = time.monotonic()
+        self.created_at[id(conn)] = now
+        self.returned_at[id(conn)] = now
+        self.stats['created'] += 1
+        return conn
+
+    def _discard(self, conn):
+        self.created_at.pop(id(conn), None)
+        self.returned_at.pop(id(conn), None)
+        if self.on_discard:
+            self.on_discard(conn)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def getconn(self, timeout: Optional[float] = None):
+        """
+        Check out a connection, waiting up to timeout seconds when the pool
+        is exhausted.
+
+        Raises:
+            PoolTimeoutError: No connection became available in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        while True:
+            with self.cond:
+                if self.closed:
+                    raise ConnectionError(f"Connection pool '{self.name}' is closed")
+                while not self.idle and self.size >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats['timeouts'] += 1
+                        raise PoolTimeoutError(
+                            f"Timed out after {timeout:.1f}s waiting for a '{self.name}' connection "
+                            f"({len(self.in_use)}/{self.maxconn} in use)")
+                    waited = True
+                    self.cond.wait(remaining)
+                    if self.closed:
+                        raise ConnectionError(f"Connection pool '{self.name}' is closed")
+
+                conn = self.idle.pop() if self.idle else None
+                if conn is None:
+                    self.opening += 1
+                else:
+                    self.probing += 1
+
+            # The connection stays counted in opening/probing until it is
+            # in in_use, so concurrent checkouts never exceed maxconn
+            fresh = conn is None
+            try:
+                usable = True if fresh else self._usable(conn)
+                if fresh:
+                    conn = self._connect()
+            except Exception:
+                with self.cond:
+                    if fresh:
+                        self.opening -= 1
+                    else:
+                        self.probing -= 1
+                    self.cond.notify()
+                raise
+
+            with self.cond:
+                if fresh:
+                    self.opening -= 1
+                else:
+                    self.probing -= 1
+                if not usable:
+                    self.cond.notify()
+                    continue
+                if self.closed:
+                    self._discard(conn)
+                    raise ConnectionError(f"Connection pool '{self.name}' is closed")
+                self.in_use[id(conn)] = conn
+                self.stats['checkouts'] += 1
+                self.stats['peak_in_use'] = max(self.stats['peak_in_use'], len(self.in_use))
+                if waited:
+                    wait_ms = (time.monotonic() - started) * 1000
+                    self.stats['waits'] += 1
+                    self.stats['wait_time_ms_total'] += wait_ms
+                    self.stats['wait_time_ms_max'] = max(self.stats['wait_time_ms_max'], wait_ms)
+            return conn
+
+    def _usable(self, conn) -> bool:
+        """Age and liveness check of an idle connection (discarded when unusable)."""
+        now = time.monotonic()
+        if conn.closed:
+            self.stats['closed_unhealthy'] += 1
+            self._discard(conn)
+            return False
+        if self.max_age and now - self.created_at.get(id(conn), now) > self.max_age:
+            self.stats['closed_max_age'] += 1
+            self._discard(conn)
+            return False
+        if self.health_check_interval is not None and \
+                now - self.returned_at.get(id(conn), now) > self.health_check_interval:
+            self.stats['health_checks'] += 1
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                if not conn.autocommit:
+                    conn.rollback()
+            except Exception as e:
+                logger.warning(f"Discarding dead '{self.name}' connection: {e}")
+                self.stats['closed_unhealthy'] += 1
+                self._discard(conn)
+                return False
+        return True
+
+    def putconn(self, conn, close: bool = False):
+        """Return a connection; broken or mid-transaction connections are cleaned up."""
+        with self.cond:
+            self.in_use.pop(id(conn), None)
+
+        if not close and not conn.closed:
+            try:
+                status = conn.info.transaction_status
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    close = True
+                elif status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                close = True
+
+        with self.cond:
+            if close or conn.closed or self.closed:
+                self._discard(conn)
+            else:
+                self.returned_at[id(conn)] = time.monotonic()
+                self.idle.append(conn)
+            self.cond.notify()
+
+    def closeall(self):
+        with self.cond:
+            self.closed = True
+            for conn in self.idle + list(self.in_use.values()):
+                self._discard(conn)
+            self.idle.clear()
+            self.in_use.clear()
+            self.cond.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool sizing, wait time and saturation for capacity planning."""
+        with self.cond:
+            stats = self.stats.copy()
+            in_use = len(self.in_use)
+            stats.update({
+                'name': self.name,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': in_use,
+                'probing': self.probing,
+                'minconn': self.minconn,
+                'maxconn': self.maxconn,
+                'saturation': round(in_use / self.maxconn, 3) if self.maxconn else 0.0,
+                'wait_time_ms_avg': round(stats['wait_time_ms_total'] / stats['waits'], 3) if stats['waits'] else 0.0
+            })
+            stats['wait_time_ms_total'] = round(stats['wait_time_ms_total'], 3)
+            stats['wait_time_ms_max'] = round(stats['wait_time_ms_max'], 3)
+            return stats
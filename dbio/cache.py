@@ -1,41 +1,156 @@
 """
-Cache Manager for DBIO - Redis-based caching layer
+Cache Manager for DBIO - two-tier caching layer
+
+Tier 1 is a bounded in-process LRU/TTL cache holding already-deserialized
+objects. Tier 2 is Redis (optional). Keys are versioned per namespace and per
+volume/library scope so invalidation is a single version bump instead of a
+KEYS scan; version bumps are broadcast over Redis pub/sub so every process
+drops its stale local entries.
 """
 
 import json
+import time
+import uuid
 import logging
-import redis
-from typing import Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
 from datetime import datetime
 
+try:
+    import redis
+except ImportError:
+    redis = None
+
 from .exceptions import CacheError
 
 logger = logging.getLogger(__name__)
 
+VERSIONS_HASH = 'dbio:cache:versions'
+INVALIDATION_CHANNEL = 'dbio:cache:invalidate'
+GLOBAL_VERSION = '*'
+
+
+class LocalCache:
+    """Thread-safe in-process LRU cache with per-entry TTL."""
+
+    def __init__(self, max_entries: int = 1000, default_ttl: float = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.entries: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'deletes': 0
+        }
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value)."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return False, None
+            if entry[0] <= time.monotonic():
+                del self.entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return True, entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self.lock:
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            self.stats['sets'] += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def delete(self, key: str) -> bool:
+        with self.lock:
+            if self.entries.pop(key, None) is None:
+                return False
+            self.stats['deletes'] += 1
+            return True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def get_statistics(self) -> dict:
+        with self.lock:
+            stats = self.stats.copy()
+            stats['entries'] = len(self.entries)
+            stats['max_entries'] = self.max_entries
+        total = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round((stats['hits'] / total) * 100, 2) if total else 0.0
+        return stats
+
 
 class CacheManager:
-    """Redis-based caching layer for catalog operations."""
-    
+    """
+    Two-tier caching layer for catalog operations.
+
+    Configuration:
+        type: 'memory' (local tier only), 'redis' or 'tiered' (default)
+        ttl / default_ttl: Default TTL in seconds
+        max_size / local_max_entries: Local tier size
+        local_ttl: Upper bound for local entries (bounds staleness when
+            pub/sub messages are missed)
+        redis: Redis connection settings
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
     def __init__(self, config: dict):
         """
         Initialize cache manager.
-        
+
         Args:
             config: Cache configuration
         """
         self.config = config
         self.redis_client = None
-        self.default_ttl = config.get('ttl', 300)  # 5 minutes default
+        self.default_ttl = config.get('ttl', config.get('default_ttl', 300))  # 5 minutes default
+        self.local_ttl = config.get('local_ttl', self.default_ttl)
         self.enabled = config.get('enabled', True)
-        
-        if self.enabled:
+        self.cache_type = config.get('type', 'tiered')
+        self.channel = config.get('channel', INVALIDATION_CHANNEL)
+        self.instance_id = uuid.uuid4().hex
+
+        self.local = LocalCache(config.get('local_max_entries', config.get('max_size', 1000)), self.local_ttl)
+        self.versions: Dict[str, int] = {}  # namespace / scope -> version
+        self.versions_lock = threading.Lock()
+        self.pubsub_thread = None
+        self.stopped = threading.Event()
+        self.stats = {
+            'redis_hits': 0,
+            'redis_misses': 0,
+            'redis_errors': 0,
+            'invalidations': 0,
+            'remote_invalidations': 0
+        }
+
+        if self.enabled and self.cache_type != 'memory':
             self._init_redis()
-    
+
     def _init_redis(self):
-        """Initialize Redis connection."""
+        """Initialize Redis connection and the invalidation subscriber."""
+        if redis is None:
+            logger.warning("redis package not installed, using local cache tier only")
+            return
+
         try:
             redis_config = self.config.get('redis', {})
-            
+
             self.redis_client = redis.Redis(
                 host=redis_config.get('host', 'localhost'),
                 port=redis_config.get('port', 6379),
@@ -45,192 +160,340 @@ class CacheManager:
                 decode_responses=True,
                 health_check_interval=30
             )
-            
+
             # Test connection
             self.redis_client.ping()
+            self._load_versions()
+            self.pubsub_thread = threading.Thread(target=self._listen, name='dbio-cache-invalidation', daemon=True)
+            self.pubsub_thread.start()
             logger.info("Redis cache initialized successfully")
-            
+
         except Exception as e:
-            logger.warning(f"Redis cache initialization failed: {e}")
-            self.enabled = False
+            logger.warning(f"Redis cache initialization failed, using local cache tier only: {e}")
             self.redis_client = None
-    
+
     def _serialize_value(self, value: Any) -> str:
         """Serialize value for Redis storage."""
         return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
-    
+
     def _deserialize_value(self, value: str) -> Any:
         """Deserialize value from Redis."""
         try:
             return json.loads(value)
         except (json.JSONDecodeError, TypeError):
             return value
-    
-    def get(self, key: str) -> Optional[Any]:
+
+    # ------------------------------------------------------------------
+    # Versioned keys
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _scope_names(scope) -> Tuple[str, ...]:
+        """Version names of a scope: volume or (volume, library)."""
+        if not scope:
+            return ()
+        if isinstance(scope, str):
+            return (f'vol:{scope}',)
+        volume, library = (tuple(scope) + (None,))[:2]
+        if library is None:
+            return (f'vol:{volume}',)
+        return (f'vol:{volume}', f'lib:{volume}/{library}')
+
+    def _physical_key(self, key: str, scope=None) -> str:
+        """Key including the versions of everything that can invalidate it."""
+        namespace = key.split(':', 1)[0]
+        names = (GLOBAL_VERSION, f'ns:{namespace}') + self._scope_names(scope)
+        versions = self.versions
+        return 'dbio:' + '.'.join(str(versions.get(name, 0)) for name in names) + ':' + key
+
+    def _bump(self, names: Iterable[str]):
+        """Advance versions locally and in Redis, then notify other processes."""
+        names = list(dict.fromkeys(names))
+        self.stats['invalidations'] += 1
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline()
+                for name in names:
+                    pipe.hincrby(VERSIONS_HASH, name, 1)
+                new_versions = dict(zip(names, pipe.execute()))
+                self._apply_versions(new_versions)
+                self.redis_client.publish(self.channel, json.dumps({
+                    'origin': self.instance_id,
+                    'versions': new_versions
+                }))
+                return
+            except Exception as e:
+                self.stats['redis_errors'] += 1
+                logger.warning(f"Cache version bump error for {names}: {e}")
+        with self.versions_lock:
+            for name in names:
+                self.versions[name] = self.versions.get(name, 0) + 1
+
+    def _apply_versions(self, new_versions: Dict[str, int]):
+        with self.versions_lock:
+            for name, version in new_versions.items():
+                if int(version) > self.versions.get(name, 0):
+                    self.versions[name] = int(version)
+
+    def _load_versions(self):
+        versions = self.redis_client.hgetall(VERSIONS_HASH) or {}
+        self._apply_versions({name: int(version) for name, version in versions.items()})
+
+    def _listen(self):
+        """Apply version bumps and deletes published by other processes."""
+        while not self.stopped.is_set():
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Catch up on bumps missed while disconnected
+                self._load_versions()
+                for message in pubsub.listen():
+                    if self.stopped.is_set():
+                        break
+                    try:
+                        payload = json.loads(message['data'])
+                    except (ValueError, TypeError, KeyError):
+                        continue
+                    if payload.get('origin') == self.instance_id:
+                        continue
+                    self.stats['remote_invalidations'] += 1
+                    if payload.get('versions'):
+                        self._apply_versions(payload['versions'])
+                    if payload.get('delete'):
+                        self.local.delete(payload['delete'])
+                pubsub.close()
+            except Exception as e:
+                if self.stopped.is_set():
+                    break
+                logger.warning(f"Cache invalidation subscriber error: {e}")
+                self.stopped.wait(5)
+
+    # ------------------------------------------------------------------
+    # Cache operations
+    # ------------------------------------------------------------------
+    def get(self, key: str, scope=None) -> Optional[Any]:
         """
         Get value from cache.
-        
+
         Args:
             key: Cache key
-            
+            scope: Volume name or (volume, library) the value belongs to
+
         Returns:
             Cached value or None if not found/cache disabled
         """
-        if not self.enabled or not self.redis_client:
+        if not self.enabled:
             return None
-        
-        try:
-            value = self.redis_client.get(key)
-            if value is not None:
-                return self._deserialize_value(value)
+
+        physical_key = self._physical_key(key, scope)
+        found, value = self.local.get(physical_key)
+        if found:
+            return value
+
+        if not self.redis_client:
             return None
-            
+
+        try:
+            raw = self.redis_client.get(physical_key)
+            if raw is None:
+                self.stats['redis_misses'] += 1
+                return None
+            self.stats['redis_hits'] += 1
+            value = self._deserialize_value(raw)
+            self.local.set(physical_key, value)
+            return value
+
         except Exception as e:
+            self.stats['redis_errors'] += 1
             logger.warning(f"Cache get error for key {key}: {e}")
             return None
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, scope=None) -> bool:
         """
         Set value in cache.
-        
+
         Args:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds (uses default if None)
-            
+            scope: Volume name or (volume, library) the value belongs to
+
         Returns:
             True if successful
         """
-        if not self.enabled or not self.redis_client:
+        if not self.enabled:
             return False
-        
+
+        ttl = ttl or self.default_ttl
+        physical_key = self._physical_key(key, scope)
+        self.local.set(physical_key, value, min(ttl, self.local_ttl))
+
+        if not self.redis_client:
+            return True
+
         try:
             serialized_value = self._serialize_value(value)
-            ttl = ttl or self.default_ttl
-            
-            result = self.redis_client.setex(key, ttl, serialized_value)
+            result = self.redis_client.setex(physical_key, ttl, serialized_value)
             return bool(result)
-            
+
         except Exception as e:
+            self.stats['redis_errors'] += 1
             logger.warning(f"Cache set error for key {key}: {e}")
             return False
-    
-    def delete(self, key: str) -> bool:
+
+    def delete(self, key: str, scope=None) -> bool:
         """
         Delete key from cache.
-        
+
         Args:
             key: Cache key to delete
-            
+            scope: Volume name or (volume, library) the value belongs to
+
         Returns:
             True if successful
         """
-        if not self.enabled or not self.redis_client:
+        if not self.enabled:
             return False
-        
+
+        physical_key = self._physical_key(key, scope)
+        deleted = self.local.delete(physical_key)
+
+        if not self.redis_client:
+            return deleted
+
         try:
-            result = self.redis_client.delete(key)
-            return result > 0
-            
+            pipe = self.redis_client.pipeline()
+            pipe.delete(physical_key)
+            pipe.publish(self.channel, json.dumps({'origin': self.instance_id, 'delete': physical_key}))
+            result = pipe.execute()[0]
+            return deleted or result > 0
+
         except Exception as e:
+            self.stats['redis_errors'] += 1
             logger.warning(f"Cache delete error for key {key}: {e}")
-            return False
-    
+            return deleted
+
     def invalidate(self, pattern: str) -> int:
         """
         Invalidate cache entries matching pattern.
-        
+
+        '*' invalidates everything and 'namespace:...*' the whole namespace,
+        both by a single version bump. A pattern without wildcards deletes
+        that key.
+
         Args:
             pattern: Pattern to match (supports * wildcards)
-            
+
         Returns:
-            Number of keys deleted
+            Number of version bumps or keys deleted
         """
-        if not self.enabled or not self.redis_client:
+        if not self.enabled:
             return 0
-        
-        try:
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                deleted = self.redis_client.delete(*keys)
-                logger.debug(f"Invalidated {deleted} cache entries matching {pattern}")
-                return deleted
-            return 0
-            
-        except Exception as e:
-            logger.warning(f"Cache invalidation error for pattern {pattern}: {e}")
+
+        if '*' not in pattern and '?' not in pattern:
+            return int(self.delete(pattern))
+
+        namespace = pattern.split(':', 1)[0] if ':' in pattern else ''
+        if not namespace or '*' in namespace or '?' in namespace:
+            self._bump([GLOBAL_VERSION])
+        else:
+            self._bump([f'ns:{namespace}'])
+        logger.debug(f"Invalidated cache entries matching {pattern}")
+        return 1
+
+    def invalidate_scope(self, volume: str, library: Optional[str] = None,
+                         namespaces: Iterable[str] = ()) -> int:
+        """
+        Invalidate everything cached for a volume or library, plus any
+        aggregate namespaces (e.g. 'catalog'), in one round trip.
+
+        Returns:
+            Number of versions bumped
+        """
+        if not self.enabled:
             return 0
-    
+
+        names = [f'lib:{volume}/{library}' if library is not None else f'vol:{volume}']
+        names.extend(f'ns:{namespace}' for namespace in namespaces)
+        self._bump(names)
+        return len(names)
+
     def clear(self) -> bool:
         """
         Clear all cache entries.
-        
+
         Returns:
             True if successful
         """
-        if not self.enabled or not self.redis_client:
-            return False
-        
-        try:
-            result = self.redis_client.flushdb()
-            logger.info("Cache cleared")
-            return bool(result)
-            
-        except Exception as e:
-            logger.warning(f"Cache clear error: {e}")
+        if not self.enabled:
             return False
-    
+
+        self._bump([GLOBAL_VERSION])
+        self.local.clear()
+        logger.info("Cache cleared")
+        return True
+
     def get_statistics(self) -> dict:
         """
         Get cache statistics.
-        
+
         Returns:
             Dictionary with cache statistics
         """
-        if not self.enabled or not self.redis_client:
+        if not self.enabled:
             return {
                 'enabled': False,
                 'status': 'disabled'
             }
-        
+
+        local_stats = self.local.get_statistics()
+        stats = {
+            'enabled': True,
+            'status': 'connected' if self.redis_client else 'local',
+            'hits': local_stats['hits'],
+            'misses': local_stats['misses'],
+            'evictions': local_stats['evictions'],
+            'local': local_stats,
+            'versions': len(self.versions),
+            **self.stats,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+        if not self.redis_client:
+            return stats
+
         try:
             info = self.redis_client.info()
-            
-            return {
-                'enabled': True,
-                'status': 'connected',
+
+            stats.update({
                 'used_memory': info.get('used_memory', 0),
                 'used_memory_human': info.get('used_memory_human', '0B'),
                 'connected_clients': info.get('connected_clients', 0),
                 'total_commands_processed': info.get('total_commands_processed', 0),
                 'keyspace_hits': info.get('keyspace_hits', 0),
                 'keyspace_misses': info.get('keyspace_misses', 0),
-                'hit_rate': self._calculate_hit_rate(info),
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            
+                'hit_rate': self._calculate_hit_rate(info)
+            })
+
         except Exception as e:
             logger.warning(f"Error getting cache statistics: {e}")
-            return {
-                'enabled': True,
-                'status': 'error',
-                'error': str(e),
-                'timestamp': datetime.utcnow().isoformat()
-            }
-    
+            stats.update({'status': 'error', 'error': str(e)})
+
+        return stats
+
     def _calculate_hit_rate(self, info: dict) -> float:
         """Calculate cache hit rate."""
         hits = info.get('keyspace_hits', 0)
         misses = info.get('keyspace_misses', 0)
         total = hits + misses
-        
+
         if total == 0:
             return 0.0
-        
+
         return round((hits / total) * 100, 2)
-    
+
     def close(self):
-        """Close Redis connection."""
+        """Stop the invalidation subscriber and close the Redis connection."""
+        self.stopped.set()
         if self.redis_client:
             try:
                 self.redis_client.close()
@@ -240,28 +503,32 @@ class CacheManager:
 
 
 class NullCache(CacheManager):
-    """Null cache implementation when Redis is not available."""
-    
+    """Null cache implementation when caching is disabled."""
+
     def __init__(self):
         self.enabled = False
-    
-    def get(self, key: str) -> None:
+
+    def get(self, key: str, scope=None) -> None:
         return None
-    
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None, scope=None) -> bool:
         return False
-    
-    def delete(self, key: str) -> bool:
+
+    def delete(self, key: str, scope=None) -> bool:
         return False
-    
+
     def invalidate(self, pattern: str) -> int:
         return 0
-    
+
+    def invalidate_scope(self, volume: str, library: Optional[str] = None,
+                         namespaces: Iterable[str] = ()) -> int:
+        return 0
+
     def clear(self) -> bool:
         return False
-    
+
     def get_statistics(self) -> dict:
         return {'enabled': False, 'status': 'disabled'}
-    
+
     def close(self):
-        pass
\ No newline at end of file
+        pass
@@ -3,8 +3,10 @@ Core DBIO Manager - Main interface for catalog operations
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, Tuple
 from datetime import datetime
+import base64
+import copy
 import json
 from pathlib import Path
 
@@ -16,6 +18,26 @@ from .exceptions import BackendNotFoundError, DBIOException
 logger = logging.getLogger(__name__)
 
 
+def encode_cursor(key: Tuple[str, str, str]) -> str:
+    """Opaque page cursor for the (volume, library, object) key of the last object on a page."""
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str, str]]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(raw.decode('utf-8'))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not (isinstance(key, list) and len(key) == 3 and all(isinstance(part, str) for part in key)):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return tuple(key)
+
+
 class DBIOManager:
     """
     Main database I/O manager with pluggable backends.
@@ -73,7 +95,7 @@ class DBIOManager:
             cached_data = self.cache.get(cache_key)
             if cached_data:
                 logger.debug("Returning cached catalog data")
-                return cached_data
+                return copy.deepcopy(cached_data)
         
         # Get from backend
         try:
@@ -81,7 +103,7 @@ class DBIOManager:
             
             # Cache the result
             if self.cache:
-                self.cache.set(cache_key, catalog_data)
+                self.cache.set(cache_key, copy.deepcopy(catalog_data))
             
             return catalog_data
             
@@ -114,17 +136,17 @@ class DBIOManager:
             }
             
             # Add CREATED timestamp if not exists
-            existing = self.backend.get_object(volume, library, object_name)
-            if not existing:
-                attributes['CREATED'] = attributes['UPDATED']
+            if not self.backend.MANAGES_TIMESTAMPS:
+                existing = self.backend.get_object(volume, library, object_name)
+                if not existing:
+                    attributes['CREATED'] = attributes['UPDATED']
             
             # Update in backend
             success = self.backend.update_object(volume, library, object_name, attributes)
             
             # Invalidate cache
             if self.cache and success:
-                self.cache.invalidate(f"catalog:*")
-                self.cache.invalidate(f"object:{volume}:{library}:{object_name}")
+                self.cache.invalidate_scope(volume, library, namespaces=('catalog', 'query', 'stats'))
             
             return success
             
@@ -149,8 +171,7 @@ class DBIOManager:
             
             # Invalidate cache
             if self.cache and success:
-                self.cache.invalidate(f"catalog:*")
-                self.cache.invalidate(f"object:{volume}:{library}:{object_name}")
+                self.cache.invalidate_scope(volume, library, namespaces=('catalog', 'query', 'stats'))
             
             return success
             
@@ -178,7 +199,7 @@ class DBIOManager:
         if self.cache:
             cached_data = self.cache.get(cache_key)
             if cached_data:
-                return cached_data
+                return copy.deepcopy(cached_data)
         
         # Query backend
         try:
@@ -186,7 +207,7 @@ class DBIOManager:
             
             # Cache results
             if self.cache:
-                self.cache.set(cache_key, results, ttl=60)  # Short TTL for queries
+                self.cache.set(cache_key, copy.deepcopy(results), ttl=60)  # Short TTL for queries
             
             return results
             
@@ -194,19 +215,81 @@ class DBIOManager:
             logger.error(f"Error querying objects: {e}")
             raise DBIOException(f"Failed to query objects: {str(e)}")
     
-    def search_objects(self, query: str, object_type: Optional[str] = None) -> List[Dict[str, Any]]:
+    def iter_objects(self, filters: Optional[Dict[str, Any]] = None, order: str = 'ASC',
+                     page_size: int = 500, after: Optional[Tuple[str, str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream matching objects in (volume, library, object) key order.
+        
+        Args:
+            filters: object_type, volume, library or attribute equality filters
+            order: 'ASC' or 'DESC'
+            page_size: Objects fetched from the backend per round trip
+            after: Key of the last object already seen (keyset pagination)
+            
+        Returns:
+            Generator of {'volume_name', 'library_name', 'object_name', 'attributes'}
+        """
+        try:
+            # yield from keeps errors raised while iterating inside the try
+            yield from self.backend.iter_objects(filters, order, page_size, after)
+        except Exception as e:
+            logger.error(f"Error iterating objects: {e}")
+            raise DBIOException(f"Failed to iterate objects: {str(e)}")
+    
+    def query_page(self, filters: Optional[Dict[str, Any]] = None, limit: int = 100,
+                   cursor: Optional[str] = None, order: str = 'ASC') -> Dict[str, Any]:
+        """
+        Fetch one page of objects for list screens and REST endpoints.
+        
+        Args:
+            filters: Same filters as iter_objects
+            limit: Page size
+            cursor: next_cursor of the previous page (None for the first page)
+            order: 'ASC' or 'DESC'
+            
+        Returns:
+            {'objects': [...], 'next_cursor': str or None, 'count': int}
+        """
+        after = decode_cursor(cursor)
+        objects = []
+        has_more = False
+        
+        try:
+            iterator = self.backend.iter_objects(filters, order, limit + 1, after)
+            try:
+                for obj in iterator:
+                    if len(objects) == limit:
+                        has_more = True
+                        break
+                    objects.append(obj)
+            finally:
+                iterator.close()
+        except Exception as e:
+            logger.error(f"Error querying page: {e}")
+            raise DBIOException(f"Failed to query page: {str(e)}")
+        
+        next_cursor = None
+        if has_more and objects:
+            last = objects[-1]
+            next_cursor = encode_cursor((last['volume_name'], last['library_name'], last['object_name']))
+        
+        return {'objects': objects, 'next_cursor': next_cursor, 'count': len(objects)}
+    
+    def search_objects(self, query: str, object_type: Optional[str] = None,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Full-text search across objects.
+        Indexed search across objects.
         
         Args:
-            query: Search query
+            query: Search query - 'ABC' contains, 'ABC*' prefix, 'A?C*' wildcard
             object_type: Optional filter by object type
+            limit: Maximum number of results (best ranked first)
             
         Returns:
-            List of matching objects
+            List of matching objects ordered by rank
         """
         try:
-            return self.backend.search_objects(query, object_type)
+            return self.backend.search_objects(query, object_type, limit)
         except Exception as e:
             logger.error(f"Error searching objects: {e}")
             raise DBIOException(f"Failed to search objects: {str(e)}")
@@ -242,14 +325,14 @@ class DBIOManager:
         if self.cache:
             cached_data = self.cache.get(cache_key)
             if cached_data:
-                return cached_data
+                return copy.deepcopy(cached_data)
         
         try:
             stats = self.backend.get_statistics()
             
             # Cache stats for longer
             if self.cache:
-                self.cache.set(cache_key, stats, ttl=300)
+                self.cache.set(cache_key, copy.deepcopy(stats), ttl=300)
             
             return stats
             
@@ -322,8 +405,22 @@ class DBIOManager:
         Returns:
             Object attributes dictionary or empty dict if not found
         """
+        cache_key = f"object:{volume}:{library}:{object_name}"
+        
+        # The local cache tier holds live objects: callers always get their own copy
+        
+        if self.cache:
+            cached_data = self.cache.get(cache_key, scope=(volume, library))
+            if cached_data:
+                return copy.deepcopy(cached_data)
+        
         try:
-            return self.backend.get_object(volume, library, object_name) or {}
+            object_data = self.backend.get_object(volume, library, object_name) or {}
+            
+            if self.cache and object_data:
+                self.cache.set(cache_key, copy.deepcopy(object_data), scope=(volume, library))
+            
+            return object_data
         except Exception as e:
             logger.error(f"Error getting object info: {e}")
             return {}
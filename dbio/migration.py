@@ -2,12 +2,16 @@
 Migration Manager for DBIO - Handles data migration between backends
 """
 
+import fcntl
 import json
+import hashlib
 import logging
 import os
 import shutil
-from datetime import datetime
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple, Iterable
 from pathlib import Path
 
 from .core import DBIOManager
@@ -16,6 +20,101 @@ from .exceptions import MigrationError
 
 logger = logging.getLogger(__name__)
 
+# Attributes compared between backends. PostgreSQL only persists a subset of
+# the catalog.json attributes and stamps its own updated_at, so by default
+# objects are compared on presence and TYPE (content changes are picked up by
+# the UPDATED-driven incremental sync).
+DIGEST_ATTRIBUTES = ('TYPE',)
+SYNC_BATCH_SIZE = int(os.environ.get('DBIO_SYNC_BATCH_SIZE', '500'))
+SYNC_OVERLAP_SECONDS = int(os.environ.get('DBIO_SYNC_OVERLAP_SECONDS', '60'))
+HYBRID_QUEUE_DIR = os.environ.get('DBIO_HYBRID_QUEUE_DIR', '/tmp/dbio_hybrid_queue')
+HYBRID_QUEUE_POLL_INTERVAL = float(os.environ.get('DBIO_HYBRID_QUEUE_POLL_INTERVAL', '0.5'))
+# How long interpreter exit waits for queued secondary writes
+HYBRID_EXIT_TIMEOUT = float(os.environ.get('DBIO_HYBRID_EXIT_TIMEOUT', '5.0'))
+
+LibraryKey = Tuple[str, str]
+DIGEST_MODULUS = 1 << 256
+
+
+def object_fingerprint(attributes: Dict[str, Any], digest_attributes: Iterable[str] = DIGEST_ATTRIBUTES) -> str:
+    """Canonical string of the compared attributes of an object."""
+    return json.dumps([attributes.get(name) for name in digest_attributes],
+                      ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+class CatalogDigest:
+    """
+    Merkle-style digest of a catalog: root -> volume -> library hashes.
+    
+    Built from the iter_objects() stream, so memory is proportional to the
+    number of libraries rather than objects. A library hash is the sum of
+    its object hashes modulo 2**256, which does not depend on the order the
+    backend returns objects in (PostgreSQL collation order differs from
+    Python code point order); volume and root hashes are computed over
+    keys sorted in Python.
+    """
+    
+    def __init__(self, digest_attributes: Iterable[str] = DIGEST_ATTRIBUTES):
+        self.digest_attributes = tuple(digest_attributes)
+        self.libraries: Dict[LibraryKey, Dict[str, Any]] = {}  # (volume, library) -> {'hash', 'count'}
+    
+    @classmethod
+    def build(cls, manager: DBIOManager, digest_attributes: Iterable[str] = DIGEST_ATTRIBUTES,
+              filters: Optional[Dict[str, Any]] = None) -> 'CatalogDigest':
+        digest = cls(digest_attributes)
+        sums: Dict[LibraryKey, List[int]] = {}  # (volume, library) -> [hash sum, count]
+        
+        for item in manager.iter_objects(filters, page_size=SYNC_BATCH_SIZE):
+            leaf = hashlib.sha256(
+                item['object_name'].encode('utf-8') + b'\x00' +
+                object_fingerprint(item['attributes'], digest.digest_attributes).encode('utf-8')).digest()
+            entry = sums.setdefault((item['volume_name'], item['library_name']), [0, 0])
+            entry[0] = (entry[0] + int.from_bytes(leaf, 'big')) % DIGEST_MODULUS
+            entry[1] += 1
+        
+        for key, (total, count) in sums.items():
+            digest.libraries[key] = {'hash': f"{total:064x}", 'count': count}
+        return digest
+    
+    @property
+    def object_count(self) -> int:
+        return sum(entry['count'] for entry in self.libraries.values())
+    
+    def volume_hashes(self) -> Dict[str, str]:
+        hashers: Dict[str, Any] = {}
+        for (volume, library), entry in sorted(self.libraries.items()):
+            hasher = hashers.setdefault(volume, hashlib.sha256())
+            hasher.update(f"{library}\x00{entry['hash']}\n".encode('utf-8'))
+        return {volume: hasher.hexdigest() for volume, hasher in hashers.items()}
+    
+    def root_hash(self) -> str:
+        hasher = hashlib.sha256()
+        for volume, volume_hash in sorted(self.volume_hashes().items()):
+            hasher.update(f"{volume}\x00{volume_hash}\n".encode('utf-8'))
+        return hasher.hexdigest()
+    
+    def volumes(self) -> set:
+        return {volume for volume, _ in self.libraries}
+    
+    def diff(self, other: 'CatalogDigest') -> List[LibraryKey]:
+        """Libraries whose contents differ, descending only into differing volumes."""
+        if self.root_hash() == other.root_hash():
+            return []
+        
+        own_volumes, other_volumes = self.volume_hashes(), other.volume_hashes()
+        changed_volumes = {volume for volume in set(own_volumes) | set(other_volumes)
+                           if own_volumes.get(volume) != other_volumes.get(volume)}
+        
+        libraries = {key for key in set(self.libraries) | set(other.libraries) if key[0] in changed_volumes}
+        return sorted(key for key in libraries
+                      if self.libraries.get(key, {}).get('hash') != other.libraries.get(key, {}).get('hash'))
+
+
+def _library_objects(manager: DBIOManager, volume: str, library: str) -> Dict[str, Dict[str, Any]]:
+    """object_name -> attributes of one library."""
+    return {item['object_name']: item['attributes']
+            for item in manager.iter_objects({'volume': volume, 'library': library}, page_size=SYNC_BATCH_SIZE)}
+
 
 class MigrationManager:
     """Manages migration of catalog data between different backends."""
@@ -31,6 +130,7 @@ class MigrationManager:
         self.source_config = source_config
         self.target_config = target_config
         self.migration_log = []
+        self.digest_attributes = tuple(target_config.get('digest_attributes', DIGEST_ATTRIBUTES))
     
     def migrate_catalog(self, backup_before: bool = True, 
                        validate_after: bool = True,
@@ -140,22 +240,24 @@ class MigrationManager:
                           target_manager: DBIOManager) -> Dict[str, Any]:
         """Validate that migration was successful."""
         try:
-            source_catalog = source_manager.get_catalog_info()
-            target_catalog = target_manager.get_catalog_info()
+            source_digest = CatalogDigest.build(source_manager, self.digest_attributes)
+            target_digest = CatalogDigest.build(target_manager, self.digest_attributes)
             
-            source_count = self._count_objects(source_catalog)
-            target_count = self._count_objects(target_catalog)
+            source_count = source_digest.object_count
+            target_count = target_digest.object_count
             
             validation = {
                 'success': True,
                 'source_objects': source_count,
                 'target_objects': target_count,
                 'count_match': source_count == target_count,
+                'source_root_hash': source_digest.root_hash(),
+                'target_root_hash': target_digest.root_hash(),
                 'differences': []
             }
             
             # Check for differences
-            differences = self._find_differences(source_catalog, target_catalog)
+            differences = self._find_differences(source_manager, target_manager, source_digest, target_digest)
             validation['differences'] = differences
             
             if differences or source_count != target_count:
@@ -171,45 +273,46 @@ class MigrationManager:
                 'timestamp': datetime.utcnow().isoformat()
             }
     
-    def _find_differences(self, source: Dict[str, Any], target: Dict[str, Any]) -> List[str]:
-        """Find differences between source and target catalogs."""
+    def _find_differences(self, source_manager: DBIOManager, target_manager: DBIOManager,
+                          source_digest: CatalogDigest, target_digest: CatalogDigest) -> List[str]:
+        """Find differences between source and target, loading only the libraries whose hashes differ."""
         differences = []
+        source_volumes, target_volumes = source_digest.volumes(), target_digest.volumes()
+        
+        for volume_name in sorted(source_volumes - target_volumes):
+            differences.append(f"Missing volume: {volume_name}")
+        for volume_name in sorted(target_volumes - source_volumes):
+            differences.append(f"Extra volume in target: {volume_name}")
         
-        # Check all source objects exist in target
-        for volume_name, volume_data in source.items():
-            if volume_name not in target:
-                differences.append(f"Missing volume: {volume_name}")
+        for volume_name, library_name in source_digest.diff(target_digest):
+            if volume_name not in source_volumes or volume_name not in target_volumes:
                 continue
-                
-            for library_name, library_data in volume_data.items():
-                if library_name not in target[volume_name]:
-                    differences.append(f"Missing library: {volume_name}.{library_name}")
-                    continue
-                
-                for object_name, object_data in library_data.items():
-                    if object_name not in target[volume_name][library_name]:
-                        differences.append(f"Missing object: {volume_name}.{library_name}.{object_name}")
-                        continue
-                    
-                    # Compare key attributes
-                    target_object = target[volume_name][library_name][object_name]
-                    if object_data.get('TYPE') != target_object.get('TYPE'):
-                        differences.append(f"Type mismatch: {volume_name}.{library_name}.{object_name}")
-        
-        # Check for extra objects in target
-        for volume_name, volume_data in target.items():
-            if volume_name not in source:
-                differences.append(f"Extra volume in target: {volume_name}")
+            if (volume_name, library_name) not in target_digest.libraries:
+                differences.append(f"Missing library: {volume_name}.{library_name}")
                 continue
-                
-            for library_name, library_data in volume_data.items():
-                if library_name not in source[volume_name]:
-                    differences.append(f"Extra library in target: {volume_name}.{library_name}")
+            if (volume_name, library_name) not in source_digest.libraries:
+                differences.append(f"Extra library in target: {volume_name}.{library_name}")
+                continue
+            
+            source_objects = _library_objects(source_manager, volume_name, library_name)
+            target_objects = _library_objects(target_manager, volume_name, library_name)
+            
+            for object_name, object_data in source_objects.items():
+                if object_name not in target_objects:
+                    differences.append(f"Missing object: {volume_name}.{library_name}.{object_name}")
                     continue
                 
-                for object_name in library_data.keys():
-                    if object_name not in source[volume_name][library_name]:
-                        differences.append(f"Extra object in target: {volume_name}.{library_name}.{object_name}")
+                # Compare key attributes
+                target_object = target_objects[object_name]
+                if object_data.get('TYPE') != target_object.get('TYPE'):
+                    differences.append(f"Type mismatch: {volume_name}.{library_name}.{object_name}")
+                elif (object_fingerprint(object_data, self.digest_attributes) !=
+                      object_fingerprint(target_object, self.digest_attributes)):
+                    differences.append(f"Attribute mismatch: {volume_name}.{library_name}.{object_name}")
+            
+            for object_name in target_objects:
+                if object_name not in source_objects:
+                    differences.append(f"Extra object in target: {volume_name}.{library_name}.{object_name}")
         
         return differences
     
@@ -250,12 +353,25 @@ class MigrationManager:
             logger.error(error_msg)
             raise MigrationError(error_msg)
     
-    def sync_backends(self, direction: str = 'source_to_target') -> Dict[str, Any]:
+    def sync_backends(self, direction: str = 'source_to_target', mode: str = 'incremental',
+                      state_path: Optional[str] = None) -> Dict[str, Any]:
         """
         Sync data between backends.
         
+        Modes:
+            incremental  Copy objects whose UPDATED is newer than the last
+                         sync watermark. Progress is checkpointed after every
+                         batch, so an interrupted sync resumes where it stopped.
+                         Deletions (which leave no UPDATED trace) are found by
+                         a key-only digest pass afterwards.
+            merkle       Compare per-library digests and reconcile only the
+                         libraries that differ (including deletions).
+            full         Merge-import the complete source catalog.
+        
         Args:
             direction: 'source_to_target' or 'target_to_source'
+            mode: 'incremental', 'merkle' or 'full'
+            state_path: Checkpoint file for incremental sync
             
         Returns:
             Sync statistics
@@ -263,43 +379,441 @@ class MigrationManager:
         try:
             source_manager = DBIOManager(self.source_config)
             target_manager = DBIOManager(self.target_config)
+            source_name = self.source_config.get('backend', 'source')
+            target_name = self.target_config.get('backend', 'target')
+            
+            if direction != 'source_to_target':
+                source_manager, target_manager = target_manager, source_manager
+                source_name, target_name = target_name, source_name
             
-            if direction == 'source_to_target':
+            if mode == 'full':
                 catalog_data = source_manager.get_catalog_info()
                 stats = target_manager.import_catalog(catalog_data, merge=True)
+            elif mode == 'merkle':
+                stats = self._sync_merkle(source_manager, target_manager)
+            elif mode == 'incremental':
+                if state_path is None:
+                    state_dir = Path(self.target_config.get('backup_location', '/tmp/catalog_backups'))
+                    state_path = str(state_dir / f"sync_state_{source_name}_to_{target_name}.json")
+                stats = self._sync_incremental(source_manager, target_manager, state_path)
             else:
-                catalog_data = target_manager.get_catalog_info()
-                stats = source_manager.import_catalog(catalog_data, merge=True)
+                raise ValueError(f"Unknown sync mode: {mode}")
             
             stats['sync_direction'] = direction
+            stats['sync_mode'] = mode
             stats['timestamp'] = datetime.utcnow().isoformat()
             
-            logger.info(f"Backend sync completed: {direction}")
+            logger.info(f"Backend sync completed: {direction} ({mode})")
             return stats
             
         except Exception as e:
             error_msg = f"Backend sync failed: {str(e)}"
             logger.error(error_msg)
             raise MigrationError(error_msg)
+    
+    def _sync_merkle(self, source_manager: DBIOManager, target_manager: DBIOManager) -> Dict[str, Any]:
+        """Reconcile only the libraries whose digests differ."""
+        source_digest = CatalogDigest.build(source_manager, self.digest_attributes)
+        target_digest = CatalogDigest.build(target_manager, self.digest_attributes)
+        changed = source_digest.diff(target_digest)
+        stats = {'objects': 0, 'deleted': 0, 'errors': 0,
+                 'libraries': len(source_digest.libraries), 'libraries_synced': len(changed)}
+        
+        for volume_name, library_name in changed:
+            source_objects = _library_objects(source_manager, volume_name, library_name)
+            target_objects = _library_objects(target_manager, volume_name, library_name)
+            operations = []
+            
+            for object_name, attributes in source_objects.items():
+                target_object = target_objects.get(object_name)
+                if target_object is None or (object_fingerprint(attributes, self.digest_attributes) !=
+                                             object_fingerprint(target_object, self.digest_attributes)):
+                    operations.append({'type': 'update', 'volume': volume_name, 'library': library_name,
+                                       'object_name': object_name, 'attributes': attributes})
+            for object_name in target_objects:
+                if object_name not in source_objects:
+                    operations.append({'type': 'delete', 'volume': volume_name, 'library': library_name,
+                                       'object_name': object_name})
+            
+            for start in range(0, len(operations), SYNC_BATCH_SIZE):
+                result = target_manager.bulk_operations(operations[start:start + SYNC_BATCH_SIZE])
+                stats['objects'] += result.get('created', 0) + result.get('updated', 0)
+                stats['deleted'] += result.get('deleted', 0)
+                stats['errors'] += result.get('errors', 0)
+        
+        return stats
+    
+    def _sync_incremental(self, source_manager: DBIOManager, target_manager: DBIOManager,
+                          state_path: str) -> Dict[str, Any]:
+        """
+        Copy objects updated since the last watermark in key order.
+        
+        The checkpoint holds the watermark of the last completed run and the
+        key of the last object copied by the current run. A completed run
+        advances the watermark to its start time minus an overlap margin,
+        so writes racing the sync are picked up again next time.
+        """
+        state = self._load_sync_state(state_path)
+        if state.get('run_started_at') is None:
+            state['run_started_at'] = (datetime.utcnow() - timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat() + 'Z'
+            state['after'] = None
+        
+        filters = {'updated_since': state['watermark']} if state.get('watermark') else None
+        after = tuple(state['after']) if state.get('after') else None
+        stats = {'objects': 0, 'errors': 0, 'watermark': state.get('watermark'), 'resumed': after is not None}
+        
+        def apply(batch):
+            result = target_manager.bulk_operations(batch)
+            stats['objects'] += result.get('created', 0) + result.get('updated', 0)
+            stats['errors'] += result.get('errors', 0)
+            last = batch[-1]
+            state['after'] = [last['volume'], last['library'], last['object_name']]
+            self._save_sync_state(state_path, state)
+        
+        batch = []
+        for item in source_manager.iter_objects(filters, page_size=SYNC_BATCH_SIZE, after=after):
+            batch.append({'type': 'update', 'volume': item['volume_name'], 'library': item['library_name'],
+                          'object_name': item['object_name'], 'attributes': item['attributes']})
+            if len(batch) >= SYNC_BATCH_SIZE:
+                apply(batch)
+                batch = []
+        if batch:
+            apply(batch)
+        
+        stats['deleted'] = self._sync_deletions(source_manager, target_manager, stats)
+        
+        state = {'watermark': state['run_started_at'], 'run_started_at': None, 'after': None}
+        self._save_sync_state(state_path, state)
+        stats['new_watermark'] = state['watermark']
+        return stats
+    
+    def _sync_deletions(self, source_manager: DBIOManager, target_manager: DBIOManager,
+                        stats: Dict[str, Any]) -> int:
+        """
+        Delete target objects that no longer exist in the source.
+        
+        Digests over object names only locate the libraries whose key sets
+        differ; only those libraries are listed on both sides.
+        """
+        source_digest = CatalogDigest.build(source_manager, ())
+        target_digest = CatalogDigest.build(target_manager, ())
+        deleted = 0
+        
+        for volume_name, library_name in source_digest.diff(target_digest):
+            if (volume_name, library_name) not in target_digest.libraries:
+                continue
+            # Re-list the source: objects created since the digest was built are kept
+            source_objects = _library_objects(source_manager, volume_name, library_name)
+            target_objects = _library_objects(target_manager, volume_name, library_name)
+            operations = [{'type': 'delete', 'volume': volume_name, 'library': library_name,
+                           'object_name': object_name}
+                          for object_name in target_objects if object_name not in source_objects]
+            
+            for start in range(0, len(operations), SYNC_BATCH_SIZE):
+                result = target_manager.bulk_operations(operations[start:start + SYNC_BATCH_SIZE])
+                deleted += result.get('deleted', 0)
+                stats['errors'] += result.get('errors', 0)
+        
+        return deleted
+    
+    def _load_sync_state(self, state_path: str) -> Dict[str, Any]:
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable sync state {state_path}: {e}")
+        return {'watermark': None, 'run_started_at': None, 'after': None}
+    
+    def _save_sync_state(self, state_path: str, state: Dict[str, Any]):
+        """Atomically replace the checkpoint file."""
+        os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+        tmp_path = f"{state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, state_path)
+
+
+class DurableWriteQueue:
+    """
+    On-disk FIFO of catalog writes for one secondary backend, shared by every
+    process that writes through the same queue file.
+    
+    Entries are appended and fsynced to '<path>' under an exclusive flock
+    before the primary write returns. One process at a time holds the
+    consumer lock ('<path>.consumer'); its worker applies the entries in
+    file order, retrying with exponential backoff, and records the
+    generation and byte offset of the last applied entry in '<path>.ack'.
+    Workers of other processes wait for the consumer lock, so an entry is
+    applied once (twice only after a crash between applying and
+    acknowledging it). Once everything is acknowledged the log is truncated
+    and the generation advanced. Entries that still fail after max_attempts
+    are moved to '<path>.failed'.
+    """
+    
+    def __init__(self, path: str, apply_func, max_attempts: int = 10,
+                 max_retry_delay: float = 30.0, compact_threshold: int = 1000,
+                 poll_interval: float = HYBRID_QUEUE_POLL_INTERVAL):
+        self.path = path
+        self.ack_path = path + '.ack'
+        self.failed_path = path + '.failed'
+        self.apply_func = apply_func
+        self.max_attempts = max_attempts
+        self.max_retry_delay = max_retry_delay
+        self.compact_threshold = compact_threshold
+        self.poll_interval = poll_interval
+        
+        self.cond = threading.Condition()
+        self.stopped = threading.Event()
+        self.written = (0, 0)  # (generation, end offset) of this process's last put
+        self.ack = (0, 0)  # (generation, offset) applied, while this process is the consumer
+        self.consumer = False
+        self.applied_since_compaction = 0
+        self.last_error = None
+        self.stats = {'enqueued': 0, 'applied': 0, 'retries': 0, 'failed': 0, 'skipped': 0}
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.fd = os.open(path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        self.consumer_fd = os.open(path + '.consumer', os.O_RDWR | os.O_CREAT, 0o644)
+        self.worker = threading.Thread(target=self._run, name=f'dbio-write-queue-{os.path.basename(path)}', daemon=True)
+        self.worker.start()
+    
+    def put(self, entry: Dict[str, Any]):
+        """Durably enqueue a write."""
+        line = (json.dumps({'entry': entry}, ensure_ascii=False) + '\n').encode('utf-8')
+        with self.cond:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                size = os.fstat(self.fd).st_size
+                if size and os.pread(self.fd, 1, size - 1) != b'\n':
+                    # Terminate the torn line of a writer that crashed mid-append
+                    self._write_all(b'\n')
+                    size += 1
+                self._write_all(line)
+                os.fsync(self.fd)
+                # The generation only changes under this lock
+                self.written = (self._read_ack()[0], size + len(line))
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            self.stats['enqueued'] += 1
+            self.cond.notify_all()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every write queued by this process was applied (or given up on)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while True:
+                generation, offset = self.ack if self.consumer else self._read_ack()
+                if generation > self.written[0] or offset >= self.written[1]:
+                    return True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(self.poll_interval if remaining is None else min(remaining, self.poll_interval))
+    
+    def close(self, timeout: float = 5.0):
+        """Stop the worker; unapplied entries stay on disk for the next consumer."""
+        self.flush(timeout)
+        self.stopped.set()
+        with self.cond:
+            self.cond.notify_all()
+        self.worker.join(timeout)
+        if not self.worker.is_alive():
+            os.close(self.consumer_fd)  # releases the consumer lock
+            os.close(self.fd)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.cond:
+            generation, offset = self.ack if self.consumer else self._read_ack()
+            try:
+                pending_bytes = max(0, os.fstat(self.fd).st_size - offset)
+            except OSError:
+                pending_bytes = None
+            stats = self.stats.copy()
+            stats.update({'pending_bytes': pending_bytes, 'generation': generation, 'acked_offset': offset,
+                          'consumer': self.consumer, 'last_error': self.last_error})
+            return stats
+    
+    def _write_all(self, data: bytes):
+        while data:
+            written = os.write(self.fd, data)
+            data = data[written:]
+    
+    def _read_ack(self) -> Tuple[int, int]:
+        try:
+            with open(self.ack_path, 'r', encoding='utf-8') as f:
+                generation, offset = f.read().split()
+            return int(generation), int(offset)
+        except (OSError, ValueError):
+            return 0, 0
+    
+    def _write_ack(self, generation: int, offset: int):
+        tmp_path = f"{self.ack_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(f"{generation} {offset}")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.ack_path)
+        except OSError as e:
+            logger.warning(f"Failed to write queue ack {self.ack_path}: {e}")
+        self.ack = (generation, offset)
+    
+    def _run(self):
+        while not self.stopped.is_set():
+            if not self.consumer:
+                try:
+                    fcntl.flock(self.consumer_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    # Another process applies the queue
+                    self.stopped.wait(self.poll_interval)
+                    continue
+                with self.cond:
+                    self.consumer = True
+                    self.ack = self._read_ack()
+                    if os.fstat(self.fd).st_size > self.ack[1]:
+                        logger.info(f"Replaying queued writes from {self.path}")
+            
+            applied = self._consume_one()
+            if applied is None:
+                return  # stopped while retrying; the entry is replayed by the next consumer
+            if not applied:
+                # Idle: woken by puts of this process, polls for other writers
+                with self.cond:
+                    if not self.stopped.is_set():
+                        self.cond.wait(self.poll_interval)
+    
+    def _next_entry(self, offset: int, size: int) -> Optional[Tuple[Optional[Dict[str, Any]], int]]:
+        """(entry, end offset) of the line at offset; None while the line is incomplete."""
+        length = 65536
+        while True:
+            data = os.pread(self.fd, min(length, size - offset), offset)
+            end = data.find(b'\n')
+            if end >= 0:
+                try:
+                    entry = json.loads(data[:end])['entry']
+                except (ValueError, KeyError, TypeError):
+                    entry = None  # torn line of a crashed writer
+                return entry, offset + end + 1
+            if offset + len(data) >= size:
+                return None
+            length *= 2
+    
+    def _consume_one(self) -> Optional[bool]:
+        generation, offset = self.ack
+        size = os.fstat(self.fd).st_size
+        item = self._next_entry(offset, size) if size > offset else None
+        if item is None:
+            if self.applied_since_compaction >= self.compact_threshold:
+                self._compact()
+            return False
+        
+        entry, end = item
+        if entry is None:
+            self.stats['skipped'] += 1
+        elif self._apply_with_retry(entry) is None:
+            return None
+        
+        with self.cond:
+            self._write_ack(generation, end)
+            self.applied_since_compaction += 1
+            self.cond.notify_all()
+        return True
+    
+    def _compact(self):
+        """Start the log over once every entry is acknowledged."""
+        with self.cond:
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+            try:
+                generation, offset = self.ack
+                if os.fstat(self.fd).st_size == offset:
+                    # Ack first: a crash before the truncate only replays applied writes
+                    self._write_ack(generation + 1, 0)
+                    os.ftruncate(self.fd, 0)
+                    self.applied_since_compaction = 0
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+    
+    def _apply_with_retry(self, entry: Dict[str, Any]) -> Optional[bool]:
+        delay = 0.5
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if self.apply_func(entry) is not False:
+                    self.stats['applied'] += 1
+                    return True
+                self.last_error = 'write returned False'
+            except Exception as e:
+                self.last_error = str(e)
+            
+            logger.warning(f"Queued write to {self.path} failed (attempt {attempt}): {self.last_error}")
+            if attempt == self.max_attempts:
+                break
+            self.stats['retries'] += 1
+            if self.stopped.wait(delay):
+                return None
+            delay = min(delay * 2, self.max_retry_delay)
+        
+        self.stats['failed'] += 1
+        try:
+            with open(self.failed_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'entry': entry, 'error': self.last_error,
+                                    'failed_at': datetime.utcnow().isoformat()}, ensure_ascii=False) + '\n')
+        except OSError as e:
+            logger.error(f"Failed to record dead write in {self.failed_path}: {e}")
+        return False
 
 
 class HybridBackend:
     """
     Hybrid backend that reads from one source and writes to multiple targets.
     Useful during migration periods.
+    
+    Writes go synchronously to the primary write backend (the one matching
+    the read backend type, else the first) and asynchronously to the others
+    through a DurableWriteQueue per secondary backend.
     """
     
-    def __init__(self, read_backend: DBIOManager, write_backends: List[DBIOManager]):
+    def __init__(self, read_backend: DBIOManager, write_backends: List[DBIOManager],
+                 async_writes: bool = True, queue_dir: str = HYBRID_QUEUE_DIR):
         """
         Initialize hybrid backend.
         
         Args:
             read_backend: Backend to read from
             write_backends: List of backends to write to
+            async_writes: Queue writes to secondary backends instead of
+                writing to every backend in turn
+            queue_dir: Directory of the durable write queues
         """
         self.read_backend = read_backend
         self.write_backends = write_backends
         self.write_errors = []
+        self.async_writes = async_writes
+        
+        read_type = getattr(read_backend, 'config', {}).get('backend')
+        self.primary = next((backend for backend in write_backends
+                             if getattr(backend, 'config', {}).get('backend') == read_type),
+                            write_backends[0] if write_backends else None)
+        self.queues: List[DurableWriteQueue] = []
+        
+        if async_writes:
+            for index, backend in enumerate(write_backends):
+                if backend is self.primary:
+                    continue
+                backend_type = getattr(backend, 'config', {}).get('backend', 'backend')
+                queue_path = os.path.join(queue_dir, f"hybrid_{index}_{backend_type}.jsonl")
+                self.queues.append(DurableWriteQueue(queue_path, self._make_apply(backend)))
+    
+    @staticmethod
+    def _make_apply(backend: DBIOManager):
+        def apply(entry: Dict[str, Any]) -> bool:
+            if entry['op'] == 'delete':
+                return backend.delete_catalog_entry(entry['volume'], entry['library'], entry['object_name'])
+            return backend.update_catalog_info(entry['volume'], entry['library'], entry['object_name'],
+                                               entry['object_type'], **entry['attributes'])
+        return apply
     
     def get_catalog_info(self) -> Dict[str, Any]:
         """Read from primary backend."""
@@ -308,19 +822,54 @@ class HybridBackend:
     def update_catalog_info(self, volume: str, library: str, object_name: str,
                           object_type: str = "DATASET", **kwargs) -> bool:
         """Write to all backends."""
+        # Stamp once so every backend records the same UPDATED time
+        kwargs.setdefault('UPDATED', datetime.utcnow().isoformat() + 'Z')
+        return self._write({'op': 'update', 'volume': volume, 'library': library,
+                            'object_name': object_name, 'object_type': object_type, 'attributes': kwargs})
+    
+    def delete_catalog_entry(self, volume: str, library: str, object_name: str) -> bool:
+        """Delete from all backends."""
+        return self._write({'op': 'delete', 'volume': volume, 'library': library, 'object_name': object_name})
+    
+    def _write(self, entry: Dict[str, Any]) -> bool:
         success = True
         self.write_errors = []
         
-        for backend in self.write_backends:
+        targets = [self.primary] if self.async_writes else self.write_backends
+        for backend in targets:
             try:
-                backend.update_catalog_info(volume, library, object_name, object_type, **kwargs)
+                if self._make_apply(backend)(entry) is False:
+                    success = False
             except Exception as e:
                 self.write_errors.append(f"Backend write error: {str(e)}")
                 success = False
                 logger.error(f"Hybrid write error: {e}")
         
+        if self.async_writes and success:
+            for queue in self.queues:
+                try:
+                    queue.put(entry)
+                except Exception as e:
+                    self.write_errors.append(f"Write queue error: {str(e)}")
+                    success = False
+                    logger.error(f"Hybrid write queue error: {e}")
+        
         return success
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued secondary writes were applied."""
+        return all(queue.flush(timeout) for queue in self.queues)
+    
+    def get_queue_stats(self) -> List[Dict[str, Any]]:
+        """Statistics of the secondary write queues."""
+        return [dict(queue.get_stats(), path=queue.path) for queue in self.queues]
+    
     def get_write_errors(self) -> List[str]:
         """Get any write errors from last operation."""
-        return self.write_errors.copy()
\ No newline at end of file
+        return self.write_errors.copy()
+    
+    def close(self, timeout: float = HYBRID_EXIT_TIMEOUT):
+        """Drain and stop the write queues (writes not applied in time are kept on disk)."""
+        for queue in self.queues:
+            queue.close(timeout)
+        self.queues = []
@@ -12,11 +12,13 @@ Usage:
                               --encoding JAK \
                               --sosi-so 0x28 \
                               --sosi-si 0x29 \
-                              --convert-sosi-to-space
+                              --convert-sosi-to-space \
+                              --mmap
 """
 
 import os
 import sys
+import mmap
 import argparse
 import struct
 import logging
@@ -58,6 +60,8 @@ class ConversionConfig:
     sosi_so: int = 0x28
     sosi_si: int = 0x29
     convert_sosi_to_space: bool = True
+    use_mmap: bool = False
+    chunk_size: int = 4 * 1024 * 1024  # bytes per conversion buffer (rounded to whole records)
 
 class EBCDICConverter:
     """EBCDIC データセット変換ツール"""
@@ -127,6 +131,70 @@ class EBCDICConverter:
     def __init__(self, config: ConversionConfig):
         self.config = config
         self.layout_fields: List[LayoutField] = []
+        self.sosi_table = self._build_sosi_table()
+        self.pic_table = self._build_pic_table()
+    
+    def _build_sosi_table(self) -> bytes:
+        """SOSI→スペース変換テーブル (bytes.translate 用)"""
+        table = bytearray(range(256))
+        if self.config.convert_sosi_to_space:
+            table[self.config.sosi_so] = 0x20
+            table[self.config.sosi_si] = 0x20
+        return bytes(table)
+    
+    def _build_pic_table(self) -> bytes:
+        """PICフィールド用テーブル: EBCDIC→ASCII 変換後に SOSI 処理を合成"""
+        converted = bytes(self.EBCDIC_TO_ASCII_JAK.get(i, i) for i in range(256))
+        return converted.translate(self.sosi_table)
+    
+    def build_slice_plan(self, fields: List[LayoutField]) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        レコード内の変換プランを作成
+        
+        フィールドは先頭から連続して配置されるため、変換対象外の範囲
+        (COMP/COMP-3) と、レイアウト合計長を返す。合計長以降はスペース埋め。
+        
+        Returns:
+            (バイナリ範囲 [(start, end)] (隣接範囲は結合済み), 変換後の有効長)
+        """
+        record_length = self.config.record_length
+        binary_ranges: List[Tuple[int, int]] = []
+        for field in fields:
+            if field.type not in ['COMP', 'COMP-3']:
+                continue
+            start = min(field.position - 1, record_length)
+            end = min(start + field.length, record_length)
+            if start >= end:
+                continue
+            if binary_ranges and binary_ranges[-1][1] == start:
+                binary_ranges[-1] = (binary_ranges[-1][0], end)
+            else:
+                binary_ranges.append((start, end))
+        data_length = min(sum(field.length for field in fields), record_length)
+        return binary_ranges, data_length
+    
+    def convert_buffer(self, buffer: bytes, binary_ranges: List[Tuple[int, int]], data_length: int) -> bytes:
+        """
+        複数レコード分のバッファを一括変換
+        
+        バッファ全体を translate した後、バイナリ範囲とパディング範囲の
+        各カラムだけをレコード長ストライドで書き戻す。
+        """
+        record_length = self.config.record_length
+        converted = buffer.translate(self.pic_table)
+        if not binary_ranges and data_length >= record_length:
+            return converted
+        
+        record_count = len(buffer) // record_length
+        output = bytearray(converted)
+        for start, end in binary_ranges:
+            for column in range(start, end):
+                output[column::record_length] = buffer[column::record_length]
+        if data_length < record_length:
+            padding = b' ' * record_count
+            for column in range(data_length, record_length):
+                output[column::record_length] = padding
+        return bytes(output)
         
     def parse_layout_file(self) -> List[LayoutField]:
         """COBOL レイアウトファイルを解析してフィールド定義を抽出"""
@@ -245,16 +313,7 @@ class EBCDICConverter:
     
     def process_sosi_codes(self, data: bytes) -> bytes:
         """SOSI コードを処理"""
-        if not self.config.convert_sosi_to_space:
-            return data
-        
-        # Convert SOSI codes to spaces
-        processed = bytearray(data)
-        for i in range(len(processed)):
-            if processed[i] == self.config.sosi_so or processed[i] == self.config.sosi_si:
-                processed[i] = 0x20  # Convert to space
-        
-        return bytes(processed)
+        return bytes(data).translate(self.sosi_table)
     
     def convert_field_data(self, field: LayoutField, field_data: bytes) -> Tuple[bytes, bool]:
         """フィールドデータを変換"""
@@ -263,14 +322,8 @@ class EBCDICConverter:
             logger.debug(f"バイナリフィールド {field.name}: {field_data.hex()}")
             return field_data, True
         
-        # PIC fields: convert EBCDIC to ASCII
-        converted = bytearray()
-        for byte_val in field_data:
-            converted_byte = self.convert_ebcdic_byte(byte_val)
-            converted.append(converted_byte)
-        
-        # Process SOSI codes
-        converted_data = self.process_sosi_codes(bytes(converted))
+        # PIC fields: convert EBCDIC to ASCII and process SOSI codes in one pass
+        converted_data = bytes(field_data).translate(self.pic_table)
         
         logger.debug(f"フィールド {field.name} 変換: {field_data.hex()} -> {converted_data.hex()}")
         return converted_data, False
@@ -304,51 +357,50 @@ class EBCDICConverter:
         logger.info(f"入力ファイルサイズ: {file_size} バイト")
         logger.info(f"予想レコード数: {record_count}")
         
+        binary_ranges, data_length = self.build_slice_plan(fields)
+        
         # Create output directory if needed
-        os.makedirs(os.path.dirname(self.config.output_file), exist_ok=True)
+        output_dir = os.path.dirname(self.config.output_file)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        # Process conversion: whole-record chunks, buffered writes
+        record_length = self.config.record_length
+        chunk_size = max(1, self.config.chunk_size // record_length) * record_length
+        records_processed = 0
         
-        # Process conversion
         with open(self.config.input_file, 'rb') as infile, \
-             open(self.config.output_file, 'wb') as outfile:
+             open(self.config.output_file, 'wb', buffering=chunk_size) as outfile:
             
-            records_processed = 0
+            source = None
+            if self.config.use_mmap and file_size > 0:
+                source = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
             
-            for record_index in range(record_count):
-                # Read one record
-                record_data = infile.read(self.config.record_length)
-                if len(record_data) < self.config.record_length:
-                    logger.warning(f"レコード {record_index + 1}: 不完全なデータ ({len(record_data)} < {self.config.record_length})")
-                    break
-                
-                # Convert each field
-                converted_record = bytearray()
-                
-                for field in fields:
-                    field_start = field.position - 1  # Convert to 0-based index
-                    field_end = field_start + field.length
-                    
-                    if field_end > len(record_data):
-                        logger.warning(f"フィールド {field.name} がレコード境界を超えています")
-                        field_data = record_data[field_start:] + b'\x00' * (field.length - (len(record_data) - field_start))
+            try:
+                offset = 0
+                complete_size = record_count * record_length
+                while offset < complete_size:
+                    length = min(chunk_size, complete_size - offset)
+                    if source is not None:
+                        buffer = source[offset:offset + length]
                     else:
-                        field_data = record_data[field_start:field_end]
+                        buffer = infile.read(length)
+                    if len(buffer) < length:
+                        length = len(buffer) - len(buffer) % record_length
+                        buffer = buffer[:length]
+                        if not length:
+                            break
                     
-                    converted_data, is_binary = self.convert_field_data(field, field_data)
-                    converted_record.extend(converted_data)
-                
-                # Pad record to original length if needed
-                while len(converted_record) < self.config.record_length:
-                    converted_record.append(0x20)  # Space padding
-                
-                # Truncate if too long
-                if len(converted_record) > self.config.record_length:
-                    converted_record = converted_record[:self.config.record_length]
-                
-                outfile.write(converted_record)
-                records_processed += 1
-                
-                if records_processed % 1000 == 0:
+                    outfile.write(self.convert_buffer(buffer, binary_ranges, data_length))
+                    offset += length
+                    records_processed += length // record_length
                     logger.info(f"処理済みレコード数: {records_processed}")
+            finally:
+                if source is not None:
+                    source.close()
+        
+        if file_size % record_length:
+            logger.warning(f"レコード {record_count + 1}: 不完全なデータ ({file_size % record_length} < {record_length})")
         
         logger.info(f"=== 変換完了 ===")
         logger.info(f"処理レコード数: {records_processed}")
@@ -430,6 +482,10 @@ def main():
     parser.add_argument('--sosi-si', default='0x29', help='SOSI Shift-In code (default: 0x29)')
     parser.add_argument('--convert-sosi-to-space', action='store_true', default=True,
                        help='Convert SOSI codes to spaces (default: True)')
+    parser.add_argument('--mmap', action='store_true',
+                       help='Read the input file through mmap')
+    parser.add_argument('--chunk-size', type=int, default=4 * 1024 * 1024,
+                       help='Conversion buffer size in bytes (default: 4MB)')
     parser.add_argument('--create-sample', action='store_true',
                        help='Create sample layout and EBCDIC data files for testing')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose logging')
@@ -464,7 +520,9 @@ def main():
         encoding=args.encoding,
         sosi_so=sosi_so,
         sosi_si=sosi_si,
-        convert_sosi_to_space=args.convert_sosi_to_space
+        convert_sosi_to_space=args.convert_sosi_to_space,
+        use_mmap=args.mmap,
+        chunk_size=args.chunk_size
     )
     
     try:
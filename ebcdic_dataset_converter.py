@@ -10,6 +10,7 @@ import sys
 import json
 import struct
 import logging
+from array import array
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
@@ -44,6 +45,15 @@ except ImportError as e:
     logger.warning(f"PostgreSQL catalog support not available: {e}")
     POSTGRESQL_AVAILABLE = False
 
+# Compiled codepage tables shared across processes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server', 'system-cmds'))
+try:
+    from codepage_registry import get_codepage
+    CODEPAGE_REGISTRY_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Codepage registry not available, parsing code page text: {e}")
+    CODEPAGE_REGISTRY_AVAILABLE = False
+
 class CatalogManager:
     """Catalog management for OpenASP system using PostgreSQL"""
     
@@ -413,6 +423,9 @@ class EBCDICConverter:
         self.codepage_cache = {}
         self.codepage_base_path = self._get_codepage_base_path()
         
+        # JAK DBCS code -> Unicode code point, loaded on first DBCS character
+        self.dbcs_unicode_table = None
+        
         self.conversion_stats = {
             'total_records': 0,
             'successful_records': 0,
@@ -508,24 +521,75 @@ class EBCDICConverter:
             if 'JEFASCK_DBCS' not in self.codepage_cache:
                 self._load_codepage_table('JEFASCK.txt')
             
-            dbcs_table = self.codepage_cache.get('JEFASCK_DBCS', {})
-            return dbcs_table.get(jak_code, 0)
+            return self.codepage_cache['JEFASCK_DBCS'][jak_code & 0xFFFF]
             
         except Exception as e:
             logger.error(f"Failed to load JAK DBCS mapping for {jak_code:04X}: {e}")
             return None
     
+    def get_dbcs_unicode_table(self, filename: str = 'JEFASCK.txt'):
+        """65536-entry JAK DBCS code -> Unicode code point table (0 = unmapped)"""
+        if self.dbcs_unicode_table is None:
+            try:
+                self.dbcs_unicode_table = self._load_dbcs_unicode_table(filename)
+            except Exception as e:
+                logger.error(f"Failed to load DBCS table {filename}: {e}")
+                self.dbcs_unicode_table = array('I', bytes(65536 * 4))
+        return self.dbcs_unicode_table
+    
+    def _load_dbcs_unicode_table(self, filename: str):
+        """Unicode table of the codepage, cached on disk by the codepage registry"""
+        if CODEPAGE_REGISTRY_AVAILABLE:
+            codepage = get_codepage(os.path.abspath(os.path.join(self.codepage_base_path, filename)))
+            return codepage.derived('unicode', 'I', lambda codepage: self._build_dbcs_unicode_table(filename))
+        return self._build_dbcs_unicode_table(filename)
+    
+    def _build_dbcs_unicode_table(self, filename: str) -> array:
+        """Decode every JEF code of the codepage once"""
+        base_name = filename.replace('.txt', '')
+        if f'{base_name}_DBCS' not in self.codepage_cache:
+            self._load_codepage_table(filename)
+        
+        table = array('I', bytes(65536 * 4))
+        for dbcs_code, jef_code in enumerate(self.codepage_cache[f'{base_name}_DBCS']):
+            if not jef_code:
+                continue
+            if jef_code == 0x8140:
+                # Full-width space
+                table[dbcs_code] = 0x3000
+                continue
+            try:
+                unicode_char = bytes([(jef_code >> 8) & 0xFF, jef_code & 0xFF]).decode('shift_jis')
+            except UnicodeDecodeError:
+                # Not representable in Shift_JIS: left unmapped
+                continue
+            if len(unicode_char) == 1:
+                table[dbcs_code] = ord(unicode_char)
+        return table
+    
     def _load_codepage_table(self, filename: str):
-        """Load code page table from file"""
+        """
+        Load code page table as SBCS (256) / DBCS (65536) arrays, 0 = unmapped
+        
+        Uses the compiled registry tables (mapped read-only, shared by all
+        processes) and parses the text file only when the registry is missing.
+        """
         filepath = os.path.join(self.codepage_base_path, filename)
         
         if not os.path.exists(filepath):
             raise FileNotFoundError(f"Code page file not found: {filepath}")
         
+        base_name = filename.replace('.txt', '')
+        if CODEPAGE_REGISTRY_AVAILABLE:
+            codepage = get_codepage(os.path.abspath(filepath))
+            self.codepage_cache[f'{base_name}_SBCS'] = codepage.sbcs
+            self.codepage_cache[f'{base_name}_DBCS'] = codepage.dbcs
+            return
+        
         logger.info(f"Loading code page table: {filepath}")
         
-        single_byte_table = {}
-        double_byte_table = {}
+        single_byte_table = array('H', bytes(256 * 2))
+        double_byte_table = array('H', bytes(65536 * 2))
         is_double_byte_section = False
         
         try:
@@ -549,16 +613,16 @@ class EBCDICConverter:
                         to_code = int(match.group(2), 16)
                         
                         if is_double_byte_section:
-                            double_byte_table[from_code] = to_code
+                            double_byte_table[from_code & 0xFFFF] = to_code & 0xFFFF
                         else:
-                            single_byte_table[from_code] = to_code
+                            single_byte_table[from_code & 0xFF] = to_code & 0xFFFF
         
             # Cache the loaded tables
-            base_name = filename.replace('.txt', '')
             self.codepage_cache[f'{base_name}_SBCS'] = single_byte_table
             self.codepage_cache[f'{base_name}_DBCS'] = double_byte_table
             
-            logger.info(f"Loaded {len(single_byte_table)} single-byte and {len(double_byte_table)} double-byte mappings from {filename}")
+            logger.info(f"Loaded {sum(1 for code in single_byte_table if code)} single-byte and "
+                        f"{sum(1 for code in double_byte_table if code)} double-byte mappings from {filename}")
             
         except Exception as e:
             logger.error(f"Failed to load code page table {filepath}: {e}")
@@ -581,7 +645,7 @@ class EBCDICConverter:
         so_code = sosi_config.get('so_code', 0x0E)
         si_code = sosi_config.get('si_code', 0x0F)
         sosi_handling = sosi_config.get('sosi_handling', 'SPACE').upper()
-        japanese_encoding = sosi_config.get('japanese_encoding', 'utf-8')
+        dbcs_unicode_table = None
         
         result = []
         i = 0
@@ -623,9 +687,12 @@ class EBCDICConverter:
                             result.append(char)
                             i += 1
                         else:
-                            # Both bytes are valid DBCS data
-                            dbcs_char = self._convert_dbcs_char(data[i], data[i + 1], japanese_encoding)
-                            result.append(dbcs_char)
+                            # Both bytes are valid DBCS data: one table index per character
+                            if dbcs_unicode_table is None:
+                                dbcs_unicode_table = self.get_dbcs_unicode_table()
+                            dbcs_code = (byte_val << 8) | next_byte
+                            code_point = dbcs_unicode_table[dbcs_code]
+                            result.append(chr(code_point) if code_point else f'\\u{dbcs_code:04X}')
                             i += 2
                     else:
                         # Last byte in DBCS mode - treat as single byte
@@ -642,47 +709,19 @@ class EBCDICConverter:
         return ''.join(result)
     
     def _convert_dbcs_char(self, high_byte: int, low_byte: int, japanese_encoding: str = 'utf-8') -> str:
-        """Convert 2-byte JAK EBCDIC DBCS character using code page table"""
-        try:
-            # Calculate DBCS character code
-            dbcs_code = (high_byte << 8) | low_byte
-            
-            # Load JAK DBCS conversion table from code page file
-            jef_code = self._load_jak_dbcs_mapping(dbcs_code)
-            
-            if jef_code and jef_code != 0:
-                # Convert JEF code to Shift_JIS character
-                try:
-                    if jef_code == 0x8140:
-                        # Full-width space
-                        unicode_char = '\u3000'
-                    else:
-                        # Convert JEF code to Shift_JIS bytes
-                        high_jef = (jef_code >> 8) & 0xFF
-                        low_jef = jef_code & 0xFF
-                        sjis_bytes = bytes([high_jef, low_jef])
-                        unicode_char = sjis_bytes.decode('shift_jis', errors='replace')
-                    
-                    if japanese_encoding.lower() == 'sjis':
-                        try:
-                            # Return as Shift_JIS
-                            return unicode_char.encode('shift_jis', errors='replace').decode('shift_jis', errors='replace')
-                        except UnicodeEncodeError:
-                            return unicode_char
-                    else:
-                        # Return as UTF-8 (default)
-                        return unicode_char
-                        
-                except Exception as e:
-                    logger.warning(f"JEF to Shift_JIS conversion failed for {jef_code:04X}: {e}")
-                    return f'\\u{jef_code:04X}'
-            
-            # If no mapping found, express as hexadecimal
-            return f'\\u{dbcs_code:04X}'
-            
-        except Exception as e:
-            logger.warning(f"JAK EBCDIC DBCS conversion failed for {high_byte:02X}{low_byte:02X}: {e}")
-            return f'\\x{high_byte:02X}\\x{low_byte:02X}'
+        """
+        Convert 2-byte JAK EBCDIC DBCS character using code page table
+        
+        Every mapped character is representable in Shift_JIS, so the result
+        is the same for utf-8 and sjis output.
+        """
+        dbcs_code = (high_byte << 8) | low_byte
+        code_point = self.get_dbcs_unicode_table()[dbcs_code]
+        if code_point:
+            return chr(code_point)
+        
+        # If no mapping found, express as hexadecimal
+        return f'\\u{dbcs_code:04X}'
     
     def _is_japanese_dbcs_range(self, code: int) -> bool:
         """Check if code is in Japanese DBCS range"""
@@ -779,6 +818,319 @@ class EBCDICConverter:
         
         return result
 
+class EBCDICEncoder:
+    """
+    ASCII/UTF-8 to JAK EBCDIC encoder (inverse of EBCDICConverter)
+    
+    The forward conversion is lossy, so a round trip is not byte-exact in
+    general:
+    - REMOVE handling drops SO/SI, so adjacent DBCS runs separated only by
+      SI/SO are written back as one run.
+    - SO/SI codes that are printable characters (e.g. 0x28/0x29 are '(' and
+      ')') cannot be told apart from literal text under SOSI handling; every
+      such character is taken as a shift code (see sosi_collisions).
+    - Characters with several DBCS codes (326 in JEFASCK) are written back
+      with the single code ASCJEFK prefers.
+    - COMP-3 sign nibbles are normalized: signed pictures are written back
+      with C (positive) or D (negative), unsigned ones with F, so an F sign
+      on an S picture (e.g. ...5F in S9(7) COMP-3) comes back as C.
+    """
+    
+    def __init__(self, converter: EBCDICConverter):
+        self.converter = converter
+        
+        # SBCS inverse of the JAK table (SO/SI entries are control codes, not text)
+        self.sbcs_table = {char: code for code, char in converter.jak_table.items()
+                           if code not in (0x0E, 0x0F)}
+        # str.translate table for pure SBCS values: unmapped characters are
+        # deleted, so a length change sends the value to the slow path
+        self.sbcs_translate = {i: None for i in range(0x80)}
+        self.sbcs_translate.update({ord(char): chr(code) for char, code in self.sbcs_table.items()})
+        
+        self.dbcs_table = self._build_dbcs_table()
+        self.dbcs_translate = {ord(char): chr(code >> 8) + chr(code & 0xFF)
+                               for char, code in self.dbcs_table.items()}
+        
+        self.token_patterns = {}
+        
+        self.encoding_stats = {
+            'total_records': 0,
+            'unmapped_chars': 0,
+            'truncated_fields': 0,
+            'sosi_literals': 0
+        }
+    
+    def sosi_collisions(self, sosi_config: Optional[Dict]) -> List[str]:
+        """Kept SO/SI codes that are also printable SBCS text (ambiguous under SOSI handling)"""
+        if not sosi_config or sosi_config.get('sosi_handling', 'SPACE').upper() != 'SOSI':
+            return []
+        chars = (chr(sosi_config.get('so_code', 0x0E)), chr(sosi_config.get('si_code', 0x0F)))
+        return [char for char in chars if char in self.sbcs_table]
+    
+    def _build_dbcs_table(self) -> Dict[str, int]:
+        """Inverse DBCS table: character -> JAK DBCS code, consistent with _convert_dbcs_char"""
+        converter = self.converter
+        if 'JEFASCK_DBCS' not in converter.codepage_cache:
+            converter._load_codepage_table('JEFASCK.txt')
+        forward = converter.codepage_cache['JEFASCK_DBCS']
+        
+        # Prefer the code chosen by the ASCII->JEF table when a character has several codes
+        preferred = None
+        try:
+            if 'ASCJEFK_DBCS' not in converter.codepage_cache:
+                converter._load_codepage_table('ASCJEFK.txt')
+            preferred = converter.codepage_cache['ASCJEFK_DBCS']
+        except FileNotFoundError:
+            logger.warning("ASCJEFK.txt not found, using first JEF code for duplicate characters")
+        
+        table = {}
+        for dbcs_code, jef_code in enumerate(forward):
+            if not jef_code:
+                continue
+            if jef_code == 0x8140:
+                char = '\u3000'
+            else:
+                char = bytes([(jef_code >> 8) & 0xFF, jef_code & 0xFF]).decode('shift_jis', errors='replace')
+            if len(char) != 1 or char == '\ufffd':
+                continue
+            if char not in table or (preferred is not None and preferred[jef_code] == dbcs_code):
+                table[char] = dbcs_code
+        
+        logger.info(f"Built inverse DBCS table: {len(table)} characters")
+        return table
+    
+    def encode_display_field(self, value: str, length: int, sosi_config: Optional[Dict] = None,
+                             numeric: bool = False) -> bytes:
+        """Encode DISPLAY field text to EBCDIC, inserting SO/SI around DBCS runs"""
+        if numeric and len(value) < length and value.isdigit():
+            value = value.zfill(length)
+        
+        sosi_config = sosi_config or {}
+        
+        # Fast path: SBCS-only text is a single translate
+        if value.isascii() and not (sosi_config.get('sosi_handling', 'SPACE').upper() == 'SOSI' and
+                                    (chr(sosi_config.get('so_code', 0x0E)) in value or
+                                     chr(sosi_config.get('si_code', 0x0F)) in value)):
+            translated = value.translate(self.sbcs_translate)
+            if len(translated) == len(value):
+                return self._fit(translated.encode('latin-1'), length)
+        
+        return self._fit(self._encode_mixed(value, sosi_config, length), length)
+    
+    def _token_pattern(self, sosi_chars: str):
+        """
+        Tokenizer for mixed text: runs of SBCS characters, \\xNN / \\uXXXX escapes
+        written by EBCDICConverter for unmapped bytes, runs of other printable
+        characters, anything else. Kept SO/SI characters are never SBCS text
+        (0x28/0x29 are also '(' and ')').
+        """
+        pattern = self.token_patterns.get(sosi_chars)
+        if pattern is None:
+            sbcs_class = ''.join(re.escape(char) for char in self.sbcs_table if char not in sosi_chars)
+            pattern = re.compile(
+                rf'(?P<sbcs>[{sbcs_class}]+)'
+                r'|(?P<escape>\\(?:x(?P<sbcs_escape>[0-9A-Fa-f]{2})|u(?P<dbcs_escape>[0-9A-Fa-f]{4})))'
+                rf'|(?P<dbcs>[^{sbcs_class}{re.escape(sosi_chars)}\\\x00-\x1f\x7f]+)'
+                r'|(?P<other>.)',
+                re.DOTALL
+            )
+            self.token_patterns[sosi_chars] = pattern
+        return pattern
+    
+    def _segments(self, value: str, so_char: str, si_char: str, keep_sosi: bool):
+        """Split text into (kind, bytes) runs: S=SBCS, D=DBCS, X=raw byte, SO/SI=kept codes"""
+        pattern = self._token_pattern(so_char + si_char if keep_sosi else '')
+        for match in pattern.finditer(value):
+            kind = match.lastgroup
+            text = match.group()
+            if kind == 'sbcs':
+                yield 'S', text.translate(self.sbcs_translate).encode('latin-1')
+            elif kind == 'escape':
+                if match.group('sbcs_escape'):
+                    yield 'X', bytes([int(match.group('sbcs_escape'), 16)])
+                else:
+                    yield 'D', int(match.group('dbcs_escape'), 16).to_bytes(2, 'big')
+            elif kind == 'dbcs':
+                codes = text.translate(self.dbcs_translate)
+                if len(codes) == len(text) * 2:
+                    yield 'D', codes.encode('latin-1')
+                    continue
+                # Run contains characters without a DBCS code
+                for char in text:
+                    code = self.dbcs_table.get(char)
+                    if code is not None:
+                        yield 'D', code.to_bytes(2, 'big')
+                    else:
+                        self.encoding_stats['unmapped_chars'] += 1
+                        yield 'S', bytes([self.sbcs_table['?']])
+            elif keep_sosi and text == so_char:
+                yield 'SO', b''
+            elif keep_sosi and text == si_char:
+                yield 'SI', b''
+            else:
+                self.encoding_stats['unmapped_chars'] += 1
+                yield 'S', bytes([self.sbcs_table['?']])
+    
+    def _encode_mixed(self, value: str, sosi_config: Dict, length: int) -> bytearray:
+        """
+        Encode text with DBCS characters, escapes or control codes
+        
+        SO/SI are inserted around DBCS runs. With SPACE handling, the spaces
+        the forward conversion wrote for SO/SI become the codes again. Output
+        stops at the field length on a character boundary; a final SI that
+        does not fit is left out, as in the source data. A kept SI outside a
+        DBCS run cannot be a shift code and is written as the literal SBCS
+        character.
+        """
+        so_code = sosi_config.get('so_code', 0x0E)
+        si_code = sosi_config.get('si_code', 0x0F)
+        sosi_handling = sosi_config.get('sosi_handling', 'SPACE').upper()
+        space_sosi = sosi_handling == 'SPACE'
+        
+        out = bytearray()
+        dbcs_mode = False
+        trailing_space = False  # last byte is a space written for an SBCS ' '
+        truncated = False
+        
+        for kind, data in self._segments(value, chr(so_code), chr(si_code), sosi_handling == 'SOSI'):
+            if kind == 'D':
+                if not dbcs_mode:
+                    if space_sosi and trailing_space:
+                        out[-1] = so_code
+                    elif len(out) + 3 > length:
+                        truncated = True
+                        break
+                    else:
+                        out.append(so_code)
+                    dbcs_mode = True
+                room = (length - len(out)) // 2 * 2
+                out += data[:room]
+                trailing_space = False
+                if len(data) > room:
+                    truncated = True
+                    break
+            elif kind == 'S':
+                if dbcs_mode:
+                    if len(out) >= length:
+                        truncated = True
+                        break
+                    out.append(si_code)
+                    dbcs_mode = False
+                    if space_sosi and data[:1] == b'\x40':
+                        data = data[1:]
+                room = length - len(out)
+                out += data[:room]
+                if len(data) > room:
+                    truncated = True
+                    break
+                if data:
+                    trailing_space = data[-1] == 0x40
+            elif len(out) >= length:
+                truncated = True
+                break
+            elif kind == 'X':
+                out += data
+                trailing_space = False
+            elif kind == 'SO':
+                if not dbcs_mode:
+                    out.append(so_code)
+                    dbcs_mode = True
+                trailing_space = False
+            elif kind == 'SI':
+                if dbcs_mode:
+                    out.append(si_code)
+                    dbcs_mode = False
+                elif chr(si_code) in self.sbcs_table:
+                    self.encoding_stats['sosi_literals'] += 1
+                    out.append(self.sbcs_table[chr(si_code)])
+                trailing_space = False
+        
+        if dbcs_mode and len(out) < length:
+            out.append(si_code)
+        if truncated:
+            self.encoding_stats['truncated_fields'] += 1
+        return out
+    
+    def _fit(self, data: bytes, length: int) -> bytes:
+        """Pad with EBCDIC spaces or truncate to the field length"""
+        if len(data) < length:
+            return bytes(data) + b'\x40' * (length - len(data))
+        if len(data) > length:
+            self.encoding_stats['truncated_fields'] += 1
+            return bytes(data[:length])
+        return bytes(data)
+    
+    def encode_comp_field(self, value: Any, length: int) -> bytes:
+        """Encode COMP (big-endian binary) field"""
+        number = int(value or 0)
+        return (number & ((1 << (length * 8)) - 1)).to_bytes(length, 'big')
+    
+    def encode_comp3_field(self, value: Any, length: int, signed: bool = False) -> bytes:
+        """Encode COMP-3 (packed decimal) field; unsigned pictures use the F sign nibble"""
+        text = str(value).strip() if value is not None else '0'
+        negative = text.startswith('-')
+        digits = text if text.isdigit() else (''.join(c for c in text if c.isdigit()) or '0')
+        digit_count = length * 2 - 1
+        digits = digits[-digit_count:].zfill(digit_count)
+        if negative:
+            sign = 'd'
+        else:
+            sign = 'c' if signed else 'f'
+        return bytes.fromhex(digits + sign)
+    
+    def build_record_plan(self, fields: List[Dict], record_length: int) -> List[Tuple]:
+        """Per-field (name, start, length, type, signed, numeric) entries for encode_record"""
+        plan = []
+        for field in fields:
+            start = field['position'] - 1
+            if start >= record_length:
+                continue
+            picture = str(field.get('picture', '')).upper()
+            plan.append((
+                field['name'],
+                start,
+                min(field['length'], record_length - start),
+                field['type'],
+                picture.startswith('S'),
+                picture.lstrip('S').startswith('9')
+            ))
+        return plan
+    
+    def _encode_value(self, value: Any, field_type: str, length: int, signed: bool, numeric: bool,
+                      sosi_config: Optional[Dict]) -> bytes:
+        if value.__class__ is str and value.startswith('ERROR[') and value.endswith(']'):
+            # Raw bytes of a field the forward conversion could not convert
+            try:
+                return self._fit(bytes.fromhex(value[6:-1]), length)
+            except ValueError:
+                pass
+        
+        if field_type == 'COMP':
+            return self.encode_comp_field(value, length)
+        elif field_type == 'COMP-3':
+            return self.encode_comp3_field(value, length, signed)
+        else:
+            text = '' if value is None else str(value)
+            return self.encode_display_field(text, length, sosi_config, numeric)
+    
+    def encode_field_data(self, value: Any, field: Dict, sosi_config: Optional[Dict] = None) -> bytes:
+        """Encode field value according to its type"""
+        picture = str(field.get('picture', '')).upper()
+        return self._encode_value(value, field['type'], field['length'], picture.startswith('S'),
+                                  picture.lstrip('S').startswith('9'), sosi_config)
+    
+    def encode_record(self, record: Dict[str, Any], fields: List[Dict], record_length: int,
+                      sosi_config: Optional[Dict] = None, plan: Optional[List[Tuple]] = None) -> bytes:
+        """Encode one record to a fixed-length EBCDIC record (pass plan when encoding many)"""
+        if plan is None:
+            plan = self.build_record_plan(fields, record_length)
+        out = bytearray(b'\x40' * record_length)
+        for name, start, length, field_type, signed, numeric in plan:
+            data = self._encode_value(record.get(name), field_type, length, signed, numeric, sosi_config)
+            out[start:start + length] = data[:length]
+        self.encoding_stats['total_records'] += 1
+        return bytes(out)
+
 class OpenASPDatasetConverter:
     """Main converter class for OpenASP EBCDIC datasets"""
     
@@ -786,6 +1138,14 @@ class OpenASPDatasetConverter:
         self.catalog_manager = CatalogManager()
         self.layout_parser = LayoutParser()
         self.ebcdic_converter = EBCDICConverter()
+        self._ebcdic_encoder = None
+    
+    @property
+    def ebcdic_encoder(self) -> EBCDICEncoder:
+        """Reverse encoder, created on first use (builds the inverse DBCS table)"""
+        if self._ebcdic_encoder is None:
+            self._ebcdic_encoder = EBCDICEncoder(self.ebcdic_converter)
+        return self._ebcdic_encoder
     
     def convert_dataset(self, input_file: str, output_file: str, layout_file: str,
                        output_dataset_name: str = None, output_format: str = 'json',
@@ -915,6 +1275,103 @@ class OpenASPDatasetConverter:
             logger.error(f"Conversion failed: {e}")
             return False
     
+    def reverse_convert_dataset(self, input_file: str, output_file: str, layout_file: str,
+                                input_format: str = 'json', sosi_config: Optional[Dict] = None,
+                                schema_file: Optional[str] = None) -> bool:
+        """
+        Convert an ASCII/UTF-8 dataset back to JAK EBCDIC fixed-length records
+        
+        Input is the JSON or FLAT output of convert_dataset, read with the same
+        layout and sosi_config. The result is not byte-exact in general: see
+        EBCDICEncoder for the REMOVE, printable SO/SI, duplicate DBCS code and
+        COMP-3 sign nibble limits; a warning is logged when SOSI handling keeps
+        printable SO/SI codes.
+        """
+        try:
+            logger.info("=== OpenASP EBCDIC Dataset Reverse Conversion ===")
+            logger.info(f"Input file: {input_file}")
+            logger.info(f"Output file: {output_file}")
+            logger.info(f"Layout file: {layout_file}")
+            
+            if schema_file:
+                fields = self.layout_parser.load_json_schema(schema_file)
+            else:
+                fields = self.layout_parser.parse_layout_file(layout_file)
+            record_length = max(field['position'] + field['length'] - 1 for field in fields)
+            
+            if not os.path.exists(input_file):
+                raise FileNotFoundError(f"Input file not found: {input_file}")
+            
+            output_dir = os.path.dirname(output_file)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            
+            encoder = self.ebcdic_encoder
+            collisions = encoder.sosi_collisions(sosi_config)
+            if collisions:
+                logger.warning(f"SO/SI codes {', '.join(repr(char) for char in collisions)} are also "
+                               f"text characters: literal occurrences are taken as shift codes")
+            plan = encoder.build_record_plan(fields, record_length)
+            records_written = 0
+            with open(output_file, 'wb', buffering=1024 * 1024) as f:
+                for record in self._iter_reverse_records(input_file, input_format, fields, sosi_config):
+                    f.write(encoder.encode_record(record, fields, record_length, sosi_config, plan))
+                    records_written += 1
+                    if records_written % 10000 == 0:
+                        logger.info(f"Written: {records_written} records")
+            
+            stats = encoder.encoding_stats
+            logger.info(f"Reverse conversion completed: {output_file}")
+            logger.info(f"Records written: {records_written} ({records_written * record_length} bytes)")
+            if stats['unmapped_chars']:
+                logger.warning(f"Unmapped characters replaced with '?': {stats['unmapped_chars']}")
+            if stats['truncated_fields']:
+                logger.warning(f"Fields truncated to layout length: {stats['truncated_fields']}")
+            if stats['sosi_literals']:
+                logger.warning(f"Unpaired SI characters written as text: {stats['sosi_literals']}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Reverse conversion failed: {e}")
+            return False
+    
+    def _iter_reverse_records(self, input_file: str, input_format: str, fields: List[Dict],
+                              sosi_config: Optional[Dict] = None):
+        """Yield record dicts from a JSON or FLAT converted dataset"""
+        if input_format.lower() != 'flat':
+            with open(input_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            records = data.get('records', []) if isinstance(data, dict) else data
+            for record in records:
+                yield record
+            return
+        
+        # FLAT: fixed-length text records in the encoding _write_flat_format used
+        text_encoding = 'shift_jis'
+        if sosi_config and sosi_config.get('japanese_encoding') == 'utf-8':
+            text_encoding = 'utf-8'
+        flat_length = sum(field['length'] for field in fields)
+        slices = []
+        offset = 0
+        for field in fields:
+            slices.append((field, offset, offset + field['length']))
+            offset += field['length']
+        
+        with open(input_file, 'rb', buffering=1024 * 1024) as f:
+            while True:
+                data = f.read(flat_length)
+                if len(data) < flat_length:
+                    if data:
+                        logger.warning(f"Last {len(data)} bytes ignored (incomplete record)")
+                    break
+                record = {}
+                for field, start, end in slices:
+                    value = data[start:end].decode(text_encoding, errors='replace')
+                    if field['type'] in ['COMP', 'COMP-3']:
+                        value = value.strip() or '0'
+                    record[field['name']] = value
+                yield record
+    
     def _write_flat_format(self, output_file: str, records: List[Dict], fields: List[Dict], sosi_config: Optional[Dict] = None):
         """Write records in FLAT format based on COBOL layout - Fixed Block without newlines"""
         try:
@@ -1057,12 +1514,14 @@ def main():
         description='OpenASP EBCDIC Dataset Converter with PostgreSQL Support',
         epilog='Note: Use --catalog-name to register the converted dataset in the catalog. Arguments can be provided in any order.'
     )
-    parser.add_argument('input_file', help='Input EBCDIC file path')
-    parser.add_argument('output_file', help='Output ASCII file path')
+    parser.add_argument('input_file', help='Input EBCDIC file path (converted ASCII file with --reverse)')
+    parser.add_argument('output_file', help='Output ASCII file path (EBCDIC file with --reverse)')
     parser.add_argument('layout_file', help='COBOL layout file path')
     parser.add_argument('--catalog-name', help='Dataset name for catalog registration (required for cataloging)', required=False)
     parser.add_argument('--format', choices=['json', 'flat'], default='json', 
-                       help='Output format (default: json)')
+                       help='Output format (default: json); input format with --reverse')
+    parser.add_argument('--reverse', action='store_true',
+                       help='Convert a converted ASCII/UTF-8 dataset back to JAK EBCDIC')
     
     # SOSI options
     parser.add_argument('--so-code', default='0x0E', 
@@ -1110,6 +1569,21 @@ def main():
         print("Using JSON catalog backend (PostgreSQL not available)")
     
     converter = OpenASPDatasetConverter()
+    if args.reverse:
+        success = converter.reverse_convert_dataset(
+            args.input_file,
+            args.output_file,
+            args.layout_file,
+            args.format,
+            sosi_config,
+            args.schema
+        )
+        if success:
+            print(f"\nReverse conversion completed successfully: {args.output_file}")
+            sys.exit(0)
+        print("\nReverse conversion failed")
+        sys.exit(1)
+    
     success = converter.convert_dataset(
         args.input_file, 
         args.output_file, 
@@ -7,10 +7,12 @@ Python EBCDIC Conversion Service API
 
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import logging
+import threading
 
 # Add project root to path
 project_root = Path(__file__).parent
@@ -40,6 +42,248 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Worker pool for binary/batch conversions (one process per core)
+CONVERSION_WORKERS = int(os.environ.get('CONVERSION_WORKERS', os.cpu_count() or 1))
+BATCH_CHUNK_SIZE = int(os.environ.get('CONVERSION_CHUNK_SIZE', 1024 * 1024))  # bytes per worker task
+STREAM_READ_SIZE = 64 * 1024
+STREAM_TRAILER_SIZE = 64  # status block ending every streamed conversion body
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """Process pool sized to the cores, created on first batch request"""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = ProcessPoolExecutor(max_workers=CONVERSION_WORKERS)
+            logger.info(f"Conversion worker pool started: {CONVERSION_WORKERS} workers")
+        return _worker_pool
+
+
+def _parse_code(value):
+    """SOSI code from a query parameter ('0x28', '40' or None)"""
+    if value is None or value == '':
+        return None
+    try:
+        code = int(value, 16) if value.lower().startswith('0x') else int(value)
+    except ValueError:
+        raise ValueError(f"Invalid SOSI code: {value}")
+    if not 0 <= code <= 0xFF:
+        raise ValueError(f"SOSI code out of range: {value}")
+    return code
+
+
+def _binary_options():
+    """Conversion options of a binary request (query string parameters)"""
+    args = request.args
+    rlen = args.get('rlen', type=int)
+    sosi_handling = args.get('sosi_handling', 'remove')
+    return {
+        'encoding': args.get('encoding', 'US'),
+        'sosi_flag': args.get('sosi_flag', 'false').lower() in ('1', 'true', 'yes'),
+        'out_sosi_flag': sosi_handling == 'keep',
+        'sosi_handling': sosi_handling,
+        'sosi_so': _parse_code(args.get('sosi_so')),
+        'sosi_si': _parse_code(args.get('sosi_si')),
+        'rlen': rlen,
+        'layout': args.get('layout') or request.headers.get('X-Layout'),
+        'text_encoding': args.get('text_encoding', 'utf-8'),
+        'record_separator': args.get('record_separator', 'newline') == 'newline'
+    }
+
+
+def _ebcdic_result_bytes(result):
+    """ASCII_TO_EBCDIC output (hex string or bytes) as raw bytes"""
+    if isinstance(result, (bytes, bytearray)):
+        return bytes(result)
+    try:
+        return bytes.fromhex(result)
+    except ValueError:
+        return result.encode('latin-1', errors='replace')
+
+
+def convert_records(direction, data, options):
+    """
+    Convert a buffer of fixed-length records (runs in a pool worker)
+
+    For ebcdic-to-ascii data is bytes and rlen counts bytes; for
+    ascii-to-ebcdic data is the decoded text and rlen counts characters,
+    so multi-byte characters never straddle a record boundary.
+
+    Returns:
+        Converted bytes: text records for ebcdic-to-ascii (newline separated
+        unless record_separator is off), raw EBCDIC for ascii-to-ebcdic
+    """
+    if converter is None:
+        raise RuntimeError('EBCDIC converter not available')
+
+    rlen = options['rlen'] or len(data)
+    text_encoding = options['text_encoding']
+    output = []
+    for start in range(0, len(data), rlen):
+        record = data[start:start + rlen]
+        if direction == 'ebcdic-to-ascii':
+            result = converter.EBCDIC_TO_ASCII(
+                input_data=record.hex(),
+                output_buffer=None,
+                encoding=options['encoding'],
+                sosi_flag=options['sosi_flag'],
+                out_sosi_flag=options['out_sosi_flag'],
+                rlen=len(record),
+                layout=options['layout'],
+                sosi_so=options['sosi_so'],
+                sosi_si=options['sosi_si']
+            )
+            if options['sosi_handling'] == 'space' and options['sosi_flag']:
+                result = result.replace('\x0E', ' ').replace('\x0F', ' ')
+            output.append(result.encode(text_encoding, errors='replace'))
+            if options['record_separator']:
+                output.append(b'\n')
+        else:
+            result = converter.ASCII_TO_EBCDIC(
+                input_data=record,
+                output_buffer=None,
+                encoding=options['encoding'],
+                sosi_flag=options['sosi_flag'],
+                out_sosi_flag=options['out_sosi_flag'],
+                rlen=len(record),
+                layout=options['layout']
+            )
+            output.append(_ebcdic_result_bytes(result))
+    return b''.join(output)
+
+
+def _read_body():
+    """Read an application/octet-stream body without buffering it twice"""
+    stream = request.stream
+    chunks = []
+    while True:
+        chunk = stream.read(STREAM_READ_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def _stream_trailer(status, records, error=None):
+    """
+    Status block ending a streamed body: '#OFASP-STATUS OK records=N' or
+    '#OFASP-STATUS ERROR records=N error=...', space padded to
+    STREAM_TRAILER_SIZE bytes and ending in a newline
+    """
+    text = f"#OFASP-STATUS {status} records={records}"
+    if error:
+        text += f" error={error}"
+    block = text.encode('ascii', errors='replace')[:STREAM_TRAILER_SIZE - 1]
+    return block.ljust(STREAM_TRAILER_SIZE - 1) + b'\n'
+
+
+def _stream_conversion(direction, data, options):
+    """
+    Chunked response of a conversion: the buffer is split on record
+    boundaries, converted in the worker pool and streamed back in order.
+
+    The first chunk is converted before the response starts, so a request
+    that cannot be converted at all still gets an error status. The body
+    ends with a STREAM_TRAILER_SIZE byte status block (see _stream_trailer);
+    a failure after the headers are sent is reported there instead of
+    leaving the client with a silently truncated body.
+    """
+    rlen = options['rlen'] or len(data) or 1
+    chunk_size = max(1, BATCH_CHUNK_SIZE // rlen) * rlen
+    chunks = [data[offset:offset + chunk_size] for offset in range(0, len(data), chunk_size)]
+    # Small requests stay in this process (no inter-process copy)
+    first = convert_records(direction, chunks[0], options) if chunks else b''
+
+    def generate():
+        records = len(chunks[0]) // rlen if chunks else 0
+        yield first
+        rest = chunks[1:]
+        try:
+            if rest:
+                pool = get_worker_pool()
+                converted_chunks = pool.map(convert_records, [direction] * len(rest), rest,
+                                            [options] * len(rest))
+                for chunk, converted in zip(rest, converted_chunks):
+                    yield converted
+                    records += len(chunk) // rlen
+        except Exception as e:
+            logger.error(f"Binary conversion {direction} failed after {records} records: {e}")
+            yield _stream_trailer('ERROR', records, str(e))
+            return
+        yield _stream_trailer('OK', records)
+
+    headers = {
+        'X-Record-Length': str(rlen),
+        'X-Record-Count': str(len(data) // rlen if rlen else 0),
+        'X-Conversion-Trailer': str(STREAM_TRAILER_SIZE)
+    }
+    return Response(stream_with_context(generate()), mimetype='application/octet-stream', headers=headers)
+
+
+def _binary_conversion(direction, require_rlen=False):
+    """Handle a binary (application/octet-stream) conversion request"""
+    if not converter:
+        return jsonify({
+            'success': False,
+            'error': 'EBCDIC converter not available'
+        }), 500
+
+    try:
+        options = _binary_options()
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    data = _read_body()
+    if not data:
+        return jsonify({
+            'success': False,
+            'error': 'Request body is empty'
+        }), 400
+    if require_rlen and not options['rlen']:
+        return jsonify({
+            'success': False,
+            'error': 'rlen is required'
+        }), 400
+    if options['rlen'] is not None and options['rlen'] <= 0:
+        return jsonify({
+            'success': False,
+            'error': f"Invalid rlen: {options['rlen']}"
+        }), 400
+
+    size = len(data)
+    if direction == 'ascii-to-ebcdic':
+        # Text input: records are rlen characters, never split inside a character
+        try:
+            data = data.decode(options['text_encoding'])
+        except (LookupError, UnicodeDecodeError) as e:
+            return jsonify({
+                'success': False,
+                'error': f"Body is not valid {options['text_encoding']} text: {e}"
+            }), 400
+    if options['rlen'] and len(data) % options['rlen']:
+        unit = 'characters' if direction == 'ascii-to-ebcdic' else 'bytes'
+        return jsonify({
+            'success': False,
+            'error': f"Body length {len(data)} {unit} is not a multiple of rlen {options['rlen']}"
+        }), 400
+
+    logger.info(f"Binary conversion {direction}: encoding={options['encoding']}, "
+                f"rlen={options['rlen']}, bytes={size}")
+    try:
+        return _stream_conversion(direction, data, options)
+    except Exception as e:
+        logger.error(f"Binary conversion {direction} failed: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 app = Flask(__name__)
 CORS(app, origins=[
     'http://localhost:3005', 
@@ -68,13 +312,18 @@ def get_info():
             'error_handling_modes': ['replace', 'ignore', 'strict'],
             'max_input_size': 1024 * 1024,  # 1MB
             'default_encoding': 'US',
-            'default_record_length': 80
+            'default_record_length': 80,
+            'binary_content_type': 'application/octet-stream',
+            'batch_chunk_size': BATCH_CHUNK_SIZE,
+            'workers': CONVERSION_WORKERS
         }
     })
 
 @app.route('/api/v1/convert/ebcdic-to-ascii', methods=['POST'])
 def convert_ebcdic_to_ascii():
-    """Convert EBCDIC to ASCII"""
+    """Convert EBCDIC to ASCII (hex JSON, or raw bytes with application/octet-stream)"""
+    if request.mimetype == 'application/octet-stream':
+        return _binary_conversion('ebcdic-to-ascii')
     try:
         if not converter:
             return jsonify({
@@ -187,7 +436,9 @@ def convert_ebcdic_to_ascii():
 
 @app.route('/api/v1/convert/ascii-to-ebcdic', methods=['POST'])
 def convert_ascii_to_ebcdic():
-    """Convert ASCII to EBCDIC"""
+    """Convert ASCII to EBCDIC (JSON, or raw bytes with application/octet-stream)"""
+    if request.mimetype == 'application/octet-stream':
+        return _binary_conversion('ascii-to-ebcdic')
     try:
         if not converter:
             return jsonify({
@@ -258,6 +509,27 @@ def convert_ascii_to_ebcdic():
             'error': f'Request processing failed: {str(e)}'
         }), 500
 
+@app.route('/api/v1/convert/batch', methods=['POST'])
+def convert_batch():
+    """
+    Convert a multi-record dataset
+
+    Body: application/octet-stream, fixed-length records
+    Query: direction (ebcdic-to-ascii | ascii-to-ebcdic), rlen (required;
+           bytes for ebcdic-to-ascii, characters for ascii-to-ebcdic),
+           layout, encoding, sosi_flag, sosi_handling, sosi_so, sosi_si,
+           text_encoding, record_separator (newline | none)
+    Response: chunked application/octet-stream ending with an
+              X-Conversion-Trailer byte status block (_stream_trailer)
+    """
+    direction = request.args.get('direction', 'ebcdic-to-ascii')
+    if direction not in ('ebcdic-to-ascii', 'ascii-to-ebcdic'):
+        return jsonify({
+            'success': False,
+            'error': f'Unsupported direction: {direction}'
+        }), 400
+    return _binary_conversion(direction, require_rlen=True)
+
 if __name__ == '__main__':
     port = int(os.environ.get('FLASK_PORT', 3003))
     
@@ -271,6 +543,8 @@ if __name__ == '__main__':
     print("  GET  /api/v1/info")
     print("  POST /api/v1/convert/ebcdic-to-ascii")
     print("  POST /api/v1/convert/ascii-to-ebcdic")
+    print("  POST /api/v1/convert/batch")
+    print(f"Conversion workers: {CONVERSION_WORKERS}")
     print("=" * 60)
     
-    app.run(host='0.0.0.0', port=port, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, debug=True, threaded=True)
\ No newline at end of file
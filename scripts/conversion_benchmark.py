@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Conversion Benchmark Suite
+
+Generates reproducible synthetic JAK EBCDIC datasets and measures the
+throughput of the EBCDIC/SJIS conversion paths (dataset converters, CTTFILE
+CONV, SMED encoding helpers). Results are written as JSON so runs on
+different commits can be compared.
+
+Usage:
+    python scripts/conversion_benchmark.py --records 20000 --output bench.json
+    python scripts/conversion_benchmark.py --dbcs-density 0.5 --compare bench.json
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / 'server'))
+sys.path.insert(0, str(project_root / 'server' / 'system-cmds'))
+os.environ.setdefault('CODEPAGE_BASE_PATH', str(project_root / 'public' / 'codepages'))
+
+# EBCDIC characters used for generated SBCS text
+SBCS_LETTERS = bytes(range(0xC1, 0xCA)) + bytes(range(0xD1, 0xDA)) + bytes(range(0xE2, 0xEA))
+SBCS_DIGITS = bytes(range(0xF0, 0xFA))
+SBCS_TEXT = SBCS_LETTERS + SBCS_DIGITS + b'\x40' * 6
+
+# JEF kanji level 1 rows (JIS X 0208 rows 16-47, all mapped)
+DBCS_ROWS = range(0xB0, 0xD0)
+DBCS_CELLS = range(0xA1, 0xFF)
+
+
+@dataclass
+class DatasetSpec:
+    """Shape of a synthetic dataset; the same spec and seed give the same bytes"""
+    records: int = 20000
+    record_length: int = 200
+    display_ratio: float = 0.7
+    comp_ratio: float = 0.1
+    comp3_ratio: float = 0.2
+    dbcs_density: float = 0.3  # share of DISPLAY fields holding DBCS text
+    sosi_frequency: int = 1  # DBCS runs (SO ... SI) per DBCS field
+    so_code: int = 0x0E
+    si_code: int = 0x0F
+    seed: int = 20240401
+
+
+def generate_layout(spec: DatasetSpec) -> List[Dict[str, Any]]:
+    """Field list filling exactly record_length bytes"""
+    rng = random.Random(spec.seed)
+    fields = []
+    position = 1
+    weights = [spec.display_ratio, spec.comp_ratio, spec.comp3_ratio]
+    while position <= spec.record_length:
+        remaining = spec.record_length - position + 1
+        kind = rng.choices(['DISPLAY', 'COMP', 'COMP-3'], weights)[0]
+        if kind == 'COMP':
+            digits = rng.choice([4, 9])
+            picture, length = f'9({digits})', 2 if digits <= 4 else 4
+        elif kind == 'COMP-3':
+            digits = rng.choice([5, 7, 9])
+            picture, length = f'S9({digits})', (digits + 1) // 2
+        else:
+            length = rng.randint(4, 30)
+            picture = f'X({length})'
+        if length > remaining or remaining - length < 4:
+            kind, length, picture = 'DISPLAY', remaining, f'X({remaining})'
+        fields.append({
+            'name': f'FLD{len(fields) + 1:03d}',
+            'type': kind,
+            'picture': picture,
+            'length': length,
+            'position': position
+        })
+        position += length
+    return fields
+
+
+def layout_text(fields: List[Dict[str, Any]]) -> str:
+    """COBOL copybook for the generated layout"""
+    lines = ['      * Synthetic benchmark layout', '       01  BENCH-RECORD.']
+    for field in fields:
+        usage = f" {field['type']}" if field['type'] != 'DISPLAY' else ''
+        lines.append(f"           03  {field['name']}  PIC {field['picture']}{usage}.")
+    return '\n'.join(lines) + '\n'
+
+
+def _display_bytes(rng: random.Random, length: int, spec: DatasetSpec) -> bytes:
+    if length < 4 or rng.random() >= spec.dbcs_density:
+        return bytes(rng.choice(SBCS_TEXT) for _ in range(length))
+    out = bytearray()
+    runs = max(1, spec.sosi_frequency)
+    for run in range(runs):
+        # Each run: a few SBCS bytes, SO, DBCS pairs, SI
+        budget = (length - len(out)) // (runs - run)
+        sbcs = rng.randint(0, min(3, max(0, budget - 4)))
+        pairs = (budget - sbcs - 2) // 2
+        if pairs <= 0:
+            break
+        out += bytes(rng.choice(SBCS_TEXT) for _ in range(sbcs))
+        out.append(spec.so_code)
+        for _ in range(pairs):
+            out += bytes([rng.choice(DBCS_ROWS), rng.choice(DBCS_CELLS)])
+        out.append(spec.si_code)
+    return bytes(out) + b'\x40' * (length - len(out))
+
+
+def _packed_bytes(rng: random.Random, length: int, signed: bool) -> bytes:
+    # C/D signs for S pictures and F for unsigned ones, as COBOL writes them
+    digits = ''.join(str(rng.randint(0, 9)) for _ in range(length * 2 - 1))
+    return bytes.fromhex(digits + (rng.choice('cd') if signed else 'f'))
+
+
+def generate_dataset(spec: DatasetSpec, fields: List[Dict[str, Any]], path: str) -> int:
+    """Write spec.records fixed-length JAK records; returns bytes written"""
+    rng = random.Random(spec.seed + 1)
+    with open(path, 'wb', buffering=1024 * 1024) as f:
+        for _ in range(spec.records):
+            record = bytearray()
+            for field in fields:
+                if field['type'] == 'COMP':
+                    record += rng.getrandbits(field['length'] * 8).to_bytes(field['length'], 'big')
+                elif field['type'] == 'COMP-3':
+                    record += _packed_bytes(rng, field['length'], field['picture'].startswith('S'))
+                else:
+                    record += _display_bytes(rng, field['length'], spec)
+            f.write(record)
+    return spec.records * spec.record_length
+
+
+def generate_sjis_dataset(spec: DatasetSpec, path: str) -> int:
+    """Fixed-length SJIS text records (CTTFILE CONV input)"""
+    rng = random.Random(spec.seed + 2)
+    ascii_chars = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789     '
+    kanji = [bytes([0x88 + row, cell]) for row in range(0, 8) for cell in range(0x9F, 0xFD)]
+    with open(path, 'wb', buffering=1024 * 1024) as f:
+        for _ in range(spec.records):
+            record = bytearray()
+            while len(record) < spec.record_length - 1:
+                if rng.random() < spec.dbcs_density:
+                    record += rng.choice(kanji)
+                else:
+                    record += rng.choice(ascii_chars).encode('ascii')
+            f.write(bytes(record).ljust(spec.record_length, b' ')[:spec.record_length])
+    return spec.records * spec.record_length
+
+
+class BenchmarkContext:
+    """Generated files shared by the benchmarks of one run"""
+
+    def __init__(self, spec: DatasetSpec, workdir: str):
+        self.spec = spec
+        self.workdir = workdir
+        self.fields = generate_layout(spec)
+        self.layout_file = os.path.join(workdir, 'BENCH.LAYOUT')
+        with open(self.layout_file, 'w', encoding='utf-8') as f:
+            f.write(layout_text(self.fields))
+        self.ebcdic_file = os.path.join(workdir, 'BENCH.ebc')
+        self.ebcdic_size = generate_dataset(spec, self.fields, self.ebcdic_file)
+        self.sjis_file = os.path.join(workdir, 'BENCH.sjis')
+        self.sjis_size = generate_sjis_dataset(spec, self.sjis_file)
+        self.sosi_config = {
+            'so_code': spec.so_code,
+            'si_code': spec.si_code,
+            'sosi_handling': 'SPACE',
+            'japanese_encoding': 'utf-8'
+        }
+
+    def output(self, name: str) -> str:
+        return os.path.join(self.workdir, name)
+
+    def read_records(self, path: str) -> List[bytes]:
+        length = self.spec.record_length
+        with open(path, 'rb') as f:
+            data = f.read()
+        return [data[i:i + length] for i in range(0, len(data), length)]
+
+
+# Each benchmark returns (bytes processed, records processed), plus the
+# seconds of its timed section when setup must not be counted
+
+def bench_convert_record(ctx: BenchmarkContext) -> Tuple[int, int]:
+    from ebcdic_dataset_converter import EBCDICConverter, LayoutParser
+    fields = LayoutParser().parse_layout_file(ctx.layout_file)
+    converter = EBCDICConverter()
+    records = ctx.read_records(ctx.ebcdic_file)
+    for record in records:
+        converter.convert_record(record, fields, ctx.sosi_config)
+    return ctx.ebcdic_size, len(records)
+
+
+def bench_convert_dataset(ctx: BenchmarkContext) -> Tuple[int, int]:
+    from ebcdic_dataset_converter import OpenASPDatasetConverter
+    converter = OpenASPDatasetConverter()
+    if not converter.convert_dataset(ctx.ebcdic_file, ctx.output('dataset.json'), ctx.layout_file,
+                                     sosi_config=ctx.sosi_config):
+        raise RuntimeError('convert_dataset failed')
+    return ctx.ebcdic_size, ctx.spec.records
+
+
+def bench_reverse_dataset(ctx: BenchmarkContext) -> Tuple[int, int]:
+    from ebcdic_dataset_converter import OpenASPDatasetConverter
+    converter = OpenASPDatasetConverter()
+    json_file = ctx.output('reverse-input.json')
+    if not converter.convert_dataset(ctx.ebcdic_file, json_file, ctx.layout_file, sosi_config=ctx.sosi_config):
+        raise RuntimeError('convert_dataset failed')
+    started = time.perf_counter()
+    if not converter.reverse_convert_dataset(json_file, ctx.output('reverse.ebc'), ctx.layout_file,
+                                             sosi_config=ctx.sosi_config):
+        raise RuntimeError('reverse_convert_dataset failed')
+    return ctx.ebcdic_size, ctx.spec.records, time.perf_counter() - started
+
+
+def bench_ebcdic_converter_tool(ctx: BenchmarkContext) -> Tuple[int, int]:
+    from ebcdic_converter import ConversionConfig, EBCDICConverter
+    config = ConversionConfig(
+        input_file=ctx.ebcdic_file,
+        output_file=ctx.output('tool.out'),
+        layout_file=ctx.layout_file,
+        record_length=ctx.spec.record_length,
+        encoding='JAK',
+        sosi_so=ctx.spec.so_code,
+        sosi_si=ctx.spec.si_code
+    )
+    EBCDICConverter(config).convert_dataset()
+    return ctx.ebcdic_size, ctx.spec.records
+
+
+def bench_jak_codec(ctx: BenchmarkContext) -> Tuple[int, int]:
+    import codecs
+    import japanese_codecs  # noqa: F401 - registers the codecs
+    decoder = codecs.getincrementaldecoder('jak')(errors='replace')
+    with open(ctx.ebcdic_file, 'rb') as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+            decoder.decode(chunk)
+    decoder.decode(b'', True)
+    return ctx.ebcdic_size, ctx.spec.records
+
+
+def bench_cttfile_convert(ctx: BenchmarkContext) -> Tuple[int, int]:
+    try:
+        from asp_commands import _cttfile_convert
+    except Exception as e:
+        raise _Skipped(f'asp_commands not importable: {e}')
+    _cttfile_convert(ctx.sjis_file, ctx.output('cttfile.out'), 'shift_jis', 'utf-8', 'FB', ctx.spec.record_length)
+    return ctx.sjis_size, ctx.spec.records
+
+
+def bench_smed_field_codec(ctx: BenchmarkContext) -> Tuple[int, int]:
+    from smed_field_codec import SMEDFieldCodec
+    codec = SMEDFieldCodec()
+    records = ctx.read_records(ctx.sjis_file)
+    # One "screen" per record: the record split into 10 fields
+    width = max(1, ctx.spec.record_length // 10)
+    for record in records:
+        codec.convert_many([record[i:i + width] for i in range(0, len(record), width)], 'sjis', 'utf-8')
+    return ctx.sjis_size, len(records)
+
+
+def bench_smart_decode(ctx: BenchmarkContext) -> Tuple[int, int]:
+    from encoding_manager import ConversionContext, DestinationType, smart_encoding_manager
+    context = ConversionContext(DestinationType.WEB_UI, source_encoding='shift_jis')
+    records = ctx.read_records(ctx.sjis_file)
+    for record in records:
+        smart_encoding_manager.smart_decode(record, context)
+    return ctx.sjis_size, len(records)
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Tuple]] = {
+    'convert_record': bench_convert_record,
+    'convert_dataset': bench_convert_dataset,
+    'reverse_dataset': bench_reverse_dataset,
+    'ebcdic_converter_tool': bench_ebcdic_converter_tool,
+    'jak_codec': bench_jak_codec,
+    'cttfile_convert': bench_cttfile_convert,
+    'smed_field_codec': bench_smed_field_codec,
+    'smart_decode': bench_smart_decode
+}
+
+
+class _Skipped(Exception):
+    """Benchmark cannot run in this environment"""
+
+
+def _run_once(name: str, ctx: BenchmarkContext) -> Dict[str, Any]:
+    logging.disable(logging.WARNING)
+    started = time.perf_counter()
+    try:
+        result = BENCHMARKS[name](ctx)
+        seconds = result[2] if len(result) > 2 else time.perf_counter() - started
+        nbytes, records = result[0], result[1]
+    except _Skipped as e:
+        return {'skipped': str(e)}
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_rss_kb //= 1024
+    return {
+        'seconds': round(seconds, 6),
+        'bytes': nbytes,
+        'records': records,
+        'mb_per_s': round(nbytes / seconds / 1e6, 3) if seconds else None,
+        'records_per_s': round(records / seconds, 1) if seconds else None,
+        'peak_rss_kb': peak_rss_kb
+    }
+
+
+def _child(name: str, ctx: BenchmarkContext, conn):
+    try:
+        conn.send(_run_once(name, ctx))
+    except Exception as e:
+        conn.send({'error': f'{type(e).__name__}: {e}'})
+    finally:
+        conn.close()
+
+
+def run_benchmark(name: str, ctx: BenchmarkContext, repeat: int = 3, isolate: bool = True) -> Dict[str, Any]:
+    """Best of `repeat` runs; each run in a forked process so peak RSS is per benchmark"""
+    best = None
+    for _ in range(repeat):
+        if isolate:
+            mp = multiprocessing.get_context('fork')
+            parent_conn, child_conn = mp.Pipe(duplex=False)
+            process = mp.Process(target=_child, args=(name, ctx, child_conn))
+            process.start()
+            child_conn.close()
+            result = parent_conn.recv() if parent_conn.poll(None) else {'error': 'no result'}
+            process.join()
+        else:
+            try:
+                result = _run_once(name, ctx)
+            except Exception as e:
+                result = {'error': f'{type(e).__name__}: {e}'}
+        if 'seconds' not in result:
+            return result
+        if best is None or result['seconds'] < best['seconds']:
+            best = result
+    return best
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=str(project_root),
+                              capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Throughput change per benchmark against a previous report"""
+    lines = []
+    for name, result in results['results'].items():
+        before = baseline.get('results', {}).get(name, {})
+        if 'mb_per_s' not in result or not before.get('mb_per_s'):
+            continue
+        ratio = result['mb_per_s'] / before['mb_per_s']
+        lines.append(f"{name:24} {before['mb_per_s']:10.3f} -> {result['mb_per_s']:10.3f} MB/s  ({ratio:.2f}x)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EBCDIC/SJIS conversion benchmarks')
+    defaults = DatasetSpec()
+    parser.add_argument('--records', type=int, default=defaults.records)
+    parser.add_argument('--record-length', type=int, default=defaults.record_length)
+    parser.add_argument('--display-ratio', type=float, default=defaults.display_ratio)
+    parser.add_argument('--comp-ratio', type=float, default=defaults.comp_ratio)
+    parser.add_argument('--comp3-ratio', type=float, default=defaults.comp3_ratio)
+    parser.add_argument('--dbcs-density', type=float, default=defaults.dbcs_density)
+    parser.add_argument('--sosi-frequency', type=int, default=defaults.sosi_frequency)
+    parser.add_argument('--so-code', default='0x0E', help='Shift Out code (default: 0x0E)')
+    parser.add_argument('--si-code', default='0x0F', help='Shift In code (default: 0x0F)')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark, best is reported')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), help='Benchmarks to run')
+    parser.add_argument('--no-isolate', action='store_true', help='Run in-process (peak RSS is cumulative)')
+    parser.add_argument('--workdir', help='Directory for generated data (default: temporary)')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--compare', help='Previous JSON report to compare against')
+    args = parser.parse_args()
+
+    spec = DatasetSpec(
+        records=args.records,
+        record_length=args.record_length,
+        display_ratio=args.display_ratio,
+        comp_ratio=args.comp_ratio,
+        comp3_ratio=args.comp3_ratio,
+        dbcs_density=args.dbcs_density,
+        sosi_frequency=args.sosi_frequency,
+        so_code=int(args.so_code, 16),
+        si_code=int(args.si_code, 16),
+        seed=args.seed
+    )
+
+    with tempfile.TemporaryDirectory(prefix='conversion-bench-', dir=args.workdir) as workdir:
+        print(f"Generating {spec.records} records x {spec.record_length} bytes in {workdir}", file=sys.stderr)
+        ctx = BenchmarkContext(spec, workdir)
+        report = {
+            'timestamp': datetime.now().isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'spec': asdict(spec),
+            'fields': len(ctx.fields),
+            'results': {}
+        }
+        for name in args.only or BENCHMARKS:
+            print(f"Running {name} ...", file=sys.stderr)
+            report['results'][name] = run_benchmark(name, ctx, args.repeat, not args.no_isolate)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    print(output)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\nCompared with {baseline.get('git_commit')} ({baseline.get('timestamp')}):", file=sys.stderr)
+        for line in compare(report, baseline):
+            print(line, file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,6 +9,7 @@ Fixed configuration loading and error handling
 import os
 import sys
 import json
+import fnmatch
 import subprocess
 import threading
 import time
@@ -65,6 +66,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Import shared compiled SMED map cache
+try:
+    from smed_map_cache import smed_map_cache
+    SMED_MAP_CACHE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"SMED map cache not available: {e}")
+    SMED_MAP_CACHE_AVAILABLE = False
+
+# Import write-behind persistence for workstation sessions
+try:
+    from session_persistence import WriteBehindSessionStore
+    SESSION_PERSISTENCE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Write-behind session persistence not available: {e}")
+    SESSION_PERSISTENCE_AVAILABLE = False
+
+# Import SMED screen state cache for delta-encoded screen updates
+try:
+    from smed_screen_state import screen_state_cache, position_field_key
+    SCREEN_STATE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"SMED screen state cache not available: {e}")
+    SCREEN_STATE_AVAILABLE = False
+
+# Import in-process SJIS codec for SMED field arrays
+try:
+    from smed_field_codec import smed_field_codec
+    SMED_FIELD_CODEC_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"SMED field codec not available: {e}")
+    SMED_FIELD_CODEC_AVAILABLE = False
+
 # Import layout API module
 try:
     from layout_api import register_layout_routes
@@ -73,6 +106,15 @@ except ImportError as e:
     logger.warning(f"Layout API module not available: {e}")
     LAYOUT_API_AVAILABLE = False
 
+# Import cached volume/library usage statistics
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'system-cmds'))
+try:
+    from volume_usage import get_usage_service
+    VOLUME_USAGE_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Volume usage service not available: {e}")
+    VOLUME_USAGE_AVAILABLE = False
+
 app = Flask(__name__)
 CORS(app, origins=['http://localhost:3005', 'http://localhost:3000', 'http://localhost:3007', 'http://localhost:3006'])
 
@@ -83,9 +125,11 @@ socketio = SocketIO(app, cors_allowed_origins=['http://localhost:3005', 'http://
 if LAYOUT_API_AVAILABLE:
     register_layout_routes(app)
 
+# Thread-safe registry of terminals, WebSocket sessions and position SMED sessions
+from terminal_registry import terminal_registry
+
 # Initialize PostgreSQL session manager for enterprise features
 postgresql_session_manager = None
-websocket_sessions = {}  # Track WebSocket sessions: {sid: {wsname, user}}
 
 if POSTGRESQL_SESSION_AVAILABLE:
     try:
@@ -98,6 +142,12 @@ if POSTGRESQL_SESSION_AVAILABLE:
 # ?? ??
 VOLUME_ROOT = "/home/aspuser/app/volume"
 CONFIG_DIR = "/home/aspuser/app/server/config"
+
+# Keep volume usage current through inotify; requests are served from memory
+volume_usage = None
+if VOLUME_USAGE_AVAILABLE:
+    volume_usage = get_usage_service(VOLUME_ROOT)
+    volume_usage.start_watching()
 SMED_DIR = None
 ACCOUNT_FILE = None
 SMED_PGM_FILE = None
@@ -129,8 +179,14 @@ class WorkstationSessionManager:
         self.workstation_sessions: Dict[str, str] = {}  # wsname -> session_id
         self.user_sessions: Dict[str, List[str]] = {}  # user_id -> [session_ids]
         self.lock = threading.RLock()
+        self.batch_depth = 0  # > 0 while a bulk operation defers the file save
         self.session_file = os.path.join(CONFIG_DIR, 'workstation_sessions.json') if CONFIG_DIR else None
+        self.store = None
+        if self.session_file and SESSION_PERSISTENCE_AVAILABLE:
+            self.store = WriteBehindSessionStore(self.session_file)
         self._load_sessions()
+        if self.store:
+            self.store.start()
     
     def create_session(self, wsname: str, user_id: str, terminal_id: str = None, 
                       display_mode: str = 'legacy', encoding: str = 'sjis') -> str:
@@ -169,16 +225,15 @@ class WorkstationSessionManager:
             self.user_sessions[user_id].append(session_id)
             
             # Maintain backward compatibility
-            active_terminals[session_id] = {
+            terminal_registry.register_terminal(session_id, {
                 'terminal_id': terminal_id or wsname,
                 'user': user_id,
                 'room': f'terminal_{terminal_id or wsname}',
                 'workstation': wsname,
                 'session_data': session_data
-            }
-            terminal_to_session[terminal_id or wsname] = session_id
+            })
             
-            self._save_sessions()
+            self._mark_dirty(session_id)
             logger.info(f"Created workstation session: {session_id} for {wsname} (user: {user_id})")
             return session_id
     
@@ -217,12 +272,12 @@ class WorkstationSessionManager:
             self.sessions[session_id].update(updates)
             
             # Update backward compatibility data
-            if session_id in active_terminals:
-                if 'user_id' in updates:
-                    active_terminals[session_id]['user'] = updates['user_id']
-                active_terminals[session_id]['session_data'] = self.sessions[session_id]
+            terminal_updates = {'session_data': self.sessions[session_id]}
+            if 'user_id' in updates:
+                terminal_updates['user'] = updates['user_id']
+            terminal_registry.update_terminal(session_id, terminal_updates)
             
-            self._save_sessions()
+            self._mark_dirty(session_id)
             return True
     
     def set_display_mode(self, wsname: str, display_mode: str) -> bool:
@@ -278,8 +333,8 @@ class WorkstationSessionManager:
             wsname = session.get('wsname')
             user_id = session.get('user_id')
             
-            # Update status
-            self.update_session(session_id, {'status': 'OFF'})
+            # The session is deleted right away, so the OFF status is not persisted
+            session['status'] = 'OFF'
             
             # Cleanup
             self._cleanup_session(session_id)
@@ -307,14 +362,20 @@ class WorkstationSessionManager:
                     del self.user_sessions[user_id]
             
             # Cleanup backward compatibility
-            if session_id in active_terminals:
-                del active_terminals[session_id]
-            if terminal_id and terminal_id in terminal_to_session:
-                del terminal_to_session[terminal_id]
+            terminal_registry.unregister_terminal(session_id)
+            if terminal_id and terminal_registry.session_for_terminal(terminal_id) == session_id:
+                terminal_registry.unmap_terminal(terminal_id)
             
             # Remove session
             del self.sessions[session_id]
             
+            self._mark_dirty(session_id, deleted=True)
+    
+    def _mark_dirty(self, session_id: str, deleted: bool = False):
+        """Queue a session change for the write-behind flusher"""
+        if self.store:
+            self.store.record(session_id, None if deleted else self.sessions[session_id], deleted=deleted)
+        elif not self.batch_depth:
             self._save_sessions()
     
     def _save_sessions(self):
@@ -322,6 +383,10 @@ class WorkstationSessionManager:
         if not self.session_file:
             return
         
+        if self.store:
+            self.store.flush()
+            return
+        
         try:
             with open(self.session_file, 'w', encoding='utf-8') as f:
                 json.dump({
@@ -334,6 +399,10 @@ class WorkstationSessionManager:
     
     def _load_sessions(self):
         """Load sessions from file"""
+        if self.store:
+            self._load_sessions_from_store()
+            return
+        
         if not self.session_file or not os.path.exists(self.session_file):
             return
         
@@ -347,18 +416,45 @@ class WorkstationSessionManager:
                 # Restore backward compatibility data
                 for session_id, session in self.sessions.items():
                     if session.get('status') == 'ON':
-                        active_terminals[session_id] = {
+                        terminal_registry.register_terminal(session_id, {
                             'terminal_id': session.get('terminal_id'),
                             'user': session.get('user_id'),
                             'room': f"terminal_{session.get('terminal_id')}",
                             'workstation': session.get('wsname'),
                             'session_data': session
-                        }
-                        terminal_to_session[session.get('terminal_id')] = session_id
+                        })
                 
                 logger.info(f"Loaded {len(self.sessions)} sessions from storage")
         except Exception as e:
             logger.warning(f"Failed to load sessions: {e}")
+    
+    def _load_sessions_from_store(self):
+        """Load snapshot + journal and rebuild the workstation/user indexes"""
+        try:
+            self.sessions = self.store.load()
+        except Exception as e:
+            logger.warning(f"Failed to load sessions: {e}")
+            return
+        
+        for session_id, session in self.sessions.items():
+            wsname = session.get('wsname')
+            user_id = session.get('user_id')
+            if wsname:
+                self.workstation_sessions[wsname] = session_id
+            if user_id:
+                self.user_sessions.setdefault(user_id, []).append(session_id)
+            
+            # Restore backward compatibility data
+            if session.get('status') == 'ON':
+                terminal_registry.register_terminal(session_id, {
+                    'terminal_id': session.get('terminal_id'),
+                    'user': user_id,
+                    'room': f"terminal_{session.get('terminal_id')}",
+                    'workstation': wsname,
+                    'session_data': session
+                })
+        
+        logger.info(f"Loaded {len(self.sessions)} sessions from storage")
 
     def bulk_logout_sessions(self, workstation_names: List[str]) -> Dict[str, Any]:
         """Bulk logout sessions by workstation names"""
@@ -368,55 +464,114 @@ class WorkstationSessionManager:
             'total_processed': len(workstation_names)
         }
         
+        with self.lock:
+            self.batch_depth += 1
+            try:
+                self._bulk_logout(workstation_names, results)
+            finally:
+                self.batch_depth -= 1
+            
+            # One snapshot for the whole batch
+            if self.store:
+                self.store.request_flush()
+            else:
+                self._save_sessions()
+            logger.info(f"Bulk logout completed: {len(results['success'])} successful, {len(results['failed'])} failed")
+            
+        return results
+
+    def _bulk_logout(self, workstation_names: List[str], results: Dict[str, Any]):
+        """Logout loop of bulk_logout_sessions (caller holds the lock and saves once)"""
+        for wsname in workstation_names:
+            try:
+                # Check if session exists
+                if wsname not in self.workstation_sessions:
+                    results['failed'].append({
+                        'wsname': wsname,
+                        'error': 'Session not found'
+                    })
+                    continue
+                
+                session_id = self.workstation_sessions[wsname]
+                session = self.sessions.get(session_id)
+                
+                if not session:
+                    results['failed'].append({
+                        'wsname': wsname,
+                        'error': 'Session data not found'
+                    })
+                    continue
+                
+                if session.get('status') == 'OFF':
+                    results['failed'].append({
+                        'wsname': wsname,
+                        'error': 'Session already inactive'
+                    })
+                    continue
+                
+                # Logout the session
+                success = self.logout_session(wsname=wsname)
+                if success:
+                    results['success'].append(wsname)
+                    logger.info(f"Bulk logout successful for workstation: {wsname}")
+                else:
+                    results['failed'].append({
+                        'wsname': wsname,
+                        'error': 'Logout operation failed'
+                    })
+                    
+            except Exception as e:
+                logger.error(f"Failed to logout session {wsname}: {e}")
+                results['failed'].append({
+                    'wsname': wsname,
+                    'error': str(e)
+                })
+
+    def bulk_update_status(self, workstation_names: List[str], status: str) -> Dict[str, Any]:
+        """
+        Set the status of many workstation sessions with a single persistence flush
+        
+        'found' lists the workstations that have a session, whether or not the update succeeded.
+        """
+        results = {
+            'success': [],
+            'failed': [],
+            'found': [],
+            'total_processed': len(workstation_names)
+        }
+        
         with self.lock:
             for wsname in workstation_names:
                 try:
-                    # Check if session exists
-                    if wsname not in self.workstation_sessions:
-                        results['failed'].append({
-                            'wsname': wsname,
-                            'error': 'Session not found'
-                        })
-                        continue
-                    
-                    session_id = self.workstation_sessions[wsname]
-                    session = self.sessions.get(session_id)
-                    
+                    session_id = self.workstation_sessions.get(wsname)
+                    session = self.sessions.get(session_id) if session_id else None
                     if not session:
                         results['failed'].append({
                             'wsname': wsname,
-                            'error': 'Session data not found'
+                            'error': 'Session not found'
                         })
                         continue
                     
-                    if session.get('status') == 'OFF':
-                        results['failed'].append({
-                            'wsname': wsname,
-                            'error': 'Session already inactive'
-                        })
-                        continue
+                    results['found'].append(wsname)
+                    session['status'] = status
+                    session['last_activity'] = datetime.now(timezone.utc).isoformat()
+                    terminal_registry.update_terminal(session_id, {'session_data': session})
+                    if self.store:
+                        self.store.record(session_id, session)
+                    results['success'].append(wsname)
                     
-                    # Logout the session
-                    success = self.logout_session(wsname=wsname)
-                    if success:
-                        results['success'].append(wsname)
-                        logger.info(f"Bulk logout successful for workstation: {wsname}")
-                    else:
-                        results['failed'].append({
-                            'wsname': wsname,
-                            'error': 'Logout operation failed'
-                        })
-                        
                 except Exception as e:
-                    logger.error(f"Failed to logout session {wsname}: {e}")
+                    logger.error(f"Failed to update session status for {wsname}: {e}")
                     results['failed'].append({
                         'wsname': wsname,
                         'error': str(e)
                     })
             
-            # Save changes
-            self._save_sessions()
-            logger.info(f"Bulk logout completed: {len(results['success'])} successful, {len(results['failed'])} failed")
+            # One snapshot for the whole batch
+            if self.store:
+                self.store.request_flush()
+            else:
+                self._save_sessions()
             
         return results
 
@@ -435,9 +590,6 @@ class WorkstationSessionManager:
 # Initialize session manager
 workstation_session_manager = WorkstationSessionManager()
 
-# Legacy Terminal/Session Management (for backward compatibility)
-active_terminals = {}  # {session_id: {'terminal_id': str, 'user': str, 'room': str}}
-terminal_to_session = {}  # {terminal_id: session_id}
 
 def convert_sjis_to_unicode(raw_bytes, destination='web_ui'):
     """
@@ -493,16 +645,28 @@ def convert_sjis_to_unicode(raw_bytes, destination='web_ui'):
 
 # POSITION-BASED SMED ENCODING INTEGRATION
 class PositionSmedEncodingConverter:
-    """Position-based SMED encoding converter for WebSocket integration"""
+    """
+    Position-based SMED encoding converter for WebSocket integration
+    
+    Field arrays are converted in-process with the Fujitsu SJIS tables
+    (smed_field_codec). Only values the tables cannot map go to the encoding
+    API, as one batch request over a pooled keep-alive session.
+    """
     
     def __init__(self, encoding_api_url="http://localhost:8081"):
         self.encoding_api_url = encoding_api_url
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.batch_api_supported = True
+        self.stats = {'api_batches': 0, 'api_requests': 0, 'api_values': 0}
         self.encoding_api_available = self._check_encoding_api()
     
     def _check_encoding_api(self):
         """Check if encoding API is available"""
         try:
-            response = requests.get(f"{self.encoding_api_url}/health", timeout=2)
+            response = self.session.get(f"{self.encoding_api_url}/health", timeout=2)
             return response.status_code == 200
         except Exception as e:
             logger.warning(f"Encoding API not available: {e}")
@@ -512,21 +676,74 @@ class PositionSmedEncodingConverter:
         """Convert SJIS data to UTF-8 for position-based SMED display"""
         if not sjis_data:
             return sjis_data
-        
-        if use_api and self.encoding_api_available:
-            return self._convert_via_api(sjis_data, 'sjis', 'utf-8')
-        else:
-            return self._convert_local_sjis_to_utf8(sjis_data)
+        return self.convert_batch([sjis_data], 'sjis', 'utf-8', use_api)[0]
     
     def convert_utf8_to_sjis(self, utf8_data, use_api=True):
         """Convert UTF-8 data to SJIS for position-based SMED processing"""
         if not utf8_data:
             return utf8_data
-        
-        if use_api and self.encoding_api_available:
-            return self._convert_via_api(utf8_data, 'utf-8', 'sjis')
+        return self.convert_batch([utf8_data], 'utf-8', 'sjis', use_api)[0]
+    
+    def convert_batch(self, values, from_encoding, to_encoding, use_api=True):
+        """
+        Convert a list of str/bytes values in one pass
+        
+        Args:
+            values: Field values
+            from_encoding: 'sjis' or 'utf-8'
+            to_encoding: 'utf-8' or 'sjis'
+            use_api: Send values the local tables cannot map to the encoding API
+        """
+        if not values:
+            return list(values)
+        
+        if SMED_FIELD_CODEC_AVAILABLE:
+            converted, unmapped = smed_field_codec.convert_many(values, from_encoding, to_encoding)
         else:
-            return self._convert_local_utf8_to_sjis(utf8_data)
+            converted, unmapped = [None] * len(values), list(range(len(values)))
+        
+        if unmapped and use_api and self.encoding_api_available:
+            remote = self._convert_batch_via_api([values[i] for i in unmapped], from_encoding, to_encoding)
+            if remote is not None:
+                for index, value in zip(unmapped, remote):
+                    converted[index] = value
+                unmapped = []
+        
+        local = self._convert_local_sjis_to_utf8 if to_encoding.lower() == 'utf-8' else self._convert_local_utf8_to_sjis
+        for index in unmapped:
+            converted[index] = local(values[index])
+        return converted
+    
+    def _convert_batch_via_api(self, texts, from_encoding, to_encoding):
+        """Convert several values with one encoding API request (None on failure)"""
+        texts = [text.decode('utf-8', errors='replace') if isinstance(text, bytes) else text for text in texts]
+        if self.batch_api_supported:
+            try:
+                response = self.session.post(
+                    f"{self.encoding_api_url}/api/encoding/convert-batch",
+                    json={'texts': texts, 'sourceEncoding': from_encoding, 'targetEncoding': to_encoding},
+                    timeout=5
+                )
+                self.stats['api_batches'] += 1
+                if response.status_code in (404, 405):
+                    # Older encoding API without the batch endpoint
+                    self.batch_api_supported = False
+                elif response.status_code == 200:
+                    result = response.json()
+                    converted = result.get('convertedTexts')
+                    if result.get('success') and isinstance(converted, list) and len(converted) == len(texts):
+                        self.stats['api_values'] += len(texts)
+                        return converted
+                    logger.error(f"Encoding API batch error: {result.get('error')}")
+                    return None
+                else:
+                    logger.error(f"Encoding API HTTP error: {response.status_code}")
+                    return None
+            except Exception as e:
+                logger.error(f"Failed to convert batch via encoding API: {e}")
+                return None
+        
+        return [self._convert_via_api(text, from_encoding, to_encoding) for text in texts]
     
     def _convert_via_api(self, data, from_encoding, to_encoding):
         """Convert data using external encoding API"""
@@ -537,15 +754,17 @@ class PositionSmedEncodingConverter:
                 'targetEncoding': to_encoding
             }
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.encoding_api_url}/api/encoding/convert",
                 json=payload,
                 timeout=5
             )
+            self.stats['api_requests'] += 1
             
             if response.status_code == 200:
                 result = response.json()
                 if result.get('success'):
+                    self.stats['api_values'] += 1
                     return result.get('convertedText', data)
                 else:
                     logger.error(f"Encoding API error: {result.get('error')}")
@@ -592,23 +811,24 @@ class PositionSmedEncodingConverter:
             logger.error(f"Local UTF-8 to SJIS conversion failed: {e}")
             return str(utf8_data)
     
+    def _convert_pair(self, from_encoding, to_encoding):
+        """(from, to) when the pair is SJIS <-> UTF-8, otherwise None"""
+        pair = (from_encoding.lower(), to_encoding.lower())
+        return pair if pair in (('sjis', 'utf-8'), ('utf-8', 'sjis')) else None
+    
     def convert_field_data_array(self, field_data, from_encoding='sjis', to_encoding='utf-8'):
         """Convert array of field data between encodings"""
         if not field_data or not isinstance(field_data, list):
             return field_data
         
-        converted_data = []
-        for field in field_data:
-            if isinstance(field, str):
-                if from_encoding.lower() == 'sjis' and to_encoding.lower() == 'utf-8':
-                    converted_field = self.convert_sjis_to_utf8(field)
-                elif from_encoding.lower() == 'utf-8' and to_encoding.lower() == 'sjis':
-                    converted_field = self.convert_utf8_to_sjis(field)
-                else:
-                    converted_field = field
-                converted_data.append(converted_field)
-            else:
-                converted_data.append(field)
+        pair = self._convert_pair(from_encoding, to_encoding)
+        if pair is None:
+            return list(field_data)
+        
+        indexes = [i for i, field in enumerate(field_data) if isinstance(field, str) and field]
+        converted_data = list(field_data)
+        for index, value in zip(indexes, self.convert_batch([field_data[i] for i in indexes], *pair)):
+            converted_data[index] = value
         
         return converted_data
     
@@ -617,20 +837,27 @@ class PositionSmedEncodingConverter:
         if not updates or not isinstance(updates, list):
             return updates
         
-        converted_updates = []
-        for update in updates:
-            if isinstance(update, dict) and 'value' in update:
-                converted_update = update.copy()
-                if isinstance(update['value'], str):
-                    if from_encoding.lower() == 'sjis' and to_encoding.lower() == 'utf-8':
-                        converted_update['value'] = self.convert_sjis_to_utf8(update['value'])
-                    elif from_encoding.lower() == 'utf-8' and to_encoding.lower() == 'sjis':
-                        converted_update['value'] = self.convert_utf8_to_sjis(update['value'])
-                converted_updates.append(converted_update)
-            else:
-                converted_updates.append(update)
+        pair = self._convert_pair(from_encoding, to_encoding)
+        converted_updates = [update.copy() if isinstance(update, dict) and 'value' in update else update
+                             for update in updates]
+        if pair is None:
+            return converted_updates
+        
+        indexes = [i for i, update in enumerate(converted_updates)
+                   if isinstance(update, dict) and isinstance(update.get('value'), str) and update['value']]
+        values = self.convert_batch([converted_updates[i]['value'] for i in indexes], *pair)
+        for index, value in zip(indexes, values):
+            converted_updates[index]['value'] = value
         
         return converted_updates
+    
+    def get_stats(self):
+        """Conversion statistics (in-process codec and encoding API usage)"""
+        stats = dict(self.stats, encoding_api_available=self.encoding_api_available,
+                     batch_api_supported=self.batch_api_supported)
+        if SMED_FIELD_CODEC_AVAILABLE:
+            stats['codec'] = smed_field_codec.get_stats()
+        return stats
 
 # Initialize position-based SMED encoding converter
 position_smed_encoder = PositionSmedEncodingConverter()
@@ -973,6 +1200,91 @@ def get_catalog_data_with_fallback():
     logger.info("[API_SERVER] Catalog retrieved via JSON fallback")
     return catalog
 
+_catalog_page_manager = None
+MAX_CATALOG_PAGE_SIZE = 1000
+
+def _get_catalog_page_manager():
+    """DBIO manager reused for paginated catalog reads (None when DBIO is unavailable)"""
+    global _catalog_page_manager
+    if _catalog_page_manager is None and DBIO_AVAILABLE:
+        try:
+            from config.catalog_backend_config import get_active_dbio_manager
+            _catalog_page_manager = get_active_dbio_manager()
+        except Exception as e:
+            logger.warning(f"[API_SERVER] DBIO manager for catalog paging not available: {e}")
+    return _catalog_page_manager
+
+def _catalog_page_limit():
+    """
+    Page size from the limit query parameter (None when the request is not
+    paged), capped at MAX_CATALOG_PAGE_SIZE. Raises ValueError for limit <= 0
+    or a non-numeric limit.
+    """
+    value = request.args.get('limit')
+    if value is None or value == '':
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid limit: {value}")
+    if limit <= 0:
+        raise ValueError(f"limit must be positive: {limit}")
+    return min(limit, MAX_CATALOG_PAGE_SIZE)
+
+def get_catalog_page_with_fallback(filters, limit, cursor=None):
+    """
+    One keyset page of catalog objects: {'objects', 'next_cursor', 'count'}
+    
+    Uses the DBIO streaming query when available; otherwise pages over the
+    full catalog. Raises ValueError for malformed cursors.
+    """
+    from dbio.core import encode_cursor, decode_cursor
+    
+    manager = _get_catalog_page_manager()
+    if manager is not None:
+        try:
+            return manager.query_page(filters, limit, cursor)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.warning(f"[API_SERVER] DBIO paging failed, falling back to catalog scan: {e}")
+    
+    after = decode_cursor(cursor)
+    catalog = get_catalog_data_with_fallback()
+    objects = []
+    next_cursor = None
+    for volume_name in sorted(catalog):
+        if filters.get('volume') not in (None, volume_name):
+            continue
+        for library_name in sorted(catalog[volume_name]):
+            if filters.get('library') not in (None, library_name):
+                continue
+            library_data = catalog[volume_name][library_name]
+            for object_name in sorted(library_data):
+                key = (volume_name, library_name, object_name)
+                attributes = library_data[object_name]
+                if after is not None and key <= after:
+                    continue
+                if not isinstance(attributes, dict):
+                    continue
+                if filters.get('object_type') not in (None, attributes.get('TYPE')):
+                    continue
+                if len(objects) == limit:
+                    next_cursor = encode_cursor(objects[-1][0])
+                    break
+                objects.append((key, attributes))
+            if next_cursor:
+                break
+        if next_cursor:
+            break
+    
+    return {
+        'objects': [{'volume_name': key[0], 'library_name': key[1], 'object_name': key[2],
+                     'attributes': attributes} for key, attributes in objects],
+        'next_cursor': next_cursor,
+        'count': len(objects)
+    }
+
 # WebSocket Event Handlers
 @socketio.event
 def connect(sid, environ):
@@ -998,14 +1310,14 @@ def handle_connect():
     
     # PostgreSQL session will be created when client registers with specific WSNAME
     # Store connection info for now
-    websocket_sessions[request.sid] = {'wsname': None, 'user': None, 'registered': False}
+    terminal_registry.set_websocket_session(request.sid, {'wsname': None, 'user': None, 'registered': False})
     
     # Send connection confirmation with debug info
     emit('connected', {
         'session_id': request.sid,
         'server_type': 'socketio',
         'message': 'WebSocket connection established',
-        'wsname': websocket_sessions.get(request.sid, {}).get('wsname', 'unknown'),
+        'wsname': (terminal_registry.get_websocket_session(request.sid) or {}).get('wsname', 'unknown'),
         'timestamp': datetime.now().isoformat()
     })
     
@@ -1022,9 +1334,9 @@ def handle_disconnect():
     logger.info(f"[WEBSOCKET] Client disconnected: {request.sid}")
     
     # Clean up sessions if they exist
-    if request.sid in websocket_sessions:
+    session_info = terminal_registry.remove_websocket_session(request.sid)
+    if session_info and session_info.get('wsname'):
         try:
-            session_info = websocket_sessions[request.sid]
             wsname = session_info['wsname']
             
             # Update workstation_session_manager (used by API v1)
@@ -1044,9 +1356,6 @@ def handle_disconnect():
                     logger.info(f"[WEBSOCKET] PostgreSQL session {wsname} set to inactive")
                 else:
                     logger.warning(f"[WEBSOCKET] Failed to update PostgreSQL session {wsname}")
-            
-            # Remove from tracking dictionary
-            del websocket_sessions[request.sid]
         except Exception as e:
             logger.error(f"[WEBSOCKET] Error updating sessions on disconnect: {e}")
     
@@ -1060,20 +1369,17 @@ def handle_disconnect():
     except Exception as e:
         logger.error(f"Error cleaning up interactive session: {e}")
     
-    # Clean up terminal registration
-    if request.sid in active_terminals:
-        terminal_info = active_terminals[request.sid]
+    # Clean up terminal registration (also removes the terminal_id mapping)
+    terminal_info = terminal_registry.unregister_terminal(request.sid)
+    if terminal_info is not None:
         terminal_id = terminal_info.get('terminal_id')
         
         logger.info(f"[WEBSOCKET] Cleaning up terminal registration: {terminal_id}")
         disconnect_info['terminal_id'] = terminal_id
         disconnect_info['terminal_info'] = terminal_info
         
-        if terminal_id and terminal_id in terminal_to_session:
-            del terminal_to_session[terminal_id]
-            logger.info(f"[WEBSOCKET] Removed terminal mapping: {terminal_id}")
-        
-        del active_terminals[request.sid]
+        if terminal_id and SCREEN_STATE_AVAILABLE:
+            screen_state_cache.forget(terminal_id)
         
         # Notify others in the room
         if 'room' in terminal_info:
@@ -1084,8 +1390,8 @@ def handle_disconnect():
             }, room=terminal_info['room'])
     
     # Clean up position-based SMED session
-    if request.sid in position_smed_sessions:
-        session_info = position_smed_sessions.get(request.sid)
+    session_info = get_position_smed_session(request.sid)
+    if session_info is not None:
         logger.info(f"[WEBSOCKET] Cleaning up position SMED session: {session_info}")
         
         # Leave all subscribed rooms
@@ -1131,29 +1437,20 @@ def handle_register_terminal(data):
     logger.info(f"[TERMINAL_REG] Registering terminal: {terminal_id} for session: {session_id}")
     logger.info(f"[TERMINAL_REG] Registration details: {registration_info}")
     
-    # Check if terminal_id is already registered
-    if terminal_id in terminal_to_session and terminal_to_session[terminal_id] != session_id:
-        existing_session = terminal_to_session[terminal_id]
-        logger.warning(f"[TERMINAL_REG] Terminal ID {terminal_id} already registered to session {existing_session}")
-        
-        # Clean up old registration
-        if existing_session in active_terminals:
-            del active_terminals[existing_session]
-        
-        logger.info(f"[TERMINAL_REG] Overriding existing registration for terminal: {terminal_id}")
-    
-    # Store terminal registration
-    active_terminals[session_id] = {
+    # Store terminal registration and map terminal ID to session for routing;
+    # an older registration of the same terminal ID is dropped
+    existing_session = terminal_registry.register_terminal(session_id, {
         'terminal_id': terminal_id,
         'user': user,
         'workstation': workstation,
         'room': f'terminal_{terminal_id}',
         'connected_at': datetime.now().isoformat(),
         'registration_data': data
-    }
+    }, replace_existing=True)
     
-    # Map terminal ID to session for routing
-    terminal_to_session[terminal_id] = session_id
+    if existing_session:
+        logger.warning(f"[TERMINAL_REG] Terminal ID {terminal_id} already registered to session {existing_session}")
+        logger.info(f"[TERMINAL_REG] Overriding existing registration for terminal: {terminal_id}")
     
     # Join terminal-specific room
     join_room(f'terminal_{terminal_id}')
@@ -1212,11 +1509,11 @@ def handle_register_terminal(data):
             
             if success:
                 # Update WebSocket session tracker
-                websocket_sessions[session_id] = {
+                terminal_registry.set_websocket_session(session_id, {
                     'wsname': wsname, 
                     'user': user, 
                     'registered': True
-                }
+                })
                 logger.info(f"[TERMINAL_REG] PostgreSQL session ready: {wsname}")
             else:
                 logger.error(f"[TERMINAL_REG] Failed to create/update PostgreSQL session: {wsname}")
@@ -1273,13 +1570,13 @@ def handle_register_client(data):
             'status': 'registered'
         }
         
-        # Store in active terminals for tracking
-        active_terminals[session_id] = {
+        # Store in active terminals for tracking (not routable by terminal ID)
+        terminal_registry.register_terminal(session_id, {
             'terminal_id': client_id,
             'user': 'hub_client',
             'room': f'hub_client_{session_id}',
             'client_info': client_info
-        }
+        }, routable=False)
         
         logger.info(f"[HUB_CLIENT_REG] Client registered successfully: {client_id}")
         
@@ -1316,6 +1613,7 @@ def handle_hub_register(data):
         wsname = data.get('wsname', 'WSNAME00')
         client_type = data.get('client_type', 'react_web_terminal')
         hub_version = data.get('hub_version', 'v2.0')
+        supports_delta = bool(data.get('supports_delta', False))
         
         # Store terminal registration (unified with other registrations)
         terminal_info = {
@@ -1325,20 +1623,23 @@ def handle_hub_register(data):
             'workstation': wsname,
             'client_type': client_type,
             'hub_version': hub_version,
+            'supports_delta': supports_delta,
             'timestamp': datetime.now().isoformat(),
             'status': 'registered'
         }
         
-        # Store in active terminals
-        active_terminals[session_id] = {
+        # Store in active terminals and update terminal mapping
+        terminal_registry.register_terminal(session_id, {
             'terminal_id': terminal_id,
             'user': user,
+            'workstation': wsname,
             'room': f'terminal_{terminal_id}',
             'hub_info': terminal_info
-        }
+        })
         
-        # Update terminal mapping
-        terminal_to_session[terminal_id] = session_id
+        # A newly registered client has an empty screen
+        if SCREEN_STATE_AVAILABLE:
+            screen_state_cache.forget(terminal_id)
         
         # Create or update session in both managers
         # First, update workstation_session_manager (used by API v1 endpoints)
@@ -1386,12 +1687,12 @@ def handle_hub_register(data):
                 
                 # Track WebSocket session
                 if success:
-                    websocket_sessions[session_id] = {
+                    terminal_registry.set_websocket_session(session_id, {
                         'wsname': wsname,
                         'user': user,
                         'terminal_id': terminal_id,
                         'connected_at': datetime.now().isoformat()
-                    }
+                    })
                     logger.info(f"[HUB_REGISTER] WebSocket session tracked for {wsname}")
                     
             except Exception as e:
@@ -1550,8 +1851,8 @@ def handle_terminal_output(data):
     output_data = data.get('data', '')
     output_type = data.get('type', 'text')
     
-    if session_id in active_terminals:
-        terminal_info = active_terminals[session_id]
+    terminal_info = terminal_registry.get_terminal(session_id)
+    if terminal_info is not None:
         terminal_id = terminal_info.get('terminal_id')
         
         logger.info(f"Terminal output from {terminal_id}: {output_type}")
@@ -1572,11 +1873,66 @@ def handle_terminal_output(data):
                 'status': 'processed'
             })
 
+@socketio.on('smed_resync')
+def handle_smed_resync(data):
+    """Resend the full current screen to a client that missed a delta"""
+    terminal_id = data.get('terminal_id', 'webui')
+    client_seq = data.get('last_seq')
+    
+    if not SCREEN_STATE_AVAILABLE:
+        emit('smed_resync_error', {'error': 'Screen state cache not available', 'terminal_id': terminal_id})
+        return
+    
+    frame = screen_state_cache.resync(terminal_id, client_seq)
+    if frame is None:
+        emit('smed_resync_error', {'error': 'No screen state for terminal', 'terminal_id': terminal_id})
+        return
+    
+    emit('smed_display', {
+        'map_file': frame['map_file'],
+        'fields': frame['fields'],
+        'action': 'display_map',
+        'seq': frame['seq'],
+        'resync': True,
+        'timestamp': datetime.now().isoformat(),
+        'terminal_id': terminal_id,
+        'session_id': request.sid,
+        'hub_source': 'websocket_hub',
+        'hub_version': '1.0'
+    })
+
 def send_smed_to_terminal(terminal_id: str, map_file: str, fields: dict):
     """Legacy function - redirects to WebSocket Hub"""
     logger.info(f"[WEBSOCKET_HUB] Legacy send_smed_to_terminal called, redirecting to hub")
     return send_smed_to_terminal_hub(terminal_id, map_file, fields, 'legacy_call')
 
+def room_members(room_name: str) -> Optional[List[str]]:
+    """Socket ids currently in a Socket.IO room (None if the server cannot tell)"""
+    try:
+        participants = socketio.server.manager.get_participants('/', room_name)
+        # python-socketio 5 yields (sid, eio_sid) pairs, older versions plain sids
+        return [p[0] if isinstance(p, tuple) else p for p in participants]
+    except Exception as e:
+        logger.debug(f"[WEBSOCKET_HUB] Room members of {room_name} unavailable: {e}")
+        return None
+
+def split_by_delta_support(room_name: str):
+    """
+    (delta_sids, full_sids) of a room; a socket gets deltas only if it
+    registered supports_delta. None when the room members are unknown.
+    """
+    members = room_members(room_name)
+    if members is None:
+        return None
+    delta_sids, full_sids = [], []
+    for sid in members:
+        terminal_info = terminal_registry.get_terminal(sid) or {}
+        if terminal_info.get('hub_info', {}).get('supports_delta'):
+            delta_sids.append(sid)
+        else:
+            full_sids.append(sid)
+    return delta_sids, full_sids
+
 def send_smed_to_terminal_hub(terminal_id: str, map_file: str, fields: dict, program_name: str = 'unknown'):
     """WebSocket Hub - Centralized SMED data transmission"""
     hub_send_info = {
@@ -1590,11 +1946,8 @@ def send_smed_to_terminal_hub(terminal_id: str, map_file: str, fields: dict, pro
     }
     
     logger.info(f"[WEBSOCKET_HUB] Centralized SMED transmission to terminal: {terminal_id}")
-    logger.info(f"[WEBSOCKET_HUB] Active terminals: {list(active_terminals.keys())}")
-    logger.info(f"[WEBSOCKET_HUB] Terminal mappings: {terminal_to_session}")
-    
-    if terminal_id in terminal_to_session:
-        session_id = terminal_to_session[terminal_id]
+    session_id = terminal_registry.session_for_terminal(terminal_id)
+    if session_id is not None:
         room_name = f'terminal_{terminal_id}'
         
         logger.info(f"[WEBSOCKET_HUB] Terminal {terminal_id} → Session {session_id} → Room {room_name}")
@@ -1613,10 +1966,41 @@ def send_smed_to_terminal_hub(terminal_id: str, map_file: str, fields: dict, pro
             'data_flow': 'single_channel'  # Indicates this bypassed HTTP API
         }
         
+        # Delta encoding against the last frame sent to this terminal; each
+        # socket in the room gets a delta only if it registered supports_delta
+        event_name = 'smed_display'
+        delta_message = None
+        full_sids = []
+        if SCREEN_STATE_AVAILABLE:
+            update = screen_state_cache.build_update(terminal_id, map_file, fields or {})
+            smed_message['seq'] = update['seq']
+            split = split_by_delta_support(room_name) if update['type'] == 'delta' else None
+            if split and split[0]:
+                delta_message = {key: value for key, value in smed_message.items() if key != 'fields'}
+                delta_message.update({
+                    'action': 'update_map',
+                    'base_seq': update['base_seq'],
+                    'changed': update['changed'],
+                    'removed': update['removed']
+                })
+                full_sids = split[1]
+                event_name = 'smed_delta' if not full_sids else 'smed_delta+smed_display'
+                hub_send_info['delta_fields_count'] = len(update['changed'])
+                hub_send_info['full_frame_sids'] = len(full_sids)
+        
         try:
-            # Single WebSocket emission (no HTTP duplication)
-            socketio.emit('smed_display', smed_message, room=room_name)
-            logger.info(f"[WEBSOCKET_HUB] Single-channel SMED data sent to room: {room_name}")
+            # Single WebSocket emission per frame type (no HTTP duplication)
+            if delta_message is None:
+                socketio.emit('smed_display', smed_message, room=room_name)
+            elif not full_sids:
+                socketio.emit('smed_delta', delta_message, room=room_name)
+            else:
+                # Mixed room: full frames to the sockets that cannot apply deltas
+                for sid in split[0]:
+                    socketio.emit('smed_delta', delta_message, room=sid)
+                for sid in full_sids:
+                    socketio.emit('smed_display', smed_message, room=sid)
+            logger.info(f"[WEBSOCKET_HUB] Single-channel SMED data ({event_name}) sent to room: {room_name}")
             
             # Hub success confirmation
             hub_send_info.update({
@@ -1640,18 +2024,25 @@ def send_smed_to_terminal_hub(terminal_id: str, map_file: str, fields: dict, pro
             return False
     else:
         logger.warning(f"[WEBSOCKET_HUB] Terminal not connected to hub: {terminal_id}")
-        logger.warning(f"[WEBSOCKET_HUB] Available hub terminals: {list(terminal_to_session.keys())}")
+        available_terminals = list(terminal_registry.terminal_mappings().keys())
+        logger.warning(f"[WEBSOCKET_HUB] Available hub terminals: {available_terminals}")
         
         hub_send_info.update({
             'success': False,
             'error': 'Terminal not connected to hub',
-            'available_terminals': list(terminal_to_session.keys())
+            'available_terminals': available_terminals
         })
         
         add_log('WARNING', 'WEBSOCKET_HUB', f'Terminal not in hub: {terminal_id}', hub_send_info)
         return False
 
 def parse_smed_file(file_path):
+    """SMEDファイル解析 (cached per file version, result is read-only)"""
+    if SMED_MAP_CACHE_AVAILABLE:
+        return smed_map_cache.get_parsed(file_path, 'api_server', lambda: _parse_smed_file_uncached(file_path))
+    return _parse_smed_file_uncached(file_path)
+
+def _parse_smed_file_uncached(file_path):
     """SMEDファイル解析"""
     try:
         # Try to read with proper encoding - handle corrupted SJIS gracefully
@@ -1845,7 +2236,8 @@ def health_check():
         'smed_pgm_maps': len(smed_pgm_config),
         'map_pgm_maps': len(map_pgm_config.get('maps', {})),
         'java_available': multi_executor.java_available if multi_executor else False,
-        'jar_exists': os.path.exists(multi_executor.jar_path) if multi_executor and multi_executor.jar_path else False
+        'jar_exists': os.path.exists(multi_executor.jar_path) if multi_executor and multi_executor.jar_path else False,
+        'smed_map_cache': smed_map_cache.get_stats() if SMED_MAP_CACHE_AVAILABLE else None
     })
 
 @app.route('/broadcast-smed', methods=['POST'])
@@ -2053,21 +2445,7 @@ def bulk_disconnect_workstations():
         
         logger.info(f"[BULK_DISCONNECT] Starting bulk disconnect for {len(workstation_names)} workstations")
         
-        # Get session information before disconnecting for WebSocket cleanup
-        sessions_to_disconnect = []
-        if postgresql_session_manager:
-            sessions_to_disconnect.extend(
-                postgresql_session_manager.get_sessions_by_workstation_names(workstation_names)
-            )
-        else:
-            sessions_to_disconnect.extend(
-                workstation_session_manager.get_sessions_by_workstation_names(workstation_names)
-            )
-        
-        # Force disconnect WebSocket connections for these workstations
-        disconnected_websockets = force_disconnect_websockets_by_workstations(workstation_names)
-        
-        # Logout sessions in PostgreSQL (if available)
+        # Logout sessions in PostgreSQL (if available) - one set-based statement/transaction
         postgresql_results = {'success': [], 'failed': []}
         if postgresql_session_manager:
             postgresql_results = postgresql_session_manager.bulk_logout_sessions(workstation_names)
@@ -2077,6 +2455,9 @@ def bulk_disconnect_workstations():
         workstation_results = workstation_session_manager.bulk_logout_sessions(workstation_names)
         logger.info(f"[BULK_DISCONNECT] Workstation manager: {len(workstation_results['success'])} successful, {len(workstation_results['failed'])} failed")
         
+        # Force disconnect WebSocket connections for these workstations in one pass
+        disconnected_websockets = force_disconnect_websockets_by_workstations(workstation_names)
+        
         # Combine results (PostgreSQL takes precedence for status)
         final_results = {
             'success': postgresql_results['success'] if postgresql_session_manager else workstation_results['success'],
@@ -2371,12 +2752,11 @@ def migrate_workstation_session():
             return jsonify({'error': 'terminal_id, wsname, and user_id required'}), 400
         
         # Check if legacy session exists
-        legacy_session_id = terminal_to_session.get(terminal_id)
-        if not legacy_session_id or legacy_session_id not in active_terminals:
+        legacy_session_id = terminal_registry.session_for_terminal(terminal_id)
+        legacy_session = terminal_registry.get_terminal(legacy_session_id) if legacy_session_id else None
+        if legacy_session is None:
             return jsonify({'error': 'Legacy session not found'}), 404
         
-        legacy_session = active_terminals[legacy_session_id]
-        
         # Create new workstation session
         new_session_id = workstation_session_manager.create_session(
             wsname=wsname,
@@ -2419,8 +2799,9 @@ def check_workstation_compatibility():
     try:
         # Check for legacy sessions that could be migrated
         legacy_sessions = []
-        for session_id, terminal_info in active_terminals.items():
-            if session_id not in [s.get('session_id') for s in workstation_session_manager.list_all_sessions()]:
+        workstation_session_ids = {s.get('session_id') for s in workstation_session_manager.list_all_sessions()}
+        for session_id, terminal_info in terminal_registry.list_terminals().items():
+            if session_id not in workstation_session_ids:
                 legacy_sessions.append({
                     'session_id': session_id,
                     'terminal_id': terminal_info.get('terminal_id'),
@@ -2473,8 +2854,9 @@ def auto_migrate_workstation_sessions():
         failed_migrations = []
         
         # Find legacy sessions to migrate
-        for session_id, terminal_info in list(active_terminals.items()):
-            if session_id not in [s.get('session_id') for s in workstation_session_manager.list_all_sessions()]:
+        workstation_session_ids = {s.get('session_id') for s in workstation_session_manager.list_all_sessions()}
+        for session_id, terminal_info in terminal_registry.list_terminals().items():
+            if session_id not in workstation_session_ids:
                 try:
                     terminal_id = terminal_info.get('terminal_id')
                     user_id = terminal_info.get('user')
@@ -2788,6 +3170,10 @@ def save_smed_file():
             f.write(content)
         logger.info(f"SAVE DEBUG: File written successfully with {encoding} encoding")
         
+        # Drop any compiled copy of the previous version
+        if SMED_MAP_CACHE_AVAILABLE:
+            smed_map_cache.invalidate(file_path)
+        
         # Verify file was saved with correct encoding
         try:
             with open(file_path, 'r', encoding=encoding) as f:
@@ -2881,12 +3267,16 @@ def get_smed_content(filename):
         
         # ファイル内容を読み取り（Shift_JIS → Unicode変換）
         try:
-            # バイナリで読み込んでSJIS変換
-            with open(file_path, 'rb') as f:
-                raw_content = f.read()
-            
-            # SJIS → Unicode 変換
-            content = convert_sjis_to_unicode(raw_content)
+            if SMED_MAP_CACHE_AVAILABLE:
+                # 変換済み内容をファイルバージョン単位でキャッシュ
+                content = smed_map_cache.get_content(file_path, 'web_ui', convert_sjis_to_unicode)
+            else:
+                # バイナリで読み込んでSJIS変換
+                with open(file_path, 'rb') as f:
+                    raw_content = f.read()
+                
+                # SJIS → Unicode 変換
+                content = convert_sjis_to_unicode(raw_content)
             
         except Exception as e:
             logger.error(f"SJIS conversion failed for {filename}: {e}")
@@ -2931,8 +3321,13 @@ def get_smed_content_from_volume(volume, library, mapname):
             print(f"CONSOLE DEBUG: Using SJIS encoding for: {file_path}", flush=True)
             
             # Use SJIS encoding (hex analysis shows 83 81 83 43 83 93... = メインン...)
-            with open(file_path, 'r', encoding='shift_jis', errors='replace') as f:
-                content = f.read()
+            if SMED_MAP_CACHE_AVAILABLE:
+                content = smed_map_cache.get_content(
+                    file_path, 'shift_jis', lambda raw: raw.decode('shift_jis', errors='replace')
+                )
+            else:
+                with open(file_path, 'r', encoding='shift_jis', errors='replace') as f:
+                    content = f.read()
             
             logger.info(f"SMED File DEBUG: SJIS read completed, length: {len(content)}")
             
@@ -3348,61 +3743,28 @@ def bulk_disconnect_sessions_v1():
                 'message': 'workstations must be an array'
             }), 400
         
-        success_list = []
-        failed_list = []
+        workstation_names = [str(wsname).strip().upper() for wsname in workstations]
+        
+        # Update sessions to logoff status (workstation session manager), one flush for the batch
+        ws_results = workstation_session_manager.bulk_update_status(workstation_names, 'OFF')
+        success_list = ws_results['success']
+        failed_list = ws_results['failed']
         
-        for wsname in workstations:
+        # Update PostgreSQL sessions in one statement if available
+        if POSTGRESQL_SESSION_AVAILABLE and postgresql_session_manager and ws_results['found']:
             try:
-                wsname = str(wsname).strip().upper()
-                
-                # Check if session exists
-                session = workstation_session_manager.get_session_by_workstation(wsname)
-                if not session:
-                    failed_list.append({
-                        'wsname': wsname,
-                        'error': 'Session not found'
-                    })
-                    continue
-                
-                # Update session to logoff status (workstation session manager)
-                session_id = session['session_id']
-                ws_success = workstation_session_manager.update_session(session_id, {
-                    'status': 'OFF'
-                })
-                
-                # Update PostgreSQL session if available
-                if POSTGRESQL_SESSION_AVAILABLE:
-                    try:
-                        postgresql_session_manager.set_session_status(wsname, '0')  # 0 = OFF
-                    except Exception as e:
-                        logger.warning(f"Failed to update PostgreSQL session for {wsname}: {e}")
-                
-                # Force disconnect WebSocket if exists
-                try:
-                    # Find and disconnect WebSocket session
-                    for sid, ws_session in websocket_sessions.items():
-                        if ws_session.get('wsname') == wsname:
-                            socketio.disconnect(sid)
-                            logger.info(f"[BULK_DISCONNECT] Force disconnected WebSocket for {wsname}")
-                            break
-                except Exception as e:
-                    logger.warning(f"Failed to disconnect WebSocket for {wsname}: {e}")
-                
-                if ws_success:
-                    success_list.append(wsname)
-                    logger.info(f"[BULK_DISCONNECT] Successfully disconnected {wsname}")
-                else:
-                    failed_list.append({
-                        'wsname': wsname,
-                        'error': 'Failed to update session status'
-                    })
-                    
+                updated = set(postgresql_session_manager.bulk_set_session_status(ws_results['found'], '0'))  # 0 = OFF
+                for wsname in ws_results['found']:
+                    if wsname not in updated:
+                        logger.warning(f"PostgreSQL session not found for {wsname}")
             except Exception as e:
-                failed_list.append({
-                    'wsname': wsname,
-                    'error': str(e)
-                })
-                logger.error(f"[BULK_DISCONNECT] Error disconnecting {wsname}: {e}")
+                logger.warning(f"Failed to update PostgreSQL sessions: {e}")
+        
+        # Force disconnect WebSockets of every workstation with a session in one pass
+        try:
+            force_disconnect_websockets_by_workstations(ws_results['found'])
+        except Exception as e:
+            logger.warning(f"Failed to disconnect WebSockets: {e}")
         
         response = {
             'success': success_list,
@@ -3445,6 +3807,9 @@ def get_system_info():
         uptime_hours = int(uptime_seconds // 3600)
         uptime_minutes = int((uptime_seconds % 3600) // 60)
         
+        # ボリューム使用量 (キャッシュ)
+        volumes = volume_usage.get_summary() if volume_usage is not None else []
+        
         return jsonify({
             'success': True,
             'cpu': {
@@ -3477,7 +3842,8 @@ def get_system_info():
                 'hours': uptime_hours,
                 'minutes': uptime_minutes,
                 'formatted': f"{uptime_hours}時間 {uptime_minutes}分"
-            }
+            },
+            'volumes': volumes
         })
     except Exception as e:
         logger.error(f"システム情報取得エラー: {e}")
@@ -3553,6 +3919,8 @@ def get_active_terminals():
     """Get list of active terminals with detailed status"""
     try:
         terminals = []
+        active_terminals = terminal_registry.list_terminals()
+        terminal_mappings = terminal_registry.terminal_mappings()
         for session_id, terminal_info in active_terminals.items():
             terminals.append({
                 'session_id': session_id,
@@ -3567,9 +3935,9 @@ def get_active_terminals():
         return jsonify({
             'success': True,
             'terminals': terminals,
-            'terminal_mappings': terminal_to_session,
+            'terminal_mappings': terminal_mappings,
             'active_sessions': list(active_terminals.keys()),
-            'registered_terminal_ids': list(terminal_to_session.keys()),
+            'registered_terminal_ids': list(terminal_mappings.keys()),
             'count': len(terminals),
             'timestamp': datetime.now().isoformat()
         })
@@ -3589,13 +3957,11 @@ def get_terminal_status(terminal_id):
             'terminal_info': None
         }
         
-        if terminal_id in terminal_to_session:
-            session_id = terminal_to_session[terminal_id]
+        session_id = terminal_registry.session_for_terminal(terminal_id)
+        if session_id is not None:
             status_info['connected'] = True
             status_info['session_id'] = session_id
-            
-            if session_id in active_terminals:
-                status_info['terminal_info'] = active_terminals[session_id]
+            status_info['terminal_info'] = terminal_registry.get_terminal(session_id)
         
         logger.info(f"[TERMINAL_STATUS] Status check for {terminal_id}: {status_info}")
         
@@ -3862,10 +4228,11 @@ def validate_position_data(data_array, position_map):
     
     return True, "Valid"
 
-def render_position_grid(position_map, data_array):
-    """Render position-based data to 24x80 grid"""
-    # Initialize empty grid
-    grid = [[' ' for _ in range(80)] for _ in range(24)]
+def render_position_grid(position_map, data_array, background=None):
+    """Render position-based data to 24x80 grid (over a pre-rendered static background)"""
+    # Untouched rows share the background/blank strings; only rows with fields are built
+    base_rows = background or [' ' * 80] * 24
+    touched_rows = {}
     rendered_fields = []
     
     for i, (map_item, data_item) in enumerate(zip(position_map, data_array)):
@@ -3876,10 +4243,13 @@ def render_position_grid(position_map, data_array):
         # Pad or truncate data to fit length
         padded_data = data_item.ljust(length)[:length]
         
-        # Place data on grid
-        for j, char in enumerate(padded_data):
-            if col + j < 80:
-                grid[row][col + j] = char
+        # Place data on grid (SMED maps are not validated against the 24 rows)
+        if 0 <= row < 24:
+            row_chars = touched_rows.get(row)
+            if row_chars is None:
+                row_chars = touched_rows[row] = list(base_rows[row])
+            visible = padded_data[:max(0, 80 - col)]
+            row_chars[col:col + len(visible)] = visible
         
         rendered_fields.append({
             'index': i,
@@ -3891,7 +4261,9 @@ def render_position_grid(position_map, data_array):
         })
     
     # Convert grid to string lines
-    grid_lines = [''.join(row) for row in grid]
+    grid_lines = list(base_rows)
+    for row, row_chars in touched_rows.items():
+        grid_lines[row] = ''.join(row_chars)
     
     return {
         'grid': grid_lines,
@@ -3903,12 +4275,38 @@ def render_position_grid(position_map, data_array):
 # Position-based map storage (in-memory for demo)
 position_maps = {}
 
+def resolve_position_map(map_name):
+    """
+    (position_map, background) of a stored position map, or of the SMED map
+    with that name from the compiled map cache; None if neither exists
+    """
+    if map_name in position_maps:
+        return position_maps[map_name]['map'], None
+    if not SMED_MAP_CACHE_AVAILABLE:
+        return None
+    file_path = get_smed_file_path(map_name)
+    if not file_path:
+        return None
+    layout = smed_map_cache.get_layout(file_path, 'api_server', lambda: _parse_smed_file_uncached(file_path))
+    if layout is None:
+        return None
+    return layout.position_map, layout.background
+
 @app.route('/api/smed/position-render/<map_name>', methods=['GET'])
 def get_position_render_map(map_name):
     """Get position-based map definition"""
     try:
         if map_name not in position_maps:
-            return jsonify({'error': f'Position map not found: {map_name}'}), 404
+            resolved = resolve_position_map(map_name)
+            if not resolved:
+                return jsonify({'error': f'Position map not found: {map_name}'}), 404
+            return jsonify({
+                'success': True,
+                'map_name': map_name,
+                'map': resolved[0],
+                'background': resolved[1],
+                'source': 'smed'
+            })
         
         map_data = position_maps[map_name]
         return jsonify({
@@ -3965,11 +4363,12 @@ def create_or_update_position_render_map(map_name):
 def render_position_data(map_name):
     """Render data using position-based map"""
     try:
-        # Get map definition
-        if map_name not in position_maps:
+        # Get map definition (stored position map or compiled SMED map)
+        resolved = resolve_position_map(map_name)
+        if not resolved:
             return jsonify({'error': f'Position map not found: {map_name}'}), 404
         
-        position_map = position_maps[map_name]['map']
+        position_map, background = resolved
         
         # Get data from request
         data = request.get_json()
@@ -3984,7 +4383,7 @@ def render_position_data(map_name):
             return jsonify({'error': error_msg}), 400
         
         # Render to grid
-        rendered = render_position_grid(position_map, data_array)
+        rendered = render_position_grid(position_map, data_array, background)
         
         logger.info(f"Position data rendered for map {map_name}: {len(data_array)} fields")
         
@@ -4002,11 +4401,12 @@ def render_position_data(map_name):
 def update_position_data(map_name):
     """Update data using position-based map and broadcast via WebSocket"""
     try:
-        # Get map definition
-        if map_name not in position_maps:
+        # Get map definition (stored position map or compiled SMED map)
+        resolved = resolve_position_map(map_name)
+        if not resolved:
             return jsonify({'error': f'Position map not found: {map_name}'}), 404
         
-        position_map = position_maps[map_name]['map']
+        position_map, background = resolved
         
         # Get data from request
         data = request.get_json()
@@ -4022,7 +4422,7 @@ def update_position_data(map_name):
             return jsonify({'error': error_msg}), 400
         
         # Render to grid
-        rendered = render_position_grid(position_map, data_array)
+        rendered = render_position_grid(position_map, data_array, background)
         
         # Broadcast update via WebSocket
         update_message = {
@@ -4033,6 +4433,18 @@ def update_position_data(map_name):
             **rendered
         }
         
+        # Attach row-level delta against the previous broadcast for this map
+        if SCREEN_STATE_AVAILABLE:
+            fields = {position_field_key(f['row'], f['col']): f['value'] for f in rendered['fields']}
+            update = screen_state_cache.build_update(f'position_render_{map_name}', map_name,
+                                                     fields, rows=rendered['grid'])
+            update_message['seq'] = update['seq']
+            if update['type'] == 'delta':
+                update_message.update({
+                    'base_seq': update['base_seq'],
+                    'changed_rows': update['rows']
+                })
+        
         socketio.emit('position_render_update', update_message, broadcast=True)
         
         logger.info(f"Position data updated and broadcasted for map {map_name}: {len(data_array)} fields")
@@ -4395,6 +4807,17 @@ def handle_position_smed_display(data):
             'api_integrated': api_result is not None
         }
         
+        # Full display resets the screen state used for later deltas
+        if SCREEN_STATE_AVAILABLE:
+            frame_fields = {
+                position_field_key(item.get('row'), item.get('col')): value
+                for item, value in zip(map_data, processed_field_data)
+                if isinstance(item, dict)
+            }
+            update = screen_state_cache.build_update(f'position_smed_{map_name}', map_name,
+                                                     frame_fields, force_full=True)
+            response_data['seq'] = update['seq']
+        
         # Broadcast to all clients subscribed to this map
         room_name = f'position_smed_{map_name}'
         emit('position_smed_display_received', response_data, room=room_name)
@@ -4455,6 +4878,22 @@ def handle_position_smed_update(data):
             )
             logger.info(f"[POSITION_SMED_UPDATE] Converted {len(updates)} updates from SJIS to UTF-8")
         
+        # Drop updates that do not change what subscribers already display
+        sequence_info = {}
+        if SCREEN_STATE_AVAILABLE:
+            update_fields = {
+                position_field_key(u.get('row'), u.get('col')): u.get('value')
+                for u in processed_updates if isinstance(u, dict)
+            }
+            update = screen_state_cache.apply_updates(f'position_smed_{map_name}', map_name, update_fields)
+            sequence_info['seq'] = update['seq']
+            if update['type'] == 'delta':
+                sequence_info['base_seq'] = update['base_seq']
+                processed_updates = [
+                    u for u in processed_updates
+                    if not isinstance(u, dict) or position_field_key(u.get('row'), u.get('col')) in update['changed']
+                ]
+        
         # Prepare response data
         response_data = {
             'event_type': 'position_smed_update',
@@ -4463,18 +4902,21 @@ def handle_position_smed_update(data):
             'terminal_id': terminal_id,
             'encoding': 'utf-8',
             'timestamp': timestamp,
-            'session_id': session_id
+            'session_id': session_id,
+            **sequence_info
         }
         
         # Broadcast to all clients subscribed to this map
         room_name = f'position_smed_{map_name}'
-        emit('position_smed_update_received', response_data, room=room_name)
+        if processed_updates:
+            emit('position_smed_update_received', response_data, room=room_name)
         
         # Confirm to sender
         emit('position_smed_update_confirmed', {
             'success': True,
             'map_name': map_name,
             'update_count': len(updates),
+            'sent_count': len(processed_updates),
             'terminal_id': terminal_id,
             'timestamp': timestamp
         })
@@ -4629,9 +5071,7 @@ def handle_position_smed_subscribe(data):
         join_room(room_name)
         
         # Add subscription to legacy session info
-        session_info = get_position_smed_session(session_id)
-        if session_info and map_name not in session_info['subscriptions']:
-            session_info['subscriptions'].append(map_name)
+        terminal_registry.add_position_subscription(session_id, map_name)
         
         logger.info(f"[POSITION_SMED_SUBSCRIBE] Client {session_id} subscribed to map: {map_name}")
         
@@ -4663,6 +5103,40 @@ def handle_position_smed_subscribe(data):
     except Exception as e:
         handle_position_smed_error(session_id, 'position_smed_subscribe', e, emit)
 
+@socketio.on('position_smed_resync')
+def handle_position_smed_resync(data):
+    """Resend the full field state of a position-based map to a lagging client"""
+    map_name = data.get('map_name')
+    client_seq = data.get('last_seq')
+    
+    if not map_name:
+        emit('position_smed_error', {'error': 'map_name is required'})
+        return
+    
+    frame = screen_state_cache.resync(f'position_smed_{map_name}', client_seq) if SCREEN_STATE_AVAILABLE else None
+    if frame is None:
+        emit('position_smed_error', {'error': f'No screen state for map: {map_name}', 'event_type': 'position_smed_resync'})
+        return
+    
+    updates = []
+    for key, value in frame['fields'].items():
+        try:
+            row, col = (int(part) for part in key.split(','))
+        except ValueError:
+            continue
+        updates.append({'row': row, 'col': col, 'value': value})
+    
+    emit('position_smed_update_received', {
+        'event_type': 'position_smed_update',
+        'map_name': map_name,
+        'updates': updates,
+        'encoding': 'utf-8',
+        'timestamp': datetime.now().isoformat(),
+        'session_id': request.sid,
+        'seq': frame['seq'],
+        'resync': True
+    })
+
 @socketio.on('position_smed_unsubscribe')
 def handle_position_smed_unsubscribe(data):
     """Unsubscribe from position-based SMED updates with session integration"""
@@ -4694,6 +5168,7 @@ def handle_position_smed_unsubscribe(data):
         # Leave room for this map
         room_name = f'position_smed_{map_name}'
         leave_room(room_name)
+        terminal_registry.remove_position_subscription(session_id, map_name)
         
         logger.info(f"[POSITION_SMED_UNSUBSCRIBE] Client {session_id} unsubscribed from map: {map_name}")
         
@@ -4754,37 +5229,27 @@ def integrate_with_position_api(map_name, action, data=None):
         return None
 
 # ENHANCED SESSION MANAGEMENT FOR POSITION-BASED SMED
-position_smed_sessions = {}  # {session_id: {'map_name': str, 'terminal_id': str, 'subscriptions': []}}
+# Sessions live in terminal_registry: {session_id: {'map_name', 'terminal_id', 'subscriptions'}}
 
 def register_position_smed_session(session_id, map_name, terminal_id):
     """Register a position-based SMED session"""
-    if session_id not in position_smed_sessions:
-        position_smed_sessions[session_id] = {
-            'map_name': map_name,
-            'terminal_id': terminal_id,
-            'subscriptions': [],
-            'created_at': datetime.now().isoformat(),
-            'last_activity': datetime.now().isoformat()
-        }
-    else:
-        position_smed_sessions[session_id]['last_activity'] = datetime.now().isoformat()
+    terminal_registry.register_position_session(session_id, map_name, terminal_id)
     
     logger.info(f"[POSITION_SMED_SESSION] Registered session {session_id} for map {map_name}")
 
 def unregister_position_smed_session(session_id):
     """Unregister a position-based SMED session"""
-    if session_id in position_smed_sessions:
-        session_info = position_smed_sessions.pop(session_id)
+    session_info = terminal_registry.unregister_position_session(session_id)
+    if session_info:
         logger.info(f"[POSITION_SMED_SESSION] Unregistered session {session_id} for map {session_info.get('map_name')}")
 
 def get_position_smed_session(session_id):
     """Get position-based SMED session info"""
-    return position_smed_sessions.get(session_id)
+    return terminal_registry.get_position_session(session_id)
 
 def update_position_smed_session_activity(session_id):
     """Update session last activity timestamp"""
-    if session_id in position_smed_sessions:
-        position_smed_sessions[session_id]['last_activity'] = datetime.now().isoformat()
+    terminal_registry.touch_position_session(session_id)
 
 # ENHANCED ERROR HANDLING FOR POSITION-BASED SMED WEBSOCKET EVENTS
 def handle_position_smed_error(session_id, event_type, error, emit_func):
@@ -4828,8 +5293,32 @@ def get_catalog():
 
 @app.route('/api/catalog/maps', methods=['GET'])
 def get_catalog_maps():
-    """Get all MAP type resources (DBIO-enabled with JSON fallback)"""
+    """Get all MAP type resources (DBIO-enabled with JSON fallback)
+    
+    Optional query parameters limit/cursor return one keyset page plus
+    next_cursor instead of every map in the catalog.
+    """
     try:
+        limit = _catalog_page_limit()
+        if limit:
+            page = get_catalog_page_with_fallback({'object_type': 'MAP'}, limit, request.args.get('cursor'))
+            maps = [{
+                'volume': obj['volume_name'],
+                'library': obj['library_name'],
+                'name': obj['object_name'],
+                'maptype': obj['attributes'].get('MAPTYPE', 'UNKNOWN'),
+                'mapfile': obj['attributes'].get('MAPFILE', obj['object_name']),
+                'description': obj['attributes'].get('DESCRIPTION', ''),
+                'rows': obj['attributes'].get('ROWS', 24),
+                'cols': obj['attributes'].get('COLS', 80)
+            } for obj in page['objects']]
+            return jsonify({
+                'success': True,
+                'maps': maps,
+                'count': len(maps),
+                'next_cursor': page['next_cursor']
+            })
+        
         catalog = get_catalog_data_with_fallback()
         maps = []
         
@@ -4855,6 +5344,8 @@ def get_catalog_maps():
             'count': len(maps)
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Failed to get catalog maps: {e}")
         return jsonify({'error': str(e)}), 500
@@ -4895,6 +5386,47 @@ def get_catalog_libraries(volume_name):
         logger.error(f"Failed to get catalog libraries: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/catalog/search', methods=['GET'])
+def search_catalog():
+    """Indexed catalog search: q=ABC (contains), ABC* (prefix) or A?C* (wildcard), type, limit"""
+    try:
+        query = request.args.get('q', '')
+        object_type = request.args.get('type')
+        limit = request.args.get('limit', 100, type=int)
+        
+        manager = _get_catalog_page_manager()
+        if manager is not None:
+            try:
+                results = manager.search_objects(query, object_type, limit)
+                return jsonify({'success': True, 'results': results, 'count': len(results)})
+            except Exception as e:
+                logger.warning(f"[API_SERVER] DBIO search failed, falling back to catalog scan: {e}")
+        
+        # Catalog scan fallback with the same query syntax
+        pattern = query.lower() if ('*' in query or '?' in query) else f'*{query.lower()}*'
+        results = []
+        catalog = get_catalog_data_with_fallback()
+        for volume_name in sorted(catalog):
+            for library_name in sorted(catalog[volume_name]):
+                for object_name, attributes in sorted(catalog[volume_name][library_name].items()):
+                    if not isinstance(attributes, dict):
+                        continue
+                    if object_type and attributes.get('TYPE') != object_type:
+                        continue
+                    if fnmatch.fnmatchcase(object_name.lower(), pattern):
+                        results.append({
+                            'volume_name': volume_name,
+                            'library_name': library_name,
+                            'object_name': object_name,
+                            'attributes': attributes
+                        })
+        results = results[:limit] if limit else results
+        return jsonify({'success': True, 'results': results, 'count': len(results)})
+        
+    except Exception as e:
+        logger.error(f"Failed to search catalog: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/compile', methods=['POST'])
 def compile_java():
     """Compile Java source file"""
@@ -5288,30 +5820,12 @@ def force_disconnect_websockets_by_workstations(workstation_names: List[str]) ->
     disconnected = []
     
     try:
-        # Find WebSocket sessions to disconnect
-        sessions_to_disconnect = []
-        
-        # Check websocket_sessions (maps session_id to session info)
-        for session_id, session_info in websocket_sessions.items():
-            wsname = session_info.get('wsname')
-            if wsname in workstation_names:
-                sessions_to_disconnect.append({
-                    'session_id': session_id,
-                    'wsname': wsname,
-                    'type': 'websocket'
-                })
-        
-        # Check active_terminals (maps session_id to terminal info)
-        for session_id, terminal_info in active_terminals.items():
-            workstation = terminal_info.get('workstation')
-            if workstation in workstation_names:
-                # Check if we haven't already added this session
-                if not any(s['session_id'] == session_id for s in sessions_to_disconnect):
-                    sessions_to_disconnect.append({
-                        'session_id': session_id,
-                        'wsname': workstation,
-                        'type': 'terminal'
-                    })
+        # Find WebSocket sessions to disconnect (workstation index covers
+        # both WebSocket sessions and registered terminals)
+        sessions_to_disconnect = [
+            {'session_id': session_id, 'wsname': wsname}
+            for session_id, wsname in terminal_registry.sessions_for_workstations(workstation_names).items()
+        ]
         
         # Force disconnect the WebSocket sessions
         for session_info in sessions_to_disconnect:
@@ -5324,19 +5838,9 @@ def force_disconnect_websockets_by_workstations(workstation_names: List[str]) ->
                 # Use socketio.disconnect to forcefully disconnect the client
                 socketio.disconnect(session_id)
                 
-                # Clean up session tracking
-                if session_id in websocket_sessions:
-                    del websocket_sessions[session_id]
-                
-                if session_id in active_terminals:
-                    terminal_info = active_terminals[session_id]
-                    terminal_id = terminal_info.get('terminal_id')
-                    
-                    # Clean up terminal mappings
-                    if terminal_id and terminal_id in terminal_to_session:
-                        del terminal_to_session[terminal_id]
-                    
-                    del active_terminals[session_id]
+                # Clean up session tracking and terminal mappings
+                terminal_registry.remove_websocket_session(session_id)
+                terminal_registry.unregister_terminal(session_id)
                 
                 disconnected.append(wsname)
                 logger.info(f"[FORCE_DISCONNECT] Successfully disconnected {wsname}")
@@ -5561,23 +6065,22 @@ def cleanup_processes():
 def get_websocket_status():
     """Get WebSocket server status including position-based SMED sessions"""
     try:
-        active_sessions = len(active_terminals)
-        position_smed_active = len(position_smed_sessions)
-        
-        # Count subscriptions
-        total_subscriptions = 0
-        for session_info in position_smed_sessions.values():
-            total_subscriptions += len(session_info.get('subscriptions', []))
+        registry_stats = terminal_registry.get_stats()
         
         status = {
             'websocket_server': 'running',
-            'active_sessions': active_sessions,
-            'position_smed_sessions': position_smed_active,
-            'total_position_subscriptions': total_subscriptions,
+            'active_sessions': registry_stats['terminals'],
+            'position_smed_sessions': registry_stats['position_smed_sessions'],
+            'total_position_subscriptions': registry_stats['position_subscriptions'],
             'encoding_api_available': position_smed_encoder.encoding_api_available,
+            'encoding': position_smed_encoder.get_stats(),
+            'terminal_registry': registry_stats,
             'timestamp': datetime.now().isoformat()
         }
         
+        if SCREEN_STATE_AVAILABLE:
+            status['screen_state'] = screen_state_cache.get_stats()
+        
         return jsonify(status)
         
     except Exception as e:
@@ -5590,7 +6093,7 @@ def get_position_smed_sessions():
     try:
         sessions = []
         
-        for session_id, session_info in position_smed_sessions.items():
+        for session_id, session_info in terminal_registry.list_position_sessions().items():
             session_detail = {
                 'session_id': session_id,
                 'map_name': session_info.get('map_name'),
@@ -6076,8 +6579,22 @@ def register_catalog_dataset():
 
 @app.route('/api/catalog/datasets/<volume>/<library>', methods=['GET'])
 def get_catalog_datasets(volume, library):
-    """Get all datasets in a library (DBIO-enabled with JSON fallback)"""
+    """Get all datasets in a library (DBIO-enabled with JSON fallback)
+    
+    Optional query parameters limit/cursor return one keyset page plus
+    next_cursor so large libraries can be scrolled.
+    """
     try:
+        limit = _catalog_page_limit()
+        if limit:
+            page = get_catalog_page_with_fallback({'volume': volume, 'library': library}, limit,
+                                                  request.args.get('cursor'))
+            return jsonify({
+                'success': True,
+                'datasets': {obj['object_name']: obj['attributes'] for obj in page['objects']},
+                'next_cursor': page['next_cursor']
+            })
+        
         catalog = get_catalog_data_with_fallback()
         
         if volume not in catalog or library not in catalog[volume]:
@@ -6093,6 +6610,8 @@ def get_catalog_datasets(volume, library):
             'datasets': datasets
         })
         
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Failed to get datasets: {e}")
         return jsonify({'error': str(e)}), 500
@@ -12,6 +12,7 @@ import org.springframework.web.bind.annotation.*;
 
 import javax.validation.Valid;
 import java.util.HashMap;
+import java.util.List;
 import java.util.Map;
 
 /**
@@ -95,6 +96,59 @@ public class EncodingController {
         }
     }
     
+    /**
+     * Batch text conversion endpoint
+     * POST /api/encoding/convert-batch
+     * Body: {"texts": [...], "sourceEncoding": "sjis", "targetEncoding": "utf-8"}
+     */
+    @PostMapping("/convert-batch")
+    public ResponseEntity<Map<String, Object>> convertBatch(@RequestBody Map<String, Object> request) {
+        Map<String, Object> response = new HashMap<>();
+        
+        Object texts = request.get("texts");
+        if (!(texts instanceof List)) {
+            response.put("success", false);
+            response.put("error", "texts array is required");
+            return ResponseEntity.badRequest().body(response);
+        }
+        
+        try {
+            List<?> values = (List<?>) texts;
+            for (Object value : values) {
+                if (value != null && !(value instanceof String)) {
+                    response.put("success", false);
+                    response.put("error", "texts must contain strings");
+                    return ResponseEntity.badRequest().body(response);
+                }
+            }
+            @SuppressWarnings("unchecked")
+            List<String> textValues = (List<String>) values;
+            String sourceEncoding = String.valueOf(request.getOrDefault("sourceEncoding", "SHIFT_JIS"));
+            String targetEncoding = String.valueOf(request.getOrDefault("targetEncoding", "UTF-8"));
+            logger.info("Received batch conversion request: {} texts {} -> {}",
+                       textValues.size(), sourceEncoding, targetEncoding);
+            
+            String[] converted = encodingService.convertTexts(textValues, sourceEncoding, targetEncoding);
+            
+            response.put("success", true);
+            response.put("sourceEncoding", sourceEncoding);
+            response.put("targetEncoding", targetEncoding);
+            response.put("convertedTexts", converted);
+            response.put("count", converted.length);
+            return ResponseEntity.ok(response);
+            
+        } catch (IllegalArgumentException e) {
+            response.put("success", false);
+            response.put("error", e.getMessage());
+            return ResponseEntity.badRequest().body(response);
+        } catch (Exception e) {
+            logger.error("Batch conversion error", e);
+            response.put("success", false);
+            response.put("error", e.getMessage());
+            return ResponseEntity.status(HttpStatus.INTERNAL_SERVER_ERROR).body(response);
+        }
+    }
+    
     /**
      * Get supported encodings
      * GET /api/encoding/supported
@@ -135,6 +189,7 @@ public class EncodingController {
         Map<String, String> endpoints = new HashMap<>();
         endpoints.put("POST /api/encoding/sjis-to-utf8", "Main conversion endpoint using buffer-based parameters");
         endpoints.put("POST /api/encoding/convert-text", "Simple text conversion for testing");
+        endpoints.put("POST /api/encoding/convert-batch", "Convert a list of texts in one request");
         endpoints.put("GET /api/encoding/supported", "Get list of supported encodings");
         endpoints.put("GET /api/encoding/health", "Health check");
         endpoints.put("GET /api/encoding/info", "API information");
@@ -10,6 +10,7 @@ import java.io.ByteArrayOutputStream;
 import java.nio.charset.Charset;
 import java.nio.charset.StandardCharsets;
 import java.util.Arrays;
+import java.util.List;
 
 /**
  * Core encoding conversion service
@@ -105,6 +106,35 @@ public class EncodingService {
         }
     }
     
+    /**
+     * Convert several text values between two encodings
+     * 
+     * Values arrive as Unicode strings, so each one is mapped through the
+     * non-Unicode side of the pair: characters that encoding cannot
+     * represent become its replacement character.
+     * 
+     * @param texts           Text values
+     * @param sourceEncoding  Source encoding (e.g., "sjis")
+     * @param targetEncoding  Target encoding (e.g., "utf-8")
+     * @return Converted values in input order
+     * @throws IllegalArgumentException on an unsupported encoding
+     */
+    public String[] convertTexts(List<String> texts, String sourceEncoding, String targetEncoding) {
+        Charset source = getCharsetFromName(sourceEncoding);
+        Charset target = getCharsetFromName(targetEncoding);
+        if (source == null || target == null) {
+            throw new IllegalArgumentException("Unsupported encoding pair: " + sourceEncoding + " -> " + targetEncoding);
+        }
+        Charset legacy = StandardCharsets.UTF_8.equals(source) ? target : source;
+        
+        String[] converted = new String[texts.size()];
+        for (int i = 0; i < converted.length; i++) {
+            String text = texts.get(i);
+            converted[i] = text == null ? null : new String(text.getBytes(legacy), legacy);
+        }
+        return converted;
+    }
+    
     /**
      * Map encoding names to Java Charset objects
      */
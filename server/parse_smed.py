@@ -16,17 +16,46 @@ try:
 except ImportError:
     SMART_READER_AVAILABLE = False
 
+# Import shared compiled map cache
+try:
+    from smed_map_cache import smed_map_cache
+    SMED_MAP_CACHE_AVAILABLE = True
+except ImportError:
+    SMED_MAP_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 def parse_smed_file(file_path, destination='server', **kwargs):
     """
     Enhanced SMED file parser with smart encoding
     Uses destination-aware encoding to avoid unnecessary conversions
+    Results are cached per file version and must be treated as read-only
     
     Args:
         file_path: Path to SMED file
         destination: 'server', 'web_ui', 'api', 'terminal'
     """
+    if SMED_MAP_CACHE_AVAILABLE:
+        parser_key = ('parse_smed', destination, kwargs.get('terminal_type', 'console'))
+        return smed_map_cache.get_parsed(
+            file_path, parser_key, lambda: _parse_smed_file_uncached(file_path, destination, **kwargs)
+        )
+    return _parse_smed_file_uncached(file_path, destination, **kwargs)
+
+def get_compiled_smed_map(file_path, destination='server', **kwargs):
+    """
+    Get the compiled form of a SMED map (parse result, position map, static background)
+    Returns None if the map cannot be parsed or the cache is not available
+    """
+    if not SMED_MAP_CACHE_AVAILABLE:
+        return None
+    parser_key = ('parse_smed', destination, kwargs.get('terminal_type', 'console'))
+    return smed_map_cache.get_layout(
+        file_path, parser_key, lambda: _parse_smed_file_uncached(file_path, destination, **kwargs)
+    )
+
+def _parse_smed_file_uncached(file_path, destination='server', **kwargs):
+    """Read and parse a SMED file without consulting the map cache"""
     try:
         # Use smart reader if available
         if SMART_READER_AVAILABLE:
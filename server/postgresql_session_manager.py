@@ -13,6 +13,7 @@ import time
 import uuid
 import psycopg2
 import psycopg2.extras
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 import logging
@@ -20,6 +21,30 @@ import logging
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Logout every requested workstation in one statement and report per-name outcome:
+# previous_status NULL = not found, '0' = already inactive, logged_out = updated now
+BULK_LOGOUT_SQL = """
+    WITH requested AS (
+        SELECT DISTINCT unnest(%s::text[]) AS wsname
+    ), current_rows AS (
+        SELECT t.wsname, t.status
+        FROM asp_terminal t JOIN requested r ON r.wsname = t.wsname
+        FOR UPDATE OF t
+    ), updated AS (
+        UPDATE asp_terminal t
+        SET status = '0', last_activity = CURRENT_TIMESTAMP
+        FROM current_rows c
+        WHERE t.wsname = c.wsname AND c.status <> '0'
+        RETURNING t.wsname, t.session_id, t.username, t.terminal_id
+    )
+    SELECT r.wsname, c.status AS previous_status,
+           u.session_id, u.username, u.terminal_id,
+           (u.wsname IS NOT NULL) AS logged_out
+    FROM requested r
+    LEFT JOIN current_rows c ON c.wsname = r.wsname
+    LEFT JOIN updated u ON u.wsname = r.wsname
+"""
+
 class PostgreSQLSessionManager:
     """PostgreSQL-based session manager for enterprise terminal sessions"""
     
@@ -63,11 +88,19 @@ class PostgreSQLSessionManager:
     
     def _get_connection(self):
         """Get database connection"""
-        conn = psycopg2.connect(**self.db_config)
-        # Set search path to include aspuser schema
-        with conn.cursor() as cur:
-            cur.execute("SET search_path TO aspuser, public")
-        return conn
+        # Set search path to include aspuser schema as a startup option (no extra round trip)
+        return psycopg2.connect(options='-c search_path=aspuser,public', **self.db_config)
+    
+    @contextmanager
+    def _transaction(self, cursor_factory=None):
+        """Cursor inside a single transaction; commits on success and always closes the connection"""
+        conn = self._get_connection()
+        try:
+            with conn:
+                with conn.cursor(cursor_factory=cursor_factory) as cur:
+                    yield cur
+        finally:
+            conn.close()
     
     def _format_conn_time(self, dt=None):
         """Format datetime to yyyy/mm/dd-hh:mm:ss format"""
@@ -380,92 +413,84 @@ class PostgreSQLSessionManager:
             return {}
 
     def bulk_logout_sessions(self, workstation_names: List[str]) -> Dict[str, Any]:
-        """Bulk logout sessions by workstation names"""
+        """
+        Bulk logout sessions by workstation names
+        
+        Runs one set-based UPDATE ... WHERE wsname = ANY(...) RETURNING in a single
+        transaction. The returned 'sessions' list carries session/terminal ids of the
+        logged-out workstations so callers can drop their sockets without another query.
+        """
         results = {
             'success': [],
             'failed': [],
+            'sessions': [],
             'total_processed': len(workstation_names)
         }
         
+        if not workstation_names:
+            return results
+        
         try:
-            with self._get_connection() as conn:
-                with conn.cursor() as cur:
-                    for wsname in workstation_names:
-                        try:
-                            # Check if session exists and is active
-                            cur.execute(
-                                "SELECT wsname, status FROM asp_terminal WHERE wsname = %s",
-                                (wsname,)
-                            )
-                            row = cur.fetchone()
-                            
-                            if not row:
-                                results['failed'].append({
-                                    'wsname': wsname,
-                                    'error': 'Session not found'
-                                })
-                                continue
-                                
-                            if row[1] == '0':
-                                results['failed'].append({
-                                    'wsname': wsname,
-                                    'error': 'Session already inactive'
-                                })
-                                continue
-                            
-                            # Logout the session
-                            cur.execute(
-                                "UPDATE asp_terminal SET status = '0', last_activity = CURRENT_TIMESTAMP WHERE wsname = %s",
-                                (wsname,)
-                            )
-                            
-                            if cur.rowcount > 0:
-                                results['success'].append(wsname)
-                                logger.info(f"Bulk logout successful for workstation: {wsname}")
-                            else:
-                                results['failed'].append({
-                                    'wsname': wsname,
-                                    'error': 'Failed to update session status'
-                                })
-                                
-                        except Exception as e:
-                            logger.error(f"Failed to logout session {wsname}: {e}")
-                            results['failed'].append({
-                                'wsname': wsname,
-                                'error': str(e)
-                            })
-                    
-                    # Commit all changes
-                    conn.commit()
-                    logger.info(f"Bulk logout completed: {len(results['success'])} successful, {len(results['failed'])} failed")
-                    
+            with self._transaction(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                cur.execute(BULK_LOGOUT_SQL, (list(workstation_names),))
+                rows = {row['wsname']: row for row in cur.fetchall()}
         except Exception as e:
             logger.error(f"Bulk logout operation failed: {e}")
-            # If connection failed, mark all as failed
-            for wsname in workstation_names:
-                if wsname not in [item['wsname'] if isinstance(item, dict) else item for item in results['success'] + [f['wsname'] for f in results['failed']]]:
-                    results['failed'].append({
-                        'wsname': wsname,
-                        'error': f'Database error: {str(e)}'
-                    })
+            results['failed'] = [{'wsname': wsname, 'error': f'Database error: {str(e)}'}
+                                 for wsname in workstation_names]
+            return results
+        
+        for wsname in dict.fromkeys(workstation_names):
+            row = rows.get(wsname)
+            if row is None or row['previous_status'] is None:
+                results['failed'].append({'wsname': wsname, 'error': 'Session not found'})
+            elif not row['logged_out']:
+                results['failed'].append({'wsname': wsname, 'error': 'Session already inactive'})
+            else:
+                results['success'].append(wsname)
+                results['sessions'].append({
+                    'wsname': wsname,
+                    'session_id': row['session_id'],
+                    'username': row['username'],
+                    'terminal_id': row['terminal_id']
+                })
         
+        logger.info(f"Bulk logout completed: {len(results['success'])} successful, {len(results['failed'])} failed")
         return results
 
+    def bulk_set_session_status(self, workstation_names: List[str], status: str) -> List[str]:
+        """
+        Set the status of many workstations with one UPDATE ... WHERE wsname = ANY(...)
+        
+        Returns:
+            Workstation names that were updated
+        """
+        if not workstation_names:
+            return []
+        
+        with self._transaction() as cur:
+            cur.execute(
+                "UPDATE asp_terminal SET status = %s, last_activity = CURRENT_TIMESTAMP "
+                "WHERE wsname = ANY(%s) RETURNING wsname",
+                (status, list(workstation_names))
+            )
+            updated = [row[0] for row in cur.fetchall()]
+        
+        logger.info(f"Bulk status update to {status}: {len(updated)} sessions")
+        return updated
+
     def get_sessions_by_workstation_names(self, workstation_names: List[str]) -> List[Dict[str, Any]]:
         """Get sessions for multiple workstation names"""
         try:
             if not workstation_names:
                 return []
-                
-            with self._get_connection() as conn:
-                with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                    # Create placeholders for the IN clause
-                    placeholders = ','.join(['%s'] * len(workstation_names))
-                    query = f"SELECT * FROM asp_terminal WHERE wsname IN ({placeholders}) ORDER BY wsname"
-                    
-                    cur.execute(query, workstation_names)
-                    rows = cur.fetchall()
-                    return [dict(row) for row in rows]
+            
+            with self._transaction(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                cur.execute(
+                    "SELECT * FROM asp_terminal WHERE wsname = ANY(%s) ORDER BY wsname",
+                    (list(workstation_names),)
+                )
+                return [dict(row) for row in cur.fetchall()]
                     
         except Exception as e:
             logger.error(f"Failed to get sessions for workstations: {e}")
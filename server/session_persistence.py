@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Write-Behind Session Persistence
+Coalesces workstation session mutations in memory, group-commits them to a
+change journal for crash recovery and writes atomic snapshots from a
+background flusher
+"""
+
+import os
+import json
+import atexit
+import threading
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SESSION_FLUSH_INTERVAL = float(os.environ.get('WS_SESSION_FLUSH_INTERVAL', '1.0'))
+SESSION_FLUSH_THRESHOLD = int(os.environ.get('WS_SESSION_FLUSH_THRESHOLD', '200'))
+# fsync every journal group commit; with 0 a crash can lose the changes made
+# since the last snapshot (at most WS_SESSION_FLUSH_INTERVAL seconds)
+SESSION_JOURNAL_FSYNC = os.environ.get('WS_SESSION_JOURNAL_FSYNC', '1') == '1'
+
+
+class WriteBehindSessionStore:
+    """
+    Session store with write-behind snapshots
+
+    Every mutation is serialized once, queued for '<snapshot>.journal' and
+    marked dirty. The journal writer appends everything queued since its last
+    commit with one write and one fsync, so a burst of mutations (a login
+    storm, a bulk logout) costs a few syncs instead of one per change and no
+    disk I/O happens under the store lock. The flusher rewrites the snapshot
+    when the flush interval expires or the dirty count reaches the
+    threshold, then trims the journal to the entries the snapshot does not
+    cover yet.
+    """
+
+    def __init__(self, snapshot_path: str, flush_interval: float = SESSION_FLUSH_INTERVAL,
+                 flush_threshold: int = SESSION_FLUSH_THRESHOLD):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + '.journal'
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+
+        self.records: Dict[str, str] = {}  # session_id -> serialized session
+        self.dirty = set()
+        self.seq = 0  # last journal sequence number
+        self.pending_lines = []  # [(seq, line)] written after the last snapshot
+        self.journal_buffer = []  # lines not yet committed to the journal
+
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.journal_lock = threading.Lock()  # journal file; taken before self.lock
+        self.wakeup = threading.Event()
+        self.journal_wakeup = threading.Event()
+        self.stopped = threading.Event()
+        self.flusher = None
+        self.journal_writer = None
+        self.journal = None
+
+        self.stats = {
+            'mutations': 0,
+            'flushes': 0,
+            'flush_errors': 0,
+            'journal_commits': 0,
+            'journal_replayed': 0
+        }
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the last snapshot and replay newer journal entries"""
+        sessions: Dict[str, Dict[str, Any]] = {}
+        snapshot_seq = 0
+
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                sessions = data.get('sessions', {})
+                snapshot_seq = data.get('_journal_seq', 0)
+            except Exception as e:
+                logger.warning(f"Failed to read session snapshot {self.snapshot_path}: {e}")
+
+        self.seq = snapshot_seq
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn last line from a crash during append
+                        continue
+                    if entry.get('seq', 0) <= snapshot_seq:
+                        continue
+                    if entry.get('deleted'):
+                        sessions.pop(entry['id'], None)
+                    else:
+                        sessions[entry['id']] = entry['data']
+                    self.seq = max(self.seq, entry['seq'])
+                    self.stats['journal_replayed'] += 1
+
+        with self.lock:
+            self.records = {sid: json.dumps(data, ensure_ascii=False) for sid, data in sessions.items()}
+            if self.stats['journal_replayed']:
+                self.dirty.add(None)
+
+        if self.stats['journal_replayed']:
+            logger.info(f"Replayed {self.stats['journal_replayed']} session journal entries")
+        return sessions
+
+    def start(self):
+        """Start the background flusher"""
+        if self.flusher is not None:
+            return
+        self.journal = open(self.journal_path, 'a', encoding='utf-8')
+        self.flusher = threading.Thread(target=self._flush_loop, name='ws-session-flusher', daemon=True)
+        self.flusher.start()
+        self.journal_writer = threading.Thread(target=self._journal_loop, name='ws-session-journal', daemon=True)
+        self.journal_writer.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Flush outstanding changes and stop the flusher"""
+        self.stopped.set()
+        self.wakeup.set()
+        self.journal_wakeup.set()
+        self.commit_journal()
+        self.flush()
+        with self.journal_lock:
+            if self.journal:
+                self.journal.close()
+                self.journal = None
+
+    def record(self, session_id: str, session_data: Optional[Dict[str, Any]] = None, deleted: bool = False):
+        """Record a session mutation (None data with deleted=True removes the session)"""
+        encoded = None if deleted else json.dumps(session_data, ensure_ascii=False)
+        with self.lock:
+            self.seq += 1
+            if deleted:
+                self.records.pop(session_id, None)
+                line = json.dumps({'seq': self.seq, 'id': session_id, 'deleted': True}, ensure_ascii=False)
+            else:
+                self.records[session_id] = encoded
+                line = f'{{"seq": {self.seq}, "id": {json.dumps(session_id)}, "data": {encoded}}}'
+            self.pending_lines.append((self.seq, line))
+            self.journal_buffer.append(line)
+            self.dirty.add(session_id)
+            self.stats['mutations'] += 1
+            if len(self.dirty) >= self.flush_threshold:
+                self.wakeup.set()
+        self.journal_wakeup.set()
+
+    def commit_journal(self):
+        """Append all queued journal lines with a single write and fsync"""
+        with self.journal_lock:
+            with self.lock:
+                lines = self.journal_buffer
+                self.journal_buffer = []
+            if not lines or self.journal is None:
+                return
+            try:
+                self.journal.write('\n'.join(lines) + '\n')
+                self.journal.flush()
+                if SESSION_JOURNAL_FSYNC:
+                    os.fsync(self.journal.fileno())
+                self.stats['journal_commits'] += 1
+            except Exception as e:
+                logger.warning(f"Failed to append session journal: {e}")
+
+    def request_flush(self):
+        """Ask the flusher to write a snapshot now without waiting for it"""
+        self.wakeup.set()
+
+    def flush(self) -> bool:
+        """Write a snapshot of all records if anything changed"""
+        with self.flush_lock:
+            with self.lock:
+                if not self.dirty:
+                    return True
+                snapshot_seq = self.seq
+                records = list(self.records.items())
+                self.dirty.clear()
+
+            try:
+                self._write_snapshot(records, snapshot_seq)
+            except Exception as e:
+                logger.warning(f"Failed to save sessions: {e}")
+                with self.lock:
+                    self.dirty.add(None)
+                    self.stats['flush_errors'] += 1
+                return False
+
+            with self.journal_lock:
+                with self.lock:
+                    self.pending_lines = [(seq, line) for seq, line in self.pending_lines if seq > snapshot_seq]
+                    # The rewritten journal holds every uncommitted line as well
+                    lines = [line for _, line in self.pending_lines]
+                    self.journal_buffer = []
+                    self.stats['flushes'] += 1
+                self._rewrite_journal(lines)
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get persistence statistics"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats.update({
+                'records': len(self.records),
+                'dirty': len(self.dirty),
+                'journal_pending': len(self.pending_lines),
+                'journal_seq': self.seq
+            })
+            return stats
+
+    def _flush_loop(self):
+        while not self.stopped.is_set():
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def _journal_loop(self):
+        # Lines queued while a commit is syncing go out together in the next one
+        while not self.stopped.is_set():
+            self.journal_wakeup.wait()
+            self.journal_wakeup.clear()
+            self.commit_journal()
+
+    def _write_snapshot(self, records, snapshot_seq: int):
+        """Atomically replace the snapshot file"""
+        body = ',\n'.join(f'{json.dumps(sid, ensure_ascii=False)}: {encoded}' for sid, encoded in records)
+        tmp_path = f'{self.snapshot_path}.tmp.{os.getpid()}'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f'{{"_journal_seq": {snapshot_seq}, "sessions": {{\n{body}\n}}}}\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _rewrite_journal(self, lines):
+        """Keep only the journal entries newer than the last snapshot (caller holds journal_lock)"""
+        if self.journal is None:
+            return
+        try:
+            self.journal.close()
+            tmp_path = self.journal_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for line in lines:
+                    f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+        except Exception as e:
+            logger.warning(f"Failed to compact session journal: {e}")
+        finally:
+            self.journal = open(self.journal_path, 'a', encoding='utf-8')
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SMED Field Codec
+In-process SJIS <-> UTF-8 conversion of whole SMED field arrays using the
+Fujitsu SJIS mapping, so screen renders no longer need one encoding API
+request per field
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Fujitsu SJIS is cp932 (NEC row 13 and IBM extensions) with the JIS X 0208
+# code points for the cells where cp932 and JIS disagree. Python's cp932
+# codec encodes both variants of those cells, but decodes to the Microsoft
+# ones, so decoded text is mapped back to the JIS code points.
+FUJITSU_DECODE_MAP = {
+    0xFF5E: '〜',  # 0x8160 WAVE DASH
+    0x2225: '‖',  # 0x8161 DOUBLE VERTICAL LINE
+    0xFF0D: '−',  # 0x817C MINUS SIGN
+    0xFFE0: '¢',  # 0x8191 CENT SIGN
+    0xFFE1: '£',  # 0x8192 POUND SIGN
+    0xFFE2: '¬',  # 0x81CA NOT SIGN
+}
+
+# Code points cp932 cannot encode but Fujitsu SJIS maps
+FUJITSU_ENCODE_MAP = {
+    0x2014: '―',  # EM DASH -> 0x815C
+}
+
+SJIS_ENCODINGS = {'sjis', 'shift_jis', 'shift-jis', 'cp932', 'ms932', 'windows-31j'}
+UTF8_ENCODINGS = {'utf-8', 'utf8'}
+
+
+def normalize_encoding(encoding: str) -> str:
+    """'sjis' / 'utf-8' for the supported encodings, the lowered name otherwise"""
+    name = (encoding or '').lower()
+    if name in SJIS_ENCODINGS:
+        return 'sjis'
+    if name in UTF8_ENCODINGS:
+        return 'utf-8'
+    return name
+
+
+class SMEDFieldCodec:
+    """Batch converter for SMED field values (str or bytes)"""
+
+    def __init__(self, codec: str = 'cp932'):
+        self.codec = codec
+        self.decode_table = str.maketrans(FUJITSU_DECODE_MAP)
+        self.encode_table = str.maketrans(FUJITSU_ENCODE_MAP)
+        self.lock = threading.Lock()
+        self.stats = {
+            'batches': 0,
+            'values': 0,
+            'unmapped': 0
+        }
+
+    def convert_value(self, value: Union[str, bytes], from_encoding: str, to_encoding: str) -> Optional[str]:
+        """
+        Convert one value; returns None when it contains code points the
+        Fujitsu table cannot map (the caller decides on a fallback)
+        """
+        try:
+            if isinstance(value, bytes):
+                if from_encoding == 'utf-8':
+                    value = value.decode('utf-8')
+                else:
+                    return value.decode(self.codec).translate(self.decode_table)
+            sjis_bytes = value.translate(self.encode_table).encode(self.codec)
+            return sjis_bytes.decode(self.codec).translate(self.decode_table)
+        except UnicodeError:
+            return None
+
+    def convert_many(self, values: List[Union[str, bytes]], from_encoding: str,
+                     to_encoding: str) -> Tuple[List[Optional[str]], List[int]]:
+        """
+        Convert a field array in one pass
+
+        Returns:
+            (converted values, indexes of values that could not be mapped)
+        """
+        from_encoding = normalize_encoding(from_encoding)
+        to_encoding = normalize_encoding(to_encoding)
+        converted = [self.convert_value(value, from_encoding, to_encoding) for value in values]
+        unmapped = [index for index, value in enumerate(converted) if value is None]
+        with self.lock:
+            self.stats['batches'] += 1
+            self.stats['values'] += len(values)
+            self.stats['unmapped'] += len(unmapped)
+        return converted, unmapped
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get codec statistics"""
+        with self.lock:
+            stats = self.stats.copy()
+        stats['codec'] = self.codec
+        return stats
+
+
+# Global instance with the mapping tables built once per process
+smed_field_codec = SMEDFieldCodec()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled SMED Map Cache
+Shared LRU cache of decoded and parsed SMED maps keyed by (path, mtime, size)
+so repeated screen displays skip Shift-JIS decoding, line parsing and
+rendering of the static screen background
+"""
+
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SMED_MAP_CACHE_SIZE = int(os.environ.get('SMED_MAP_CACHE_SIZE', '128'))
+
+SCREEN_ROWS = 24
+SCREEN_COLS = 80
+
+
+class SMEDLayout:
+    """Parsed SMED map with its position map and pre-rendered static background"""
+
+    def __init__(self, result: Dict[str, Any]):
+        self.result = result  # parse result (read-only)
+        self.map_name = result.get('map_name')
+        self.fields: List[Dict[str, Any]] = result.get('fields', [])
+        self.position_map = build_position_map(self.fields)
+        self.background = render_static_background(self.fields)
+
+
+class CompiledSMEDMap:
+    """Everything derived from one version of a SMED file"""
+
+    def __init__(self, path: str, key: Tuple[str, int, int]):
+        self.path = path
+        self.key = key  # (path, mtime_ns, size)
+        self.contents: Dict[Hashable, str] = {}  # decoder -> decoded text
+        self.parsed: Dict[Hashable, Any] = {}  # parser -> parse result
+        self.layouts: Dict[Hashable, SMEDLayout] = {}  # parser -> layout of its parse result
+
+
+class SMEDMapCache:
+    """Thread-safe LRU cache of compiled SMED maps"""
+
+    def __init__(self, max_entries: int = SMED_MAP_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, CompiledSMEDMap]' = OrderedDict()
+        self.lock = threading.RLock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stale': 0,
+            'evictions': 0,
+            'invalidations': 0
+        }
+
+    def _entry(self, file_path: str) -> CompiledSMEDMap:
+        """Return the entry for the current file version (raises if the file is missing)"""
+        path = os.path.realpath(file_path)
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry.key != key:
+                self.stats['stale'] += 1
+                entry = None
+            if entry is None:
+                entry = CompiledSMEDMap(path, key)
+                self.entries[path] = entry
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.stats['evictions'] += 1
+            else:
+                self.entries.move_to_end(path)
+            return entry
+
+    def get_content(self, file_path: str, decoder: Hashable,
+                    decode_func: Callable[[bytes], str]) -> str:
+        """
+        Get decoded SMED text, decoding the raw bytes only once per file version
+
+        Args:
+            file_path: Path to SMED file
+            decoder: Cache key describing the decoding (e.g. 'sjis', 'api')
+            decode_func: Converts the raw file bytes to text
+        """
+        entry = self._entry(file_path)
+        with self.lock:
+            if decoder in entry.contents:
+                self.stats['hits'] += 1
+                return entry.contents[decoder]
+            self.stats['misses'] += 1
+
+        with open(entry.path, 'rb') as f:
+            content = decode_func(f.read())
+
+        with self.lock:
+            entry.contents[decoder] = content
+        return content
+
+    def get_parsed(self, file_path: str, parser: Hashable, parse_func: Callable[[], Any]) -> Any:
+        """
+        Get a parse result, running parse_func only on a miss
+
+        Results are shared between callers and must be treated as read-only.
+        Failed parses (None) are not cached.
+        """
+        try:
+            entry = self._entry(file_path)
+        except OSError:
+            return parse_func()
+
+        with self.lock:
+            if parser in entry.parsed:
+                self.stats['hits'] += 1
+                return entry.parsed[parser]
+            self.stats['misses'] += 1
+
+        result = parse_func()
+        if result is not None:
+            with self.lock:
+                entry.parsed[parser] = result
+        return result
+
+    def get_layout(self, file_path: str, parser: Hashable,
+                   parse_func: Callable[[], Any]) -> Optional[SMEDLayout]:
+        """
+        Get the parse result with its position map and static background
+
+        The layout is built once per file version and parser (prompts are
+        decoded per destination). Returns None when the map cannot be parsed.
+        """
+        result = self.get_parsed(file_path, parser, parse_func)
+        if not result:
+            return None
+        try:
+            entry = self._entry(file_path)
+        except OSError:
+            return SMEDLayout(result)
+
+        with self.lock:
+            layout = entry.layouts.get(parser)
+            if layout is not None and layout.result is result:
+                return layout
+
+        layout = SMEDLayout(result)
+        with self.lock:
+            entry.layouts[parser] = layout
+        return layout
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """Drop one map (or everything) after the file was saved or recreated"""
+        with self.lock:
+            if file_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.realpath(file_path), None)
+            self.stats['invalidations'] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['entries'] = len(self.entries)
+            stats['max_entries'] = self.max_entries
+            return stats
+
+
+def _field_row_col(field: Dict[str, Any]) -> Tuple[int, int]:
+    """Row/col of a parsed field, accepting both parser output shapes"""
+    position = field.get('position')
+    if isinstance(position, dict):
+        return position.get('row', 0), position.get('col', 0)
+    return field.get('row', 0), field.get('col', 0)
+
+
+def build_position_map(fields: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Position map (0-based row/col) of the input fields of a SMED map"""
+    position_map = []
+    for field in fields:
+        if field.get('prompt'):
+            # Constant text is part of the static background
+            continue
+        row, col = _field_row_col(field)
+        position_map.append({
+            'name': field.get('name', ''),
+            'row': max(0, row - 1),
+            'col': max(0, col - 1),
+            'length': field.get('length', 0)
+        })
+    return position_map
+
+
+def render_static_background(fields: List[Dict[str, Any]]) -> List[str]:
+    """Render the constant text (prompts) of a SMED map onto a 24x80 grid"""
+    blank_row = ' ' * SCREEN_COLS
+    touched_rows: Dict[int, List[str]] = {}
+    for field in fields:
+        prompt = field.get('prompt')
+        if not prompt:
+            continue
+        row, col = _field_row_col(field)
+        row, col = row - 1, col - 1
+        if not (0 <= row < SCREEN_ROWS and 0 <= col < SCREEN_COLS):
+            continue
+        row_chars = touched_rows.get(row)
+        if row_chars is None:
+            row_chars = touched_rows[row] = list(blank_row)
+        visible = prompt[:SCREEN_COLS - col]
+        row_chars[col:col + len(visible)] = visible
+
+    rows = [blank_row] * SCREEN_ROWS
+    for row, row_chars in touched_rows.items():
+        rows[row] = ''.join(row_chars)[:SCREEN_COLS]
+    return rows
+
+
+# Global instance shared by all SMED consumers in the process
+smed_map_cache = SMEDMapCache()
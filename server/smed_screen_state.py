@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SMED Screen State Cache
+Keeps the last frame sent to each terminal so screen refreshes can be sent as
+field/row deltas instead of full map resends
+"""
+
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+logger = logging.getLogger(__name__)
+
+# Fall back to a full frame when more than this share of the fields changed
+DELTA_FULL_FRAME_RATIO = float(os.environ.get('SMED_DELTA_FULL_FRAME_RATIO', '0.6'))
+
+
+class ScreenFrame:
+    """Last frame known to be on a terminal screen"""
+
+    def __init__(self, map_file: str, fields: Dict[str, Any], rows: Optional[List[str]], seq: int):
+        self.map_file = map_file
+        self.fields = fields
+        self.rows = rows
+        self.seq = seq
+        self.updated_at = datetime.now().isoformat()
+
+    def to_full_payload(self) -> Dict[str, Any]:
+        """Full-frame payload used for initial display and resync"""
+        payload = {
+            'type': 'full',
+            'map_file': self.map_file,
+            'fields': dict(self.fields),
+            'seq': self.seq
+        }
+        if self.rows is not None:
+            payload['rows'] = list(self.rows)
+        return payload
+
+
+class SMEDScreenStateCache:
+    """Per-terminal screen state with field/row level diffing"""
+
+    def __init__(self, full_frame_ratio: float = DELTA_FULL_FRAME_RATIO):
+        self.frames: Dict[str, ScreenFrame] = {}  # screen_key -> last frame sent
+        self.full_frame_ratio = full_frame_ratio
+        self.lock = threading.RLock()
+        self.stats = {
+            'full_frames': 0,
+            'delta_frames': 0,
+            'empty_deltas': 0,
+            'resyncs': 0,
+            'fields_sent': 0,
+            'fields_suppressed': 0
+        }
+
+    def build_update(self, screen_key: str, map_file: str, fields: Dict[str, Any],
+                     rows: Optional[List[str]] = None, force_full: bool = False) -> Dict[str, Any]:
+        """
+        Record a new frame and return the payload to send
+
+        Args:
+            screen_key: Terminal or room identifier owning the screen
+            map_file: Map currently displayed
+            fields: Complete field dictionary for the new frame
+            rows: Optional rendered 24x80 rows for the new frame
+            force_full: Always send a full frame (first display, explicit refresh)
+
+        Returns:
+            {'type': 'full', ...} or {'type': 'delta', 'seq', 'base_seq', 'changed', 'removed', 'rows'}
+        """
+        fields = dict(fields or {})
+        with self.lock:
+            previous = self.frames.get(screen_key)
+            seq = previous.seq + 1 if previous else 1
+            frame = ScreenFrame(map_file, fields, list(rows) if rows is not None else None, seq)
+            self.frames[screen_key] = frame
+
+            if force_full or previous is None or previous.map_file != map_file:
+                return self._full(frame)
+
+            changed = {name: value for name, value in fields.items()
+                       if name not in previous.fields or previous.fields[name] != value}
+            removed = [name for name in previous.fields if name not in fields]
+
+            if fields and len(changed) + len(removed) > len(fields) * self.full_frame_ratio:
+                return self._full(frame)
+
+            delta = {
+                'type': 'delta',
+                'map_file': map_file,
+                'seq': seq,
+                'base_seq': previous.seq,
+                'changed': changed,
+                'removed': removed
+            }
+            if rows is not None:
+                delta['rows'] = diff_rows(previous.rows, frame.rows)
+
+            if changed or removed or delta.get('rows'):
+                self.stats['delta_frames'] += 1
+            else:
+                # Nothing will be shown, so the client sequence must not advance
+                frame.seq = delta['seq'] = previous.seq
+                delta['base_seq'] = previous.seq
+                self.stats['empty_deltas'] += 1
+            self.stats['fields_sent'] += len(changed)
+            self.stats['fields_suppressed'] += len(fields) - len(changed)
+            return delta
+
+    def apply_updates(self, screen_key: str, map_file: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge partial field updates into the cached frame and return only the
+        fields that actually differ from what the screen already shows
+        """
+        with self.lock:
+            previous = self.frames.get(screen_key)
+            if previous is None or previous.map_file != map_file:
+                return self.build_update(screen_key, map_file, updates, force_full=True)
+
+            merged = dict(previous.fields)
+            merged.update(updates)
+            return self.build_update(screen_key, map_file, merged, rows=previous.rows)
+
+    def resync(self, screen_key: str, client_seq: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Return a full frame for a client that lost track of the sequence"""
+        with self.lock:
+            frame = self.frames.get(screen_key)
+            if frame is None:
+                return None
+            self.stats['resyncs'] += 1
+            logger.info(f"[SCREEN_STATE] Resync {screen_key}: client seq {client_seq}, server seq {frame.seq}")
+            return frame.to_full_payload()
+
+    def get_frame(self, screen_key: str) -> Optional[ScreenFrame]:
+        """Get the last frame recorded for a screen"""
+        with self.lock:
+            return self.frames.get(screen_key)
+
+    def forget(self, screen_key: str):
+        """Drop cached state so the next send is a full frame"""
+        with self.lock:
+            self.frames.pop(screen_key, None)
+
+    def _full(self, frame: ScreenFrame) -> Dict[str, Any]:
+        self.stats['full_frames'] += 1
+        self.stats['fields_sent'] += len(frame.fields)
+        return frame.to_full_payload()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['screens'] = len(self.frames)
+            return stats
+
+
+def diff_rows(old_rows: Optional[List[str]], new_rows: Optional[List[str]]) -> Dict[int, str]:
+    """Row-level diff between two rendered grids: {row_index: new_row_text}"""
+    if new_rows is None:
+        return {}
+    if old_rows is None or len(old_rows) != len(new_rows):
+        return {i: row for i, row in enumerate(new_rows)}
+    return {i: row for i, (old, row) in enumerate(zip(old_rows, new_rows)) if old != row}
+
+
+def position_field_key(row: int, col: int) -> str:
+    """Field key used for position-based maps"""
+    return f"{row},{col}"
+
+
+# Global instance for easy access
+screen_state_cache = SMEDScreenStateCache()
@@ -44,6 +44,27 @@ try:
 except ImportError as e:
     print(f"[INFO] DBIO not available, using JSON fallback: {e}")
     DBIO_AVAILABLE = False
+
+# In-process Japanese codecs (Fujitsu SJIS / EUC-JP / JEF / JAK)
+try:
+    import japanese_codecs
+    JAPANESE_CODECS_AVAILABLE = True
+except ImportError as e:
+    print(f"[INFO] Japanese codecs not available: {e}")
+    JAPANESE_CODECS_AVAILABLE = False
+
+# Cached per-library object counts and sizes for WRKVOL / WRKLIB
+try:
+    from volume_usage import get_usage_service
+    VOLUME_USAGE_AVAILABLE = True
+except ImportError as e:
+    print(f"[INFO] Volume usage cache not available: {e}")
+    VOLUME_USAGE_AVAILABLE = False
+
+# External encoding fallbacks are opt-in: the Java encoding API costs an HTTP
+# request and nkf/iconv a process for every record converted
+USE_JAVA_ENCODING_API = os.environ.get('ASP_ENCODING_JAVA_API', '0') == '1'
+USE_ENCODING_SUBPROCESS = os.environ.get('ASP_ENCODING_SUBPROCESS', '0') == '1'
 JOB_LOG_DIR = os.path.join(VOLUME_ROOT, "JOBLOG")
 
 # Initialize configuration directories
@@ -306,21 +327,36 @@ def get_file_info(volume, filename):
         }
 
 def _convert_bytes_to_string(data, encoding='utf-8'):
-    """Convert bytes to string using Java API or fallback methods"""
+    """Convert bytes to string with the in-process codecs, external tools only when enabled"""
     if not data:
         return ""
     
+    codec_name = japanese_codecs.codec_for(encoding) if JAPANESE_CODECS_AVAILABLE else encoding
     try:
-        # First try Java API
-        from java_encoding_client import convert_bytes_to_string_via_java
-        result = convert_bytes_to_string_via_java(data, encoding)
-        
-        # Check if Java API returned a valid UTF-8 string (not hex fallback)
-        if result and not all(c in '0123456789ABCDEF .' for c in result[:20]):
-            return result
+        # Strict first so unmappable data can still go to an enabled fallback
+        return data.decode(codec_name)
+    except LookupError:
+        codec_name = None
+    except UnicodeDecodeError:
+        if not (USE_JAVA_ENCODING_API or USE_ENCODING_SUBPROCESS):
+            return data.decode(codec_name, errors='replace')
+    
+    if USE_JAVA_ENCODING_API:
+        try:
+            from java_encoding_client import convert_bytes_to_string_via_java
+            result = convert_bytes_to_string_via_java(data, encoding)
             
-    except Exception as e:
-        print(f"[WARNING] Java API encoding failed: {e}")
+            # Check if Java API returned a valid UTF-8 string (not hex fallback)
+            if result and not all(c in '0123456789ABCDEF .' for c in result[:20]):
+                return result
+                
+        except Exception as e:
+            print(f"[WARNING] Java API encoding failed: {e}")
+    
+    if not USE_ENCODING_SUBPROCESS:
+        if codec_name:
+            return data.decode(codec_name, errors='replace')
+        return ' '.join(f'{b:02X}' for b in data)
     
     try:
         # Fallback to external tools
@@ -358,6 +394,9 @@ def _convert_bytes_to_string(data, encoding='utf-8'):
     except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, OSError):
         pass
     
+    if codec_name:
+        return data.decode(codec_name, errors='replace')
+    
     # Absolute fallback: show hex representation of entire data
     return ' '.join(f'{b:02X}' for b in data)
 
@@ -505,51 +544,24 @@ def SNDMSG(command):
     print(f"[INFO] User '{user}'message sent.")
     log_message("INFO", f"SNDMSG TO-{user}: {message}")
 def RSTLIB(command):
-    params = dict(item.split('-') for item in command.replace('RSTLIB ', '').split(','))
-    backup_file = params.get('FILE')
-
-    if not backup_file:
-        print("[ERROR] FILE parameter is missing.")
-        return
-
-    backup_path = os.path.join(BACKUP_DIR, backup_file)
-    if not os.path.isfile(backup_path):
-        print(f"[ERROR] Backup file does not exist: {backup_path}")
-        return
-
-    try:
-        with tarfile.open(backup_path, "r:gz") as tar:
-            tar.extractall(path=VOLUME_ROOT)
-        print(f"[INFO] Restore completed: {backup_path}")
-        log_message("INFO", f"RSTLIB -> {backup_file} restore successful")
-    except Exception as e:
-        print(f"[ERROR] Restore failed: {e}")
-        log_message("ERROR", f"RSTLIB failed: {e}")
-import tarfile
+    """
+    RSTLIB command - delegated to functions.rstlib module
+    
+    Restores .asplib backups (optionally single objects with OBJ-) and
+    legacy tar.gz backups.
+    """
+    from functions.rstlib import RSTLIB as rstlib_impl
+    return rstlib_impl(command)
 
 def SAVLIB(command):
-    params = dict(item.split('-') for item in command.replace('SAVLIB ', '').split(','))
-    lib = params.get('LIB')
-    vol = params.get('VOL')
-
-    if not lib or not vol:
-        print("[ERROR] LIB or VOL parameter is missing.")
-        return
-
-    lib_path = os.path.join(VOLUME_ROOT, vol, lib)
-    if not os.path.isdir(lib_path):
-        print(f"[ERROR] Library '{lib}'does not exist in volume '{vol}'.")
-        return
-
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    backup_name = f"{lib}_{vol}_{timestamp}.tar.gz"
-    backup_path = os.path.join(BACKUP_DIR, backup_name)
-
-    with tarfile.open(backup_path, "w:gz") as tar:
-        tar.add(lib_path, arcname=f"{lib}")
+    """
+    SAVLIB command - delegated to functions.savlib module
+    
+    Parallel-compressed library backups with FULL, INCR and DIFF modes.
+    """
+    from functions.savlib import SAVLIB as savlib_impl
+    return savlib_impl(command)
 
-    print(f"[INFO] Library '{lib}'has been backed up: {backup_path}")
-    log_message("INFO", f"SAVLIB {lib} -> {backup_name}")
 def DSPJOB(command=None):
     """Enhanced DSPJOB - Display Job Information and System Variables"""
     print("[INFO] DSPJOB - Display Job Information and System Variables")
@@ -638,6 +650,14 @@ def WRKVOL(command=None):
         print("[INFO] No volumes are currently registered.")
         return
 
+    if VOLUME_USAGE_AVAILABLE:
+        for volume in get_usage_service(VOLUME_ROOT).get_summary():
+            print(f"  Volume Name        : {volume['name']}")
+            print(f"     |- Library Count : {volume['library_count']}")
+            print(f"     |- Total Files   : {volume['file_count']}")
+            print(f"     -- Disk Usage    : {volume['total_size']:,} Byte")
+        return
+
     for vol in os.listdir(VOLUME_ROOT):
         vol_path = os.path.join(VOLUME_ROOT, vol)
         if not os.path.isdir(vol_path):
@@ -855,6 +875,14 @@ def WRKLIB(command=None):
         print("[INFO] No volumes have been created yet.")
         return
 
+    if VOLUME_USAGE_AVAILABLE:
+        for volume in get_usage_service(VOLUME_ROOT).get_summary(include_libraries=True):
+            print(f" Volume: {volume['name']}")
+            for library in volume['libraries']:
+                print(f"   - Library: {library['name']} "
+                      f"({library['file_count']} files, {library['total_size']:,} Byte)")
+        return
+
     for vol in os.listdir(VOLUME_ROOT):
         vol_path = os.path.join(VOLUME_ROOT, vol)
         if os.path.isdir(vol_path):
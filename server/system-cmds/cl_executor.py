@@ -3,12 +3,21 @@
 """
 CL (Control Language) Executor for OpenASP
 Executes parsed CL instructions using ASP commands
+
+CL scripts are compiled once into CompiledInstruction lists (handler
+resolved, command line formatted, structured entry point bound) and cached
+per script text and per (path, mtime, size) of CL files, so repeated CALLs
+of a CL program skip reading, tokenizing and formatting.
 """
 
 import os
 import sys
 import json
-from typing import Dict, List, Union, Callable
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable
 
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -68,6 +77,62 @@ if DSLOCK_AVAILABLE:
         "DLTOVR": DLTOVR,
     })
 
+# Maximum number of compiled CL scripts kept in memory (0 disables the cache)
+CL_CACHE_SIZE = int(os.environ.get('CL_CACHE_SIZE', '256'))
+
+# Run CL streams with dependencies inferred from OVRF usage (see cl_parallel)
+CL_PARALLEL = os.environ.get('CL_PARALLEL', '0').lower() in ('1', 'true', 'yes')
+
+
+@dataclass
+class CompiledInstruction:
+    """CL instruction with its handler resolved at compile time"""
+    command: str
+    params: Dict[str, Optional[str]]
+    handler: Optional[Callable] = None
+    command_line: str = ""
+    bound: Optional[Callable[[], Any]] = None  # structured entry point with pre-bound parameters
+
+
+def _bind_call(params: Dict[str, Optional[str]]) -> Optional[Callable[[], Any]]:
+    """CALL PGM=program[.library],PARA=...,VOL=... -> functions.call.call_program"""
+    pgm_spec = params.get("PGM")
+    if not pgm_spec:
+        return None
+    from functions.call import call_program
+    program, _, library = pgm_spec.partition(".")
+    volume = params["VOL"] if params.get("VOL") is not None else "DISK01"
+    return partial(call_program, program, library or None, volume, params.get("PARA") or "")
+
+
+def _bind_ovrf(params: Dict[str, Optional[str]]) -> Optional[Callable[[], Any]]:
+    """OVRF FILE=...,TOFILE=...,TYPE=... -> functions.ovrf.override_file"""
+    if params.get("FILE") is None or params.get("TOFILE") is None:
+        return None
+    from functions.ovrf import override_file
+    return partial(override_file, params["FILE"], params["TOFILE"], params.get("TYPE", "*DATA"))
+
+
+def _bind_dltovr(params: Dict[str, Optional[str]]) -> Optional[Callable[[], Any]]:
+    """DLTOVR FILE=... -> functions.dltovr.delete_override"""
+    if params.get("FILE") is None:
+        return None
+    from functions.dltovr import delete_override
+    return partial(delete_override, params["FILE"])
+
+
+# Commands whose parsed parameters bind directly to a structured entry point;
+# a binder returns None to fall back to the formatted command line
+STRUCTURED_HANDLERS = {
+    "CALL": _bind_call,
+}
+
+if DSLOCK_AVAILABLE:
+    STRUCTURED_HANDLERS.update({
+        "OVRF": _bind_ovrf,
+        "DLTOVR": _bind_dltovr,
+    })
+
 def format_command_line(command: str, params: Dict[str, str]) -> str:
     """
     Format parsed instruction back into ASP command line format
@@ -204,6 +269,119 @@ def format_default_command(command: str, params: Dict[str, str]) -> str:
     
     return f"{command} {','.join(param_parts)}"
 
+def compile_instruction(instruction: Dict[str, Union[str, Dict[str, str]]]) -> CompiledInstruction:
+    """
+    Resolve the handler of a parsed instruction and bind its parameters
+    
+    Args:
+        instruction: Parsed instruction with 'command' and 'params'
+        
+    Returns:
+        CompiledInstruction ready for execute_compiled_instruction
+    """
+    command = instruction["command"]
+    params = instruction["params"]
+    handler = COMMAND_MAP.get(command)
+    if not handler:
+        return CompiledInstruction(command, params)
+    
+    compiled = CompiledInstruction(command, params, handler, format_command_line(command, params))
+    binder = STRUCTURED_HANDLERS.get(command)
+    if binder:
+        try:
+            compiled.bound = binder(params)
+        except Exception as e:
+            # Importing the handler module can fail for other reasons too (e.g. its
+            # log file); the instruction still runs through the command line
+            print(f"[WARN] Structured handler for {command} not available: {e}")
+    return compiled
+
+class CLProgramCache:
+    """LRU cache of compiled CL scripts, keyed by script text and by CL file identity"""
+    
+    def __init__(self, max_entries: int = CL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.scripts: "OrderedDict[str, List[CompiledInstruction]]" = OrderedDict()
+        self.files: "OrderedDict[str, Tuple[int, int, List[CompiledInstruction]]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'file_hits': 0,
+            'file_misses': 0
+        }
+    
+    def compile_script(self, script: str) -> List[CompiledInstruction]:
+        """Compiled instructions of a CL script"""
+        if self.max_entries <= 0:
+            return [compile_instruction(instruction) for instruction in parse_cl_script(script)]
+        
+        with self.lock:
+            compiled = self.scripts.get(script)
+            if compiled is not None:
+                self.scripts.move_to_end(script)
+                self.stats['hits'] += 1
+                return compiled
+            self.stats['misses'] += 1
+        
+        compiled = [compile_instruction(instruction) for instruction in parse_cl_script(script)]
+        with self.lock:
+            self.scripts[script] = compiled
+            while len(self.scripts) > self.max_entries:
+                self.scripts.popitem(last=False)
+        return compiled
+    
+    def compile_file(self, filename: str) -> List[CompiledInstruction]:
+        """
+        Compiled instructions of a CL file, recompiled when its mtime or size changes
+        
+        Raises:
+            OSError: CL file cannot be read
+        """
+        path = os.path.realpath(filename)
+        stat = os.stat(path)
+        with self.lock:
+            entry = self.files.get(path)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                self.files.move_to_end(path)
+                self.stats['file_hits'] += 1
+                return entry[2]
+            self.stats['file_misses'] += 1
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            script = f.read()
+        compiled = self.compile_script(script)
+        if self.max_entries > 0:
+            with self.lock:
+                self.files[path] = (stat.st_mtime_ns, stat.st_size, compiled)
+                while len(self.files) > self.max_entries:
+                    self.files.popitem(last=False)
+        return compiled
+    
+    def clear(self):
+        with self.lock:
+            self.scripts.clear()
+            self.files.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['scripts'] = len(self.scripts)
+            stats['files'] = len(self.files)
+        return stats
+
+# Global compiled CL program cache
+cl_program_cache = CLProgramCache()
+
+def compile_cl_script(script: str) -> List[CompiledInstruction]:
+    """Compile a CL script (cached by script text)"""
+    return cl_program_cache.compile_script(script)
+
+def compile_cl_file(filename: str) -> List[CompiledInstruction]:
+    """Compile a CL file (cached by path, mtime and size)"""
+    return cl_program_cache.compile_file(filename)
+
 def execute_instruction(instruction: Dict[str, Union[str, Dict[str, str]]]) -> bool:
     """
     Execute a single CL instruction
@@ -214,11 +392,21 @@ def execute_instruction(instruction: Dict[str, Union[str, Dict[str, str]]]) -> b
     Returns:
         True if successful, False otherwise
     """
-    command = instruction["command"]
-    params = instruction["params"]
+    return execute_compiled_instruction(compile_instruction(instruction))
+
+def execute_compiled_instruction(compiled: CompiledInstruction) -> bool:
+    """
+    Execute a compiled CL instruction
     
-    # Get command handler
-    handler = COMMAND_MAP.get(command)
+    Args:
+        compiled: Instruction from compile_instruction / compile_cl_script
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    command = compiled.command
+    params = compiled.params
+    handler = compiled.handler
     
     # Debug logging for OVRF command
     if command == "OVRF":
@@ -231,17 +419,17 @@ def execute_instruction(instruction: Dict[str, Union[str, Dict[str, str]]]) -> b
         print(f"[INFO] Parameters: {params}")
         return True  # Continue execution even for unknown commands
     
-    # Format command line for ASP command handler
-    command_line = format_command_line(command, params)
-    
-    print(f"[EXEC] {command_line}")
+    print(f"[EXEC] {compiled.command_line}")
     
     try:
         # Reset PGMEC before execution
         reset_pgmec()
         
-        # Execute command
-        result = handler(command_line)
+        # Execute command: structured entry point when bound, ASP command line otherwise
+        if compiled.bound is not None:
+            result = compiled.bound()
+        else:
+            result = handler(compiled.command_line)
         
         # Check execution result
         pgmec = get_pgmec()
@@ -255,13 +443,37 @@ def execute_instruction(instruction: Dict[str, Union[str, Dict[str, str]]]) -> b
         set_pgmec(999)
         return False
 
-def execute_cl_script(script: str, stop_on_error: bool = False) -> int:
+def execute_cl_script(script: str, stop_on_error: bool = False, parallel: Optional[bool] = None) -> int:
     """
     Execute a CL script
     
     Args:
         script: CL script content
         stop_on_error: Stop execution on first error
+        parallel: Run independent CALL steps concurrently (default CL_PARALLEL);
+                  PARALLEL/ENDPARALLEL blocks always run concurrently
+        
+    Returns:
+        Number of failed instructions
+    """
+    return _execute_instructions(compile_cl_script(script), stop_on_error, parallel)
+
+def _execute_instructions(instructions: List[CompiledInstruction], stop_on_error: bool,
+                          parallel: Optional[bool]) -> int:
+    """Dispatch to the sequential or the parallel step executor"""
+    parallel = CL_PARALLEL if parallel is None else parallel
+    if parallel or any(instruction.command in ("PARALLEL", "ENDPARALLEL") for instruction in instructions):
+        from cl_parallel import execute_parallel_script
+        return execute_parallel_script(instructions, stop_on_error, infer=parallel)
+    return execute_compiled_script(instructions, stop_on_error)
+
+def execute_compiled_script(instructions: List[CompiledInstruction], stop_on_error: bool = False) -> int:
+    """
+    Execute compiled CL instructions
+    
+    Args:
+        instructions: Compiled instructions
+        stop_on_error: Stop execution on first error
         
     Returns:
         Number of failed instructions
@@ -269,9 +481,6 @@ def execute_cl_script(script: str, stop_on_error: bool = False) -> int:
     print("[INFO] Starting CL script execution")
     print("-" * 50)
     
-    # Parse script
-    instructions = parse_cl_script(script)
-    
     if not instructions:
         print("[WARN] No instructions found in script")
         return 0
@@ -284,7 +493,7 @@ def execute_cl_script(script: str, stop_on_error: bool = False) -> int:
     for i, instruction in enumerate(instructions):
         print(f"[{i+1}/{len(instructions)}] ", end="")
         
-        success = execute_instruction(instruction)
+        success = execute_compiled_instruction(instruction)
         
         if not success:
             failed_count += 1
@@ -299,13 +508,14 @@ def execute_cl_script(script: str, stop_on_error: bool = False) -> int:
     
     return failed_count
 
-def execute_cl_file(filename: str, stop_on_error: bool = False) -> int:
+def execute_cl_file(filename: str, stop_on_error: bool = False, parallel: Optional[bool] = None) -> int:
     """
     Execute a CL script from file
     
     Args:
         filename: Path to CL script file
         stop_on_error: Stop execution on first error
+        parallel: Run independent CALL steps concurrently (default CL_PARALLEL)
         
     Returns:
         Number of failed instructions
@@ -313,9 +523,8 @@ def execute_cl_file(filename: str, stop_on_error: bool = False) -> int:
     print(f"[INFO] Loading CL script from: {filename}")
     
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            script = f.read()
-        return execute_cl_script(script, stop_on_error)
+        instructions = compile_cl_file(filename)
+        return _execute_instructions(instructions, stop_on_error, parallel)
     except Exception as e:
         print(f"[ERROR] Failed to load CL file: {e}")
         return 1
@@ -330,6 +539,8 @@ if __name__ == "__main__":
                        help="Treat argument as filename")
     parser.add_argument("-e", "--stop-on-error", action="store_true",
                        help="Stop execution on first error")
+    parser.add_argument("-p", "--parallel", action="store_true", default=None,
+                       help="Run independent CALL steps concurrently (dependencies from OVRF usage)")
     
     args = parser.parse_args()
     
@@ -337,13 +548,13 @@ if __name__ == "__main__":
         # Interactive mode - read from stdin
         print("Enter CL commands (Ctrl+D to execute):")
         script = sys.stdin.read()
-        failed = execute_cl_script(script, args.stop_on_error)
+        failed = execute_cl_script(script, args.stop_on_error, args.parallel)
     elif args.file or os.path.isfile(args.script):
         # Execute from file
-        failed = execute_cl_file(args.script, args.stop_on_error)
+        failed = execute_cl_file(args.script, args.stop_on_error, args.parallel)
     else:
         # Execute as inline script
-        failed = execute_cl_script(args.script, args.stop_on_error)
+        failed = execute_cl_script(args.script, args.stop_on_error, args.parallel)
     
     # Exit with error count
     sys.exit(min(failed, 255))
\ No newline at end of file
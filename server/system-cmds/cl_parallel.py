@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parallel CL step execution for OpenASP
+Runs independent CALL steps of a CL job stream concurrently, in a bounded
+set of forked worker processes, and records per-step timings.
+
+Step dependencies come from two sources:
+
+    PARALLEL / ENDPARALLEL blocks
+        CALL steps inside a block are independent of each other unless they
+        use the same overridden dataset.
+
+        PARALLEL
+        CALL PGM=DAILY01
+        CALL PGM=DAILY02
+        ENDPARALLEL
+
+    Inferred mode (execute_cl_script(..., parallel=True) or CL_PARALLEL=1)
+        A CALL step uses the files overridden (OVRF FILE/TOFILE) while it
+        runs. Steps sharing a TOFILE dataset keep their order, OVRF and
+        DLTOVR wait for the steps using the same logical name and a CALL
+        without active overrides is ordered against all other CALL steps
+        and the OVRF/DLTOVR steps after it.
+
+Each CALL step runs with the overrides that were active at its position in
+the script: the graph records them per step, the parent captures the
+mapping each OVRF step created, and the worker installs that snapshot
+before the program starts. A CALL deferred for a free worker slot therefore
+does not see overrides changed by later OVRF/DLTOVR steps.
+
+Outside blocks and inferred mode steps keep their sequential order. OVRF,
+DLTOVR and all other commands run in the parent process; any command other
+than CALL/OVRF/DLTOVR is a barrier. Each CALL step runs in its own forked
+process, so os.environ changes and PGMEC stay local to the step; its
+output is captured and printed in one piece when the step finishes.
+"""
+
+import heapq
+import io
+import multiprocessing
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Set
+
+from asp_commands import get_pgmec, reset_pgmec, set_pgmec
+from cl_executor import CompiledInstruction, execute_compiled_instruction
+
+PARALLEL_BEGIN = "PARALLEL"
+PARALLEL_END = "ENDPARALLEL"
+
+# Commands scheduled by dataset usage instead of acting as barriers
+WORKER_COMMANDS = {"CALL"}
+OVERRIDE_COMMANDS = {"OVRF", "DLTOVR"}
+
+# Maximum number of concurrently running CALL steps; programs mostly wait on
+# their Java/COBOL/shell subprocess, so the default exceeds the CPU count
+CL_MAX_PARALLEL = int(os.environ.get('CL_MAX_PARALLEL', str(min(32, (os.cpu_count() or 1) + 4))))
+
+
+@dataclass
+class CLStep:
+    """One node of the CL step graph"""
+    index: int
+    instruction: CompiledInstruction
+    deps: Set[int] = field(default_factory=set)
+    number: int = 0  # 1-based position among executable steps (0 for block markers)
+    marker: bool = False
+    in_worker: bool = False
+    datasets: Set[str] = field(default_factory=set)
+    overrides: Dict[str, int] = field(default_factory=dict)  # logical name -> OVRF step index (CALL)
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of one executed CL step"""
+    number: int
+    command: str
+    command_line: str
+    success: bool
+    pgmec: int
+    started: float
+    elapsed: float
+    worker: bool
+
+
+def build_step_graph(instructions: List[CompiledInstruction], infer: bool = False) -> List[CLStep]:
+    """
+    Build the dependency graph of a compiled CL script
+
+    Args:
+        instructions: Compiled instructions
+        infer: Infer dependencies outside PARALLEL blocks from OVRF usage
+
+    Returns:
+        Steps in script order; deps only point to earlier steps
+    """
+    steps: List[CLStep] = []
+    last_barrier: Optional[int] = None
+    since_barrier: List[int] = []
+    active: Dict[str, tuple] = {}  # logical name -> (TOFILE dataset, OVRF step)
+    logical_last: Dict[str, int] = {}  # logical name -> last OVRF/DLTOVR step
+    logical_users: Dict[str, List[int]] = {}  # logical name -> CALL steps run under the override
+    dataset_users: Dict[str, List[int]] = {}  # TOFILE dataset -> CALL steps using it
+    unknown_calls: List[int] = []  # CALL steps without overrides (inferred mode)
+    bare_calls: List[int] = []  # CALL steps without overrides (any mode)
+    in_block = False
+    number = 0
+
+    def barrier(step: CLStep):
+        nonlocal last_barrier, since_barrier
+        step.deps.update(since_barrier)
+        if last_barrier is not None:
+            step.deps.add(last_barrier)
+        last_barrier = step.index
+        since_barrier = []
+        logical_last.clear()
+        logical_users.clear()
+        dataset_users.clear()
+        unknown_calls.clear()
+        bare_calls.clear()
+
+    for index, instruction in enumerate(instructions):
+        command = instruction.command
+        step = CLStep(index, instruction)
+        steps.append(step)
+
+        if command in (PARALLEL_BEGIN, PARALLEL_END):
+            step.marker = True
+            barrier(step)
+            in_block = command == PARALLEL_BEGIN
+            continue
+
+        number += 1
+        step.number = number
+        step.in_worker = command in WORKER_COMMANDS
+        params = instruction.params
+
+        if not (in_block or infer) or not (step.in_worker or command in OVERRIDE_COMMANDS):
+            # Sequential region or state-changing command
+            barrier(step)
+            if command == "OVRF" and params.get("FILE") is not None:
+                active[params["FILE"]] = (params.get("TOFILE"), index)
+            elif command == "DLTOVR":
+                active.pop(params.get("FILE"), None)
+            continue
+
+        if last_barrier is not None:
+            step.deps.add(last_barrier)
+        since_barrier.append(index)
+
+        if command in OVERRIDE_COMMANDS:
+            # CALL steps get their override snapshot from the graph, so only
+            # users of this logical name (and CALLs without overrides) wait
+            logical = params.get("FILE")
+            step.deps.update(logical_users.pop(logical, []))
+            step.deps.update(bare_calls)
+            if logical in logical_last:
+                step.deps.add(logical_last[logical])
+            logical_last[logical] = index
+            if command == "OVRF":
+                active[logical] = (params.get("TOFILE"), index)
+            else:
+                active.pop(logical, None)
+        else:
+            step.deps.update(unknown_calls)
+            for logical, (dataset, ovrf_index) in active.items():
+                if ovrf_index > (last_barrier if last_barrier is not None else -1):
+                    step.deps.add(ovrf_index)
+                step.overrides[logical] = ovrf_index
+                logical_users.setdefault(logical, []).append(index)
+                if dataset:
+                    step.datasets.add(dataset)
+            for dataset in step.datasets:
+                step.deps.update(dataset_users.get(dataset, []))
+                dataset_users.setdefault(dataset, []).append(index)
+            if not active:
+                # No overrides to snapshot: later OVRF/DLTOVR steps wait for it
+                bare_calls.append(index)
+                if not in_block:
+                    # Unknown dataset usage: ordered against every other CALL
+                    step.deps.update(i for i in since_barrier if i != index and steps[i].in_worker)
+                    unknown_calls.append(index)
+
+    return steps
+
+
+def _current_override(logical: str) -> Optional[Dict]:
+    """Mapping created by the last OVRF of a logical name in this process"""
+    try:
+        from functions.ovrf import get_override_mappings
+    except Exception:
+        return None
+    return get_override_mappings().get(logical)
+
+
+def _install_overrides(overrides: Dict[str, Dict]):
+    """Worker process: replace the inherited override table by the step's snapshot"""
+    try:
+        from functions import ovrf
+    except Exception:
+        return
+    with ovrf.mapping_lock:
+        ovrf.override_mappings.clear()
+        ovrf.override_mappings.update(overrides)
+        ovrf.override_locks.clear()
+        ovrf.override_locks.update({logical: mapping.get("dataset_name")
+                                    for logical, mapping in overrides.items()})
+
+
+def _run_worker_step(step: CLStep, conn, overrides: Dict[str, Dict]):
+    """Worker process body: run one step with captured output and local PGMEC"""
+    buffer = io.StringIO()
+    sys.stdout = sys.stderr = buffer
+    started = time.monotonic()
+    try:
+        reset_pgmec()
+        _install_overrides(overrides)
+        success = execute_compiled_instruction(step.instruction)
+    except BaseException as e:
+        print(f"[ERROR] Step failed: {e}")
+        success = False
+    conn.send((success, get_pgmec(), time.monotonic() - started, buffer.getvalue()))
+    conn.close()
+
+
+def execute_parallel_script(instructions: List[CompiledInstruction], stop_on_error: bool = False,
+                            infer: bool = False, max_workers: Optional[int] = None,
+                            results: Optional[List[StepResult]] = None) -> int:
+    """
+    Execute compiled CL instructions along their dependency graph
+
+    Args:
+        instructions: Compiled instructions
+        stop_on_error: Start no further steps after the first failure
+        infer: Infer dependencies from OVRF usage outside PARALLEL blocks
+        max_workers: Maximum concurrent CALL steps (default CL_MAX_PARALLEL)
+        results: Optional list receiving a StepResult per executed step
+
+    Returns:
+        Number of failed steps
+    """
+    try:
+        context = multiprocessing.get_context('fork')
+    except ValueError:
+        print("[WARN] fork not available, running CL steps sequentially")
+        context = None
+
+    steps = build_step_graph(instructions, infer=infer)
+    total = sum(1 for step in steps if not step.marker)
+    max_workers = max(1, max_workers or CL_MAX_PARALLEL)
+    if context is None:
+        max_workers = 1
+
+    print("[INFO] Starting CL script execution (parallel)")
+    print("-" * 50)
+    if not total:
+        print("[WARN] No instructions found in script")
+        return 0
+    print(f"[INFO] Found {total} instructions, "
+          f"{sum(1 for step in steps if step.in_worker)} CALL steps, max {max_workers} parallel")
+    print()
+
+    dependents: Dict[int, List[int]] = {step.index: [] for step in steps}
+    waiting = {}
+    for step in steps:
+        waiting[step.index] = len(step.deps)
+        for dep in step.deps:
+            dependents[dep].append(step.index)
+    ready = [step.index for step in steps if not step.deps]
+    heapq.heapify(ready)
+
+    step_results: Dict[int, StepResult] = {}
+    override_entries: Dict[int, Dict] = {}  # OVRF step index -> mapping it created
+    running = {}  # connection -> (step, process, started)
+    failed_count = 0
+    stopping = False
+    run_started = time.monotonic()
+
+    def finish(step: CLStep, success: bool):
+        nonlocal failed_count, stopping
+        if not success:
+            failed_count += 1
+            if stop_on_error and not stopping:
+                print(f"[ERROR] Stopping execution due to error")
+                stopping = True
+        for dependent in dependents[step.index]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                heapq.heappush(ready, dependent)
+
+    def record(step: CLStep, success: bool, pgmec: int, started: float, elapsed: float):
+        step_results[step.index] = StepResult(step.number, step.instruction.command,
+                                              step.instruction.command_line, success, pgmec,
+                                              started - run_started, elapsed, step.in_worker)
+
+    while (ready and not stopping) or running:
+        deferred = []
+        while ready and not stopping:
+            step = steps[heapq.heappop(ready)]
+            if step.marker:
+                finish(step, True)
+            elif step.in_worker and context is not None:
+                if len(running) >= max_workers:
+                    deferred.append(step.index)
+                    continue
+                overrides = {logical: override_entries[ovrf_index]
+                             for logical, ovrf_index in step.overrides.items()
+                             if ovrf_index in override_entries}
+                reader, writer = context.Pipe(duplex=False)
+                process = context.Process(target=_run_worker_step, args=(step, writer, overrides),
+                                          daemon=True)
+                sys.stdout.flush()
+                process.start()
+                writer.close()
+                running[reader] = (step, process, time.monotonic())
+            else:
+                print(f"[{step.number}/{total}] ", end="")
+                started = time.monotonic()
+                success = execute_compiled_instruction(step.instruction)
+                record(step, success, get_pgmec(), started, time.monotonic() - started)
+                if success and step.instruction.command == "OVRF":
+                    entry = _current_override(step.instruction.params.get("FILE"))
+                    if entry is not None:
+                        override_entries[step.index] = entry
+                print()
+                finish(step, success)
+        for index in deferred:
+            heapq.heappush(ready, index)
+
+        if not running:
+            continue
+        for reader in wait(list(running)):
+            step, process, started = running.pop(reader)
+            try:
+                success, pgmec, elapsed, output = reader.recv()
+            except EOFError:
+                success, pgmec, elapsed = False, 999, time.monotonic() - started
+                output = f"[ERROR] Worker process for step {step.number} exited with code {process.exitcode}\n"
+            reader.close()
+            process.join()
+            print(f"[{step.number}/{total}] ", end="")
+            print(output, end="")
+            print(f"[TIMING] Step {step.number} finished in {elapsed:.3f}s")
+            print()
+            record(step, success, pgmec, started, elapsed)
+            finish(step, success)
+
+    wall_time = time.monotonic() - run_started
+    ordered = [step_results[index] for index in sorted(step_results)]
+    if results is not None:
+        results.extend(ordered)
+
+    # Longest dependency chain by measured step time
+    finish_time: Dict[int, float] = {}
+    for step in steps:
+        own = step_results[step.index].elapsed if step.index in step_results else 0.0
+        finish_time[step.index] = own + max((finish_time[dep] for dep in step.deps), default=0.0)
+    critical_path = max(finish_time.values(), default=0.0)
+
+    # PGMEC of the stream: highest step PGMEC (steps ran with their own PGMEC)
+    set_pgmec(max((result.pgmec for result in ordered), default=0))
+
+    skipped = total - len(ordered)
+    print("-" * 50)
+    for result in ordered:
+        print(f"[TIMING] #{result.number:<3} {'W' if result.worker else 'P'} "
+              f"start={result.started:8.3f}s elapsed={result.elapsed:8.3f}s "
+              f"{'OK ' if result.success else 'ERR'} {result.command_line or result.command}")
+    print(f"[INFO] Wall time {wall_time:.3f}s, sequential {sum(r.elapsed for r in ordered):.3f}s, "
+          f"critical path {critical_path:.3f}s")
+    print(f"[INFO] Execution complete. Failed: {failed_count}/{total}"
+          + (f", skipped: {skipped}" if skipped else ""))
+
+    return failed_count
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Codepage Registry
+Compiles the text codepage tables (public/codepages/*.txt) once into a
+binary form and maps it read-only into every process, so converters no
+longer regex-parse 65536 lines into dicts on startup.
+
+Compiled file (<name>-<source sha256 prefix>.cpg):
+    header   magic, source sha256, table lengths, array typecode
+    sbcs     uint16[256]    source code -> target code (0 = unmapped)
+    dbcs     uint16[65536]  source code -> target code (0 = unmapped)
+
+Tables derived from a codepage (e.g. the JAK DBCS -> Unicode array of the
+dataset converter) are cached the same way as <name>-<hash>.<suffix>.cpg.
+The files live in CODEPAGE_CACHE_DIR, <codepage dir>/.compiled or the
+temp directory, whichever is writable first. Pages of the mapped files are
+shared by all processes through the page cache.
+
+Usage:
+    from codepage_registry import get_codepage
+    codepage = get_codepage('JEFASCK.txt')
+    jef_code = codepage.dbcs[0x4447]
+
+    python codepage_registry.py            # precompile all codepages
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CODEPAGE_PATHS = [
+    os.environ.get('CODEPAGE_BASE_PATH'),
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'public', 'codepages'),
+    '/home/aspuser/app/ofasp-refactor/public/codepages',
+    '/home/aspuser/app/public/codepages',
+    '/home/aspuser/app/build/codepages'
+]
+
+COMPILED_MAGIC = b'ASPCPG01'
+COMPILED_SUFFIX = '.cpg'
+# magic, source sha256, length of the first and second table, array typecode
+COMPILED_HEADER = struct.Struct('<8s32sIIc23x')
+
+SBCS_SIZE = 256
+DBCS_SIZE = 65536
+
+_SECTION_LINE = re.compile(r'^\[(Single|Double) byte mapping table\]\s*$', re.MULTILINE)
+_MAPPING_LINE = re.compile(r'^\s*([0-9A-Fa-f]+)\s*-\s*([0-9A-Fa-f]+)\s*$', re.MULTILINE)
+
+
+def find_codepage(filename: str) -> Optional[str]:
+    """Locate a codepage file in the known codepage directories"""
+    for path in CODEPAGE_PATHS:
+        if path:
+            candidate = os.path.join(path, filename)
+            if os.path.exists(candidate):
+                return candidate
+    return None
+
+
+def compile_codepage_text(text: str):
+    """Parse codepage text into (sbcs, dbcs) uint16 arrays"""
+    sbcs = array('H', bytes(SBCS_SIZE * 2))
+    dbcs = array('H', bytes(DBCS_SIZE * 2))
+
+    # Mapping lines before the first section header belong to the SBCS table
+    sections = _SECTION_LINE.split(text)
+    parts = [('Single', sections[0])] + list(zip(sections[1::2], sections[2::2]))
+    for kind, body in parts:
+        table, size = (dbcs, DBCS_SIZE) if kind == 'Double' else (sbcs, SBCS_SIZE)
+        for from_hex, to_hex in _MAPPING_LINE.findall(body):
+            from_code = int(from_hex, 16)
+            to_code = int(to_hex, 16)
+            if from_code < size and to_code <= 0xFFFF:
+                table[from_code] = to_code
+    return sbcs, dbcs
+
+
+class CompiledCodepage:
+    """Read-only SBCS/DBCS arrays of one codepage file"""
+
+    def __init__(self, registry: 'CodepageRegistry', name: str, source_path: str, digest: str,
+                 sbcs, dbcs):
+        self.registry = registry
+        self.name = name
+        self.source_path = source_path
+        self.digest = digest
+        self.sbcs = sbcs
+        self.dbcs = dbcs
+        self.derived_tables: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+
+    def derived(self, suffix: str, typecode: str, builder: Callable[['CompiledCodepage'], array]):
+        """
+        Table computed from this codepage, cached on disk next to the compiled file
+
+        Args:
+            suffix: Cache name of the table (e.g. 'unicode')
+            typecode: array typecode of the table
+            builder: Builds the array from this codepage on a cache miss
+        """
+        with self.lock:
+            table = self.derived_tables.get(suffix)
+            if table is None:
+                table = self.registry.load_or_build(
+                    f"{self.name}-{self.digest[:16]}.{suffix}", self.digest, typecode,
+                    lambda: (builder(self),), source_dir=os.path.dirname(self.source_path))[0]
+                self.derived_tables[suffix] = table
+            return table
+
+    def sbcs_mappings(self) -> Dict[int, int]:
+        """Mapped SBCS entries as a dict (0x00 -> 0x00 included)"""
+        return {code: target for code, target in enumerate(self.sbcs) if target or not code}
+
+    def dbcs_mappings(self) -> Dict[int, int]:
+        """Mapped DBCS entries as a dict"""
+        return {code: target for code, target in enumerate(self.dbcs) if target or not code}
+
+
+class CodepageRegistry:
+    """Process-wide cache of compiled codepages"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or os.environ.get('CODEPAGE_CACHE_DIR')
+        self.codepages: Dict[str, CompiledCodepage] = {}
+        self.lock = threading.Lock()
+        self.stats = {
+            'loaded': 0,
+            'mapped': 0,
+            'compiled': 0,
+            'write_errors': 0
+        }
+
+    def get(self, filename: str) -> CompiledCodepage:
+        """
+        Compiled codepage for a file name (searched in CODEPAGE_PATHS) or path
+
+        Raises:
+            FileNotFoundError: Codepage file not found
+        """
+        source_path = filename if os.path.isabs(filename) else find_codepage(filename)
+        if source_path is None or not os.path.exists(source_path):
+            raise FileNotFoundError(f"Code page file not found: {filename}")
+        source_path = os.path.realpath(source_path)
+
+        with self.lock:
+            codepage = self.codepages.get(source_path)
+            if codepage is None:
+                codepage = self._load(source_path)
+                self.codepages[source_path] = codepage
+                self.stats['loaded'] += 1
+            return codepage
+
+    def _load(self, source_path: str) -> CompiledCodepage:
+        with open(source_path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        name = os.path.splitext(os.path.basename(source_path))[0]
+
+        def build():
+            return compile_codepage_text(raw.decode('utf-8', errors='replace'))
+
+        sbcs, dbcs = self.load_or_build(f"{name}-{digest[:16]}", digest, 'H', build,
+                                        source_dir=os.path.dirname(source_path))
+        return CompiledCodepage(self, name, source_path, digest, sbcs, dbcs)
+
+    def _cache_dirs(self, source_dir: Optional[str] = None) -> List[str]:
+        dirs = []
+        if self.cache_dir:
+            dirs.append(self.cache_dir)
+        if source_dir:
+            dirs.append(os.path.join(source_dir, '.compiled'))
+        dirs.append(os.path.join(tempfile.gettempdir(), 'openasp-codepages'))
+        return dirs
+
+    def load_or_build(self, cache_name: str, digest: str, typecode: str,
+                      build: Callable[[], tuple], source_dir: Optional[str] = None) -> tuple:
+        """
+        Map the arrays cached under cache_name read-only, or build and write them
+
+        Returns:
+            Tuple of arrays (memoryviews over the mapped file when cached)
+        """
+        cache_dirs = self._cache_dirs(source_dir)
+        filename = cache_name + COMPILED_SUFFIX
+
+        for cache_dir in cache_dirs:
+            tables = self._map(os.path.join(cache_dir, filename), digest, typecode)
+            if tables is not None:
+                self.stats['mapped'] += 1
+                return tables
+
+        tables = build()
+        self.stats['compiled'] += 1
+        for cache_dir in cache_dirs:
+            if self._write(os.path.join(cache_dir, filename), digest, typecode, tables):
+                break
+        return tables
+
+    def _map(self, cache_path: str, digest: str, typecode: str) -> Optional[tuple]:
+        try:
+            with open(cache_path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            magic, source_digest, first_size, second_size, header_typecode = \
+                COMPILED_HEADER.unpack_from(mapped)
+            itemsize = array(typecode).itemsize
+            if magic != COMPILED_MAGIC or source_digest != bytes.fromhex(digest) or \
+                    header_typecode != typecode.encode() or \
+                    len(mapped) != COMPILED_HEADER.size + (first_size + second_size) * itemsize:
+                raise ValueError('stale compiled codepage')
+        except (struct.error, ValueError):
+            mapped.close()
+            return None
+
+        view = memoryview(mapped)[COMPILED_HEADER.size:].cast(typecode)
+        tables = (view[:first_size],) + ((view[first_size:],) if second_size else ())
+        logger.debug(f"Mapped compiled codepage: {cache_path}")
+        return tables
+
+    def _write(self, cache_path: str, digest: str, typecode: str, tables: tuple) -> bool:
+        first_size = len(tables[0])
+        second_size = len(tables[1]) if len(tables) > 1 else 0
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(COMPILED_HEADER.pack(COMPILED_MAGIC, bytes.fromhex(digest), first_size,
+                                             second_size, typecode.encode()))
+                for table in tables:
+                    f.write(table.tobytes())
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            self.stats['write_errors'] += 1
+            logger.debug(f"Cannot write compiled codepage {cache_path}: {e}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return False
+
+        logger.info(f"Wrote compiled codepage: {cache_path}")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['codepages'] = sorted(codepage.name for codepage in self.codepages.values())
+        return stats
+
+
+# Global registry shared by all converters of the process
+registry = CodepageRegistry()
+
+
+def get_codepage(filename: str) -> CompiledCodepage:
+    """Compiled codepage from the global registry"""
+    return registry.get(filename)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Precompile codepage tables')
+    parser.add_argument('files', nargs='*', help='Codepage files (default: all *.txt in the codepage directories)')
+    parser.add_argument('--cache-dir', help='Directory for compiled codepages')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.cache_dir:
+        registry.cache_dir = args.cache_dir
+
+    files = list(args.files)
+    if not files:
+        for path in CODEPAGE_PATHS:
+            if path and os.path.isdir(path):
+                files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.txt'))
+        files = list(dict.fromkeys(os.path.realpath(path) for path in files))
+
+    failed = 0
+    for path in files:
+        try:
+            codepage = get_codepage(os.path.abspath(path))
+            print(f"{codepage.name:10} {codepage.digest[:16]}  "
+                  f"SBCS {sum(1 for c in codepage.sbcs if c):3}  DBCS {sum(1 for c in codepage.dbcs if c):5}")
+        except Exception as e:
+            failed += 1
+            print(f"{path}: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -195,6 +195,37 @@ def CALL(command: str) -> bool:
             print(f"[CALL_TRACE] === CALL Function End (no program) ===")
             return False
         
+        return call_program(program, library, volume, parameters)
+        
+    except Exception as e:
+        print(f"[CALL_ERROR] CALL command exception: {e}")
+        print(f"[ERROR] CALL command failed: {e}")
+        import traceback
+        traceback.print_exc()
+        set_pgmec(999)
+        print(f"[CALL_TRACE] === CALL Function End (exception) ===")
+        return False
+
+def call_program(program: str, library: Optional[str] = None, volume: str = "DISK01",
+                 parameters: str = "") -> bool:
+    """
+    Call a program from already parsed CALL parameters
+    
+    Structured entry point used by CALL and by compiled CL programs, which
+    bind their CALL instructions here without formatting a command string.
+    
+    Args:
+        program: Program name
+        library: Library name (auto-detected on the volume when None)
+        volume: Volume name
+        parameters: PARA value without the surrounding parentheses
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        reset_pgmec()
+        
         print(f"[INFO] Calling program: {program}")
         print(f"[INFO] Library: {library if library else 'Auto-detect'}")
         print(f"[INFO] Volume: {volume}")
@@ -288,6 +288,28 @@ def DLTOVR(command_line: str) -> bool:
             return False
         
         logical_name = params["FILE"]
+        return delete_override(logical_name)
+        
+    except RuntimeError as e:
+        print(f"[ERROR] DLTOVR runtime error: {str(e)}")
+        raise
+    except Exception as e:
+        print(f"[ERROR] DLTOVR unexpected error: {str(e)}")
+        raise RuntimeError(f"DLTOVR command failed: {str(e)}")
+
+def delete_override(logical_name: str) -> bool:
+    """
+    Delete a file override from an already parsed DLTOVR FILE parameter
+    
+    Structured entry point used by DLTOVR and by compiled CL programs.
+    
+    Args:
+        logical_name: Logical file name (FILE)
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
         print(f"[DLTOVR] Logical file: {logical_name}")
         
         # Note: Previously tried parent-child communication, but direct execution works better
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+"""
+Library Archive Engine for SAVLIB / RSTLIB
+
+Seekable library backups compressed in parallel chunks, with incremental
+and differential backups and restore of single objects.
+
+Archive layout (<LIB>_<VOL>_<timestamp>.asplib):
+    header   b'ASPLIB01' + codec name (8 bytes, 'zstd' or 'zlib')
+    chunks   file data in CHUNK_SIZE pieces, each compressed independently
+    index    compressed JSON manifest: library, volume, mode, base archive
+             and one entry per file (path, size, mtime_ns, mode, sha256 and
+             either the chunk list or the archive holding unchanged data)
+    trailer  index offset, index length, b'ASPLIBIX'
+
+Chunks are compressed by a thread pool; zstd (python zstandard) is used
+when installed, stdlib zlib otherwise (both release the GIL).
+
+Backup modes:
+    FULL  every file is stored
+    INCR  files unchanged since the latest backup of the library are
+          stored as references to the archive that holds their data
+    DIFF  same, against the latest FULL backup
+
+A file is unchanged when its size and mtime match the base manifest, or
+when its SHA-256 does. Restoring an INCR/DIFF archive reads referenced
+files directly from their archives, so the restored library is the state
+at backup time, and restoring one object only decompresses its chunks.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Import from parent module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asp_commands import VOLUME_ROOT
+
+BACKUP_DIR = os.environ.get('ASP_BACKUP_DIR', os.path.join(VOLUME_ROOT, "BACKUP"))
+ARCHIVE_SUFFIX = ".asplib"
+
+ARCHIVE_MAGIC = b'ASPLIB01'
+TRAILER_MAGIC = b'ASPLIBIX'
+HEADER = struct.Struct('<8s8s')  # magic, codec name
+TRAILER = struct.Struct('<QQ8s')  # index offset, index length, magic
+
+CHUNK_SIZE = int(os.environ.get('SAVLIB_CHUNK_SIZE', str(4 * 1024 * 1024)))
+ARCHIVE_THREADS = int(os.environ.get('SAVLIB_THREADS', str(os.cpu_count() or 4)))
+
+BACKUP_MODES = ('FULL', 'INCR', 'DIFF')
+
+
+class ArchiveError(Exception):
+    """Invalid or inconsistent library archive"""
+    pass
+
+
+class _Codec:
+    """Chunk compressor; zstd contexts are per thread"""
+
+    def __init__(self, name: str):
+        if name == 'zstd' and not ZSTD_AVAILABLE:
+            raise ArchiveError("Archive is zstd compressed but the zstandard module is not installed")
+        if name not in ('zstd', 'zlib'):
+            raise ArchiveError(f"Unknown archive codec: {name}")
+        self.name = name
+        self.local = threading.local()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == 'zstd':
+            compressor = getattr(self.local, 'compressor', None)
+            if compressor is None:
+                compressor = self.local.compressor = zstandard.ZstdCompressor(level=3)
+            return compressor.compress(data)
+        return zlib.compress(data, 6)
+
+    def decompress(self, data: bytes, size: int) -> bytes:
+        if self.name == 'zstd':
+            decompressor = getattr(self.local, 'decompressor', None)
+            if decompressor is None:
+                decompressor = self.local.decompressor = zstandard.ZstdDecompressor()
+            return decompressor.decompress(data, max_output_size=size)
+        return zlib.decompress(data)
+
+
+def default_codec() -> str:
+    return 'zstd' if ZSTD_AVAILABLE else 'zlib'
+
+
+def _ordered_map(executor: ThreadPoolExecutor, fn: Callable, items: Iterable, window: int) -> Iterator:
+    """executor.map with at most window pending items, results in input order"""
+    pending = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= window:
+            item, future = pending.popleft()
+            yield item, future.result()
+    while pending:
+        item, future = pending.popleft()
+        yield item, future.result()
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _scan_library(lib_path: str):
+    """Relative file paths and directories of a library, sorted"""
+    files, dirs = [], []
+    for root, dirnames, filenames in os.walk(lib_path):
+        dirnames.sort()
+        rel_root = os.path.relpath(root, lib_path)
+        if rel_root != '.':
+            dirs.append(rel_root.replace(os.sep, '/'))
+        for filename in sorted(filenames):
+            rel = filename if rel_root == '.' else os.path.join(rel_root, filename)
+            files.append(rel.replace(os.sep, '/'))
+    return files, dirs
+
+
+class LibraryArchive:
+    """Read access to an .asplib archive"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.file = open(path, 'rb')
+        try:
+            magic, codec_name = HEADER.unpack(self.file.read(HEADER.size))
+            if magic != ARCHIVE_MAGIC:
+                raise ArchiveError(f"Not a library archive: {path}")
+            self.codec = _Codec(codec_name.rstrip(b'\0').decode('ascii'))
+
+            self.file.seek(-TRAILER.size, os.SEEK_END)
+            index_offset, index_length, trailer_magic = TRAILER.unpack(self.file.read(TRAILER.size))
+            if trailer_magic != TRAILER_MAGIC:
+                raise ArchiveError(f"Library archive is truncated: {path}")
+            self.file.seek(index_offset)
+            self.index = json.loads(self.codec.decompress(self.file.read(index_length), 1 << 30))
+        except (struct.error, ValueError, zlib.error) as e:
+            self.file.close()
+            raise ArchiveError(f"Corrupt library archive {path}: {e}")
+        except Exception:
+            self.file.close()
+            raise
+        self.entries = {entry['path']: entry for entry in self.index['files']}
+        self.read_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def read_chunk(self, chunk: List[int]) -> bytes:
+        """Compressed bytes of a chunk [offset, compressed length, length]"""
+        with self.read_lock:
+            self.file.seek(chunk[0])
+            return self.file.read(chunk[1])
+
+
+def find_archives(lib: str, vol: str, backup_dir: str = BACKUP_DIR) -> List[str]:
+    """Library archives of LIB/VOL in the backup directory, oldest first"""
+    if not os.path.isdir(backup_dir):
+        return []
+    prefix = f"{lib}_{vol}_"
+    return sorted(os.path.join(backup_dir, name) for name in os.listdir(backup_dir)
+                  if name.startswith(prefix) and name.endswith(ARCHIVE_SUFFIX))
+
+
+def _find_base(lib: str, vol: str, mode: str, backup_dir: str) -> Optional[LibraryArchive]:
+    for path in reversed(find_archives(lib, vol, backup_dir)):
+        try:
+            archive = LibraryArchive(path)
+        except (OSError, ArchiveError) as e:
+            print(f"[WARN] Skipping unreadable backup {path}: {e}")
+            continue
+        if mode == 'INCR' or archive.index.get('mode') == 'FULL':
+            return archive
+        archive.close()
+    return None
+
+
+def save_library(lib: str, vol: str, mode: str = 'FULL', backup_dir: str = BACKUP_DIR,
+                 threads: Optional[int] = None, codec: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Back up VOLUME_ROOT/vol/lib into a new archive
+
+    Args:
+        lib: Library name
+        vol: Volume name
+        mode: FULL, INCR or DIFF (falls back to FULL without a base backup)
+        backup_dir: Directory receiving the archive
+        threads: Compression threads (default SAVLIB_THREADS)
+        codec: 'zstd' or 'zlib' (default zstd when available)
+
+    Returns:
+        Backup summary (archive path, mode, base, file and byte counts)
+    """
+    started = time.monotonic()
+    lib_path = os.path.join(VOLUME_ROOT, vol, lib)
+    if not os.path.isdir(lib_path):
+        raise FileNotFoundError(f"Library '{lib}' does not exist in volume '{vol}'.")
+    mode = mode.upper()
+    if mode not in BACKUP_MODES:
+        raise ValueError(f"Invalid backup mode: {mode} (use {', '.join(BACKUP_MODES)})")
+
+    os.makedirs(backup_dir, exist_ok=True)
+    base = _find_base(lib, vol, mode, backup_dir) if mode != 'FULL' else None
+    if mode != 'FULL' and base is None:
+        print(f"[INFO] No base backup of {lib} found, taking a FULL backup")
+        mode = 'FULL'
+    base_entries = base.entries if base else {}
+    if base:
+        base.close()
+
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    archive_name = f"{lib}_{vol}_{timestamp}{ARCHIVE_SUFFIX}"
+    archive_path = os.path.join(backup_dir, archive_name)
+    suffix = 1
+    while os.path.exists(archive_path):
+        archive_name = f"{lib}_{vol}_{timestamp}_{suffix}{ARCHIVE_SUFFIX}"
+        archive_path = os.path.join(backup_dir, archive_name)
+        suffix += 1
+
+    files, dirs = _scan_library(lib_path)
+    entries = []
+    to_store = []
+    for rel in files:
+        full_path = os.path.join(lib_path, rel)
+        st = os.stat(full_path)
+        entry = {'path': rel, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'mode': st.st_mode & 0o7777}
+        previous = base_entries.get(rel)
+        if previous and previous['size'] == st.st_size:
+            if previous['mtime_ns'] == st.st_mtime_ns:
+                entry.update(sha256=previous['sha256'], archive=previous.get('archive') or base.name)
+            else:
+                sha256 = _file_sha256(full_path)
+                if sha256 == previous['sha256']:
+                    entry.update(sha256=sha256, archive=previous.get('archive') or base.name)
+        entries.append(entry)
+        if 'archive' not in entry:
+            to_store.append(entry)
+
+    codec_impl = _Codec(codec or default_codec())
+    threads = max(1, threads or ARCHIVE_THREADS)
+    stored_bytes = 0
+    temp_path = f"{archive_path}.{os.getpid()}.tmp"
+
+    def read_chunks():
+        for entry in to_store:
+            digest = hashlib.sha256()
+            entry['chunks'] = []
+            with open(os.path.join(lib_path, entry['path']), 'rb') as f:
+                for data in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(data)
+                    yield entry, data
+            entry['sha256'] = digest.hexdigest()
+
+    try:
+        with open(temp_path, 'wb') as out, ThreadPoolExecutor(max_workers=threads) as executor:
+            out.write(HEADER.pack(ARCHIVE_MAGIC, codec_impl.name.encode('ascii')))
+            for (entry, data), compressed in _ordered_map(executor, lambda item: codec_impl.compress(item[1]),
+                                                          read_chunks(), threads * 2):
+                entry['chunks'].append([out.tell(), len(compressed), len(data)])
+                out.write(compressed)
+                stored_bytes += len(compressed)
+
+            index = {
+                'format': 1,
+                'library': lib,
+                'volume': vol,
+                'mode': mode,
+                'created': datetime.now().isoformat(),
+                'codec': codec_impl.name,
+                'base': base.name if base else None,
+                'dirs': dirs,
+                'files': entries
+            }
+            index_data = codec_impl.compress(json.dumps(index, separators=(',', ':')).encode('utf-8'))
+            index_offset = out.tell()
+            out.write(index_data)
+            out.write(TRAILER.pack(index_offset, len(index_data), TRAILER_MAGIC))
+        os.replace(temp_path, archive_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    total_bytes = sum(entry['size'] for entry in entries)
+    return {
+        'archive': archive_path,
+        'mode': mode,
+        'base': base.name if base else None,
+        'codec': codec_impl.name,
+        'files': len(entries),
+        'stored_files': len(to_store),
+        'referenced_files': len(entries) - len(to_store),
+        'total_bytes': total_bytes,
+        'input_bytes': sum(entry['size'] for entry in to_store),
+        'archive_bytes': os.path.getsize(archive_path),
+        'compressed_bytes': stored_bytes,
+        'elapsed': time.monotonic() - started
+    }
+
+
+def restore_library(archive_path: str, target_path: Optional[str] = None, pattern: Optional[str] = None,
+                    threads: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Restore files of a library archive
+
+    Args:
+        archive_path: .asplib archive
+        target_path: Library directory to restore into (default VOLUME_ROOT/<vol>/<lib> of the archive)
+        pattern: Restore only objects whose path or name matches this fnmatch pattern
+        threads: Decompression threads (default SAVLIB_THREADS)
+
+    Returns:
+        Restore summary (target, restored file and byte counts)
+
+    Raises:
+        ArchiveError: Archive unreadable, referenced archive missing or checksum mismatch
+    """
+    started = time.monotonic()
+    archive = LibraryArchive(archive_path)
+    archives = {archive.name: archive}
+    backup_dir = os.path.dirname(os.path.abspath(archive_path))
+    threads = max(1, threads or ARCHIVE_THREADS)
+
+    def source_of(entry) -> LibraryArchive:
+        name = entry.get('archive') or archive.name
+        if name not in archives:
+            path = os.path.join(backup_dir, name)
+            if not os.path.exists(path):
+                raise ArchiveError(f"Referenced backup not found: {path}")
+            archives[name] = LibraryArchive(path)
+        return archives[name]
+
+    try:
+        index = archive.index
+        target_path = target_path or os.path.join(VOLUME_ROOT, index['volume'], index['library'])
+        selected = [entry for entry in index['files']
+                    if not pattern or fnmatch.fnmatch(entry['path'], pattern)
+                    or fnmatch.fnmatch(os.path.basename(entry['path']), pattern)]
+        if not pattern:
+            for rel in index.get('dirs', []):
+                os.makedirs(os.path.join(target_path, rel), exist_ok=True)
+        os.makedirs(target_path, exist_ok=True)
+
+        restored_bytes = 0
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for entry in selected:
+                rel = entry['path']
+                if os.path.isabs(rel) or '..' in rel.split('/'):
+                    raise ArchiveError(f"Unsafe path in archive: {rel}")
+                source = source_of(entry)
+                source_entry = source.entries.get(rel) if source is not archive else entry
+                if not source_entry or source_entry.get('archive') or source_entry.get('sha256') != entry['sha256']:
+                    raise ArchiveError(f"{rel} not stored in {source.name}")
+
+                dest = os.path.join(target_path, rel)
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                temp_dest = f"{dest}.{os.getpid()}.rst"
+                digest = hashlib.sha256()
+                try:
+                    with open(temp_dest, 'wb') as out:
+                        def decompress(chunk, source=source):
+                            return source.codec.decompress(source.read_chunk(chunk), chunk[2])
+                        for chunk, data in _ordered_map(executor, decompress, source_entry['chunks'], threads * 2):
+                            digest.update(data)
+                            out.write(data)
+                    if digest.hexdigest() != entry['sha256']:
+                        raise ArchiveError(f"Checksum mismatch restoring {rel} from {source.name}")
+                    os.chmod(temp_dest, entry['mode'])
+                    os.utime(temp_dest, ns=(entry['mtime_ns'], entry['mtime_ns']))
+                    os.replace(temp_dest, dest)
+                except BaseException:
+                    if os.path.exists(temp_dest):
+                        os.unlink(temp_dest)
+                    raise
+                restored_bytes += entry['size']
+    finally:
+        for opened in archives.values():
+            opened.close()
+
+    return {
+        'target': target_path,
+        'library': index['library'],
+        'volume': index['volume'],
+        'mode': index['mode'],
+        'files': len(selected),
+        'bytes': restored_bytes,
+        'archives_read': len(archives),
+        'elapsed': time.monotonic() - started
+    }
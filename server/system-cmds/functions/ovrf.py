@@ -555,6 +555,30 @@ def OVRF(command_line: str) -> bool:
         physical_file = params["TOFILE"]
         override_type = params.get("TYPE", "*DATA")
         
+        return override_file(logical_name, physical_file, override_type)
+        
+    except RuntimeError as e:
+        print(f"[ERROR] OVRF runtime error: {str(e)}")
+        raise
+    except Exception as e:
+        print(f"[ERROR] OVRF unexpected error: {str(e)}")
+        raise RuntimeError(f"OVRF command failed: {str(e)}")
+
+def override_file(logical_name: str, physical_file: str, override_type: str = "*DATA") -> bool:
+    """
+    Create a file override from already parsed OVRF parameters
+    
+    Structured entry point used by OVRF and by compiled CL programs.
+    
+    Args:
+        logical_name: Logical file name (FILE)
+        physical_file: Physical file (TOFILE)
+        override_type: Override type (TYPE)
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
         print(f"[OVRF] Logical: {logical_name}, Physical: {physical_file}, Type: {override_type}")
         
         # Note: Previously tried parent-child communication, but direct execution works better
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+RSTLIB (Restore Library) Command Implementation for OpenASP
+
+Restores a library, or selected objects of it, from a SAVLIB backup.
+.asplib archives restore only the requested objects; legacy tar.gz
+backups are extracted with tarfile.
+"""
+
+import fnmatch
+import os
+import sys
+import tarfile
+
+# Import from parent module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asp_commands import VOLUME_ROOT, set_pgmec, log_message
+
+from .library_archive import BACKUP_DIR, ArchiveError, restore_library
+
+def _restore_tar(backup_path: str, pattern: str = None) -> int:
+    """Legacy tar.gz restore into VOLUME_ROOT; returns the number of restored members"""
+    with tarfile.open(backup_path, "r:gz") as tar:
+        members = tar.getmembers()
+        if pattern:
+            members = [member for member in members if member.isfile() and
+                       (fnmatch.fnmatch(member.name, pattern) or
+                        fnmatch.fnmatch(os.path.basename(member.name), pattern))]
+        tar.extractall(path=VOLUME_ROOT, members=members)
+    return len(members)
+
+def RSTLIB(command: str) -> bool:
+    """
+    RSTLIB command - Restore Library
+    
+    Format: RSTLIB FILE-BACKUPFILE[,OBJ-OBJECT][,LIB-LIBNAME,VOL-VOLUME]
+    
+    OBJ restores only the matching objects (fnmatch pattern on the object
+    name or its path in the library). LIB/VOL restore into another library.
+    
+    Args:
+        command: Full RSTLIB command string
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        # Parse command parameters
+        params = {}
+        command_str = command.replace('RSTLIB ', '').strip()
+        
+        for param in command_str.split(','):
+            param = param.strip()
+            if '-' in param:
+                key, value = param.split('-', 1)
+                params[key.strip().upper()] = value.strip()
+        
+        backup_file = params.get('FILE')
+        pattern = params.get('OBJ')
+        
+        if not backup_file:
+            print("[ERROR] FILE parameter is missing.")
+            print("[USAGE] RSTLIB FILE-BACKUPFILE[,OBJ-OBJECT][,LIB-LIBNAME,VOL-VOLUME]")
+            set_pgmec(999)
+            return False
+        
+        backup_path = os.path.join(BACKUP_DIR, backup_file)
+        if not os.path.isfile(backup_path):
+            print(f"[ERROR] Backup file does not exist: {backup_path}")
+            set_pgmec(999)
+            return False
+        
+        if tarfile.is_tarfile(backup_path):
+            count = _restore_tar(backup_path, pattern)
+            print(f"[INFO] Restore completed: {backup_path} ({count} entries)")
+            log_message("INFO", f"RSTLIB -> {backup_file} restore successful")
+            return True
+        
+        target_path = None
+        if params.get('LIB') and params.get('VOL'):
+            target_path = os.path.join(VOLUME_ROOT, params['VOL'], params['LIB'])
+        
+        result = restore_library(backup_path, target_path, pattern)
+        if pattern and not result['files']:
+            print(f"[ERROR] No object matching '{pattern}' in {backup_file}")
+            set_pgmec(999)
+            return False
+        
+        print(f"[INFO] Restore completed: {backup_path} -> {result['target']}")
+        print(f"[INFO] Files: {result['files']}, {result['bytes']:,} Byte from "
+              f"{result['archives_read']} archive(s) in {result['elapsed']:.2f}s")
+        log_message("INFO", f"RSTLIB -> {backup_file} restore successful"
+                    + (f" (OBJ-{pattern})" if pattern else ""))
+        return True
+        
+    except (OSError, ArchiveError, tarfile.TarError) as e:
+        print(f"[ERROR] Restore failed: {e}")
+        log_message("ERROR", f"RSTLIB failed: {e}")
+        set_pgmec(999)
+        return False
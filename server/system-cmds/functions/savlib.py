@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+SAVLIB (Save Library) Command Implementation for OpenASP
+
+Backs up a library into a parallel-compressed .asplib archive (see
+library_archive), as a full, incremental or differential backup.
+"""
+
+import os
+import sys
+import tarfile
+from datetime import datetime
+
+# Import from parent module
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from asp_commands import VOLUME_ROOT, set_pgmec, log_message
+
+from .library_archive import BACKUP_DIR, BACKUP_MODES, ArchiveError, save_library
+
+def _save_tar(lib: str, vol: str) -> str:
+    """Legacy single-threaded tar.gz backup (FORMAT-TAR)"""
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    backup_path = os.path.join(BACKUP_DIR, f"{lib}_{vol}_{timestamp}.tar.gz")
+    with tarfile.open(backup_path, "w:gz") as tar:
+        tar.add(os.path.join(VOLUME_ROOT, vol, lib), arcname=f"{lib}")
+    return backup_path
+
+def SAVLIB(command: str) -> bool:
+    """
+    SAVLIB command - Save Library
+    
+    Format: SAVLIB LIB-LIBNAME,VOL-VOLUME[,MODE-FULL|INCR|DIFF][,FORMAT-ASPLIB|TAR]
+    
+    Args:
+        command: Full SAVLIB command string
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        # Parse command parameters
+        params = {}
+        command_str = command.replace('SAVLIB ', '').strip()
+        
+        for param in command_str.split(','):
+            param = param.strip()
+            if '-' in param:
+                key, value = param.split('-', 1)
+                params[key.strip().upper()] = value.strip()
+        
+        lib = params.get('LIB')
+        vol = params.get('VOL')
+        mode = params.get('MODE', 'FULL').upper()
+        archive_format = params.get('FORMAT', 'ASPLIB').upper()
+        
+        if not lib or not vol:
+            print("[ERROR] LIB or VOL parameter is missing.")
+            print("[USAGE] SAVLIB LIB-LIBNAME,VOL-VOLUME[,MODE-FULL|INCR|DIFF][,FORMAT-ASPLIB|TAR]")
+            set_pgmec(999)
+            return False
+        
+        if mode not in BACKUP_MODES:
+            print(f"[ERROR] Invalid MODE: {mode} (use {', '.join(BACKUP_MODES)})")
+            set_pgmec(999)
+            return False
+        
+        if not os.path.isdir(os.path.join(VOLUME_ROOT, vol, lib)):
+            print(f"[ERROR] Library '{lib}' does not exist in volume '{vol}'.")
+            set_pgmec(999)
+            return False
+        
+        if archive_format == 'TAR':
+            backup_path = _save_tar(lib, vol)
+            print(f"[INFO] Library '{lib}' has been backed up: {backup_path}")
+            log_message("INFO", f"SAVLIB {lib} -> {os.path.basename(backup_path)}")
+            return True
+        
+        result = save_library(lib, vol, mode)
+        backup_name = os.path.basename(result['archive'])
+        throughput = result['input_bytes'] / result['elapsed'] / 1024 / 1024 if result['elapsed'] else 0.0
+        
+        print(f"[INFO] Library '{lib}' has been backed up: {result['archive']}")
+        print(f"[INFO] Mode: {result['mode']}" + (f" (base: {result['base']})" if result['base'] else ""))
+        print(f"[INFO] Files: {result['files']} ({result['stored_files']} stored, "
+              f"{result['referenced_files']} unchanged)")
+        print(f"[INFO] Size: {result['input_bytes']:,} -> {result['archive_bytes']:,} Byte "
+              f"[{result['codec']}], {result['elapsed']:.2f}s, {throughput:.1f} MB/s")
+        log_message("INFO", f"SAVLIB {lib} -> {backup_name} ({result['mode']})")
+        return True
+        
+    except (OSError, ArchiveError, ValueError) as e:
+        print(f"[ERROR] Backup failed: {e}")
+        log_message("ERROR", f"SAVLIB failed: {e}")
+        set_pgmec(999)
+        return False
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Japanese Codecs for ASP System Commands
+In-process Shift-JIS / EUC-JP / Fujitsu JEF / JAK EBCDIC codecs registered
+with the codecs module, so record display no longer needs the Java encoding
+API or an nkf/iconv process per record.
+
+Registered names:
+    fujitsu_sjis   - cp932 with the Fujitsu (JIS X 0208) code points
+    fujitsu_eucjp  - EUC-JP with the same code points
+    jef            - Fujitsu JEF EBCDIC (JEFASCK.txt / ASCJEFK.txt)
+    jak            - JAK EBCDIC (EBCASCJP.txt / ASCEBCJP.txt, JEF DBCS fallback)
+
+Usage:
+    import japanese_codecs
+    text = record.decode('jef', errors='replace')
+"""
+
+import codecs
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from codepage_registry import get_codepage
+
+logger = logging.getLogger(__name__)
+
+# Fujitsu SJIS decodes the cells where cp932 and JIS X 0208 disagree to the
+# JIS code points (same overlay as the SMED field codec)
+FUJITSU_DECODE_MAP = str.maketrans({
+    0xFF5E: '〜',  # 0x8160 WAVE DASH
+    0x2225: '‖',  # 0x8161 DOUBLE VERTICAL LINE
+    0xFF0D: '−',  # 0x817C MINUS SIGN
+    0xFFE0: '¢',  # 0x8191 CENT SIGN
+    0xFFE1: '£',  # 0x8192 POUND SIGN
+    0xFFE2: '¬',  # 0x81CA NOT SIGN
+})
+FUJITSU_ENCODE_MAP = str.maketrans({
+    0x2014: '―',  # EM DASH -> 0x815C
+})
+
+# Shift codes accepted on decode: standard SO/SI and the Fujitsu 0x28/0x29
+# used by the dataset converters. Encoding writes the Fujitsu pair.
+SO_CODES = (0x0E, 0x28)
+SI_CODES = (0x0F, 0x29)
+DEFAULT_SO = 0x28
+DEFAULT_SI = 0x29
+SHIFT_CODE_PATTERN = re.compile(b'[\x0e\x0f\x28\x29]')
+
+
+def load_codepage(filename: str) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Codepage tables as (single byte, double byte) dicts from the compiled
+    codepage registry; entries mapped to 0 (unmapped) are left out, except
+    0x00 -> 0x00
+    """
+    codepage = get_codepage(filename)
+    return codepage.sbcs_mappings(), codepage.dbcs_mappings()
+
+
+def _sjis_to_text(code: int) -> Optional[str]:
+    """One SJIS code (single byte or double byte) as text, None when unmapped"""
+    raw = bytes([code]) if code <= 0xFF else bytes([code >> 8, code & 0xFF])
+    try:
+        return raw.decode('cp932').translate(FUJITSU_DECODE_MAP)
+    except UnicodeDecodeError:
+        if code <= 0xFF:
+            # C1 controls (e.g. 0x04 -> 0x9C) have no cp932 single byte form
+            return chr(code)
+        return None
+
+
+def _text_to_sjis(char: str) -> Optional[int]:
+    try:
+        raw = char.translate(FUJITSU_ENCODE_MAP).encode('cp932')
+    except UnicodeEncodeError:
+        if len(char) == 1 and 0x80 <= ord(char) <= 0xFF:
+            return ord(char)
+        return None
+    if len(raw) == 1:
+        return raw[0]
+    if len(raw) == 2:
+        return (raw[0] << 8) | raw[1]
+    return None
+
+
+class EbcdicTables:
+    """Decode/encode tables of one EBCDIC code page, built on first use"""
+
+    def __init__(self, name: str, decode_file: str, encode_file: str,
+                 fallback_decode_file: Optional[str] = None,
+                 fallback_encode_file: Optional[str] = None):
+        self.name = name
+        self.decode_file = decode_file
+        self.encode_file = encode_file
+        self.fallback_decode_file = fallback_decode_file
+        self.fallback_encode_file = fallback_encode_file
+        self.lock = threading.Lock()
+        self.loaded = False
+
+    def _load(self):
+        with self.lock:
+            if self.loaded:
+                return
+            sbcs, dbcs = load_codepage(self.decode_file)
+            if self.fallback_decode_file:
+                dbcs = {**load_codepage(self.fallback_decode_file)[1], **dbcs}
+
+            # SBCS as a charmap string: runs decode through codecs.charmap_decode
+            table = ['\ufffe'] * 256
+            for ebcdic, sjis in sbcs.items():
+                table[ebcdic] = _sjis_to_text(sjis) or '\ufffe'
+            self.sbcs_decode = ''.join(table)
+
+            self.dbcs_decode = {}
+            for ebcdic, sjis in dbcs.items():
+                text = _sjis_to_text(sjis)
+                if text:
+                    self.dbcs_decode[ebcdic] = text
+
+            sbcs_rev, dbcs_rev = load_codepage(self.encode_file)
+            if self.fallback_encode_file:
+                dbcs_rev = {**load_codepage(self.fallback_encode_file)[1], **dbcs_rev}
+            self.sbcs_encode = {}
+            for sjis, ebcdic in sbcs_rev.items():
+                text = _sjis_to_text(sjis)
+                if text and len(text) == 1:
+                    self.sbcs_encode.setdefault(text, ebcdic)
+            self.dbcs_encode = dbcs_rev
+            self.loaded = True
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self._load()
+
+
+def _decode_error(encoding: str, data: bytes, start: int, end: int, errors: str,
+                  reason: str) -> str:
+    if errors == 'strict':
+        raise UnicodeDecodeError(encoding, bytes(data), start, end, reason)
+    if errors == 'ignore':
+        return ''
+    return '\ufffd'
+
+
+def ebcdic_decode(tables: EbcdicTables, data: bytes, errors: str = 'strict',
+                  dbcs: bool = False, final: bool = True) -> Tuple[str, int, bool]:
+    """
+    Decode an EBCDIC buffer with SO/SI shifting
+
+    Returns:
+        (text, bytes consumed, DBCS shift state at the end)
+    """
+    tables.ensure_loaded()
+    data = memoryview(data).tobytes() if not isinstance(data, bytes) else data
+    out: List[str] = []
+    pos = 0
+    length = len(data)
+    sbcs_decode = tables.sbcs_decode
+    dbcs_decode = tables.dbcs_decode
+
+    while pos < length:
+        if not dbcs:
+            match = SHIFT_CODE_PATTERN.search(data, pos)
+            end = match.start() if match else length
+            if end > pos:
+                out.append(codecs.charmap_decode(data[pos:end], errors, sbcs_decode)[0])
+            if not match:
+                pos = length
+                break
+            pos = end + 1
+            if data[end] in SO_CODES:
+                dbcs = True
+            continue
+
+        byte = data[pos]
+        if byte in SI_CODES:
+            dbcs = False
+            pos += 1
+            continue
+        if byte in SO_CODES:
+            pos += 1
+            continue
+        if pos + 1 >= length:
+            if not final:
+                break
+            out.append(_decode_error(tables.name, data, pos, length, errors, 'truncated DBCS character'))
+            pos = length
+            break
+        code = (byte << 8) | data[pos + 1]
+        text = dbcs_decode.get(code)
+        if text is None:
+            if code == 0x4040:
+                text = '\u3000'
+            else:
+                text = _decode_error(tables.name, data, pos, pos + 2, errors, 'unmapped DBCS character')
+        out.append(text)
+        pos += 2
+
+    return ''.join(out), pos, dbcs
+
+
+def ebcdic_encode(tables: EbcdicTables, text: str, errors: str = 'strict',
+                  so: int = DEFAULT_SO, si: int = DEFAULT_SI) -> bytes:
+    """Encode text to EBCDIC, wrapping DBCS runs in SO/SI"""
+    tables.ensure_loaded()
+    out = bytearray()
+    dbcs = False
+    for index, char in enumerate(text):
+        ebcdic = tables.sbcs_encode.get(char)
+        if ebcdic is not None:
+            if dbcs:
+                out.append(si)
+                dbcs = False
+            out.append(ebcdic)
+            continue
+        sjis = _text_to_sjis(char)
+        code = tables.dbcs_encode.get(sjis) if sjis is not None and sjis > 0xFF else None
+        if code is None:
+            if errors == 'strict':
+                raise UnicodeEncodeError(tables.name, text, index, index + 1, 'unmapped character')
+            if errors == 'ignore':
+                continue
+            if dbcs:
+                out.append(si)
+                dbcs = False
+            out.append(tables.sbcs_encode.get('?', 0x6F))
+            continue
+        if not dbcs:
+            out.append(so)
+            dbcs = True
+        out += bytes([code >> 8, code & 0xFF])
+    if dbcs:
+        out.append(si)
+    return bytes(out)
+
+
+def _ebcdic_codec(tables: EbcdicTables) -> codecs.CodecInfo:
+
+    def encode(text, errors='strict'):
+        return ebcdic_encode(tables, text, errors), len(text)
+
+    def decode(data, errors='strict'):
+        text, consumed, _ = ebcdic_decode(tables, data, errors)
+        return text, consumed
+
+    class IncrementalEncoder(codecs.IncrementalEncoder):
+        def encode(self, text, final=False):
+            return ebcdic_encode(tables, text, self.errors)
+
+    class IncrementalDecoder(codecs.IncrementalDecoder):
+        """Keeps the shift state and a split DBCS byte between buffers"""
+
+        def __init__(self, errors='strict'):
+            super().__init__(errors)
+            self.reset()
+
+        def decode(self, data, final=False):
+            data = self.pending + bytes(data)
+            text, consumed, self.dbcs = ebcdic_decode(tables, data, self.errors, self.dbcs, final)
+            self.pending = data[consumed:]
+            return text
+
+        def reset(self):
+            self.pending = b''
+            self.dbcs = False
+
+        def getstate(self):
+            return self.pending, int(self.dbcs)
+
+        def setstate(self, state):
+            self.pending, dbcs = state
+            self.dbcs = bool(dbcs)
+
+    class StreamWriter(codecs.StreamWriter):
+        def encode(self, text, errors='strict'):
+            return encode(text, errors)
+
+    class StreamReader(codecs.StreamReader):
+        def decode(self, data, errors='strict'):
+            return decode(data, errors)
+
+    return codecs.CodecInfo(
+        name=tables.name,
+        encode=encode,
+        decode=decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+        streamwriter=StreamWriter,
+        streamreader=StreamReader
+    )
+
+
+def _overlay_codec(name: str, base: str) -> codecs.CodecInfo:
+    """A standard CJK codec with the Fujitsu code point overlay"""
+    base_info = codecs.lookup(base)
+
+    def encode(text, errors='strict'):
+        return base_info.encode(text.translate(FUJITSU_ENCODE_MAP), errors)
+
+    def decode(data, errors='strict'):
+        text, consumed = base_info.decode(data, errors)
+        return text.translate(FUJITSU_DECODE_MAP), consumed
+
+    class IncrementalEncoder(base_info.incrementalencoder):
+        def encode(self, text, final=False):
+            return super().encode(text.translate(FUJITSU_ENCODE_MAP), final)
+
+    class IncrementalDecoder(base_info.incrementaldecoder):
+        def decode(self, data, final=False):
+            return super().decode(data, final).translate(FUJITSU_DECODE_MAP)
+
+    class StreamWriter(codecs.StreamWriter):
+        def encode(self, text, errors='strict'):
+            return encode(text, errors)
+
+    class StreamReader(codecs.StreamReader):
+        def decode(self, data, errors='strict'):
+            return decode(data, errors)
+
+    return codecs.CodecInfo(
+        name=name,
+        encode=encode,
+        decode=decode,
+        incrementalencoder=IncrementalEncoder,
+        incrementaldecoder=IncrementalDecoder,
+        streamwriter=StreamWriter,
+        streamreader=StreamReader
+    )
+
+
+JEF_TABLES = EbcdicTables('jef', 'JEFASCK.txt', 'ASCJEFK.txt')
+JAK_TABLES = EbcdicTables('jak', 'EBCASCJP.txt', 'ASCEBCJP.txt',
+                          fallback_decode_file='JEFASCK.txt',
+                          fallback_encode_file='ASCJEFK.txt')
+
+CODEC_ALIASES = {
+    'fujitsu_sjis': 'fujitsu_sjis',
+    'sjis_fujitsu': 'fujitsu_sjis',
+    'fujitsu_eucjp': 'fujitsu_eucjp',
+    'eucjp_fujitsu': 'fujitsu_eucjp',
+    'jef': 'jef',
+    'fujitsu_jef': 'jef',
+    'jak': 'jak',
+    'jak_ebcdic': 'jak'
+}
+
+# Dataset ENCODING values -> registered codec names
+ENCODING_CODECS = {
+    'sjis': 'fujitsu_sjis',
+    'shift_jis': 'fujitsu_sjis',
+    'shift-jis': 'fujitsu_sjis',
+    'shift.jis': 'fujitsu_sjis',
+    'cp932': 'fujitsu_sjis',
+    'ms932': 'fujitsu_sjis',
+    'windows-31j': 'fujitsu_sjis',
+    'euc-jp': 'fujitsu_eucjp',
+    'euc_jp': 'fujitsu_eucjp',
+    'eucjp': 'fujitsu_eucjp',
+    'jef': 'jef',
+    'jak': 'jak',
+}
+
+_codec_cache: Dict[str, codecs.CodecInfo] = {}
+
+
+def _search(name: str) -> Optional[codecs.CodecInfo]:
+    codec_name = CODEC_ALIASES.get(name.lower().replace('-', '_').replace(' ', '_'))
+    if codec_name is None:
+        return None
+    if codec_name not in _codec_cache:
+        if codec_name == 'fujitsu_sjis':
+            _codec_cache[codec_name] = _overlay_codec(codec_name, 'cp932')
+        elif codec_name == 'fujitsu_eucjp':
+            _codec_cache[codec_name] = _overlay_codec(codec_name, 'euc_jp')
+        elif codec_name == 'jef':
+            _codec_cache[codec_name] = _ebcdic_codec(JEF_TABLES)
+        else:
+            _codec_cache[codec_name] = _ebcdic_codec(JAK_TABLES)
+    return _codec_cache[codec_name]
+
+
+codecs.register(_search)
+
+
+def codec_for(encoding: str) -> str:
+    """Codec name to use for a dataset ENCODING value"""
+    name = (encoding or 'utf-8').lower()
+    return ENCODING_CODECS.get(name, name)
+
+
+def decode_bytes(data: bytes, encoding: str, errors: str = 'replace') -> str:
+    """Decode a whole record/buffer with the codec for a dataset encoding"""
+    return codecs.decode(data, codec_for(encoding), errors)
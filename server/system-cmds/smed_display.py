@@ -18,10 +18,12 @@ sys.path.append('/home/aspuser/app/server')
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from parse_smed import parse_smed_file
+    from parse_smed import parse_smed_file, get_compiled_smed_map
 except ImportError:
+    get_compiled_smed_map = None
+
     # Fallback SMED parser if parse_smed is not available
-    def parse_smed_file(file_path):
+    def parse_smed_file(file_path, **kwargs):
         return {
             'map_name': 'FALLBACK_MAP',
             'fields': [
@@ -79,7 +81,12 @@ class SMEDDisplayEngine:
             # Try to load actual SMED file
             if os.path.exists(map_file):
                 # Console terminal display - no conversion needed (preserve original encoding)
-                self.map_data = parse_smed_file(map_file, destination='terminal')
+                # Served from the shared compiled map cache when available
+                compiled = get_compiled_smed_map(map_file, destination='terminal') if get_compiled_smed_map else None
+                if compiled is not None:
+                    self.map_data = compiled.result
+                else:
+                    self.map_data = parse_smed_file(map_file, destination='terminal')
             else:
                 # Create default map structure from output_data
                 self.map_data = self._create_default_map(output_data)
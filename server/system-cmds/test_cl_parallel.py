@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CL step graph tests
+
+Checks the dependencies build_step_graph infers for OVRF/CALL/DLTOVR
+groups and the override snapshot recorded for each CALL step.
+"""
+
+import os
+import sys
+
+# Add current directory to path for imports
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from cl_executor import CompiledInstruction
+from cl_parallel import build_step_graph
+
+
+def _instruction(command, **params):
+    return CompiledInstruction(command, params)
+
+
+def _ancestors(steps, index):
+    """All steps a step transitively waits for"""
+    seen = set()
+    pending = list(steps[index].deps)
+    while pending:
+        dep = pending.pop()
+        if dep not in seen:
+            seen.add(dep)
+            pending.extend(steps[dep].deps)
+    return seen
+
+
+def test_independent_override_groups():
+    """CALL steps under different logical names do not wait for each other"""
+    steps = build_step_graph([
+        _instruction("OVRF", FILE="IN", TOFILE="A"),    # 0
+        _instruction("CALL", PGM="P1"),                 # 1
+        _instruction("DLTOVR", FILE="IN"),              # 2
+        _instruction("OVRF", FILE="X", TOFILE="C"),     # 3
+        _instruction("CALL", PGM="P2"),                 # 4
+        _instruction("DLTOVR", FILE="X"),               # 5
+        _instruction("OVRF", FILE="Y", TOFILE="D"),     # 6
+        _instruction("CALL", PGM="P3"),                 # 7
+        _instruction("DLTOVR", FILE="Y"),               # 8
+    ], infer=True)
+
+    assert _ancestors(steps, 4) == {3}
+    assert _ancestors(steps, 7) == {6}
+    # DLTOVR keeps the dataset locked until the programs using it are done
+    assert steps[2].deps == {0, 1}
+    assert steps[5].deps == {3, 4}
+    assert steps[1].overrides == {"IN": 0}
+    assert steps[4].overrides == {"X": 3}
+    assert steps[7].overrides == {"Y": 6}
+
+
+def test_reused_logical_name_is_ordered():
+    """Re-overriding a logical name waits for the programs using the old override"""
+    steps = build_step_graph([
+        _instruction("OVRF", FILE="IN", TOFILE="A"),    # 0
+        _instruction("CALL", PGM="P1"),                 # 1
+        _instruction("DLTOVR", FILE="IN"),              # 2
+        _instruction("OVRF", FILE="IN", TOFILE="B"),    # 3
+        _instruction("CALL", PGM="P2"),                 # 4
+    ], infer=True)
+
+    assert {1, 2} <= _ancestors(steps, 4)
+    assert steps[4].overrides == {"IN": 3}
+
+
+def test_override_snapshot_of_deferred_call():
+    """A later OVRF of a new logical name does not wait for, or leak into, earlier CALLs"""
+    steps = build_step_graph([
+        _instruction("OVRF", FILE="IN", TOFILE="A"),    # 0
+        _instruction("CALL", PGM="P1"),                 # 1
+        _instruction("OVRF", FILE="OUT", TOFILE="B"),   # 2
+        _instruction("CALL", PGM="P2"),                 # 3
+    ], infer=True)
+
+    assert steps[2].deps == set()
+    assert steps[1].overrides == {"IN": 0}
+    assert steps[3].overrides == {"IN": 0, "OUT": 2}
+
+
+def test_call_without_overrides_orders_later_overrides():
+    """A CALL without overrides has no snapshot, so later OVRF steps wait for it"""
+    steps = build_step_graph([
+        _instruction("CALL", PGM="P1"),                 # 0
+        _instruction("OVRF", FILE="IN", TOFILE="A"),    # 1
+        _instruction("CALL", PGM="P2"),                 # 2
+    ], infer=True)
+
+    assert 0 in steps[1].deps
+    assert steps[0].overrides == {}
+
+
+def test_parallel_block_calls_are_independent():
+    """CALL steps in a PARALLEL block only wait for the block start"""
+    steps = build_step_graph([
+        _instruction("PARALLEL"),
+        _instruction("CALL", PGM="DAILY01"),
+        _instruction("CALL", PGM="DAILY02"),
+        _instruction("ENDPARALLEL"),
+    ])
+
+    assert steps[1].deps == {0}
+    assert steps[2].deps == {0}
+    assert steps[3].deps == {0, 1, 2}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"[OK] {name}")
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Volume Usage Accounting
+Keeps per-library object counts and sizes of the volume tree
+(<VOLUME_ROOT>/<volume>/<library>/<object>) in memory, so WRKVOL, WRKLIB
+and the API server no longer stat every dataset file on each request.
+
+Validation:
+    A library is scanned once with os.scandir (one stat per object). On
+    later requests it is only rescanned when the mtime of its directory
+    changed (objects created, deleted or renamed) or its totals are older
+    than VOLUME_USAGE_MAX_AGE seconds (objects rewritten in place do not
+    change the directory mtime).
+
+    Long-running processes call start_watching(): inotify then reports
+    every change, the affected objects are re-stat'ed individually and
+    summaries are served from memory without touching the filesystem.
+
+Totals are also written to a snapshot file (VOLUME_USAGE_CACHE_DIR or the
+temp directory), so short-lived CLI processes start from the totals of the
+previous run and only rescan libraries whose directory changed.
+
+Usage:
+    from volume_usage import get_usage_service
+    usage = get_usage_service('/home/aspuser/app/volume')
+    for volume in usage.get_summary():
+        print(volume['name'], volume['total_size'])
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import logging
+import os
+import select
+import stat
+import struct
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+VOLUME_USAGE_MAX_AGE = float(os.environ.get('VOLUME_USAGE_MAX_AGE', '60'))
+VOLUME_USAGE_CACHE_DIR = os.environ.get('VOLUME_USAGE_CACHE_DIR',
+                                        os.path.join(tempfile.gettempdir(), 'openasp-volume-usage'))
+VOLUME_USAGE_INOTIFY = os.environ.get('VOLUME_USAGE_INOTIFY', '1') == '1'
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+DIRECTORY_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+LIBRARY_EVENTS = DIRECTORY_EVENTS | IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE
+INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    INOTIFY_AVAILABLE = True
+except (OSError, AttributeError):
+    INOTIFY_AVAILABLE = False
+
+# Key of a watched directory: (None, None) root, (volume, None) volume, (volume, library)
+WatchKey = Tuple[Optional[str], Optional[str]]
+
+
+@dataclass
+class LibraryUsage:
+    """Object count and size of one library"""
+    volume: str
+    library: str
+    mtime_ns: int = 0
+    file_count: int = 0
+    total_size: int = 0
+    updated: float = 0.0
+    sizes: Optional[Dict[str, int]] = None  # object name -> size (None when loaded from the snapshot)
+    dirty: bool = False
+    watched: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.library,
+            'file_count': self.file_count,
+            'total_size': self.total_size
+        }
+
+
+class VolumeUsageService:
+    """Cached usage statistics of one volume root"""
+
+    def __init__(self, root: str, cache_path: Optional[str] = None, max_age: Optional[float] = None):
+        self.root = os.path.abspath(root)
+        self.cache_path = cache_path or os.path.join(
+            VOLUME_USAGE_CACHE_DIR, hashlib.sha1(self.root.encode()).hexdigest()[:16] + '.json')
+        self.max_age = VOLUME_USAGE_MAX_AGE if max_age is None else max_age
+        self.libraries: Dict[Tuple[str, str], LibraryUsage] = {}
+        self.volumes: List[str] = []
+        self.lock = threading.RLock()
+        self.changed = False
+        self.structure_dirty = True
+        self.inotify_fd: Optional[int] = None
+        self.watches: Dict[int, WatchKey] = {}
+        self.watch_keys: Dict[WatchKey, int] = {}
+        self.watch_thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.stats = {
+            'refreshes': 0,
+            'library_scans': 0,
+            'library_hits': 0,
+            'object_updates': 0,
+            'inotify_events': 0,
+            'snapshot_loaded': 0,
+            'snapshot_errors': 0
+        }
+        self._load_snapshot()
+
+    # Scanning
+
+    def refresh(self):
+        """Bring the cached totals up to date with the volume tree"""
+        with self.lock:
+            if self.watching and not self.structure_dirty and \
+                    all(usage.watched and not usage.dirty for usage in self.libraries.values()):
+                return
+            self.stats['refreshes'] += 1
+            self.structure_dirty = False
+
+            found = set()
+            volumes = []
+            now = time.time()
+            for volume_entry in self._scandir(self.root):
+                if not volume_entry.is_dir():
+                    continue
+                volume = volume_entry.name
+                volumes.append(volume)
+                if self.watching:
+                    self._watch(volume_entry.path, (volume, None), DIRECTORY_EVENTS)
+                for library_entry in self._scandir(volume_entry.path):
+                    if not library_entry.is_dir():
+                        continue
+                    key = (volume, library_entry.name)
+                    try:
+                        mtime_ns = library_entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    found.add(key)
+                    usage = self.libraries.get(key)
+                    if usage is None:
+                        usage = self.libraries[key] = LibraryUsage(volume, library_entry.name)
+                    if self.watching and not usage.watched:
+                        # Watch before scanning so no change is missed
+                        usage.watched = self._watch(library_entry.path, key, LIBRARY_EVENTS)
+                        usage.dirty = usage.dirty or usage.watched
+                    if not usage.dirty and (
+                            (usage.watched and usage.sizes is not None) or
+                            (usage.mtime_ns == mtime_ns and now - usage.updated < self.max_age)):
+                        self.stats['library_hits'] += 1
+                        continue
+                    self._scan_library(usage, library_entry.path, mtime_ns)
+
+            for key in [key for key in self.watch_keys if key[0] and key[1] is None and key[0] not in volumes]:
+                del self.watch_keys[key]
+            self.volumes = sorted(volumes)
+            for key in set(self.libraries) - found:
+                del self.libraries[key]
+                self.watch_keys.pop(key, None)
+                self.changed = True
+
+            if self.changed:
+                self._save_snapshot()
+
+    def _scandir(self, path: str) -> List[os.DirEntry]:
+        try:
+            with os.scandir(path) as entries:
+                return list(entries)
+        except OSError:
+            return []
+
+    def _scan_library(self, usage: LibraryUsage, path: str, mtime_ns: int):
+        """Scan one library; DirEntry caches the type, so each object costs one stat"""
+        sizes = {}
+        for entry in self._scandir(path):
+            try:
+                if entry.is_file():
+                    sizes[entry.name] = entry.stat().st_size
+            except OSError:
+                continue  # removed while scanning
+        usage.sizes = sizes
+        usage.file_count = len(sizes)
+        usage.total_size = sum(sizes.values())
+        usage.mtime_ns = mtime_ns  # taken before the scan: a concurrent change forces a rescan
+        usage.updated = time.time()
+        usage.dirty = False
+        self.stats['library_scans'] += 1
+        self.changed = True
+
+    def _update_object(self, usage: LibraryUsage, name: str):
+        """Re-stat one object of a library after an inotify event"""
+        if usage.sizes is None:
+            usage.dirty = True
+            return
+        try:
+            st = os.stat(os.path.join(self.root, usage.volume, usage.library, name))
+            size = st.st_size if stat.S_ISREG(st.st_mode) else None
+        except OSError:
+            size = None  # deleted or renamed away
+        old = usage.sizes.pop(name, None)
+        if old is not None:
+            usage.total_size -= old
+        if size is not None:
+            usage.sizes[name] = size
+            usage.total_size += size
+        usage.file_count = len(usage.sizes)
+        usage.updated = time.time()
+        self.stats['object_updates'] += 1
+        self.changed = True
+
+    # Summaries
+
+    def get_summary(self, include_libraries: bool = False) -> List[Dict[str, Any]]:
+        """
+        Usage per volume, sorted by volume name
+
+        Returns:
+            List of dicts with name, library_count, file_count, total_size
+            (and libraries when include_libraries is set)
+        """
+        self.refresh()
+        with self.lock:
+            volumes = {volume: {
+                'name': volume,
+                'library_count': 0,
+                'file_count': 0,
+                'total_size': 0,
+                'libraries': []
+            } for volume in self.volumes}
+            for (volume, _), usage in sorted(self.libraries.items()):
+                summary = volumes[volume]
+                summary['library_count'] += 1
+                summary['file_count'] += usage.file_count
+                summary['total_size'] += usage.total_size
+                if include_libraries:
+                    summary['libraries'].append(usage.to_dict())
+
+            if not include_libraries:
+                for summary in volumes.values():
+                    del summary['libraries']
+            return list(volumes.values())
+
+    def get_library(self, volume: str, library: str) -> Optional[LibraryUsage]:
+        """Usage of one library, None when it does not exist"""
+        self.refresh()
+        with self.lock:
+            return self.libraries.get((volume, library))
+
+    def invalidate(self, volume: Optional[str] = None, library: Optional[str] = None):
+        """Force a rescan of a library, a volume or everything on the next request"""
+        with self.lock:
+            self.structure_dirty = True
+            for (vol, lib), usage in self.libraries.items():
+                if (volume is None or vol == volume) and (library is None or lib == library):
+                    usage.dirty = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get service statistics"""
+        with self.lock:
+            stats = self.stats.copy()
+            stats['libraries'] = len(self.libraries)
+            stats['watching'] = self.watching
+            stats['watches'] = len(self.watches)
+        return stats
+
+    # Snapshot
+
+    def _load_snapshot(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('root') != self.root:
+                return
+            for item in snapshot.get('libraries', []):
+                usage = LibraryUsage(item['volume'], item['library'], item['mtime_ns'],
+                                     item['file_count'], item['total_size'], item['updated'])
+                self.libraries[(usage.volume, usage.library)] = usage
+            self.stats['snapshot_loaded'] += 1
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.stats['snapshot_errors'] += 1
+            logger.debug(f"Ignoring volume usage snapshot {self.cache_path}: {e}")
+
+    def _save_snapshot(self):
+        snapshot = {
+            'root': self.root,
+            'saved': time.time(),
+            'libraries': [
+                {
+                    'volume': usage.volume,
+                    'library': usage.library,
+                    'mtime_ns': usage.mtime_ns,
+                    'file_count': usage.file_count,
+                    'total_size': usage.total_size,
+                    'updated': usage.updated
+                }
+                for usage in self.libraries.values() if not usage.dirty
+            ]
+        }
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, self.cache_path)
+            self.changed = False
+        except OSError as e:
+            self.stats['snapshot_errors'] += 1
+            logger.debug(f"Cannot write volume usage snapshot {self.cache_path}: {e}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    # inotify
+
+    @property
+    def watching(self) -> bool:
+        return self.inotify_fd is not None
+
+    def start_watching(self) -> bool:
+        """
+        Keep the totals current through inotify (Linux only)
+
+        Returns:
+            True when watching, False when inotify is unavailable
+        """
+        with self.lock:
+            if self.watching:
+                return True
+            if not (INOTIFY_AVAILABLE and VOLUME_USAGE_INOTIFY) or not os.path.isdir(self.root):
+                return False
+            fd = _libc.inotify_init1(IN_CLOEXEC)
+            if fd < 0:
+                logger.warning(f"inotify not available: {os.strerror(ctypes.get_errno())}")
+                return False
+            self.inotify_fd = fd
+            self.stop_event.clear()
+            self._watch(self.root, (None, None), DIRECTORY_EVENTS)
+            self.structure_dirty = True
+            self.watch_thread = threading.Thread(target=self._watch_loop, name='volume-usage-inotify',
+                                                 daemon=True)
+            self.watch_thread.start()
+        logger.info(f"Watching volume usage of {self.root}")
+        return True
+
+    def stop_watching(self):
+        """Stop inotify updates; totals fall back to mtime validation"""
+        with self.lock:
+            if not self.watching:
+                return
+            self.stop_event.set()
+            thread = self.watch_thread
+        if thread is not None:
+            thread.join()
+        with self.lock:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+            self.watch_thread = None
+            self.watches.clear()
+            self.watch_keys.clear()
+            for usage in self.libraries.values():
+                usage.watched = False
+
+    def _watch(self, path: str, key: WatchKey, mask: int) -> bool:
+        if key in self.watch_keys:
+            return True
+        wd = _libc.inotify_add_watch(self.inotify_fd, os.fsencode(path), mask | IN_ONLYDIR)
+        if wd < 0:
+            # ENOSPC: fs.inotify.max_user_watches reached, mtime validation is used instead
+            logger.warning(f"Cannot watch {path}: {os.strerror(ctypes.get_errno())}")
+            return False
+        self.watches[wd] = key
+        self.watch_keys[key] = wd
+        return True
+
+    def _watch_loop(self):
+        while not self.stop_event.is_set():
+            readable, _, _ = select.select([self.inotify_fd], [], [], 1.0)
+            if not readable:
+                continue
+            try:
+                data = os.read(self.inotify_fd, 65536)
+            except OSError as e:
+                logger.error(f"inotify read failed: {e}")
+                return
+            try:
+                self._handle_events(data)
+            except Exception as e:
+                logger.error(f"Volume usage update failed: {e}")
+                self.invalidate()
+
+    def _handle_events(self, data: bytes):
+        # Collect the objects first: a large write produces many IN_MODIFY events
+        pending = set()
+        with self.lock:
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + INOTIFY_EVENT.size:offset + INOTIFY_EVENT.size + length]
+                                   .rstrip(b'\0'))
+                offset += INOTIFY_EVENT.size + length
+                self.stats['inotify_events'] += 1
+
+                if mask & IN_Q_OVERFLOW:
+                    self.invalidate()
+                    continue
+                key = self.watches.get(wd)
+                if key is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self.watches[wd]
+                    if self.watch_keys.get(key) == wd:
+                        # Not replaced by a watch on a recreated directory
+                        self.watch_keys.pop(key)
+                        usage = self.libraries.get(key)
+                        if usage is not None:
+                            usage.watched = False
+                    self.structure_dirty = True
+                    continue
+
+                volume, library = key
+                if library is None:
+                    # Root or volume: libraries/volumes created, removed or renamed
+                    if mask & (IN_ISDIR | IN_DELETE_SELF | IN_MOVE_SELF):
+                        self.structure_dirty = True
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    self.structure_dirty = True
+                    continue
+                usage = self.libraries.get(key)
+                if usage is not None and name:
+                    pending.add((key, name))
+
+            for key, name in pending:
+                usage = self.libraries.get(key)
+                if usage is not None:
+                    self._update_object(usage, name)
+
+
+_services: Dict[str, VolumeUsageService] = {}
+_services_lock = threading.Lock()
+
+
+def get_usage_service(root: str) -> VolumeUsageService:
+    """Process-wide usage service of a volume root"""
+    root = os.path.abspath(root)
+    with _services_lock:
+        service = _services.get(root)
+        if service is None:
+            service = _services[root] = VolumeUsageService(root)
+        return service
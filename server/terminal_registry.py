@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Terminal Registry
+Thread-safe registry of connected terminals, WebSocket sessions and
+position-based SMED sessions with secondary indexes for O(1) lookups
+"""
+
+import threading
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class TerminalRegistry:
+    """
+    Registry keyed by Socket.IO session id (sid)
+
+    Primary tables:
+        terminals          sid -> {'terminal_id', 'user', 'room', 'workstation', ...}
+        websocket_sessions sid -> {'wsname', 'user', 'terminal_id', ...}
+        position_sessions  sid -> {'map_name', 'terminal_id', 'subscriptions', ...}
+
+    Secondary indexes:
+        terminal_id -> sid, wsname -> {sid}, user -> {sid}, map_name -> {sid}
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._terminals: Dict[str, Dict[str, Any]] = {}
+        self._websocket_sessions: Dict[str, Dict[str, Any]] = {}
+        self._position_sessions: Dict[str, Dict[str, Any]] = {}
+
+        self._by_terminal_id: Dict[str, str] = {}
+        self._by_wsname: Dict[str, Set[str]] = {}
+        self._by_user: Dict[str, Set[str]] = {}
+        self._by_map: Dict[str, Set[str]] = {}
+        self._sid_keys: Dict[str, tuple] = {}  # sid -> (wsnames, users) currently indexed
+
+    # ------------------------------------------------------------------
+    # Terminals
+    # ------------------------------------------------------------------
+    def register_terminal(self, sid: str, terminal_info: Dict[str, Any], routable: bool = True,
+                          replace_existing: bool = False) -> Optional[str]:
+        """
+        Register (or replace) the terminal of a session
+
+        Args:
+            sid: Socket.IO / workstation session id
+            terminal_info: Terminal entry
+            routable: Route terminal_info['terminal_id'] to this sid
+            replace_existing: Drop the terminal entry of the session the
+                terminal_id was previously routed to
+
+        Returns the sid the terminal_id was previously routed to, or None
+        """
+        terminal_id = terminal_info.get('terminal_id') if routable else None
+        with self.lock:
+            previous_sid = self._by_terminal_id.get(terminal_id) if terminal_id else None
+            if previous_sid == sid:
+                previous_sid = None
+            if previous_sid is not None and replace_existing:
+                self._terminals.pop(previous_sid, None)
+                self._reindex(previous_sid)
+
+            old_info = self._terminals.get(sid)
+            if old_info and old_info.get('terminal_id') != terminal_info.get('terminal_id'):
+                self._unmap_terminal_id(old_info.get('terminal_id'), sid)
+
+            self._terminals[sid] = terminal_info
+            if terminal_id:
+                self._by_terminal_id[terminal_id] = sid
+            self._reindex(sid)
+            return previous_sid
+
+    def update_terminal(self, sid: str, updates: Dict[str, Any]) -> bool:
+        """Merge updates into a registered terminal entry"""
+        with self.lock:
+            terminal_info = self._terminals.get(sid)
+            if terminal_info is None:
+                return False
+            terminal_info.update(updates)
+            self._reindex(sid)
+            return True
+
+    def unregister_terminal(self, sid: str) -> Optional[Dict[str, Any]]:
+        """Remove the terminal of a session and its terminal_id mapping"""
+        with self.lock:
+            terminal_info = self._terminals.pop(sid, None)
+            if terminal_info is not None:
+                self._unmap_terminal_id(terminal_info.get('terminal_id'), sid)
+                self._reindex(sid)
+            return terminal_info
+
+    def get_terminal(self, sid: str) -> Optional[Dict[str, Any]]:
+        """Get the terminal entry of a session"""
+        with self.lock:
+            return self._terminals.get(sid)
+
+    def has_terminal(self, sid: str) -> bool:
+        with self.lock:
+            return sid in self._terminals
+
+    def map_terminal(self, terminal_id: str, sid: str):
+        """Route a terminal_id to a session id (workstation sessions without a socket)"""
+        with self.lock:
+            self._by_terminal_id[terminal_id] = sid
+
+    def unmap_terminal(self, terminal_id: str):
+        with self.lock:
+            self._by_terminal_id.pop(terminal_id, None)
+
+    def session_for_terminal(self, terminal_id: str) -> Optional[str]:
+        """Session id a terminal_id is routed to"""
+        with self.lock:
+            return self._by_terminal_id.get(terminal_id)
+
+    def terminal_by_id(self, terminal_id: str) -> Optional[Dict[str, Any]]:
+        """Terminal entry for a terminal_id"""
+        with self.lock:
+            sid = self._by_terminal_id.get(terminal_id)
+            return self._terminals.get(sid) if sid else None
+
+    def list_terminals(self) -> Dict[str, Dict[str, Any]]:
+        """Snapshot of all terminal entries"""
+        with self.lock:
+            return dict(self._terminals)
+
+    def terminal_mappings(self) -> Dict[str, str]:
+        """Snapshot of terminal_id -> sid routing"""
+        with self.lock:
+            return dict(self._by_terminal_id)
+
+    # ------------------------------------------------------------------
+    # WebSocket sessions
+    # ------------------------------------------------------------------
+    def set_websocket_session(self, sid: str, session_info: Dict[str, Any]):
+        with self.lock:
+            self._websocket_sessions[sid] = session_info
+            self._reindex(sid)
+
+    def get_websocket_session(self, sid: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self._websocket_sessions.get(sid)
+
+    def remove_websocket_session(self, sid: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            session_info = self._websocket_sessions.pop(sid, None)
+            if session_info is not None:
+                self._reindex(sid)
+            return session_info
+
+    # ------------------------------------------------------------------
+    # Position-based SMED sessions
+    # ------------------------------------------------------------------
+    def register_position_session(self, sid: str, map_name: str, terminal_id: str):
+        now = datetime.now().isoformat()
+        with self.lock:
+            session_info = self._position_sessions.get(sid)
+            if session_info is None:
+                self._position_sessions[sid] = {
+                    'map_name': map_name,
+                    'terminal_id': terminal_id,
+                    'subscriptions': [],
+                    'created_at': now,
+                    'last_activity': now
+                }
+            else:
+                session_info['last_activity'] = now
+
+    def add_position_subscription(self, sid: str, map_name: str):
+        with self.lock:
+            session_info = self._position_sessions.get(sid)
+            if session_info is None:
+                return
+            if map_name not in session_info['subscriptions']:
+                session_info['subscriptions'].append(map_name)
+            self._by_map.setdefault(map_name, set()).add(sid)
+
+    def remove_position_subscription(self, sid: str, map_name: str):
+        with self.lock:
+            session_info = self._position_sessions.get(sid)
+            if session_info and map_name in session_info['subscriptions']:
+                session_info['subscriptions'].remove(map_name)
+            self._discard(self._by_map, map_name, sid)
+
+    def touch_position_session(self, sid: str):
+        with self.lock:
+            session_info = self._position_sessions.get(sid)
+            if session_info is not None:
+                session_info['last_activity'] = datetime.now().isoformat()
+
+    def get_position_session(self, sid: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self._position_sessions.get(sid)
+
+    def unregister_position_session(self, sid: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            session_info = self._position_sessions.pop(sid, None)
+            if session_info:
+                for map_name in session_info.get('subscriptions', []):
+                    self._discard(self._by_map, map_name, sid)
+            return session_info
+
+    def list_position_sessions(self) -> Dict[str, Dict[str, Any]]:
+        with self.lock:
+            return dict(self._position_sessions)
+
+    def sessions_for_map(self, map_name: str) -> Set[str]:
+        """Session ids subscribed to a position-based map"""
+        with self.lock:
+            return set(self._by_map.get(map_name, ()))
+
+    # ------------------------------------------------------------------
+    # Index lookups
+    # ------------------------------------------------------------------
+    def sessions_for_workstation(self, wsname: str) -> Set[str]:
+        with self.lock:
+            return set(self._by_wsname.get(wsname, ()))
+
+    def sessions_for_workstations(self, wsnames: Iterable[str]) -> Dict[str, str]:
+        """{sid: wsname} for every session bound to one of the workstations"""
+        with self.lock:
+            return {sid: wsname for wsname in set(wsnames) for sid in self._by_wsname.get(wsname, ())}
+
+    def sessions_for_user(self, user: str) -> Set[str]:
+        with self.lock:
+            return set(self._by_user.get(user, ()))
+
+    def remove_session(self, sid: str) -> Dict[str, Any]:
+        """Drop everything registered for a session id"""
+        with self.lock:
+            return {
+                'terminal': self.unregister_terminal(sid),
+                'websocket': self.remove_websocket_session(sid),
+                'position': self.unregister_position_session(sid)
+            }
+
+    def get_stats(self) -> Dict[str, int]:
+        """Registry sizes for the metrics endpoint"""
+        with self.lock:
+            return {
+                'terminals': len(self._terminals),
+                'terminal_ids': len(self._by_terminal_id),
+                'websocket_sessions': len(self._websocket_sessions),
+                'position_smed_sessions': len(self._position_sessions),
+                'workstations': len(self._by_wsname),
+                'users': len(self._by_user),
+                'subscribed_maps': len(self._by_map),
+                'position_subscriptions': sum(len(sids) for sids in self._by_map.values())
+            }
+
+    # ------------------------------------------------------------------
+    # Internal index maintenance (caller holds self.lock)
+    # ------------------------------------------------------------------
+    def _reindex(self, sid: str):
+        old_wsnames, old_users = self._sid_keys.pop(sid, ((), ()))
+        for wsname in old_wsnames:
+            self._discard(self._by_wsname, wsname, sid)
+        for user in old_users:
+            self._discard(self._by_user, user, sid)
+
+        sources: List[Dict[str, Any]] = [
+            entry for entry in (self._terminals.get(sid), self._websocket_sessions.get(sid)) if entry
+        ]
+        wsnames = {entry.get('workstation') or entry.get('wsname') for entry in sources} - {None}
+        users = {entry.get('user') for entry in sources} - {None}
+        for wsname in wsnames:
+            self._by_wsname.setdefault(wsname, set()).add(sid)
+        for user in users:
+            self._by_user.setdefault(user, set()).add(sid)
+        if wsnames or users:
+            self._sid_keys[sid] = (wsnames, users)
+
+    def _unmap_terminal_id(self, terminal_id: Optional[str], sid: str):
+        if terminal_id and self._by_terminal_id.get(terminal_id) == sid:
+            del self._by_terminal_id[terminal_id]
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, sid: str):
+        sids = index.get(key)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del index[key]
+
+
+# Global instance shared by all handlers
+terminal_registry = TerminalRegistry()